@@ -22,6 +22,9 @@ class Settings(BaseSettings):
         - STATE_PREFIX: GCS prefix for state files (default: state)
         - FIREBASE_AUTH_REQUIRED: Require Firebase token on protected routes (default: false)
         - SHOW_DOCS: Force-enable API docs regardless of environment (default: false)
+        - STARTUP_WARMUP: "parallel" (default) loads all leagues concurrently before
+          serving, "background" serves immediately while leagues load, "serial"
+          loads one league after another
     """
 
     # Environment mode
@@ -56,6 +59,13 @@ class Settings(BaseSettings):
     # Docs override
     show_docs: bool = False
 
+    # League warm-up strategy at startup: parallel | background | serial
+    startup_warmup: str = "parallel"
+
+    # Seconds between checks of each league's state MANIFEST.json for a new
+    # generation (hot reload without restart); 0 disables the watcher
+    state_watch_interval: float = 30.0
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
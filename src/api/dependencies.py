@@ -5,9 +5,14 @@ Provides singleton instances of predictor, state manager, etc.
 """
 
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
 from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -23,8 +28,16 @@ from core import (
     ESPNClient,
     OddsClient,
 )
+from core.config import MODEL_VARIANT
+from core.elo_engine import EloParams
 from core.injury_client import InjuryClient
-from core.league_config import NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG, LeagueConfig
+from core.model_artifacts import read_refresh_record, serving_paths
+from core.predictor import preload_model_libraries
+from core.schedule_store import SCHEDULE_FILE, ScheduleStore, season_end
+from core.season_simulator import project_season
+from core.standings_tracker import StandingsTracker
+from core.state_index import INDEX_FILE, StateIndex
+from core.league_config import NBA_CONFIG, LEAGUE_CONFIGS, LeagueConfig
 
 
 # =============================================================================
@@ -118,10 +131,17 @@ class PredictionService:
     Combines all necessary components.
     """
     
-    def __init__(self, config: LeagueConfig = NBA_CONFIG):
+    def __init__(self, config: LeagueConfig = NBA_CONFIG, league: Optional[str] = None):
         self.config = config
+        self.league = league or next((k for k, c in LEAGUE_CONFIGS.items() if c is config), "nba")
+        # Seconds spent in each load stage, reported by warm_up_services()
+        self.timings: Dict[str, float] = {}
+        start = time.perf_counter()
         self.team_mapper = TeamMapper(lookup_path=get_project_root() / config.team_lookup_csv) if config.team_lookup_csv else TeamMapper()
-        self.state_manager = StateManager(get_project_root() / config.state_dir)
+        self.state_manager = StateManager(
+            get_project_root() / config.state_dir,
+            elo_params=EloParams.from_config(config),
+        )
         self.espn_client = ESPNClient(self.team_mapper, league_slug=config.espn_slug)
         self.odds_client = OddsClient(team_mapper=self.team_mapper, sport_key=config.odds_sport_key)
         self.injury_client = None if config.injury_source == "none" else InjuryClient(team_mapper=self.team_mapper, league_slug=config.espn_slug)
@@ -131,30 +151,78 @@ class PredictionService:
         self._feature_builder = None
         self._confidence_scorer = None
         self._odds_dict = None
+        self._standings = None
+        self._schedule = None
+        # Point-in-time index (None: not loaded yet, False: no index file)
+        self._state_index = None
+        self._historical_builders: "OrderedDict[str, FeatureBuilder]" = OrderedDict()
+        self._load_lock = threading.Lock()
+        self._simulation_lock = threading.Lock()
+        # StateManager.state_version() of the trackers currently loaded, and
+        # the refresh record (model_artifacts) of the model currently loaded
+        self.state_version = None
+        self.model_version = None
+        self.timings["team_mapper"] = time.perf_counter() - start
     
     def _ensure_trackers(self):
-        """Ensure trackers are loaded."""
-        if self._elo_tracker is None or self._stats_tracker is None:
-            self._elo_tracker, self._stats_tracker = get_trackers(self.state_manager)
-            
-            # Create feature builder with injury support
-            self._feature_builder = FeatureBuilder(
-                self._elo_tracker, 
-                self._stats_tracker,
-                injury_client=self.injury_client,  # Pass injury client for adjustments
-            )
-            self._confidence_scorer = ConfidenceScorer(self._stats_tracker)
-            
-            # Create predictor with confidence scorer
-            model_path = get_project_root() / self.config.model_path
-            calibrator_path = get_project_root() / self.config.calibrator_path
-            
-            self._predictor_with_confidence = Predictor(
-                model_path,
-                calibrator_path if calibrator_path.exists() else None,
-                confidence_scorer=self._confidence_scorer,
-            )
-    
+        """Ensure trackers are loaded (concurrent callers wait for one load)."""
+        if self._predictor_with_confidence is not None:
+            return
+        with self._load_lock:
+            if self._predictor_with_confidence is None:
+                self._load_components()
+
+    def _load_components(self):
+        """Load state, feature builder and predictor (load lock held)."""
+        self._swap_state(self._read_state())
+        self._predictor_with_confidence = self._make_predictor()
+
+    def _read_state(self) -> tuple:
+        """Trackers of the current state and the objects built on them."""
+        wait_for_state_sync()
+        start = time.perf_counter()
+        version = self.state_manager.state_version()
+        elo_tracker, stats_tracker = get_trackers(self.state_manager)
+        self.timings["state"] = time.perf_counter() - start
+
+        # Create feature builder with injury support
+        feature_builder = FeatureBuilder(
+            elo_tracker,
+            stats_tracker,
+            injury_client=self.injury_client,  # Pass injury client for adjustments
+        )
+        return version, elo_tracker, stats_tracker, feature_builder, ConfidenceScorer(stats_tracker)
+
+    def _swap_state(self, state: tuple) -> None:
+        """Swap in new trackers. Every attribute goes from one object to the next, never to None."""
+        self.state_version, self._elo_tracker, self._stats_tracker, self._feature_builder, scorer = state
+        self._confidence_scorer = scorer
+        if self._predictor_with_confidence is not None:
+            self._predictor_with_confidence.confidence_scorer = scorer
+
+    def _refresh_version(self) -> Optional[str]:
+        record = read_refresh_record(self.state_manager.state_dir)
+        return record.get("model_sha256") if record else None
+
+    def _make_predictor(self) -> Predictor:
+        """Predictor with confidence scoring on the model to serve."""
+        # A model refreshed by the daily job and synced with the state
+        # takes precedence over the configured one
+        self.model_version = self._refresh_version()
+        model_path, calibrator_path = serving_paths(
+            get_project_root() / self.config.model_path,
+            get_project_root() / self.config.calibrator_path,
+            self.state_manager.state_dir,
+        )
+        predictor = Predictor(
+            model_path,
+            calibrator_path,
+            confidence_scorer=self._confidence_scorer,
+            variant=MODEL_VARIANT,
+        )
+        self.timings.update(predictor.load_timings)
+        return predictor
+
     @property
     def predictor(self) -> Predictor:
         """Get predictor with confidence scoring."""
@@ -194,6 +262,105 @@ class PredictionService:
             self._odds_dict = self.odds_client.get_odds_dict()
         return self._odds_dict
     
+    @property
+    def standings(self) -> StandingsTracker:
+        """Season standings of the loaded state (incl. journaled games)."""
+        standings = self._standings
+        if standings is None:
+            with self._load_lock:
+                standings = self._standings
+                if standings is None:
+                    wait_for_state_sync()
+                    standings = self._standings = self.state_manager.load_standings(self.league)
+        return standings
+
+    @property
+    def schedule(self) -> ScheduleStore:
+        """Season schedule of the league (state_dir/schedule.json)."""
+        schedule = self._schedule
+        if schedule is None:
+            with self._load_lock:
+                schedule = self._schedule
+                if schedule is None:
+                    wait_for_state_sync()
+                    schedule = self._schedule = ScheduleStore(
+                        self.state_manager.state_dir / SCHEDULE_FILE, self.league)
+        return schedule
+
+    def schedule_for(self, start: date, end: date) -> ScheduleStore:
+        """The schedule with the stale days of [start, end] re-fetched from ESPN."""
+        schedule = self.schedule
+        schedule.refresh(self.espn_client, start, end)
+        return schedule
+
+    def season_projections(self, iterations: int) -> dict:
+        """
+        Seeding, play-in and playoff odds from a simulation of the rest of
+        the season (see core/season_simulator.py). Cached per state version
+        and iteration count in data/cache/season_sim; one simulation runs
+        at a time, inline (no worker processes inside the API).
+
+        Raises:
+            ValueError: The league has no playoff format
+        """
+        today = date.today()
+        end = season_end(today, self.league)
+        schedule = self.schedule_for(today, end)
+        with self._simulation_lock:
+            return project_season(
+                self.league, self.elo_tracker, self.standings,
+                schedule.games(today, end, scheduled_only=False),
+                iterations=iterations,
+                workers=1,
+                cache_dir=get_project_root() / "data" / "cache" / "season_sim",
+                today=today,
+            )
+
+    # Feature builders for past dates kept in memory (a few KB each)
+    HISTORICAL_CACHE_SIZE = 32
+
+    @property
+    def state_index(self) -> Optional[StateIndex]:
+        """Point-in-time state index (None if the league has none)."""
+        index = self._state_index
+        if index is None:
+            wait_for_state_sync()
+            path = self.state_manager.state_dir / INDEX_FILE
+            index = self._state_index = StateIndex.load(path) if path.exists() else False
+        return index or None
+
+    def is_historical(self, game_date: str | date) -> bool:
+        """Whether a date is in the past and covered by the state index."""
+        if isinstance(game_date, date):
+            game_date = game_date.isoformat()
+        if game_date[:10] >= date.today().isoformat():
+            return False
+        index = self.state_index
+        return index is not None and index.covers(game_date)
+
+    def feature_builder_for(self, game_date: str | date) -> FeatureBuilder:
+        """
+        Feature builder over the state as of ``game_date``.
+
+        Past dates covered by the state index get trackers rebuilt from the
+        index (cached per date); today, future dates and uncovered dates
+        use the live trackers.
+        """
+        if not self.is_historical(game_date):
+            return self.feature_builder
+        key = game_date.isoformat() if isinstance(game_date, date) else game_date[:10]
+        with self._load_lock:
+            builder = self._historical_builders.get(key)
+            if builder is None:
+                elo, stats = self.state_index.trackers_at(key)
+                builder = FeatureBuilder(elo, stats)
+                self._historical_builders[key] = builder
+                if len(self._historical_builders) > self.HISTORICAL_CACHE_SIZE:
+                    self._historical_builders.popitem(last=False)
+            else:
+                self._historical_builders.move_to_end(key)
+        return builder
+
     def get_odds_for_game(self, home_id: int, away_id: int) -> tuple:
         """Get moneylines for a specific matchup."""
         key = (home_id, away_id)
@@ -201,34 +368,211 @@ class PredictionService:
             return self.odds_dict[key]
         return None, None
     
-    def reload_state(self):
-        """Reload state from disk."""
-        self._elo_tracker = None
-        self._stats_tracker = None
-        self._feature_builder = None
-        self._confidence_scorer = None
-        self._predictor_with_confidence = None
-        self._odds_dict = None
-        self._ensure_trackers()
+    def reload_state(self, reload_model: bool = True):
+        """
+        Reload state (and, unless ``reload_model`` is False, the model) from disk.
+
+        The new trackers and predictor are built before anything is swapped
+        in, so concurrent requests keep using the previous objects until
+        then and never see a half-reloaded service.
+        """
+        with self._load_lock:
+            if self._predictor_with_confidence is None:
+                self._load_components()
+            else:
+                state = self._read_state()
+                self._swap_state(state)
+                if reload_model:
+                    self._predictor_with_confidence = self._make_predictor()
+            self._odds_dict = None
+            self._standings = None
+            self._schedule = None
+            self._state_index = None
+            self._historical_builders.clear()
+
+    def reload_model(self):
+        """Reload the model and calibrator only (e.g. after a refresh was promoted)."""
+        with self._load_lock:
+            if self._predictor_with_confidence is None:
+                self._load_components()
+            else:
+                self._predictor_with_confidence = self._make_predictor()
+
+    def state_changed(self) -> bool:
+        """Whether the tracker state on disk differs from the loaded one."""
+        return self.state_manager.state_version() != self.state_version
+
+    def model_changed(self) -> bool:
+        """Whether a different refreshed model has been promoted since loading."""
+        return self._refresh_version() != self.model_version
 
 
 # Singleton prediction service cache
 _prediction_services = {}
+_services_lock = threading.Lock()
+
+# Startup GCS state download (see set_state_sync)
+_state_sync: Optional[Future] = None
+
+
+def set_state_sync(future: Optional[Future]) -> None:
+    """
+    Register the startup state download. Until it finishes, every read of
+    state files (warm-up or a request arriving first) waits for it instead
+    of loading the state baked into the image.
+    """
+    global _state_sync
+    _state_sync = future
+
+
+def wait_for_state_sync() -> None:
+    """Block until the registered state download has finished (if any)."""
+    if _state_sync is not None:
+        _state_sync.result()
+
+
+def _get_service(league: str) -> PredictionService:
+    service = _prediction_services.get(league)
+    if service is None:
+        with _services_lock:
+            service = _prediction_services.get(league)
+            if service is None:
+                service = PredictionService(config=LEAGUE_CONFIGS[league], league=league)
+                _prediction_services[league] = service
+    return service
 
 def get_nba_prediction_service() -> PredictionService:
-    if "nba" not in _prediction_services:
-        _prediction_services["nba"] = PredictionService(config=NBA_CONFIG)
-    return _prediction_services["nba"]
+    return _get_service("nba")
 
 def get_wnba_prediction_service() -> PredictionService:
-    if "wnba" not in _prediction_services:
-        _prediction_services["wnba"] = PredictionService(config=WNBA_CONFIG)
-    return _prediction_services["wnba"]
+    return _get_service("wnba")
 
 def get_cbb_prediction_service() -> PredictionService:
-    if "cbb" not in _prediction_services:
-        _prediction_services["cbb"] = PredictionService(config=CBB_CONFIG)
-    return _prediction_services["cbb"]
+    return _get_service("cbb")
+
+
+# =============================================================================
+# Warm-up
+# =============================================================================
+
+def warm_up_services(
+    leagues: Iterable[str] = LEAGUE_CONFIGS,
+    parallel: bool = True,
+    wait_for: Optional[Future] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Load every league's team mapper, state, model and calibrator.
+
+    The xgboost/sklearn import (the single most expensive step) starts
+    first and overlaps with building team mappers and clients. With
+    ``parallel`` each league then loads on its own thread.
+
+    Args:
+        leagues: League keys to warm ("nba", "wnba", "cbb")
+        parallel: Load leagues concurrently instead of one after another
+        wait_for: Optional future (e.g. the GCS state download) that must
+                  finish before state files are read. Team mappers and
+                  clients are built while it is still running.
+
+    Returns:
+        Dict mapping league -> stage -> seconds, plus an "imports" entry.
+        Failed leagues have an "error" entry holding the message instead
+        of timings.
+    """
+    leagues = list(leagues)
+    pool = ThreadPoolExecutor(
+        max_workers=(len(leagues) + 1) if parallel else 1,
+        thread_name_prefix="warmup",
+    )
+
+    def _warm(league: str, imports: Future) -> Dict[str, float]:
+        service = _get_service(league)
+        imports.result()
+        if wait_for is not None:
+            wait_for.result()
+        service._ensure_trackers()
+        return {**service.timings, "total": sum(service.timings.values())}
+
+    with pool:
+        imports = pool.submit(preload_model_libraries)
+        futures = {league: pool.submit(_warm, league, imports) for league in leagues}
+
+    results: Dict[str, Dict[str, float]] = {}
+    if imports.exception() is None:
+        results["imports"] = {"model_libraries": imports.result()}
+    for league, future in futures.items():
+        error = future.exception()
+        results[league] = {"error": str(error)} if error else future.result()
+    return results
+
+
+# =============================================================================
+# State hot reload
+# =============================================================================
+
+class StateWatcher:
+    """
+    Reloads a league's state when it changes on disk.
+
+    StateManager commits every state write by renaming a new manifest into
+    place and journals games in between, so the generation plus the journal
+    length (StateManager.state_version) is a cheap change token per league
+    per interval. Metadata-only commits (last processed date, counters) do
+    not trigger a reload. The model is only reloaded when the daily job
+    promotes a refreshed one (see model_artifacts.REFRESH_RECORD).
+    Leagues that have not been loaded yet are skipped; they read the
+    current state on first use anyway.
+    """
+
+    def __init__(self, interval: float, leagues: Iterable[str] = LEAGUE_CONFIGS):
+        self.interval = interval
+        self.leagues = list(leagues)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> Dict[str, bool]:
+        """
+        Reload every loaded league whose state or refreshed model changed.
+
+        Returns:
+            Dict mapping league -> True if it was reloaded
+        """
+        reloaded = {}
+        for league in self.leagues:
+            service = _prediction_services.get(league)
+            if service is None or service._predictor_with_confidence is None:
+                continue
+            try:
+                state_changed, model_changed = service.state_changed(), service.model_changed()
+                if not (state_changed or model_changed):
+                    continue
+                if state_changed:
+                    service.reload_state(reload_model=model_changed)
+                else:
+                    service.reload_model()
+                reloaded[league] = True
+                what = "state" if not model_changed else "model" if not state_changed else "state and model"
+                print(f"✓ Reloaded {league.upper()} {what} "
+                      f"(generation {service.state_manager.generation})")
+            except Exception as e:
+                reloaded[league] = False
+                print(f"⚠ Could not reload {league.upper()} state: {e}")
+        return reloaded
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> None:
+        """Start polling on a daemon thread (no-op if interval <= 0)."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="state-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
 
 from fastapi import Request
 
@@ -239,4 +583,3 @@ def get_prediction_service(request: Request) -> PredictionService:
     if request and request.url.path.startswith("/cbb/"):
         return get_cbb_prediction_service()
     return get_nba_prediction_service()
-
@@ -25,7 +25,7 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from .config import get_settings
-from .routes import predictions, games, health, playoff_predictions, chat, bracket, offseason
+from .routes import predictions, games, health, playoff_predictions, chat, bracket, offseason, standings
 from .middleware import RateLimiter, SecurityHeadersMiddleware
 
 
@@ -123,17 +123,20 @@ app.include_router(games.router)
 app.include_router(playoff_predictions.router)
 app.include_router(chat.router)
 app.include_router(offseason.router)
+app.include_router(standings.router)
 
 # WNBA Routes
 wnba_router = APIRouter(prefix="/wnba")
 wnba_router.include_router(predictions.router)
 wnba_router.include_router(games.router)
+wnba_router.include_router(standings.router)
 app.include_router(wnba_router)
 
 # CBB Routes
 cbb_router = APIRouter(prefix="/cbb")
 cbb_router.include_router(predictions.router)
 cbb_router.include_router(games.router)
+cbb_router.include_router(standings.router)
 cbb_router.include_router(bracket.router)
 app.include_router(cbb_router)
 
@@ -186,41 +189,85 @@ async def root():
 async def startup_event():
     """
     Initialize components on startup.
+
+    The GCS state download runs alongside league warm-up; each league (and
+    any request that arrives first) only waits for it before reading its
+    state files. STARTUP_WARMUP selects
+    whether leagues load concurrently (default), one by one, or in the
+    background while the server already accepts requests.
     """
-    from .dependencies import get_prediction_service, get_nba_prediction_service, get_wnba_prediction_service, get_cbb_prediction_service
+    import asyncio
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from .dependencies import LEAGUE_CONFIGS, StateWatcher, set_state_sync, warm_up_services
     from core.state_sync import download_state_from_gcs
 
+    started = time.perf_counter()
+    mode = settings.startup_warmup.lower()
     state_dir = Path(__file__).parent.parent.parent / "state"
-    try:
-        synced_files = download_state_from_gcs(state_dir)
-    except Exception as e:
-        synced_files = 0
-        print(f"⚠ GCS state sync skipped: {e}")
-    
+
+    def _sync_state() -> int:
+        sync_start = time.perf_counter()
+        try:
+            return download_state_from_gcs(state_dir)
+        except Exception as e:
+            print(f"⚠ GCS state sync skipped: {e}")
+            return 0
+        finally:
+            app.state.startup_timings["gcs_sync"] = time.perf_counter() - sync_start
+
+    app.state.startup_timings = {}
+    chat.usage_ledger.start()
+    sync_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gcs-sync")
+    sync_future = sync_pool.submit(_sync_state)
+    sync_pool.shutdown(wait=False)
+    # Requests served before warm-up is done wait for the download too
+    set_state_sync(sync_future)
+
     print(f"🚀 Starting {settings.api_title} v{settings.api_version}")
     print(f"📍 Environment: {settings.environment}")
     print(f"🌐 CORS Origins: {settings.cors_origins}")
     print(f"⏱️  Rate Limit: {settings.rate_limit_per_minute}/minute")
-    if synced_files > 0:
-        print(f"☁ Synced {synced_files} state file(s) from GCS")
-    
-    try:
-        service = get_nba_prediction_service() # pre-warm NBA
-        print(f"✓ Loaded NBA predictor: {service.predictor}")
-        print(f"✓ Loaded NBA state: {service.elo_tracker}")
-        
-        wnba_service = get_wnba_prediction_service() # pre-warm WNBA
-        print(f"✓ Loaded WNBA predictor: {wnba_service.predictor}")
-        print(f"✓ Loaded WNBA state: {wnba_service.elo_tracker}")
-        
-        cbb_service = get_cbb_prediction_service() # pre-warm CBB
-        print(f"✓ Loaded CBB predictor: {cbb_service.predictor}")
-        print(f"✓ Loaded CBB state: {cbb_service.elo_tracker}")
-        
-        print("✓ API ready to serve predictions")
-    except Exception as e:
-        print(f"⚠ Warning: Could not load prediction service: {e}")
-        print("  Run bootstrap_state.py and xgb_boost_model.py first")
+    print(f"🔥 Warm-up mode: {mode}")
+
+    def _warm_up() -> None:
+        results = warm_up_services(
+            LEAGUE_CONFIGS,
+            parallel=(mode != "serial"),
+            wait_for=sync_future,
+        )
+        synced_files = sync_future.result()
+        if synced_files > 0:
+            print(f"☁ Synced {synced_files} state file(s) from GCS "
+                  f"({app.state.startup_timings['gcs_sync']:.2f}s)")
+
+        failed = False
+        for league, stages in results.items():
+            app.state.startup_timings[league] = stages
+            if league == "imports":
+                print(f"✓ Imported model libraries ({stages['model_libraries']:.2f}s)")
+                continue
+            if "error" in stages:
+                failed = True
+                print(f"⚠ Warning: Could not load {league.upper()} prediction service: {stages['error']}")
+                continue
+            detail = ", ".join(f"{stage} {secs:.2f}s" for stage, secs in stages.items())
+            print(f"✓ Loaded {league.upper()} ({detail})")
+
+        app.state.startup_timings["total"] = time.perf_counter() - started
+        if failed:
+            print("  Run bootstrap_state.py and xgb_boost_model.py first")
+        else:
+            print(f"✓ API ready to serve predictions ({app.state.startup_timings['total']:.2f}s)")
+
+        app.state.state_watcher = StateWatcher(settings.state_watch_interval)
+        app.state.state_watcher.start()
+
+    if mode == "background":
+        threading.Thread(target=_warm_up, name="league-warmup", daemon=True).start()
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, _warm_up)
 
 
 # =============================================================================
@@ -233,3 +280,13 @@ async def shutdown_event():
     Cleanup on shutdown.
     """
     print("👋 Shutting down NBA Prediction API")
+
+    watcher = getattr(app.state, "state_watcher", None)
+    if watcher is not None:
+        watcher.stop()
+
+    # Hand unused chat quota reservations back to RTDB
+    chat.usage_ledger.stop()
+    settled = chat.usage_ledger.flush(force=True)
+    if settled:
+        print(f"   Settled {settled} chat usage leases")
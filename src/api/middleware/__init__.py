@@ -5,6 +5,12 @@ API Middleware components.
 from .rate_limiter import RateLimiter, rate_limit_exceeded_handler
 from .security import SecurityHeadersMiddleware
 from .firebase_auth import verify_firebase_token, FirebaseUser
+from .auth_cache import (
+    TokenClaimsCache,
+    SubscriptionTierCache,
+    get_token_cache,
+    get_tier_cache,
+)
 
 __all__ = [
     "RateLimiter",
@@ -12,4 +18,8 @@ __all__ = [
     "SecurityHeadersMiddleware",
     "verify_firebase_token",
     "FirebaseUser",
+    "TokenClaimsCache",
+    "SubscriptionTierCache",
+    "get_token_cache",
+    "get_tier_cache",
 ]
@@ -0,0 +1,227 @@
+"""
+In-process caches for Firebase authentication.
+
+Verifying a Firebase ID token means an RSA signature check (plus a periodic
+fetch of Google's public keys), and the chat endpoint also reads the user's
+subscription tier from RTDB on every message. A mobile app session re-sends
+the same ID token for up to an hour, so both results are cached here:
+
+  - TokenClaimsCache: verified claims keyed by SHA-256 of the raw token,
+    bounded (LRU) and never served past the token's own ``exp``.
+  - SubscriptionTierCache: subscription tier per uid with a short TTL.
+
+Configurable via environment variables:
+    AUTH_TOKEN_CACHE_SIZE       Max cached tokens (default: 2048, 0 disables)
+    AUTH_TOKEN_CACHE_MAX_TTL    Upper bound on a cached entry's life in seconds (default: 900)
+    SUBSCRIPTION_TIER_CACHE_TTL Seconds to trust a cached tier (default: 300, 0 disables)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "2048"))
+AUTH_TOKEN_CACHE_MAX_TTL = int(os.getenv("AUTH_TOKEN_CACHE_MAX_TTL", "900"))
+SUBSCRIPTION_TIER_CACHE_TTL = int(os.getenv("SUBSCRIPTION_TIER_CACHE_TTL", "300"))
+
+# Stop serving a cached token this many seconds before it actually expires,
+# so a request never goes through on a token Firebase would already reject.
+EXPIRY_MARGIN_SECONDS = 5
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key for a raw ID token (the token itself is never stored)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenClaimsCache:
+    """
+    Thread-safe, bounded LRU cache of verified ID-token claims.
+
+    Entries expire at the earlier of the token's ``exp`` claim (minus a small
+    margin) and ``max_ttl`` seconds after insertion.
+    """
+
+    def __init__(
+        self,
+        max_size: int = AUTH_TOKEN_CACHE_SIZE,
+        max_ttl: int = AUTH_TOKEN_CACHE_MAX_TTL,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize token cache.
+
+        Args:
+            max_size: Maximum number of tokens kept (0 disables caching)
+            max_ttl: Maximum seconds an entry may be served
+            clock: Time source returning epoch seconds (injectable for tests)
+        """
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[dict]:
+        """
+        Return cached claims for a token, or None if absent or expired.
+
+        Args:
+            token: Raw ID token from the Authorization header
+        """
+        key = hash_token(token)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def set(self, token: str, claims: dict) -> bool:
+        """
+        Cache verified claims for a token.
+
+        Tokens without a numeric ``exp`` claim, or already inside the expiry
+        margin, are not cached.
+
+        Args:
+            token: Raw ID token
+            claims: Decoded claims returned by firebase_auth.verify_id_token
+
+        Returns:
+            True if the entry was stored
+        """
+        if self.max_size <= 0:
+            return False
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)):
+            return False
+
+        now = self._clock()
+        expires_at = min(float(exp) - EXPIRY_MARGIN_SECONDS, now + self.max_ttl)
+        if expires_at <= now:
+            return False
+
+        key = hash_token(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached tokens."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"TokenClaimsCache({len(self)}/{self.max_size} entries, "
+                f"hits={self.hits}, misses={self.misses})")
+
+
+class SubscriptionTierCache:
+    """
+    Thread-safe TTL cache mapping uid -> subscription tier string.
+    """
+
+    def __init__(
+        self,
+        ttl: int = SUBSCRIPTION_TIER_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize tier cache.
+
+        Args:
+            ttl: Seconds a cached tier is trusted (0 disables caching)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, uid: str) -> Optional[str]:
+        """Return the cached tier for a user, or None if absent or stale."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(uid)
+            if entry is None:
+                return None
+            cached_at, tier = entry
+            if now - cached_at >= self.ttl:
+                del self._entries[uid]
+                return None
+            return tier
+
+    def set(self, uid: str, tier: str) -> None:
+        """Cache a user's tier."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[uid] = (self._clock(), tier)
+
+    def invalidate(self, uid: Optional[str] = None) -> None:
+        """
+        Drop cached tiers.
+
+        Args:
+            uid: If provided, drop only this user. Otherwise drop all.
+        """
+        with self._lock:
+            if uid is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(uid, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"SubscriptionTierCache({len(self)} users, TTL={self.ttl}s)"
+
+
+# =============================================================================
+# Global Cache Instances
+# =============================================================================
+
+_token_cache: Optional[TokenClaimsCache] = None
+_tier_cache: Optional[SubscriptionTierCache] = None
+
+
+def get_token_cache() -> TokenClaimsCache:
+    """Get the process-wide token claims cache."""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenClaimsCache()
+    return _token_cache
+
+
+def get_tier_cache() -> SubscriptionTierCache:
+    """Get the process-wide subscription tier cache."""
+    global _tier_cache
+    if _tier_cache is None:
+        _tier_cache = SubscriptionTierCache()
+    return _tier_cache
@@ -10,11 +10,18 @@ from __future__ import annotations
 import os
 from typing import Optional
 
-import firebase_admin
-from firebase_admin import auth as firebase_auth, credentials
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from core.lazy_import import LazyModule
+
+from .auth_cache import get_token_cache
+
+# The Admin SDK is imported on the first authenticated request.
+firebase_admin = LazyModule("firebase_admin")
+firebase_auth = LazyModule("firebase_admin.auth")
+credentials = LazyModule("firebase_admin.credentials")
+
 _firebase_initialized = False
 _bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -45,6 +52,24 @@ def _auth_required() -> bool:
     return os.getenv("FIREBASE_AUTH_REQUIRED", "false").lower() in ("true", "1", "yes")
 
 
+def _verify_id_token(id_token: str) -> dict:
+    """
+    Verify an ID token, serving repeat tokens from the in-process claims cache.
+
+    Only successful verifications are cached; entries never outlive the
+    token's own ``exp`` claim.
+    """
+    cache = get_token_cache()
+    cached = cache.get(id_token)
+    if cached is not None:
+        return cached
+
+    _ensure_firebase()
+    decoded = firebase_auth.verify_id_token(id_token)
+    cache.set(id_token, decoded)
+    return decoded
+
+
 class FirebaseUser:
     """Lightweight wrapper around a verified Firebase token."""
 
@@ -77,8 +102,7 @@ async def verify_firebase_token(
         return None
 
     try:
-        _ensure_firebase()
-        decoded = firebase_auth.verify_id_token(credential.credentials)
+        decoded = _verify_id_token(credential.credentials)
         return FirebaseUser(
             uid=decoded["uid"],
             email=decoded.get("email"),
@@ -10,17 +10,22 @@ POST /chat/message
 import json
 import os
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, List, Optional
+from typing import AsyncGenerator, List, Optional
 
-from google import genai
-from google.genai import types as genai_types
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import StreamingResponse
-from firebase_admin import db as rtdb
 from pydantic import BaseModel, Field
 
-from ..middleware import FirebaseUser, verify_firebase_token
+from ..middleware import FirebaseUser, get_tier_cache, verify_firebase_token
 from ..middleware.firebase_auth import _ensure_firebase
+from ..usage_ledger import UsageLedger, UsageLimitExceeded
+from core.lazy_import import LazyModule
+
+# Heavy SDKs are imported on first chat request, not at API startup.
+genai = LazyModule("google.genai")
+genai_types = LazyModule("google.genai.types")
+rtdb = LazyModule("firebase_admin.db")
+
 
 # ── Configuration ─────────────────────────────────────────────────────────────
 
@@ -75,57 +80,59 @@ def _today_utc() -> str:
 
 
 def _get_daily_limit(uid: str) -> int:
-    """Return the effective chat limit for a user (pro = unlimited)."""
-    try:
-        _ensure_firebase()
-        snap = rtdb.reference(f"users/{uid}/subscription/tier").get()
-        if snap == "pro":
-            return 9999
-    except Exception:
-        pass
+    """
+    Return the effective chat limit for a user (pro = unlimited).
+
+    The tier is cached per uid for SUBSCRIPTION_TIER_CACHE_TTL seconds so a
+    chat session doesn't hit RTDB on every message. Read failures fall back
+    to the free limit and are not cached.
+    """
+    tier_cache = get_tier_cache()
+    tier = tier_cache.get(uid)
+    if tier is None:
+        try:
+            _ensure_firebase()
+            snap = rtdb.reference(f"users/{uid}/subscription/tier").get()
+        except Exception:
+            return DAILY_FREE_CHAT_LIMIT
+        tier = snap if isinstance(snap, str) else "free"
+        tier_cache.set(uid, tier)
+
+    if tier == "pro":
+        return 9999
     return DAILY_FREE_CHAT_LIMIT
 
 
-def _check_and_increment_usage(uid: str, limit: int) -> tuple[int, int]:
-    """
-    Atomically check and increment today's usage in Firebase RTDB.
-    Returns (new_count, remaining).
-    Raises HTTPException 429 if already at limit.
-    """
+def _usage_reference(path: str):
     _ensure_firebase()
-    today = _today_utc()
-    ref = rtdb.reference(f"usage/{uid}/{today}")
+    return rtdb.reference(path)
 
-    # Use a single transaction for atomic check-and-increment (no TOCTOU race)
-    exceeded = False
 
-    def _check_and_inc(current_val: Any) -> Any:
-        nonlocal exceeded
-        current = current_val or 0
-        if current >= limit:
-            exceeded = True
-            return current  # abort: return unchanged value
-        return current + 1
+# Per-instance usage ledger: reserves quota from RTDB in blocks and settles
+# unused reservations in batched writes (see api/usage_ledger.py).
+usage_ledger = UsageLedger(_usage_reference)
 
-    ref.transaction(_check_and_inc)
 
-    if exceeded:
-        current = ref.get() or 0
+def _check_and_increment_usage(uid: str, limit: int) -> tuple[int, int]:
+    """
+    Count one chat against today's usage.
+    Returns (new_count, remaining).
+    Raises HTTPException 429 if already at limit.
+    """
+    try:
+        return usage_ledger.consume(uid, _today_utc(), limit)
+    except UsageLimitExceeded as exc:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail={
                 "error": "rate_limited",
                 "message": f"You've used all {limit} free AI chats for today. Upgrade to Pro for unlimited access.",
-                "chatsUsedToday": current,
+                "chatsUsedToday": exc.used,
                 "chatsRemaining": 0,
                 "limit": limit,
             },
         )
 
-    new_count = ref.get() or 1
-    remaining = max(0, limit - new_count)
-    return new_count, remaining
-
 
 def _build_full_message(message: str, ctx: Optional[GameContext]) -> str:
     """Prepend structured game context to the user message (mirrors chatWithAgent logic)."""
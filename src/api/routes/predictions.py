@@ -5,16 +5,21 @@ Prediction endpoints with rate limiting.
 from datetime import datetime, date
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Depends, Request
+import numpy as np
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from core.feature_builder import FEATURE_COLS
+from core.predictor import confidence_tier
+
 from ..schemas import (
     PredictGameRequest,
     PredictBatchRequest,
     SinglePredictionResponse,
     PredictionsListResponse,
     BatchPredictionResponse,
+    RangePredictionsResponse,
     GamePredictionResponse,
     PredictionInfo,
     GameContext,
@@ -27,6 +32,9 @@ limiter = Limiter(key_func=get_remote_address)
 
 router = APIRouter(prefix="/predict", tags=["predictions"])
 
+# Longest span GET /predict/range accepts (days)
+MAX_RANGE_DAYS = 14
+
 
 def build_prediction_response(
     service: PredictionService,
@@ -39,17 +47,22 @@ def build_prediction_response(
     include_context: bool = True,
 ) -> GamePredictionResponse:
     """Build a prediction response for a game."""
+    # Past dates use the state as of that date (today's odds and injuries
+    # do not apply to them)
+    historical = service.is_historical(game_date)
+    feature_builder = service.feature_builder_for(game_date)
+
     # Get odds for this matchup (from cached data)
-    ml_home, ml_away = service.get_odds_for_game(home_id, away_id)
+    ml_home, ml_away = (None, None) if historical else service.get_odds_for_game(home_id, away_id)
     
     # Get prediction with odds
     result = service.predictor.predict_game(
-        home_id, away_id, game_date, service.feature_builder,
+        home_id, away_id, game_date, feature_builder,
         ml_home=ml_home, ml_away=ml_away
     )
     
     # Get features for context
-    features = service.feature_builder.build_features_dict(home_id, away_id, game_date)
+    features = feature_builder.build_features_dict(home_id, away_id, game_date)
     
     prediction = PredictionInfo(
         home_win_prob=round(result["prob_home_win"], 3),
@@ -64,7 +77,7 @@ def build_prediction_response(
     context = None
     if include_context:
         # NEW: Fetch injury data
-        injury_summary = service.injury_client.get_matchup_injury_summary(home_id, away_id)
+        injury_summary = {} if historical else service.injury_client.get_matchup_injury_summary(home_id, away_id)
         
         context = GameContext(
             home_elo=round(features["elo_home"], 1),
@@ -108,6 +121,104 @@ async def predict_today(
     return await predict_date(date.today().isoformat(), request, service)
 
 
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid date format: {value}. Use YYYY-MM-DD."
+        )
+
+
+@router.get("/range", response_model=RangePredictionsResponse)
+@limiter.limit("10/minute")
+async def predict_range(
+    request: Request,
+    start: str = Query(..., description="First date (YYYY-MM-DD)"),
+    end: str = Query(..., description="Last date (YYYY-MM-DD)"),
+    service: PredictionService = Depends(get_prediction_service),
+    user: FirebaseUser | None = Depends(verify_firebase_token),
+):
+    """
+    Get predictions for every scheduled game from start through end.
+    
+    Games come from the league's season schedule. Rest days and
+    back-to-backs are projected from it (games before the date count even
+    if not played yet), and the whole range is scored in one model call.
+    Elo ratings and recent form are those of the current state.
+    """
+    start_date, end_date = _parse_date(start), _parse_date(end)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end must not be before start.")
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {MAX_RANGE_DAYS} days.")
+    if start_date < date.today():
+        raise HTTPException(status_code=400, detail="Use /predict/{date} for past dates.")
+
+    try:
+        schedule = service.schedule_for(start_date, end_date)
+    except Exception as e:
+        print(f"ESPN schedule fetch error: {e}")
+        raise HTTPException(
+            status_code=502,
+            detail="Failed to fetch the schedule from ESPN. Please try again later."
+        )
+
+    games = [g for g in schedule.games(start_date, end_date)
+             if g.home_team_id is not None and g.away_team_id is not None]
+    predictions = []
+    if games:
+        odds = {(g.home_team_id, g.away_team_id): service.get_odds_for_game(g.home_team_id, g.away_team_id)
+                for g in games}
+        X = service.feature_builder.build_matrix(games, odds, schedule=schedule)
+        probs = np.atleast_1d(service.predictor.predict_proba(X))
+        scorer = service.predictor.confidence_scorer
+
+        for game, row, prob in zip(games, X, probs):
+            prob = float(prob)
+            features = dict(zip(FEATURE_COLS, row))
+            confidence = scorer.calculate_confidence_score(
+                prob_home=prob, features=row,
+                home_id=game.home_team_id, away_id=game.away_team_id,
+            ) if scorer else {}
+            predictions.append(GamePredictionResponse(
+                game_date=game.game_date,
+                game_time=game.game_time,
+                home_team=game.home_team,
+                away_team=game.away_team,
+                home_team_id=game.home_team_id,
+                away_team_id=game.away_team_id,
+                prediction=PredictionInfo(
+                    home_win_prob=round(prob, 3),
+                    away_win_prob=round(1.0 - prob, 3),
+                    confidence=confidence_tier(prob),
+                    favored="home" if prob > 0.5 else "away",
+                    confidence_score=confidence.get("score"),
+                    confidence_qualifier=confidence.get("qualifier"),
+                    confidence_factors=confidence.get("factors"),
+                ),
+                context=GameContext(
+                    home_elo=round(features["elo_home"], 1),
+                    away_elo=round(features["elo_away"], 1),
+                    home_recent_wins=round(features["win_roll_home"], 2),
+                    away_recent_wins=round(features["win_roll_away"], 2),
+                    home_rest_days=int(features["home_rest_days"]),
+                    away_rest_days=int(features["away_rest_days"]),
+                    home_b2b=bool(features["home_b2b"]),
+                    away_b2b=bool(features["away_b2b"]),
+                ),
+            ))
+
+    return RangePredictionsResponse(
+        start=start_date.isoformat(),
+        end=end_date.isoformat(),
+        generated_at=datetime.now().isoformat(),
+        count=len(predictions),
+        games=predictions,
+    )
+
+
 @router.get("/{game_date}", response_model=PredictionsListResponse)
 @limiter.limit("30/minute")
 async def predict_date(
@@ -200,20 +311,24 @@ async def predict_game(
     # Determine game date
     game_date = game_request.game_date or date.today().isoformat()
     
+    # Past dates use the state as of that date
+    historical = service.is_historical(game_date)
+    feature_builder = service.feature_builder_for(game_date)
+
     # Get odds for this matchup
-    ml_home, ml_away = service.get_odds_for_game(home_id, away_id)
+    ml_home, ml_away = (None, None) if historical else service.get_odds_for_game(home_id, away_id)
     
     # Get prediction with odds
     result = service.predictor.predict_game(
-        home_id, away_id, game_date, service.feature_builder,
+        home_id, away_id, game_date, feature_builder,
         ml_home=ml_home, ml_away=ml_away
     )
     
     # Get features for context
-    features = service.feature_builder.build_features_dict(home_id, away_id, game_date)
+    features = feature_builder.build_features_dict(home_id, away_id, game_date)
     
     # NEW: Fetch injury data
-    injury_summary = service.injury_client.get_matchup_injury_summary(home_id, away_id)
+    injury_summary = {} if historical else service.injury_client.get_matchup_injury_summary(home_id, away_id)
     
     context = GameContext(
         home_elo=round(features["elo_home"], 1),
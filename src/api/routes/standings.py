@@ -0,0 +1,175 @@
+"""
+Standings endpoints.
+
+Served from the standings kept with the prediction state (see
+core/standings_tracker.py), so no ESPN call is made. Projections simulate
+the rest of the season (core/season_simulator.py).
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from ..schemas import (
+    TeamStanding,
+    StandingsResponse,
+    HeadToHeadResponse,
+    TeamStandingDetailResponse,
+    TeamProjection,
+    SeasonProjectionResponse,
+)
+from ..dependencies import get_prediction_service, PredictionService
+
+
+# Rate limiter
+limiter = Limiter(key_func=get_remote_address)
+
+router = APIRouter(prefix="/standings", tags=["standings"])
+
+# Simulated seasons a projection request may ask for. A fixed set keeps the
+# result cache at one file per league and count; more precise runs are for
+# simulate_season.py (with worker processes).
+PROJECTION_ITERATIONS = (10_000, 50_000)
+
+
+def _resolve_team(service: PredictionService, team: str) -> int:
+    """Team ID from an ID, name or abbreviation (400 if unknown)."""
+    team_id = int(team) if team.isdigit() else service.team_mapper.get_team_id(team)
+    if team_id is None:
+        raise HTTPException(status_code=400, detail=f"Could not find team: {team}")
+    return team_id
+
+
+def _standing(service: PredictionService, row: dict) -> TeamStanding:
+    team_id = row["team_id"]
+    return TeamStanding(
+        team_name=service.team_mapper.get_team_name(team_id) or str(team_id),
+        abbreviation=service.team_mapper.get_team_abbreviation(team_id) or "UNK",
+        **row,
+    )
+
+
+def _head_to_head(service: PredictionService, series: dict) -> HeadToHeadResponse:
+    mapper = service.team_mapper
+    return HeadToHeadResponse(
+        team_a_id=series["team_a"],
+        team_a=mapper.get_team_name(series["team_a"]) or str(series["team_a"]),
+        team_b_id=series["team_b"],
+        team_b=mapper.get_team_name(series["team_b"]) or str(series["team_b"]),
+        team_a_wins=series["team_a_wins"],
+        team_b_wins=series["team_b_wins"],
+        games=series["games"],
+    )
+
+
+@router.get("", response_model=StandingsResponse)
+async def get_standings(
+    service: PredictionService = Depends(get_prediction_service),
+):
+    """
+    Current season standings, ordered by win percentage.
+
+    Includes games back, home/away splits, streak and last-10 record.
+    """
+    standings = service.standings
+    if not len(standings):
+        raise HTTPException(
+            status_code=503,
+            detail="No standings for the current season. Run build_standings.py.",
+        )
+
+    teams = [_standing(service, row) for row in standings.table()]
+    return StandingsResponse(
+        season_id=standings.season_id,
+        games=standings.games,
+        count=len(teams),
+        teams=teams,
+    )
+
+
+@router.get("/projections", response_model=SeasonProjectionResponse)
+@limiter.limit("10/minute")
+def get_season_projections(
+    request: Request,
+    iterations: int = Query(PROJECTION_ITERATIONS[0], description="Simulated seasons: 10000 or 50000"),
+    service: PredictionService = Depends(get_prediction_service),
+):
+    """
+    Seeding, play-in and playoff probabilities per team.
+
+    Simulates the rest of the season's schedule from the current standings
+    and Elo ratings. Results are cached until the state changes.
+    """
+    if iterations not in PROJECTION_ITERATIONS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"iterations must be one of {', '.join(map(str, PROJECTION_ITERATIONS))}",
+        )
+    try:
+        result = service.season_projections(iterations)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        print(f"Season simulation error: {e}")
+        raise HTTPException(
+            status_code=502,
+            detail="Failed to project the season. Please try again later."
+        )
+
+    mapper = service.team_mapper
+    teams = [
+        TeamProjection(
+            team_id=t["team_id"],
+            team_name=mapper.get_team_name(t["team_id"]) or str(t["team_id"]),
+            abbreviation=mapper.get_team_abbreviation(t["team_id"]) or "UNK",
+            conference=t["group"],
+            **{k: t[k] for k in ("wins", "projected_wins", "projected_losses", "seed_probs",
+                                 "top_seed", "direct", "play_in", "playoffs")},
+        )
+        for t in result["teams"]
+    ]
+    return SeasonProjectionResponse(
+        season_id=result["season_id"],
+        iterations=result["iterations"],
+        remaining_games=result["remaining_games"],
+        generated_at=result["generated_at"],
+        count=len(teams),
+        teams=teams,
+    )
+
+
+@router.get("/team/{team}", response_model=TeamStandingDetailResponse)
+async def get_team_standing(
+    team: str,
+    service: PredictionService = Depends(get_prediction_service),
+):
+    """
+    A team's record plus its season series against every opponent.
+
+    The team may be given as ID, name or abbreviation.
+    """
+    team_id = _resolve_team(service, team)
+    standings = service.standings
+    if team_id not in standings.team_ids:
+        raise HTTPException(status_code=404, detail=f"No games this season for team: {team}")
+
+    series = sorted(standings.opponents(team_id), key=lambda s: -s["games"])
+    return TeamStandingDetailResponse(
+        season_id=standings.season_id,
+        standing=_standing(service, standings.team(team_id)),
+        head_to_head=[_head_to_head(service, s) for s in series],
+    )
+
+
+@router.get("/h2h", response_model=HeadToHeadResponse)
+async def get_head_to_head(
+    team_a: str = Query(..., description="Team ID, name or abbreviation"),
+    team_b: str = Query(..., description="Team ID, name or abbreviation"),
+    service: PredictionService = Depends(get_prediction_service),
+):
+    """Season series between two teams."""
+    series = service.standings.head_to_head(
+        _resolve_team(service, team_a),
+        _resolve_team(service, team_b),
+    )
+    return _head_to_head(service, series)
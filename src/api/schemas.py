@@ -109,6 +109,15 @@ class PredictionsListResponse(BaseModel):
     games: List[GamePredictionResponse]
 
 
+class RangePredictionsResponse(BaseModel):
+    """Response for GET /predict/range."""
+    start: str
+    end: str
+    generated_at: str
+    count: int
+    games: List[GamePredictionResponse]
+
+
 class BatchPredictionResponse(BaseModel):
     """Response for POST /predict/batch."""
     generated_at: str
@@ -208,6 +217,83 @@ class TeamsListResponse(BaseModel):
     teams: List[TeamInfo]
 
 
+# =============================================================================
+# Response Models - Standings
+# =============================================================================
+
+class TeamStanding(BaseModel):
+    """A team's record in the current season."""
+    rank: Optional[int] = None
+    team_id: int
+    team_name: str
+    abbreviation: str
+    wins: int
+    losses: int
+    win_pct: float
+    games_back: Optional[float] = None
+    home_record: str
+    away_record: str
+    points_for: float = Field(..., description="Points scored per game")
+    points_against: float = Field(..., description="Points allowed per game")
+    point_diff: float
+    streak: str = Field(..., description="Current streak, e.g. W3 or L2")
+    last_n: int
+    last_n_record: str
+    last_game: Optional[str] = None
+
+
+class StandingsResponse(BaseModel):
+    """Response for GET /standings."""
+    season_id: Optional[int] = None
+    games: int
+    count: int
+    teams: List[TeamStanding]
+
+
+class HeadToHeadResponse(BaseModel):
+    """Season series between two teams."""
+    team_a_id: int
+    team_a: str
+    team_b_id: int
+    team_b: str
+    team_a_wins: int
+    team_b_wins: int
+    games: int
+
+
+class TeamStandingDetailResponse(BaseModel):
+    """Response for GET /standings/team/{team_id}."""
+    season_id: Optional[int] = None
+    standing: TeamStanding
+    head_to_head: List[HeadToHeadResponse]
+
+
+class TeamProjection(BaseModel):
+    """A team's simulated end-of-season outlook."""
+    team_id: int
+    team_name: str
+    abbreviation: str
+    conference: str
+    wins: int
+    projected_wins: float
+    projected_losses: float
+    seed_probs: List[float] = Field(..., description="Probability of each seed, 1st first")
+    top_seed: float
+    direct: float = Field(..., description="Probability of a seed with a direct playoff spot")
+    play_in: float = Field(..., description="Probability of a play-in seed")
+    playoffs: float = Field(..., description="Probability of making the playoffs (incl. via play-in)")
+
+
+class SeasonProjectionResponse(BaseModel):
+    """Response for GET /standings/projections."""
+    season_id: Optional[int] = None
+    iterations: int
+    remaining_games: int
+    generated_at: str
+    count: int
+    teams: List[TeamProjection]
+
+
 # =============================================================================
 # Error Models
 # =============================================================================
@@ -0,0 +1,294 @@
+"""
+UsageLedger: Buffered per-user daily chat usage accounting.
+
+Firebase RTDB stays the authority for ``usage/{uid}/{YYYY-MM-DD}``, but
+instead of one transaction (plus a read-back) per chat message, each API
+instance *reserves* a block of quota with a single transaction and serves
+subsequent messages from memory. The RTDB counter therefore always holds
+``used + outstanding reservations`` across all instances, so no instance can
+grant more than the limit.
+
+Unused reservations are handed back in batches: ``flush`` settles every idle
+lease with one multi-path ``update`` using server-side increments, instead of
+one round trip per user. A background thread (``start``) flushes every
+``flush_interval`` seconds, so an idle instance does not sit on quota.
+
+The same counter is what the app shows as today's usage and what the
+``chatWithAgent`` Cloud Function enforces, so reserved quota must never
+make a user look out of chats. Blocks are therefore only reserved while at
+least ``_BLOCK_HEADROOM`` blocks of quota are left (in practice: pro
+users); closer to the limit, and so for free users (3 chats) always,
+quota is reserved one chat at a time and the counter is exact. Quota held
+by an instance that crashes is lost for the day, at most one block per
+pro user.
+
+Rejections are answered from memory; an exhausted lease re-checks RTDB
+after ``exhausted_ttl`` seconds.
+
+Configurable via environment variables:
+    CHAT_USAGE_RESERVATION_BLOCK  Max chats reserved per transaction (default: 10)
+    CHAT_USAGE_FLUSH_INTERVAL     Seconds between opportunistic flushes (default: 30)
+    CHAT_USAGE_LEASE_IDLE         Seconds before an idle lease is settled (default: 60)
+    CHAT_USAGE_EXHAUSTED_TTL      Seconds an at-limit answer is reused before
+                                  re-checking RTDB (default: 30)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+CHAT_USAGE_RESERVATION_BLOCK = int(os.getenv("CHAT_USAGE_RESERVATION_BLOCK", "10"))
+CHAT_USAGE_FLUSH_INTERVAL = float(os.getenv("CHAT_USAGE_FLUSH_INTERVAL", "30"))
+CHAT_USAGE_LEASE_IDLE = float(os.getenv("CHAT_USAGE_LEASE_IDLE", "60"))
+CHAT_USAGE_EXHAUSTED_TTL = float(os.getenv("CHAT_USAGE_EXHAUSTED_TTL", "30"))
+
+USAGE_ROOT = "usage"
+_LOCK_STRIPES = 64
+# Reserve whole blocks only while this many blocks of quota remain
+_BLOCK_HEADROOM = 4
+
+
+class UsageLimitExceeded(Exception):
+    """Raised when a user has no chats left for the day."""
+
+    def __init__(self, used: int, limit: int):
+        super().__init__(f"usage limit reached ({used}/{limit})")
+        self.used = used
+        self.limit = limit
+
+
+@dataclass
+class _Lease:
+    """Quota this instance holds for one (uid, day)."""
+    limit: int
+    used: int          # chats counted against the user (RTDB base + local grants)
+    reserved: int      # RTDB counter value after our last reservation
+    touched_at: float
+    exhausted_at: Optional[float] = None   # when a reservation last found no quota
+
+    @property
+    def unused(self) -> int:
+        return self.reserved - self.used
+
+
+class UsageLedger:
+    """
+    Thread-safe in-memory usage counters backed by RTDB reservations.
+    """
+
+    def __init__(
+        self,
+        reference: Callable[[str], Any],
+        block_size: int = CHAT_USAGE_RESERVATION_BLOCK,
+        flush_interval: float = CHAT_USAGE_FLUSH_INTERVAL,
+        lease_idle: float = CHAT_USAGE_LEASE_IDLE,
+        exhausted_ttl: float = CHAT_USAGE_EXHAUSTED_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the ledger.
+
+        Args:
+            reference: Callable returning an RTDB reference for a path
+                       (firebase_admin.db.reference or a fake in tests)
+            block_size: Maximum chats reserved per RTDB transaction
+            flush_interval: Seconds between opportunistic flushes in consume()
+            lease_idle: Seconds without activity before a lease is settled
+            exhausted_ttl: Seconds a user at the limit is rejected from
+                           memory before RTDB is checked again
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._reference = reference
+        self.block_size = max(1, block_size)
+        self.flush_interval = flush_interval
+        self.lease_idle = lease_idle
+        self.exhausted_ttl = exhausted_ttl
+        self._clock = clock
+
+        self._leases: dict[tuple[str, str], _Lease] = {}
+        self._key_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._lock = threading.Lock()
+        self._last_flush = clock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.reservations = 0
+        self.flushes = 0
+
+    # ------------------------------------------------------------------
+    # Consumption
+    # ------------------------------------------------------------------
+
+    def consume(self, uid: str, day: str, limit: int) -> tuple[int, int]:
+        """
+        Count one chat for a user, reserving more quota from RTDB if needed.
+
+        Args:
+            uid: Firebase user id
+            day: Usage day (YYYY-MM-DD, UTC)
+            limit: User's daily chat limit
+
+        Returns:
+            Tuple of (chats_used_today, chats_remaining)
+
+        Raises:
+            UsageLimitExceeded: If the user is already at the limit
+        """
+        key = (uid, day)
+        with self._lock_for(key):
+            now = self._clock()
+            lease = self._leases.get(key)
+
+            if lease is not None and lease.limit != limit:
+                # Tier changed mid-day; re-check against RTDB with the new limit.
+                lease.limit = limit
+                lease.exhausted_at = None
+
+            if lease is not None and lease.exhausted_at is not None:
+                # Not touched: the lease still idles and gets settled.
+                if now - lease.exhausted_at < self.exhausted_ttl:
+                    raise UsageLimitExceeded(lease.used, limit)
+                lease.exhausted_at = None
+
+            if lease is None or lease.unused <= 0:
+                lease = self._reserve(uid, day, limit, lease, now)
+                if lease.unused <= 0:
+                    lease.exhausted_at = now
+                    raise UsageLimitExceeded(lease.used, limit)
+
+            lease.used += 1
+            lease.touched_at = now
+            used = lease.used
+
+        self._maybe_flush()
+        return used, max(0, limit - used)
+
+    def _reserve(
+        self,
+        uid: str,
+        day: str,
+        limit: int,
+        lease: Optional[_Lease],
+        now: float,
+    ) -> _Lease:
+        """Reserve a block of quota with one RTDB transaction (key lock held)."""
+        outcome = {"base": 0, "grant": 0}
+
+        def _txn(current_val: Any) -> Any:
+            current = current_val or 0
+            remaining = max(0, limit - current)
+            grant = self.block_size if remaining >= self.block_size * _BLOCK_HEADROOM else min(1, remaining)
+            outcome["base"] = current
+            outcome["grant"] = grant
+            return current + grant
+
+        self._reference(f"{USAGE_ROOT}/{uid}/{day}").transaction(_txn)
+        self.reservations += 1
+
+        base, grant = outcome["base"], outcome["grant"]
+        if lease is None:
+            lease = _Lease(limit=limit, used=base, reserved=base, touched_at=now)
+        # Everything reserved by other instances counts as used from here.
+        lease.used = base
+        lease.reserved = base + grant
+        with self._lock:
+            # Re-register even a known lease: flush() may have dropped it.
+            self._leases[(uid, day)] = lease
+        return lease
+
+    # ------------------------------------------------------------------
+    # Settlement
+    # ------------------------------------------------------------------
+
+    def flush(self, force: bool = False) -> int:
+        """
+        Return unused reservations of idle leases to RTDB in one batched write.
+
+        Args:
+            force: Settle every lease regardless of idleness (e.g. on shutdown)
+
+        Returns:
+            Number of leases settled
+        """
+        now = self._clock()
+        with self._lock:
+            self._last_flush = now
+            candidates = [
+                (key, lease) for key, lease in self._leases.items()
+                if force or now - lease.touched_at >= self.lease_idle
+            ]
+
+        updates: dict[str, Any] = {}
+        settled: list[tuple[tuple[str, str], _Lease, int]] = []
+        for key, lease in candidates:
+            with self._lock_for(key):
+                # Take the unused quota out of the lease before writing, so a
+                # concurrent consume() reserves afresh instead of spending it.
+                unused = max(0, lease.unused)
+                lease.reserved -= unused
+            if unused > 0:
+                uid, day = key
+                updates[f"{uid}/{day}"] = {".sv": {"increment": -unused}}
+            settled.append((key, lease, unused))
+
+        if updates:
+            try:
+                self._reference(USAGE_ROOT).update(updates)
+            except Exception as e:
+                print(f"Usage ledger flush failed ({len(updates)} leases): {e}")
+                for key, lease, unused in settled:
+                    with self._lock_for(key):
+                        lease.reserved += unused
+                return 0
+            self.flushes += 1
+
+        with self._lock:
+            for key, lease, _ in settled:
+                if lease.unused <= 0 and self._leases.get(key) is lease:
+                    del self._leases[key]
+
+        return len(settled)
+
+    def _maybe_flush(self) -> None:
+        if self._clock() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def start(self) -> None:
+        """Flush idle leases periodically on a daemon thread (no-op if flush_interval <= 0)."""
+        if self.flush_interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="usage-ledger-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _lock_for(self, key: tuple[str, str]) -> threading.Lock:
+        """Striped per-user lock: serializes one user's reservations only."""
+        return self._key_locks[hash(key) % _LOCK_STRIPES]
+
+    def outstanding(self) -> int:
+        """Total chats reserved in RTDB but not yet used by this instance."""
+        with self._lock:
+            return sum(lease.unused for lease in self._leases.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._leases)
+
+    def __repr__(self) -> str:
+        return (f"UsageLedger({len(self)} leases, outstanding={self.outstanding()}, "
+                f"reservations={self.reservations}, flushes={self.flushes})")
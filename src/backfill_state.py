@@ -193,8 +193,12 @@ def main():
         print("DRY RUN - No changes will be made")
         print("-" * 70)
     
-    # Create processor
-    processor = GameProcessor(elo_tracker, stats_tracker, team_mapper)
+    # Create processor (journals each game, so re-running update_state.py on a
+    # backfilled date skips it; standings are updated alongside and saved
+    # with every checkpoint)
+    standings = state_manager.load_standings()
+    processor = GameProcessor(elo_tracker, stats_tracker, team_mapper,
+                              journal=state_manager.journal, standings_tracker=standings)
     
     # Track progress
     total_games_processed = 0
@@ -253,7 +257,7 @@ def main():
                     # Checkpoint save
                     if games_since_checkpoint >= args.checkpoint_interval:
                         print(f"         Checkpoint: saving state...")
-                        state_manager.save(elo_tracker, stats_tracker)
+                        state_manager.save(elo_tracker, stats_tracker, standings=standings)
                         games_since_checkpoint = 0
             else:
                 days_without_games += 1
@@ -270,7 +274,7 @@ def main():
     except KeyboardInterrupt:
         print("\n\nInterrupted! Saving current progress...")
         if not args.dry_run:
-            state_manager.save(elo_tracker, stats_tracker)
+            state_manager.save(elo_tracker, stats_tracker, standings=standings)
             state_manager.set_last_processed_date(previous_date)
             print(f"  State saved up to {previous_date}")
         return
@@ -279,7 +283,7 @@ def main():
     if not args.dry_run and total_games_processed > 0:
         print("\n" + "-" * 70)
         print("Saving final state...")
-        state_manager.save(elo_tracker, stats_tracker)
+        state_manager.save(elo_tracker, stats_tracker, standings=standings)
         state_manager.set_last_processed_date(end_date)
         
         # Update total games processed
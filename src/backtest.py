@@ -0,0 +1,122 @@
+"""
+Walk-forward backtest of the live prediction path.
+
+Replays each season day by day through EloTracker / StatsTracker /
+FeatureBuilder / Predictor / GameProcessor (see core/backtest.py) and
+reports log loss, Brier score, accuracy and calibration of the model next to
+the Elo-only baseline. Seasons run in parallel on a process pool.
+
+Note that seasons the model was trained on score optimistically; the
+held-out seasons are the ones in xgb_boost_model.py's val/test splits.
+
+Usage:
+    # Every season after the first, default model for the league
+    python src/backtest.py --league nba
+
+    # Selected seasons, 4 workers, per-game predictions to CSV
+    python src/backtest.py --league wnba --seasons 22024 22025 --workers 4 \
+        --out data/processed/wnba_backtest.csv
+
+    # Another model / no calibrator
+    python src/backtest.py --league cbb --model models/xgb_cbb_v1.json --no-calibrator
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.backtest import (
+    calibration_table,
+    predictions_frame,
+    prepare_tasks,
+    run_backtest,
+    summarize,
+)
+from core.elo_engine import EloParams
+from core.league_config import LEAGUE_CONFIGS
+from core.table_store import csv_path_for, read_frame, store_mtime
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _has_table(table: str, league: str) -> bool:
+    return csv_path_for(table, league).exists() or store_mtime(table, league) is not None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Walk-forward backtest through the live core classes.")
+    parser.add_argument("--league", default="nba", choices=list(LEAGUE_CONFIGS))
+    parser.add_argument("--seasons", type=int, nargs="+", default=None,
+                        help="season_id values to backtest. Default: all but the first")
+    parser.add_argument("--model", default=None, help="Model path. Default: league model")
+    parser.add_argument("--calibrator", default=None, help="Calibrator path. Default: league calibrator")
+    parser.add_argument("--no-calibrator", action="store_true", help="Score raw model probabilities")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes. Default: CPU count")
+    parser.add_argument("--bins", type=int, default=10, help="Calibration bins")
+    parser.add_argument("--out", default=None, help="Write per-game predictions as CSV")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+
+    if not _has_table("games_with_labels", args.league):
+        print(f"⚠ {csv_path_for('games_with_labels', args.league).name} not found")
+        sys.exit(1)
+
+    games = read_frame("games_with_labels", args.league)
+    odds = read_frame("odds_with_team_ids", args.league) if _has_table("odds_with_team_ids", args.league) else None
+
+    all_seasons = sorted(int(s) for s in games["season_id"].unique())
+    seasons = args.seasons or all_seasons[1:]
+
+    model_path = Path(args.model) if args.model else PROJECT_ROOT / config.model_path
+    calibrator_path = None
+    if not args.no_calibrator:
+        calibrator_path = Path(args.calibrator) if args.calibrator else PROJECT_ROOT / config.calibrator_path
+
+    start = time.perf_counter()
+    tasks = prepare_tasks(
+        games, seasons, EloParams.from_config(config),
+        model_path=str(model_path),
+        calibrator_path=str(calibrator_path) if calibrator_path else None,
+        odds=odds,
+    )
+    if not tasks:
+        print(f"No games for seasons {seasons}")
+        sys.exit(1)
+    results = run_backtest(tasks, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results, bins=args.bins)
+    print(f"\n{'=' * 60}")
+    print(f"{config.league_name} walk-forward backtest ({model_path.name}"
+          f"{', calibrated' if calibrator_path else ''})")
+    print(f"{'=' * 60}")
+    print(summary.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+
+    y = np.concatenate([r.home_win for r in results])
+    p = np.concatenate([r.prob for r in results])
+    print("\nCalibration (all seasons):")
+    print(calibration_table(y, p, args.bins).to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+
+    n_games = sum(r.n_games for r in results)
+    n_days = sum(r.n_days for r in results)
+    print(f"\n✓ {n_games} games over {n_days} game days in {len(results)} seasons, {elapsed:.1f}s")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        predictions_frame(results).to_csv(out_path, index=False)
+        print(f"Saved predictions to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark model artifact loading: JSON + pickle vs UBJSON + lookup table.
+
+Each variant runs in a fresh interpreter so import caches and allocator
+state don't leak between measurements. Reported per variant:
+    load_s     wall time to construct Predictor for every league
+    reload_s   wall time to construct them all again (as reload_state does)
+    rss_mb     resident memory growth caused by the loads
+
+Variants:
+    json_pickle     original artifacts, no cache (the pre-export code path)
+    ubj_table       exported artifacts through the artifact cache
+
+Usage:
+    python src/export_model_artifacts.py      # create .ubj / .table.npz first
+    python src/benchmark_model_loading.py --repeats 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+SRC_DIR = Path(__file__).parent
+PROJECT_ROOT = SRC_DIR.parent
+
+
+_CHILD = r"""
+import json, sys, time, warnings
+warnings.filterwarnings("ignore")
+sys.path.insert(0, {src!r})
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+from core.league_config import NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG
+from core.model_artifacts import (
+    get_artifact_cache, joblib, resolve_calibrator_path, resolve_model_path, xgboost,
+)
+from core.predictor import Predictor, preload_model_libraries
+
+preload_model_libraries()
+root = {root!r}
+pairs = [(root + "/" + c.model_path, root + "/" + c.calibrator_path)
+         for c in (NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG)]
+
+def load_uncached():
+    out = []
+    for model_path, calibrator_path in pairs:
+        model = xgboost.XGBClassifier()
+        model.load_model(model_path)
+        out.append((model, joblib.load(calibrator_path)))
+    return out
+
+def load_cached():
+    out = []
+    for model_path, calibrator_path in pairs:
+        for p in (resolve_model_path(model_path), resolve_calibrator_path(calibrator_path)):
+            if p.suffix == ".json" or p.suffix == ".pkl":
+                raise SystemExit("exported artifacts missing: run export_model_artifacts.py")
+        out.append(Predictor(model_path, calibrator_path))
+    return out
+
+load = load_uncached if {variant!r} == "json_pickle" else load_cached
+
+rss0 = rss_mb()
+t0 = time.perf_counter(); first = load(); t1 = time.perf_counter()
+second = load(); t2 = time.perf_counter()
+print(json.dumps({{"load_s": t1 - t0, "reload_s": t2 - t1, "rss_mb": rss_mb() - rss0}}))
+"""
+
+
+def run_variant(variant: str) -> dict:
+    code = _CHILD.format(src=str(SRC_DIR), root=str(PROJECT_ROOT), variant=variant)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model artifact loading.")
+    parser.add_argument("--repeats", type=int, default=3, help="Fresh processes per variant")
+    args = parser.parse_args()
+
+    print(f"{'variant':<14}{'load_s':>10}{'reload_s':>10}{'rss_mb':>10}")
+    for variant in ("json_pickle", "ubj_table"):
+        runs = [run_variant(variant) for _ in range(args.repeats)]
+        med = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        print(f"{variant:<14}{med['load_s']:>10.3f}{med['reload_s']:>10.3f}{med['rss_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,64 +19,29 @@ import sys
 # Add core path to import LeagueConfig
 sys.path.insert(0, str(Path(__file__).parent))
 from core.league_config import NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG
-
-# ==========================
-# Elo constants (from build_elo.py)
-# ==========================
-DEFAULT_ELO = 1500
-K_FACTOR = 20
-HOME_COURT_ADVANTAGE = 70
-SEASON_CARRYOVER = 0.7
-
-
-def expected_home_win(e_home: float, e_away: float) -> float:
-    """Calculate expected probability that home team wins."""
-    exponent = -(e_home - e_away + HOME_COURT_ADVANTAGE) / 400
-    return 1 / (1 + 10 ** exponent)
-
-
-def compute_final_elo(games: pd.DataFrame) -> dict[int, float]:
+from core.elo_engine import EloParams, replay_games
+from core.elo_tracker import EloTracker
+from core.standings_tracker import StandingsTracker
+from core.state_manager import StateManager
+from core.stats_tracker import StatsTracker
+from core.table_store import read_frame
+
+def compute_final_elo(games: pd.DataFrame, params: EloParams = EloParams()) -> dict[int, float]:
     """
     Replay all games to compute final Elo ratings.
     
     Args:
         games: DataFrame with game_date, team_id_home, team_id_away, home_win, season_id
+        params: League Elo parameters
         
     Returns:
         Dict mapping team_id -> final Elo rating
     """
     # Sort chronologically
     games = games.sort_values("game_date").reset_index(drop=True)
-    
-    # Get all teams
-    teams = set(games["team_id_home"].unique()) | set(games["team_id_away"].unique())
-    elo = {team: DEFAULT_ELO for team in teams}
-    
-    current_season = None
-    
-    for _, row in games.iterrows():
-        season = row["season_id"]
-        
-        # Season regression
-        if current_season is not None and season != current_season:
-            for team in elo:
-                elo[team] = SEASON_CARRYOVER * elo[team] + (1 - SEASON_CARRYOVER) * DEFAULT_ELO
-        current_season = season
-        
-        home = row["team_id_home"]
-        away = row["team_id_away"]
-        
-        e_home = elo[home]
-        e_away = elo[away]
-        p_home = expected_home_win(e_home, e_away)
-        
-        result = 1.0 if row["home_win"] else 0.0
-        
-        # Update
-        elo[home] = e_home + K_FACTOR * (result - p_home)
-        elo[away] = e_away - K_FACTOR * (result - p_home)
-    
-    return elo
+
+    replay, team_ids = replay_games(games, params)
+    return {int(team): float(rating) for team, rating in zip(team_ids, replay.ratings)}
 
 
 def compute_team_stats(games: pd.DataFrame, window: int = 10) -> dict[int, list[dict]]:
@@ -133,22 +98,19 @@ def main():
     
     if args.league == "wnba":
         config = WNBA_CONFIG
-        games_path = Path(__file__).parent.parent / "data" / "processed" / "wnba_games_with_elo_rest.csv"
         state_dir = Path(__file__).parent.parent / config.state_dir
     elif args.league == "cbb":
         config = CBB_CONFIG
-        games_path = Path(__file__).parent.parent / "data" / "processed" / "cbb_games_with_elo_rest.csv"
         state_dir = Path(__file__).parent.parent / config.state_dir
     else:
         config = NBA_CONFIG
-        games_path = Path(__file__).parent.parent / "data" / "processed" / "games_with_elo_rest.csv"
         state_dir = Path(__file__).parent.parent / config.state_dir
 
     elo_state_path = state_dir / "elo.json"
     stats_state_path = state_dir / "stats.json"
 
     print("Loading games data...")
-    games = pd.read_csv(games_path, parse_dates=["game_date"])
+    games = read_frame("games_with_elo_rest", args.league)
     games["season_id"] = games["season_id"].astype(int)
     
     print(f"Total games: {len(games)}")
@@ -156,7 +118,7 @@ def main():
     
     # Compute Elo
     print("\nComputing final Elo ratings...")
-    elo_state = compute_final_elo(games)
+    elo_state = compute_final_elo(games, EloParams.from_config(config))
     print(f"Teams tracked: {len(elo_state)}")
     
     # Show some ratings
@@ -193,6 +155,19 @@ def main():
     with open(stats_state_path, "w", encoding="utf-8") as f:
         json.dump(stats_json, f, indent=2)
     print(f"  Saved stats state to: {stats_state_path}")
+
+    # Standings of the latest season in the history
+    standings = StandingsTracker.from_games(games, args.league)
+    print(f"  Standings: {standings}")
+
+    # Commit the files as a new state generation (readers follow MANIFEST.json)
+    manager = StateManager(state_dir, elo_params=EloParams.from_config(config))
+    manager.save(
+        EloTracker.from_file(elo_state_path, params=EloParams.from_config(config)),
+        StatsTracker.from_file(stats_state_path),
+        standings=standings,
+    )
+    print(f"  Committed state generation {manager.generation}")
     
     print("\nBootstrap complete!")
 
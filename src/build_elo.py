@@ -1,6 +1,6 @@
 '''
 elo builder
-Phome = 1 / (1 + 10**((Ehome - Eaway + HCA) / 400))
+Phome = 1 / (1 + 10**(-(Ehome - Eaway + HCA) / 400))
 
 home wins:
 Ehome_new = Ehome + K * (1 - Phome)
@@ -9,8 +9,10 @@ Eaway_new = Eaway - K * (1 - Phome)
 away wins:
 Ehome_new = Ehome + K * (0 - Phome)
 Eaway_new = Eaway - K * (0 - Phome)
+
+ratings regress toward 1500 by the league's carry-over at each new season
+(see core/elo_engine.py)
 '''
-import pandas as pd 
 from pathlib import Path
 import argparse
 import sys
@@ -18,27 +20,8 @@ import sys
 # Add core path to import LeagueConfig
 sys.path.insert(0, str(Path(__file__).parent))
 from core.league_config import NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG
-
-def initilaze_elo(teams):
-    #starting every team at 1500 elo 
-
-    return {team: 1500 for team in teams}
-
-def expected_home_win(Ehome, Eaway, hca=70):
-    #calculate expected probability that home team wins
-    return 1 / (1 + 10 ** (-(Ehome - Eaway + hca) / 400))
-
-def update_elo(Ehome, Eaway, home_win, k=20):
-    Phome = expected_home_win(Ehome, Eaway)
-
-    if home_win == 1:
-        Ehome_new = Ehome + k * (1 - Phome)
-        Eaway_new = Eaway - k * (1 - Phome)
-    else:
-        Ehome_new = Ehome + k * (0 - Phome)
-        Eaway_new = Eaway - k * (0 - Phome)
-
-    return Ehome_new, Eaway_new, Phome
+from core.elo_engine import EloParams, replay_games
+from core.table_store import read_frame, save_frame
 
 def main():
     parser = argparse.ArgumentParser()
@@ -47,66 +30,31 @@ def main():
     
     if args.league == "wnba":
         config = WNBA_CONFIG
-        base_games = Path(__file__).parent.parent / "data" / "processed" / "wnba_games_with_labels.csv"
         out_path = Path(__file__).parent.parent / "data" / "processed" / "wnba_games_with_elo.csv"
     elif args.league == "cbb":
         config = CBB_CONFIG
-        base_games = Path(__file__).parent.parent / "data" / "processed" / "cbb_games_with_labels.csv"
         out_path = Path(__file__).parent.parent / "data" / "processed" / "cbb_games_with_elo.csv"
     else:
         config = NBA_CONFIG
-        base_games = Path(__file__).parent.parent / "data" / "processed" / "games_with_labels.csv"
         out_path = Path(__file__).parent.parent / "data" / "processed" / "games_with_elo.csv"
 
-    df = pd.read_csv(base_games, parse_dates=['game_date'])
+    # Columnar store when it is current, otherwise the processed CSV
+    df = read_frame("games_with_labels", args.league)
 
     #chronological order
     df = df.sort_values('game_date').reset_index(drop=True)
 
-    teams = pd.concat([df['team_id_home'], df['team_id_away']]).unique()
-
-    elo = initilaze_elo(teams)
-
-    #storage columns
-    df["elo_home"] = 0.0
-    df["elo_away"] = 0.0
-    df["elo_prob"] = 0.0
-
-    #add reset
-    current_season = None
-    for i, row in df.iterrows():
-        season = row["season_id"]
-
-        # -------- Season regression (once per season) --------
-        if current_season is None:
-            current_season = season
-
-        if season != current_season:
-            # regress ALL teams toward mean
-            for team in elo:
-                elo[team] = 0.7 * elo[team] + 0.3 * 1500
-            current_season = season
-
-        home = row["team_id_home"]
-        away = row["team_id_away"]
-
-        Ehome = elo[home]
-        Eaway = elo[away]
-
-        df.at[i, 'elo_home'] = Ehome
-        df.at[i, 'elo_away'] = Eaway
-
-        #update elo after game
-        Ehome_new, Eaway_new, Phome = update_elo(Ehome, Eaway, row['home_win'], k=config.k_factor)
-
-        df.at[i, 'elo_prob'] = Phome
+    # Replay over arrays with the league's K / HCA / carry-over, the same
+    # update EloTracker applies when serving
+    replay, _ = replay_games(df, EloParams.from_config(config))
 
-        elo[home] = Ehome_new
-        elo[away] = Eaway_new
+    df["elo_home"] = replay.elo_home
+    df["elo_away"] = replay.elo_away
+    df["elo_prob"] = replay.elo_prob
 
     #save
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(out_path, index=False)
+    # CSV export + columnar store (data/store)
+    save_frame(df, "games_with_elo", args.league)
     print(f"Saved elo data to {out_path}")
 
     #print shape, head, and tail
@@ -5,7 +5,8 @@ import sqlite3
 import pandas as pd
 from pathlib import Path
 
-DB_PATH = Path("/mnt/c/Users/sandy/Desktop/dev/Basketball_Prediction/data/nba.sqlite")
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_PATH = PROJECT_ROOT / "data" / "nba.sqlite"
 
 def load_games():
     conn = sqlite3.connect(DB_PATH)
@@ -44,7 +45,7 @@ def main():
     print(df.head())
 
     #save to csv
-    out_path = Path("/mnt/c/Users/sandy/Desktop/dev/Basketball_Prediction/data/processed/games_with_labels.csv")
+    out_path = PROJECT_ROOT / "data" / "processed" / "games_with_labels.csv"
     out_path.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out_path, index=False)
     print(f"Saved processed data to {out_path}")
@@ -0,0 +1,118 @@
+"""
+Build the season standings of a league's state.
+
+New states get standings from bootstrap_state.py, and every game applied
+afterwards keeps them current (see core/standings_tracker.py). This script
+adds them to an existing state, as a new state generation with the Elo and
+rolling stats unchanged, from either
+
+  - the league's game history (games_with_elo_rest, latest season) plus
+    the games journaled since the last snapshot, or
+  - ESPN scoreboards from --since through the last processed date (read
+    through the scoreboard archive, so reruns are offline).
+
+Usage:
+    python src/build_standings.py --league nba
+
+    # Season already partly applied live: rebuild it from ESPN
+    python src/build_standings.py --league nba --since 2025-10-21
+
+    # Print the table after building
+    python src/build_standings.py --league wnba --show
+"""
+
+import argparse
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.elo_engine import EloParams
+from core.espn_client import ESPNClient
+from core.league_config import LEAGUE_CONFIGS
+from core.standings_tracker import StandingsTracker
+from core.state_manager import StateManager
+from core.table_store import read_frame
+from core.team_mapper import TeamMapper
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GAME_COLUMNS = ["game_date", "season_id", "team_id_home", "team_id_away", "pts_home", "pts_away"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the season standings of a league's state.")
+    parser.add_argument("--league", default="nba", choices=list(LEAGUE_CONFIGS))
+    parser.add_argument("--state-dir", type=str, default=None,
+                        help="State directory. Default: the league's state dir")
+    parser.add_argument("--since", type=str, default=None,
+                        help="Rebuild from ESPN scoreboards from this date (YYYY-MM-DD)")
+    parser.add_argument("--show", action="store_true", help="Print the standings table")
+    return parser.parse_args()
+
+
+def from_history(league: str, manager: StateManager) -> StandingsTracker:
+    games = read_frame("games_with_elo_rest", league, columns=GAME_COLUMNS)
+    games["season_id"] = games["season_id"].astype(int)
+    standings = StandingsTracker.from_games(games, league)
+
+    last_processed = manager.get_last_processed_date()
+    history_end = str(games["game_date"].max())[:10]
+    if last_processed and last_processed.isoformat() > history_end:
+        print(f"⚠ History ends {history_end} but the state is processed through {last_processed};")
+        print("  games applied in between are only included if still journaled (use --since)")
+
+    for entry in manager.journal.tail():
+        game = entry.to_result()
+        if not game.is_regular_season:
+            continue
+        standings.record_game(game.home_team_id, game.away_team_id,
+                              game.home_score, game.away_score, game.game_date)
+    return standings
+
+
+def from_espn(league: str, config, since: date, through: date) -> StandingsTracker:
+    lookup = PROJECT_ROOT / config.team_lookup_csv if config.team_lookup_csv else None
+    client = ESPNClient(TeamMapper(lookup_path=lookup) if lookup else TeamMapper(), league_slug=config.espn_slug)
+    standings = StandingsTracker(league)
+    day = since
+    while day <= through:
+        for game in client.get_completed_games(day):
+            if game.home_team_id is not None and game.away_team_id is not None and game.is_regular_season:
+                standings.record_game(game.home_team_id, game.away_team_id,
+                                      game.home_score, game.away_score, game.game_date)
+        day += timedelta(days=1)
+    return standings
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+    state_dir = Path(args.state_dir) if args.state_dir else PROJECT_ROOT / config.state_dir
+
+    manager = StateManager(state_dir, elo_params=EloParams.from_config(config))
+    if not manager.exists():
+        print(f"⚠ No state in {state_dir}; run bootstrap_state.py first")
+        sys.exit(1)
+    elo_tracker, stats_tracker = manager.load()
+
+    if args.since:
+        since = datetime.strptime(args.since, "%Y-%m-%d").date()
+        through = manager.get_last_processed_date() or date.today() - timedelta(days=1)
+        print(f"Replaying ESPN scoreboards {since} → {through}...")
+        standings = from_espn(args.league, config, since, through)
+    else:
+        standings = from_history(args.league, manager)
+
+    manager.save(elo_tracker, stats_tracker, standings=standings)
+    print(f"✓ {standings} → generation {manager.generation}")
+
+    if args.show:
+        for row in standings.table():
+            print(f"  {row['rank']:>3}. {row['team_id']:<12} {row['wins']:>3}-{row['losses']:<3} "
+                  f"GB {row['games_back']:>4.1f}  {row['streak']:>3}  L{row['last_n']} {row['last_n_record']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Build the point-in-time state index of a league.
+
+Replays the league's game history (games_with_elo_rest, the same replay as
+the offline Elo features) into state/<league>/state_index.npz, which the
+API uses to predict past dates from the state as of that date and
+update_state.py extends day by day. See core/state_index.py.
+
+Usage:
+    python src/build_state_index.py --league nba
+
+    # Look up one team's state as of a date after building
+    python src/build_state_index.py --league wnba --show 2024-06-01 --team 17
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.elo_engine import EloParams
+from core.league_config import LEAGUE_CONFIGS
+from core.state_index import INDEX_FILE, StateIndex
+from core.table_store import read_frame
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GAME_COLUMNS = ["game_date", "season_id", "team_id_home", "team_id_away", "pts_home", "pts_away", "home_win"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the point-in-time state index.")
+    parser.add_argument("--league", default="nba", choices=list(LEAGUE_CONFIGS))
+    parser.add_argument("--state-dir", type=str, default=None,
+                        help="State directory. Default: the league's state dir")
+    parser.add_argument("--show", type=str, default=None, help="Print the state as of this date (YYYY-MM-DD)")
+    parser.add_argument("--team", type=int, default=None, help="Team for --show (default: all teams' Elo)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+    state_dir = Path(args.state_dir) if args.state_dir else PROJECT_ROOT / config.state_dir
+
+    start = time.perf_counter()
+    games = read_frame("games_with_elo_rest", args.league, columns=GAME_COLUMNS)
+    index = StateIndex.from_games(games, EloParams.from_config(config))
+    index.save(state_dir / INDEX_FILE)
+    size_kb = (state_dir / INDEX_FILE).stat().st_size / 1024
+    print(f"✓ {index} → {state_dir / INDEX_FILE} ({size_kb:.0f} KB, {time.perf_counter() - start:.2f}s)")
+
+    if args.show:
+        if args.team is not None:
+            print(f"\nTeam {args.team} as of {args.show}:")
+            print(f"  Elo: {index.elo_at(args.team, args.show):.1f}")
+            for game in index.window_at(args.team, args.show):
+                print(f"  {game['date']}  {game['pf']}-{game['pa']}  {'W' if game['won'] else 'L'}")
+        else:
+            ratings = sorted(index.ratings_at(args.show).items(), key=lambda x: x[1], reverse=True)
+            print(f"\nElo as of {args.show}:")
+            for team_id, rating in ratings:
+                print(f"  {team_id}: {rating:.1f}")
+
+
+if __name__ == "__main__":
+    main()
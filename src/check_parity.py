@@ -0,0 +1,102 @@
+"""
+Check training-serving feature parity for a league.
+
+Replays EloTracker / StatsTracker / FeatureBuilder over the full game
+history (see core/parity.py) and diffs the resulting serving-side feature
+matrix column by column against the training table
+(features_with_injuries, from the store or CSV). If a league has no
+training table yet, it is rebuilt in memory with core/feature_pipeline.py.
+
+Typical findings: rolling stats are NaN before a team's first game offline
+but StatsTracker's neutral defaults online, and Elo columns drift when the
+Elo tables were built with other K / HCA / carry-over than the league config.
+
+Usage:
+    python src/check_parity.py --league wnba
+
+    # Show 10 example rows per mismatching column, save the serving matrix
+    python src/check_parity.py --league cbb --examples 10 --out data/processed/cbb_serving_features.csv
+
+    # Exit non-zero on any mismatch (CI)
+    python src/check_parity.py --league wnba --strict
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.elo_engine import EloParams
+from core.feature_pipeline import build_features
+from core.league_config import LEAGUE_CONFIGS
+from core.parity import DEFAULT_ATOL, mismatch_examples, run_parity
+from core.table_store import csv_path_for, read_frame, store_mtime
+
+
+def _has_table(table: str, league: str) -> bool:
+    return csv_path_for(table, league).exists() or store_mtime(table, league) is not None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Diff serving-side features against the training table.")
+    parser.add_argument("--league", default="nba", choices=list(LEAGUE_CONFIGS))
+    parser.add_argument("--atol", type=float, default=DEFAULT_ATOL, help="Absolute tolerance")
+    parser.add_argument("--examples", type=int, default=3, help="Example rows per mismatching column")
+    parser.add_argument("--out", default=None, help="Write the serving feature matrix as CSV")
+    parser.add_argument("--strict", action="store_true", help="Exit with status 1 on any mismatch")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+
+    if not _has_table("games_with_elo_rest", args.league):
+        print(f"⚠ {csv_path_for('games_with_elo_rest', args.league).name} not found")
+        sys.exit(1)
+
+    # The training table is built from games_with_elo_rest row for row
+    games = read_frame("games_with_elo_rest", args.league)
+    odds = read_frame("odds_with_team_ids", args.league) if _has_table("odds_with_team_ids", args.league) else None
+
+    if _has_table("features_with_injuries", args.league):
+        training = read_frame("features_with_injuries", args.league)
+        source = csv_path_for("features_with_injuries", args.league).name
+    else:
+        training = build_features(games, odds=odds)
+        source = "rebuilt from games_with_elo_rest (no training table)"
+
+    serving, report, elapsed = run_parity(games, training, EloParams.from_config(config), odds, args.atol)
+
+    print(f"\n{'=' * 60}")
+    print(f"{config.league_name} training-serving parity")
+    print(f"{'=' * 60}")
+    print(f"Training: {source}")
+    print(f"Serving:  tracker replay of {len(serving)} games in {elapsed:.2f}s\n")
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+
+    bad = report[report["mismatches"] > 0]
+    for col in bad["column"]:
+        if args.examples <= 0:
+            break
+        print(f"\n{col}:")
+        print(mismatch_examples(serving, training, col, args.examples, args.atol).to_string(index=False))
+
+    if bad.empty:
+        print(f"\n✓ All {len(report)} columns match")
+    else:
+        print(f"\n⚠ {len(bad)} of {len(report)} columns differ")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        serving.to_csv(out_path, index=False)
+        print(f"Saved serving features to {out_path}")
+
+    if args.strict and not bad.empty:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
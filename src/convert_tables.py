@@ -0,0 +1,84 @@
+"""
+Move processed tables between CSV and the columnar store (data/store).
+
+The build scripts write both formats; this is for seeding the store from
+existing CSVs and for getting an ad-hoc CSV back out of the store.
+
+Usage:
+    # Load every processed CSV into the store
+    python src/convert_tables.py
+
+    # One league
+    python src/convert_tables.py --league cbb
+
+    # Export a stored table back to data/processed (or --out PATH)
+    python src/convert_tables.py --export games_with_elo_rest --league cbb
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.table_store import (
+    DEFAULT_STORE_DIR,
+    csv_path_for,
+    export_csv,
+    read_frame,
+    write_table,
+)
+
+
+LEAGUES = ["nba", "wnba", "cbb"]
+TABLES = [
+    "games_with_labels",
+    "games_with_elo",
+    "games_with_elo_rest",
+    "odds_with_team_ids",
+    "features_with_injuries",
+    "model_predictions",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Convert processed tables between CSV and the columnar store.")
+    parser.add_argument("--league", default="all", choices=["all", *LEAGUES])
+    parser.add_argument("--table", default="all", choices=["all", *TABLES])
+    parser.add_argument("--export", default=None, choices=TABLES, metavar="TABLE",
+                        help="Export a stored table to CSV instead of importing")
+    parser.add_argument("--out", default=None, help="CSV path for --export (single league)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    leagues = LEAGUES if args.league == "all" else [args.league]
+
+    if args.export:
+        for league in leagues:
+            try:
+                path = export_csv(args.export, league, args.out)
+            except FileNotFoundError:
+                print(f"⚠ {args.export}/{league}: not in store")
+                continue
+            print(f"✓ Exported {args.export}/{league} to {path}")
+        return
+
+    tables = TABLES if args.table == "all" else [args.table]
+    for league in leagues:
+        for table in tables:
+            csv_path = csv_path_for(table, league)
+            if not csv_path.exists():
+                continue
+            start = time.perf_counter()
+            df = read_frame(table, league, prefer_store=False)
+            league_dir = write_table(df, table, league, DEFAULT_STORE_DIR)
+            size = sum(p.stat().st_size for p in league_dir.rglob("*.arrow"))
+            print(f"✓ {table}/{league}: {len(df)} rows, {csv_path.stat().st_size / 1e6:.1f} MB CSV -> "
+                  f"{size / 1e6:.1f} MB store ({time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ Core prediction module for NBA game predictions.
 """
 
 from .team_mapper import TeamMapper
+from .elo_engine import EloParams, replay_elo, replay_games
 from .elo_tracker import EloTracker
 from .stats_tracker import StatsTracker
 from .feature_builder import FeatureBuilder
@@ -17,6 +18,8 @@ from .injury_client import InjuryClient, PlayerInjury, TeamInjuryReport, calcula
 from .injury_cache import InjuryCache, get_global_cache
 from .player_importance import PlayerTier, get_player_tier, get_player_importance_multiplier
 from .state_sync import download_state_from_gcs, upload_state_to_gcs
+from .calibration import CalibratorTable, PlattCalibrator, compile_calibrator
+from .model_artifacts import ArtifactCache, export_artifacts, get_artifact_cache
 
 # Configuration module (optional import)
 try:
@@ -26,6 +29,9 @@ except ImportError:
 
 __all__ = [
     "TeamMapper",
+    "EloParams",
+    "replay_elo",
+    "replay_games",
     "EloTracker",
     "StatsTracker",
     "FeatureBuilder",
@@ -51,5 +57,11 @@ __all__ = [
     "get_player_importance_multiplier",
     "download_state_from_gcs",
     "upload_state_to_gcs",
+    "ArtifactCache",
+    "CalibratorTable",
+    "PlattCalibrator",
+    "compile_calibrator",
+    "export_artifacts",
+    "get_artifact_cache",
     "config",
 ]
@@ -0,0 +1,74 @@
+"""
+Crash-safe file writes.
+
+Every write goes to a temporary file in the target's directory, is fsynced,
+and is renamed over the target, so readers (and a process restarted after
+a crash or preemption) see either the old file or the new one, never a
+truncated mix.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Union
+
+
+def fsync_dir(path: Union[str, Path]) -> None:
+    """Flush a directory entry (makes renames / new files in it durable)."""
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return      # e.g. directories cannot be opened on Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_bytes_atomic(path: Union[str, Path], data: bytes, sync_dir: bool = True) -> Path:
+    """
+    Atomically replace ``path`` with ``data``.
+
+    Args:
+        path: Target file
+        data: Contents
+        sync_dir: Also fsync the parent directory so the rename itself is
+                  durable (skip when the caller syncs the directory once
+                  for many files)
+
+    Returns:
+        The target path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    if sync_dir:
+        fsync_dir(path.parent)
+    return path
+
+
+def json_bytes(obj: Any, **dump_kwargs) -> bytes:
+    """Serialize to UTF-8 JSON (json.dumps keyword arguments pass through)."""
+    return json.dumps(obj, **dump_kwargs).encode("utf-8")
+
+
+def write_json_atomic(path: Union[str, Path], obj: Any, sync_dir: bool = True, **dump_kwargs) -> Path:
+    """Atomically write ``obj`` as JSON (see write_bytes_atomic)."""
+    return write_bytes_atomic(path, json_bytes(obj, **dump_kwargs), sync_dir=sync_dir)
+
+
+def sha256_file(path: Union[str, Path]) -> str:
+    """Hex SHA-256 of a file's contents."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
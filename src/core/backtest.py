@@ -0,0 +1,389 @@
+"""
+Walk-forward backtest of the serving code path.
+
+Replays a season day by day through the same objects the daily job uses:
+
+    for each game day:
+        FeatureBuilder (EloTracker + StatsTracker) -> one feature row per game
+        Predictor.predict_proba on the whole slate (one model call)
+        GameProcessor.process_games with the day's final scores
+
+so every prediction only sees results from earlier days, exactly as in
+production. Each season starts from the state the trackers would have had
+going into it (Elo after all earlier seasons, then regressed; the last
+10 games of every team, both looked up in a StateIndex built with one
+replay), so seasons are independent and run in parallel on a process pool.
+
+Injury features are zero for history (no archived ESPN reports), as in the
+training table; moneylines are used when the league has an odds table.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import brier_score_loss, log_loss
+
+from .elo_engine import EloParams
+from .elo_tracker import EloTracker
+from .espn_client import GameResult
+from .feature_builder import FEATURE_COLS, FeatureBuilder
+from .game_processor import GameProcessor
+from .predictor import Predictor
+from .state_index import StateIndex
+from .stats_tracker import StatsTracker
+
+
+# (game_date "YYYY-MM-DD", home_id, away_id) -> (ml_home, ml_away)
+OddsLookup = Dict[Tuple[str, int, int], Tuple[float, float]]
+
+ELO_PROB_COL = FEATURE_COLS.index("elo_prob")
+MARKET_PROB_COL = FEATURE_COLS.index("market_prob_home")
+
+GAME_COLUMNS = ["game_id", "game_date", "season_id", "team_id_home", "team_id_away",
+                "pts_home", "pts_away", "home_win"]
+
+
+@dataclass
+class SeasonTask:
+    """Everything a worker needs to replay one season."""
+    season_id: int
+    games: pd.DataFrame                          # the season's games (GAME_COLUMNS), chronological
+    elo_ratings: Dict[int, float]                # ratings after the previous season (not yet regressed)
+    stats_state: Dict[int, List[dict]]           # last N games per team before the season
+    elo_params: EloParams
+    model_path: str
+    calibrator_path: Optional[str] = None
+    odds: OddsLookup = field(default_factory=dict)
+
+
+@dataclass
+class SeasonBacktest:
+    """Pre-game predictions for every game of one season."""
+    season_id: int
+    game_id: np.ndarray
+    game_date: np.ndarray
+    home_win: np.ndarray
+    prob: np.ndarray            # Predictor output (calibrated if a calibrator is set)
+    elo_prob: np.ndarray        # Elo-only baseline from the same trackers
+    market_prob: np.ndarray     # 0.5 where no odds
+    n_days: int
+    seconds: float
+
+    @property
+    def n_games(self) -> int:
+        return len(self.prob)
+
+
+# =============================================================================
+# Task preparation
+# =============================================================================
+
+def odds_lookup(odds: Optional[pd.DataFrame]) -> OddsLookup:
+    """
+    Moneylines by game from an odds table (date or game_date, team_id_home,
+    team_id_away, moneyline_home, moneyline_away). Rows without both lines
+    are dropped, so those games get the neutral market default.
+    """
+    if odds is None or len(odds) == 0:
+        return {}
+    odds = odds.rename(columns={"date": "game_date"})
+    odds = odds.dropna(subset=["team_id_home", "team_id_away", "moneyline_home", "moneyline_away"])
+    dates = pd.to_datetime(odds["game_date"]).dt.strftime("%Y-%m-%d")
+    return {
+        (d, int(h), int(a)): (float(mh), float(ma))
+        for d, h, a, mh, ma in zip(
+            dates, odds["team_id_home"], odds["team_id_away"],
+            odds["moneyline_home"], odds["moneyline_away"],
+        )
+    }
+
+
+def prepare_tasks(
+    games: pd.DataFrame,
+    seasons: Sequence[int],
+    elo_params: EloParams,
+    model_path: str,
+    calibrator_path: Optional[str] = None,
+    odds: Optional[pd.DataFrame] = None,
+) -> List[SeasonTask]:
+    """
+    Split a league's history into independent per-season tasks.
+
+    Args:
+        games: Full game history (GAME_COLUMNS); earlier seasons seed the
+               tracker state of later ones
+        seasons: season_id values to backtest
+        elo_params: League Elo parameters
+        model_path: Model for the Predictor
+        calibrator_path: Optional calibrator for the Predictor
+        odds: Optional odds table (see odds_lookup)
+
+    Returns:
+        One SeasonTask per requested season that has games, in season order
+    """
+    games = games[GAME_COLUMNS].copy()
+    games["game_date"] = pd.to_datetime(games["game_date"])
+    games["season_id"] = games["season_id"].astype(int)
+    games = games.sort_values("game_date", kind="stable").reset_index(drop=True)
+    lookup = odds_lookup(odds)
+
+    # One replay for the whole history; each season's starting state is a
+    # point-in-time lookup instead of a replay of everything before it
+    index = StateIndex.from_games(games, elo_params, window=StatsTracker.WINDOW_SIZE)
+
+    tasks = []
+    season_ids = games["season_id"].to_numpy()
+    for season in sorted({int(s) for s in seasons}):
+        season_games = games[season_ids == season].reset_index(drop=True)
+        if len(season_games) == 0:
+            continue
+        first_day = season_games["game_date"].iloc[0]
+
+        season_dates = set(season_games["game_date"].dt.strftime("%Y-%m-%d"))
+        tasks.append(SeasonTask(
+            season_id=season,
+            games=season_games,
+            # backtest_season() applies the season-start regression itself
+            elo_ratings=index.ratings_at(first_day, pending_regression=False),
+            stats_state=index.stats_state_at(first_day),
+            elo_params=elo_params,
+            model_path=str(model_path),
+            calibrator_path=str(calibrator_path) if calibrator_path else None,
+            odds={k: v for k, v in lookup.items() if k[0] in season_dates},
+        ))
+    return tasks
+
+
+# =============================================================================
+# Replay
+# =============================================================================
+
+def walk_slates(
+    games: pd.DataFrame,
+    feature_builder: FeatureBuilder,
+    processor: GameProcessor,
+    out: np.ndarray,
+    odds: Optional[OddsLookup] = None,
+) -> Iterator[Tuple[int, int]]:
+    """
+    Walk chronological games one game day at a time.
+
+    For each day the feature rows of the whole slate are written to
+    ``out[lo:hi]`` from the tracker state before the day, then ``(lo, hi)``
+    is yielded so the caller can score the slate, and the day's results are
+    applied through ``processor`` when iteration resumes. Elo is regressed
+    whenever season_id changes between days, like the offline replay.
+
+    Args:
+        games: Games (GAME_COLUMNS) sorted by game_date
+        feature_builder: FeatureBuilder over the trackers ``processor`` updates
+        processor: GameProcessor that applies results
+        out: (len(games), len(FEATURE_COLS)) array to fill
+        odds: Optional moneylines by game
+
+    Yields:
+        (lo, hi) row range of each game day
+    """
+    odds = odds or {}
+    dates = games["game_date"].dt.strftime("%Y-%m-%d").to_numpy()
+    seasons = games["season_id"].to_numpy()
+    home = games["team_id_home"].to_numpy().astype(np.int64)
+    away = games["team_id_away"].to_numpy().astype(np.int64)
+    pts_home = games["pts_home"].to_numpy().astype(np.int64)
+    pts_away = games["pts_away"].to_numpy().astype(np.int64)
+
+    n = len(games)
+    day_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]]) if n else np.empty(0, dtype=np.int64)
+    day_ends = np.r_[day_starts[1:], n]
+
+    for lo, hi in zip(day_starts, day_ends):
+        if lo > 0 and seasons[lo] != seasons[lo - 1]:
+            processor.elo_tracker.apply_season_regression()
+        day = date.fromisoformat(dates[lo])
+
+        # Whole slate is built from the state before any of the day's results
+        for i in range(lo, hi):
+            ml_home, ml_away = odds.get((dates[i], int(home[i]), int(away[i])), (None, None))
+            out[i] = feature_builder.build_features(int(home[i]), int(away[i]), day, ml_home, ml_away)
+
+        yield int(lo), int(hi)
+
+        processor.process_games([
+            GameResult(
+                game_date=dates[i],
+                home_team=str(home[i]),
+                away_team=str(away[i]),
+                home_score=int(pts_home[i]),
+                away_score=int(pts_away[i]),
+                status="Final",
+                home_team_id=int(home[i]),
+                away_team_id=int(away[i]),
+            )
+            for i in range(lo, hi)
+        ])
+
+
+def backtest_season(task: SeasonTask) -> SeasonBacktest:
+    """
+    Replay one season day by day through the serving trackers.
+
+    Args:
+        task: Season games and starting state
+
+    Returns:
+        SeasonBacktest with one pre-game prediction per game
+    """
+    start = time.perf_counter()
+
+    elo_tracker = EloTracker(initial_ratings=task.elo_ratings, params=task.elo_params)
+    if task.elo_ratings:
+        elo_tracker.apply_season_regression()
+    stats_tracker = StatsTracker(initial_state=task.stats_state)
+    feature_builder = FeatureBuilder(elo_tracker, stats_tracker)
+    # Results already carry team ids, so no name mapping is needed
+    processor = GameProcessor(elo_tracker, stats_tracker, team_mapper=None)
+    predictor = Predictor(task.model_path, task.calibrator_path)
+
+    games = task.games
+    n = len(games)
+    X = np.empty((n, len(FEATURE_COLS)), dtype=np.float64)
+    prob = np.empty(n, dtype=np.float64)
+
+    n_days = 0
+    for lo, hi in walk_slates(games, feature_builder, processor, X, task.odds):
+        prob[lo:hi] = np.atleast_1d(predictor.predict_proba(X[lo:hi]))
+        n_days += 1
+
+    return SeasonBacktest(
+        season_id=task.season_id,
+        game_id=games["game_id"].to_numpy(),
+        game_date=games["game_date"].to_numpy(),
+        home_win=games["home_win"].to_numpy().astype(np.int64),
+        prob=prob,
+        elo_prob=X[:, ELO_PROB_COL].copy(),
+        market_prob=X[:, MARKET_PROB_COL].copy(),
+        n_days=n_days,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def run_backtest(tasks: Sequence[SeasonTask], workers: Optional[int] = None) -> List[SeasonBacktest]:
+    """
+    Backtest seasons, on a process pool when more than one worker is allowed.
+
+    Args:
+        tasks: Season tasks (see prepare_tasks)
+        workers: Worker processes (default: CPU count; 1 runs inline)
+
+    Returns:
+        SeasonBacktest per task, in task order
+    """
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        return [backtest_season(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(backtest_season, tasks))
+
+
+# =============================================================================
+# Metrics
+# =============================================================================
+
+def score(home_win: np.ndarray, prob: np.ndarray) -> dict:
+    """Log loss, Brier score and accuracy of home-win probabilities."""
+    y = np.asarray(home_win, dtype=np.int64)
+    p = np.clip(np.asarray(prob, dtype=np.float64), 1e-15, 1 - 1e-15)
+    if len(y) == 0:
+        return {"n": 0, "log_loss": float("nan"), "brier": float("nan"), "accuracy": float("nan")}
+    return {
+        "n": int(len(y)),
+        "log_loss": float(log_loss(y, p, labels=[0, 1])),
+        "brier": float(brier_score_loss(y, p)),
+        "accuracy": float(np.mean((p >= 0.5) == (y == 1))),
+    }
+
+
+def calibration_table(home_win: np.ndarray, prob: np.ndarray, bins: int = 10) -> pd.DataFrame:
+    """
+    Reliability table over equal-width probability bins.
+
+    Returns:
+        DataFrame with bin_lo, bin_hi, n, mean_pred, win_rate (empty bins omitted)
+    """
+    y = np.asarray(home_win, dtype=np.float64)
+    p = np.asarray(prob, dtype=np.float64)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    idx = np.clip(np.searchsorted(edges, p, side="right") - 1, 0, bins - 1)
+
+    n = np.bincount(idx, minlength=bins)
+    pred_sum = np.bincount(idx, weights=p, minlength=bins)
+    win_sum = np.bincount(idx, weights=y, minlength=bins)
+    keep = n > 0
+    return pd.DataFrame({
+        "bin_lo": edges[:-1][keep],
+        "bin_hi": edges[1:][keep],
+        "n": n[keep],
+        "mean_pred": pred_sum[keep] / n[keep],
+        "win_rate": win_sum[keep] / n[keep],
+    })
+
+
+def expected_calibration_error(home_win: np.ndarray, prob: np.ndarray, bins: int = 10) -> float:
+    """Game-weighted mean |win rate - mean prediction| over calibration bins."""
+    table = calibration_table(home_win, prob, bins)
+    if table.empty:
+        return float("nan")
+    gap = (table["win_rate"] - table["mean_pred"]).abs()
+    return float((gap * table["n"]).sum() / table["n"].sum())
+
+
+def predictions_frame(results: Sequence[SeasonBacktest]) -> pd.DataFrame:
+    """Per-game predictions of all backtested seasons as one DataFrame."""
+    return pd.concat([
+        pd.DataFrame({
+            "game_id": r.game_id,
+            "game_date": r.game_date,
+            "season_id": r.season_id,
+            "home_win": r.home_win,
+            "model_prob": r.prob,
+            "elo_prob": r.elo_prob,
+            "market_prob": r.market_prob,
+        })
+        for r in results
+    ], ignore_index=True)
+
+
+def summarize(results: Sequence[SeasonBacktest], bins: int = 10) -> pd.DataFrame:
+    """
+    Per-season and overall scores of the model and the Elo baseline.
+
+    Returns:
+        DataFrame with one row per season plus an "all" row
+    """
+    rows = []
+    groups = [(str(r.season_id), [r]) for r in results] + [("all", list(results))]
+    for label, group in groups:
+        y = np.concatenate([r.home_win for r in group])
+        p = np.concatenate([r.prob for r in group])
+        elo = np.concatenate([r.elo_prob for r in group])
+        model = score(y, p)
+        baseline = score(y, elo)
+        rows.append({
+            "season": label,
+            "games": model["n"],
+            "log_loss": model["log_loss"],
+            "brier": model["brier"],
+            "accuracy": model["accuracy"],
+            "ece": expected_calibration_error(y, p, bins),
+            "elo_log_loss": baseline["log_loss"],
+            "elo_brier": baseline["brier"],
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,219 @@
+"""
+Compiled probability calibrators.
+
+Every calibrator in this project maps one raw model probability to one
+calibrated probability, but evaluating the pickled sklearn estimator goes
+through input validation and estimator dispatch on every call. At load
+time the estimator is compiled into plain NumPy:
+
+  - PlattCalibrator: LogisticRegression on the raw probability, evaluated in
+    closed form as ``1 / (1 + exp(-(coef * p + intercept)))``.
+  - CalibratorTable: a monotone map stored as (x, y) knots and applied with
+    ``np.interp``. Isotonic regressions compile to their exact thresholds;
+    anything else is tabulated on an even grid.
+
+Compiled calibrators are checked against the estimator they came from
+(verify_calibrator) before they are used.
+"""
+
+from __future__ import annotations
+
+import warnings
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+
+DEFAULT_GRID_SIZE = 4097
+VERIFY_TOLERANCE = 1e-6
+
+
+class CalibratorTable:
+    """
+    1-D calibration map stored as (x, y) knots and applied with np.interp.
+
+    Inputs outside [x[0], x[-1]] are clamped to the end values, matching
+    sklearn's IsotonicRegression(out_of_bounds="clip").
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, kind: str = "grid"):
+        """
+        Initialize table.
+
+        Args:
+            x: Increasing raw-probability knots
+            y: Calibrated probability at each knot
+            kind: "isotonic" (exact thresholds) or "grid" (sampled)
+        """
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.kind = kind
+
+    @classmethod
+    def from_estimator(cls, calibrator: Any, grid_size: int = DEFAULT_GRID_SIZE) -> "CalibratorTable":
+        """
+        Tabulate any calibrator with ``predict_proba`` on an even grid over [0, 1].
+
+        Args:
+            calibrator: Fitted sklearn-style calibrator
+            grid_size: Number of knots
+        """
+        x = np.linspace(0.0, 1.0, grid_size)
+        y = calibrator.predict_proba(x.reshape(-1, 1))[:, 1]
+        return cls(x, y, kind="grid")
+
+    def calibrate(self, proba: np.ndarray) -> np.ndarray:
+        """Map raw probabilities to calibrated ones."""
+        return np.interp(proba, self.x, self.y)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """sklearn-compatible: (n, 1) raw probabilities -> (n, 2) class probabilities."""
+        p = self.calibrate(np.asarray(X, dtype=np.float64).reshape(-1))
+        return np.column_stack([1.0 - p, p])
+
+    def _arrays(self) -> dict:
+        return {"x": self.x, "y": self.y}
+
+    def __repr__(self) -> str:
+        return f"CalibratorTable({self.kind}, {len(self.x)} knots)"
+
+
+class PlattCalibrator:
+    """
+    Closed-form Platt scaling: sigmoid(coef * p + intercept).
+    """
+
+    kind = "platt"
+
+    def __init__(self, coef: float, intercept: float):
+        """
+        Initialize calibrator.
+
+        Args:
+            coef: Logistic slope on the raw probability
+            intercept: Logistic intercept
+        """
+        self.coef = float(coef)
+        self.intercept = float(intercept)
+
+    def calibrate(self, proba: np.ndarray) -> np.ndarray:
+        """Map raw probabilities to calibrated ones."""
+        return 1.0 / (1.0 + np.exp(-(self.coef * np.asarray(proba, dtype=np.float64) + self.intercept)))
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """sklearn-compatible: (n, 1) raw probabilities -> (n, 2) class probabilities."""
+        p = self.calibrate(np.asarray(X, dtype=np.float64).reshape(-1))
+        return np.column_stack([1.0 - p, p])
+
+    def _arrays(self) -> dict:
+        return {"coef": np.array(self.coef), "intercept": np.array(self.intercept)}
+
+    def __repr__(self) -> str:
+        return f"PlattCalibrator(coef={self.coef:.4f}, intercept={self.intercept:.4f})"
+
+
+# =============================================================================
+# Compilation
+# =============================================================================
+
+def compile_calibrator(estimator: Any, grid_size: int = DEFAULT_GRID_SIZE):
+    """
+    Compile a fitted sklearn calibrator into a NumPy-only equivalent.
+
+    Args:
+        estimator: LogisticRegression (Platt), IsotonicRegression, or any
+                   object with ``predict_proba`` on an (n, 1) array
+        grid_size: Knots used when falling back to a sampled table
+
+    Returns:
+        PlattCalibrator or CalibratorTable
+    """
+    if isinstance(estimator, (PlattCalibrator, CalibratorTable)):
+        return estimator
+
+    coef = getattr(estimator, "coef_", None)
+    intercept = getattr(estimator, "intercept_", None)
+    classes = getattr(estimator, "classes_", None)
+    if (coef is not None and intercept is not None and np.size(coef) == 1
+            and classes is not None and len(classes) == 2):
+        return PlattCalibrator(np.ravel(coef)[0], np.ravel(intercept)[0])
+
+    x_thresholds = getattr(estimator, "X_thresholds_", None)
+    y_thresholds = getattr(estimator, "y_thresholds_", None)
+    if (x_thresholds is not None and y_thresholds is not None
+            and getattr(estimator, "out_of_bounds", "clip") == "clip"):
+        return CalibratorTable(x_thresholds, y_thresholds, kind="isotonic")
+
+    return CalibratorTable.from_estimator(estimator, grid_size=grid_size)
+
+
+def _estimator_proba(estimator: Any, p: np.ndarray) -> np.ndarray:
+    if hasattr(estimator, "predict_proba"):
+        return estimator.predict_proba(p.reshape(-1, 1))[:, 1]
+    return estimator.predict(p)  # IsotonicRegression
+
+
+def verify_calibrator(
+    compiled: Any,
+    estimator: Any,
+    atol: float = VERIFY_TOLERANCE,
+    n_points: int = 2001,
+) -> float:
+    """
+    Check a compiled calibrator against its source estimator on [0, 1].
+
+    Args:
+        compiled: Result of compile_calibrator()
+        estimator: Original sklearn estimator
+        atol: Maximum allowed absolute difference
+        n_points: Evenly spaced probabilities to compare at
+
+    Returns:
+        Maximum absolute difference observed
+
+    Raises:
+        ValueError: If the difference exceeds atol
+    """
+    p = np.linspace(0.0, 1.0, n_points)
+    max_diff = float(np.max(np.abs(compiled.calibrate(p) - _estimator_proba(estimator, p))))
+    if max_diff > atol:
+        raise ValueError(f"compiled calibrator differs from estimator by {max_diff:.2e} (> {atol:.0e})")
+    return max_diff
+
+
+def compile_and_verify(estimator: Any, grid_size: int = DEFAULT_GRID_SIZE):
+    """
+    Compile a calibrator, falling back to the estimator itself if the
+    compiled form does not reproduce it within VERIFY_TOLERANCE.
+    """
+    compiled = compile_calibrator(estimator, grid_size=grid_size)
+    if compiled is estimator:
+        return compiled
+    try:
+        verify_calibrator(compiled, estimator)
+    except ValueError as e:
+        warnings.warn(f"Using sklearn calibrator as-is: {e}")
+        return estimator
+    return compiled
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+def save_calibrator(calibrator: Union[PlattCalibrator, CalibratorTable], path: Union[str, Path]) -> Path:
+    """Write a compiled calibrator as an .npz file (no pickling)."""
+    path = Path(path)
+    with open(path, "wb") as f:
+        np.savez(f, kind=np.array(calibrator.kind), **calibrator._arrays())
+    return path
+
+
+def load_calibrator(path: Union[str, Path]) -> Union[PlattCalibrator, CalibratorTable]:
+    """Load a calibrator written by save_calibrator()."""
+    with np.load(path, allow_pickle=False) as data:
+        kind = str(data["kind"])
+        if kind == "platt":
+            return PlattCalibrator(float(data["coef"]), float(data["intercept"]))
+        return CalibratorTable(data["x"], data["y"], kind=kind)
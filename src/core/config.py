@@ -122,6 +122,18 @@ INJURY_USE_STALE_CACHE = os.getenv(
 ).lower() in ("true", "1", "yes")
 
 
+# =============================================================================
+# Model Settings
+# =============================================================================
+
+# Which model file the API serves: "default" or "fast" (the smaller export
+# written by src/export_fast_model.py; falls back to default if missing)
+MODEL_VARIANT = os.getenv(
+    "MODEL_VARIANT",
+    "default"
+).lower()
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
@@ -147,6 +159,7 @@ def get_config_summary() -> dict:
         "debug_injury_calculations": DEBUG_INJURY_CALCULATIONS,
         "injury_fallback_on_error": INJURY_FALLBACK_ON_ERROR,
         "injury_use_stale_cache": INJURY_USE_STALE_CACHE,
+        "model_variant": MODEL_VARIANT,
     }
 
 
@@ -178,6 +191,9 @@ def print_config():
     print(f"  Fallback on Error: {config['injury_fallback_on_error']}")
     print(f"  Use Stale Cache: {config['injury_use_stale_cache']}")
 
+    print("\nModel Settings:")
+    print(f"  Variant: {config['model_variant']}")
+
 
 if __name__ == "__main__":
     print_config()
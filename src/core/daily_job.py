@@ -0,0 +1,551 @@
+"""
+In-process daily pipeline for every league.
+
+One DailyLeagueJob per league loads its state and model once, then runs
+
+  update   apply the completed games of every day since the last processed
+           one, through yesterday (journaled, idempotent)
+  persist  checkpoint the state, record training rows, extend the index
+  schedule refresh the stale days of the season schedule (schedule_store.py)
+  refresh  optional warm-start model refresh (see model_refresh.py)
+  predict  score today's slate in a single model call, remembering the
+           served market / injury features for tomorrow's training rows
+  publish  write the app-format predictions JSON
+
+Training rows, served features and a refreshed model all live in the
+league's state directory, so they are synced to GCS with the state.
+
+run_daily_job() runs the leagues concurrently on a thread pool. All HTTP
+clients share one pooled requests.Session, so ESPN / odds / injury calls
+reuse connections across leagues. Every stage is timed; the timings come
+back with each league's result.
+"""
+
+from __future__ import annotations
+
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from .elo_engine import EloParams
+from .espn_client import ESPNClient, GameResult
+from .feature_builder import FEATURE_COLS, FeatureBuilder
+from .game_processor import GameProcessor
+from .injury_client import InjuryClient
+from .league_config import LEAGUE_CONFIGS, LeagueConfig, season_id_for
+from .model_artifacts import serving_paths
+from .odds_client import OddsClient
+from .prediction_output import GamePrediction, PredictionOutput
+from .predictor import Predictor, confidence_tier
+from .schedule_store import SCHEDULE_FILE, ScheduleStore
+from .state_index import INDEX_FILE, StateIndex
+from .state_manager import StateManager
+from .team_mapper import TeamMapper
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+STAGES = ("load", "update", "persist", "schedule", "refresh", "predict", "publish")
+HTTP_POOL_SIZE = 16
+
+# Before per-league state directories the NBA job kept its state in the
+# state root (state/elo.json, gs://<bucket>/state/elo.json)
+ROOT_STATE_LEAGUE = "nba"
+
+DateLike = Union[str, date, datetime]
+OddsDict = Dict[Tuple[int, int], Tuple[Optional[float], Optional[float]]]
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def make_http_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """A requests.Session with a connection pool large enough to share."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/json",
+        "User-Agent": "NBA-Predictor/1.0",
+    })
+    return session
+
+
+def default_output_path(league: str, project_root: Path = PROJECT_ROOT) -> Path:
+    """NBA keeps predictions/daily.json; other leagues get their own file."""
+    name = "daily.json" if league == "nba" else f"{league}_daily.json"
+    return project_root / "predictions" / name
+
+
+# =============================================================================
+# Prediction
+# =============================================================================
+
+def predict_slate(
+    games: Sequence[GameResult],
+    predictor: Predictor,
+    feature_builder: FeatureBuilder,
+    odds_dict: Optional[OddsDict] = None,
+    schedule: Optional[ScheduleStore] = None,
+    served: Optional[List[Tuple[GameResult, np.ndarray]]] = None,
+) -> List[GamePrediction]:
+    """
+    Predict a slate of games with one model call.
+
+    Feature vectors are built once per game (with odds where available),
+    stacked, and scored together; games whose teams could not be mapped
+    are skipped.
+
+    Args:
+        games: Scheduled games
+        predictor: Loaded Predictor
+        feature_builder: FeatureBuilder over the current state
+        odds_dict: Optional (home_id, away_id) -> (ml_home, ml_away)
+        schedule: Optional ScheduleStore to project rest days from (for
+                  slates spanning several days)
+        served: Optional list to append (game, feature vector) to for every
+                predicted game
+
+    Returns:
+        List of GamePrediction, in slate order
+    """
+    games = [g for g in games if g.home_team_id is not None and g.away_team_id is not None]
+    if not games:
+        return []
+
+    X = feature_builder.build_matrix(games, odds_dict, schedule=schedule)
+    probs = np.atleast_1d(predictor.predict_proba(X))
+    if served is not None:
+        served.extend(zip(games, X))
+
+    predictions = []
+    for game, row, prob in zip(games, X, probs):
+        features = dict(zip(FEATURE_COLS, row))
+        prob_home = round(float(prob), 4)
+        predictions.append(GamePrediction(
+            game_date=game.game_date,
+            game_time=game.game_time,
+            home_team=game.home_team,
+            away_team=game.away_team,
+            home_team_id=game.home_team_id,
+            away_team_id=game.away_team_id,
+            prob_home_win=prob_home,
+            prob_away_win=round(1.0 - float(prob), 4),
+            confidence_tier=confidence_tier(float(prob)),
+            home_elo=features["elo_home"],
+            away_elo=features["elo_away"],
+            elo_diff=features["elo_diff"],
+            home_win_pct=features["win_roll_home"],
+            away_win_pct=features["win_roll_away"],
+            home_margin=features["margin_roll_home"],
+            away_margin=features["margin_roll_away"],
+            home_rest_days=int(features["home_rest_days"]),
+            away_rest_days=int(features["away_rest_days"]),
+            home_b2b=bool(features["home_b2b"]),
+            away_b2b=bool(features["away_b2b"]),
+        ))
+    return predictions
+
+
+# =============================================================================
+# Per-league job
+# =============================================================================
+
+@dataclass
+class LeagueRunResult:
+    """Outcome of one league's daily run."""
+    league: str
+    processed: int = 0
+    predictions: int = 0
+    output_path: Optional[Path] = None
+    refresh: Optional[object] = None          # model_refresh.RefreshResult
+    timings: Dict[str, float] = field(default_factory=dict)
+    notes: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+class DailyLeagueJob:
+    """
+    update -> persist -> schedule -> [refresh] -> predict -> publish for one league,
+    on state and a model that are loaded once.
+    """
+
+    def __init__(
+        self,
+        league: str,
+        config: Optional[LeagueConfig] = None,
+        session: Optional[requests.Session] = None,
+        project_root: Path = PROJECT_ROOT,
+        state_dir: Optional[Path] = None,
+        output_path: Optional[Path] = None,
+        use_odds: bool = True,
+        use_injuries: bool = True,
+        record_training_rows: bool = True,
+        espn_client: Optional[ESPNClient] = None,
+    ):
+        """
+        Args:
+            league: League key ("nba", "wnba", "cbb")
+            config: LeagueConfig. Default: LEAGUE_CONFIGS[league]
+            session: Shared HTTP session for the ESPN / odds / injury clients
+            project_root: Root the config paths are relative to
+            state_dir: State directory. Default: config.state_dir
+            output_path: Predictions JSON. Default: default_output_path()
+            use_odds: Fetch moneylines for the market features
+            use_injuries: Apply injury adjustments (if the league has data)
+            record_training_rows: Record processed games and served features
+                                  for the model refresh
+            espn_client: ESPN client to use instead of a new one (tests)
+        """
+        self.league = league
+        self.config = config or LEAGUE_CONFIGS[league]
+        self.project_root = Path(project_root)
+        self.session = session
+        self.state_dir = Path(state_dir) if state_dir else self.project_root / self.config.state_dir
+        self.output_path = Path(output_path) if output_path else default_output_path(league, self.project_root)
+        self.model_path = self.project_root / self.config.model_path
+        self.calibrator_path = self.project_root / self.config.calibrator_path
+        self.use_odds = use_odds and bool(self.config.odds_sport_key)
+        self.use_injuries = use_injuries and self.config.injury_source != "none"
+        self.record_training_rows = record_training_rows
+        self._espn_client = espn_client
+
+        self.result = LeagueRunResult(league)
+        self.state_manager: Optional[StateManager] = None
+        self.predictor: Optional[Predictor] = None
+        self._applied: List[GameResult] = []
+        self._training_rows: List[dict] = []
+        self._processed_through: Optional[date] = None
+
+    def _log(self, message: str) -> None:
+        self.result.notes.append(message)
+        print(f"[{self.league.upper()}] {message}", flush=True)
+
+    @contextmanager
+    def _stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.result.timings[name] = self.result.timings.get(name, 0.0) + time.perf_counter() - start
+
+    # -------------------------------------------------------------------------
+    # Stages
+    # -------------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Load clients, state and model. False if the league has no state."""
+        config = self.config
+        lookup = self.project_root / config.team_lookup_csv if config.team_lookup_csv else None
+        self.team_mapper = TeamMapper(lookup_path=lookup) if lookup and lookup.exists() else TeamMapper()
+        self.espn_client = self._espn_client or ESPNClient(
+            self.team_mapper, league_slug=config.espn_slug, session=self.session)
+
+        self.state_manager = StateManager(self.state_dir, elo_params=EloParams.from_config(config))
+        if self.league == ROOT_STATE_LEAGUE:
+            self.adopt_root_state()
+        if not self.state_manager.exists():
+            self._log(f"⚠ No state in {self.state_dir}; run bootstrap_state.py first")
+            return False
+        self.elo_tracker, self.stats_tracker = self.state_manager.load()
+
+        if self.model_path.exists():
+            self._load_predictor()
+        else:
+            self._log(f"⚠ Model not found at {self.model_path}; predictions disabled")
+        return True
+
+    def _load_predictor(self) -> None:
+        """The configured model, or the refreshed one in the state directory."""
+        model_path, calibrator_path = serving_paths(self.model_path, self.calibrator_path, self.state_dir)
+        self.predictor = Predictor(model_path, calibrator_path)
+
+    def adopt_root_state(self) -> bool:
+        """
+        One-time adoption of the state kept in the state root.
+
+        The root state is adopted when it has processed a later date than
+        the league directory and the directory has not adopted it before.
+
+        Returns:
+            True if the root state was adopted
+        """
+        sm = self.state_manager
+        if sm.get_metadata().get("adopted_from"):
+            return False
+        root = StateManager(self.state_dir.parent, elo_params=sm.elo_params)
+        root_last = root.get_last_processed_date() if root.exists() else None
+        if root_last is None:
+            return False
+        last = sm.get_last_processed_date() if sm.exists() else None
+        if last is not None and last >= root_last:
+            return False
+        sm.adopt(root, self.league)
+        self._log(f"Adopted the state in {root.state_dir} (processed through {root_last}, "
+                  f"was {last or 'empty'})")
+        return True
+
+    def update(self, through: DateLike) -> int:
+        """
+        Apply the completed games of every date after the last processed one,
+        through ``through``. Returns the number applied.
+
+        A run that failed or was skipped leaves the last processed date
+        behind, so the next run picks up every day it missed.
+        """
+        through = _as_date(through)
+        last_processed = self.state_manager.get_last_processed_date()
+        if last_processed and last_processed >= through:
+            self._log(f"{through} already processed (last: {last_processed})")
+            return 0
+        start = last_processed + timedelta(days=1) if last_processed else through
+        days = (through - start).days + 1
+
+        processor = GameProcessor(self.elo_tracker, self.stats_tracker, self.team_mapper,
+                                  journal=self.state_manager.journal)
+        pregame = FeatureBuilder(self.elo_tracker, self.stats_tracker)
+
+        from .model_refresh import live_row, load_served_features, served_key
+
+        served = load_served_features(self.state_dir) if self.record_training_rows else {}
+        completed = 0
+        for offset in range(days):
+            game_date = start + timedelta(days=offset)
+            games = [g for g in self.espn_client.get_games(game_date) if g.is_final]
+            completed += len(games)
+            for game in games:
+                if game.home_team_id is None or game.away_team_id is None:
+                    continue
+                # Features from the pre-game state, as the model would have seen them
+                features = pregame.build_features(game.home_team_id, game.away_team_id, game.game_date)
+                if processor.process_game(game):
+                    self._applied.append(game)
+                    key = served_key(game.game_date, game.home_team_id, game.away_team_id)
+                    self._training_rows.append(live_row(game, features, self.league, served.get(key)))
+            self._processed_through = game_date
+
+        span = f"{start}" if days == 1 else f"{start} through {through} ({days} days)"
+        self._log(f"Applied {len(self._applied)} of {completed} completed games from {span}")
+        return len(self._applied)
+
+    def persist(self) -> None:
+        """Checkpoint the updated state and its derived records."""
+        sm = self.state_manager
+        if not self._applied:
+            # Days without games still count as processed
+            if self._processed_through is not None:
+                sm.set_last_processed_date(self._processed_through)
+            return
+        if sm.checkpoint(self.elo_tracker, self.stats_tracker):
+            self._log(f"Wrote state generation {sm.generation}")
+        sm.set_last_processed_date(self._processed_through)
+        sm.increment_games_processed(len(self._applied))
+
+        from .model_refresh import append_live_games
+
+        if self.record_training_rows:
+            try:
+                append_live_games(self._training_rows, self.state_dir)
+            except Exception as e:
+                self._log(f"⚠ Could not record training rows: {e}")
+
+        index_path = sm.state_dir / INDEX_FILE
+        if index_path.exists():
+            try:
+                index = StateIndex.load(index_path)
+                seasons: Dict[int, List[GameResult]] = {}
+                for game in self._applied:
+                    seasons.setdefault(season_id_for(game.game_date, self.league), []).append(game)
+                for season_id, games in seasons.items():
+                    index = index.append_results(games, season_id)
+                index.save(index_path)
+            except Exception as e:
+                self._log(f"⚠ Could not extend the state index (rebuild with build_state_index.py): {e}")
+
+    def refresh_schedule(self, today: DateLike) -> int:
+        """Ingest / refresh the rest of the season's schedule. Returns ESPN requests made."""
+        schedule = ScheduleStore(self.state_dir / SCHEDULE_FILE, self.league)
+        requests_made = schedule.ingest(self.espn_client, _as_date(today))
+        if requests_made:
+            schedule.save()
+            self._log(f"Schedule: {len(schedule)} games ({requests_made} ESPN requests)")
+        return requests_made
+
+    def refresh(self, cache_dir: Path, **kwargs) -> None:
+        """Warm-start refresh; a promoted model replaces the loaded one."""
+        from .model_refresh import refresh_league, refresh_report
+
+        result = refresh_league(self.league, self.model_path, self.calibrator_path, cache_dir,
+                                self.state_dir, **kwargs)
+        self.result.refresh = result
+        self._log(refresh_report([result]))
+        if result.promoted:
+            self._load_predictor()
+
+    def predict(self, game_date: DateLike) -> List[GamePrediction]:
+        """Predict the date's scheduled games."""
+        if self.predictor is None:
+            return []
+        games = self.espn_client.get_scheduled_games(_as_date(game_date))
+        if not games:
+            self._log(f"No scheduled games on {_as_date(game_date)}")
+            return []
+
+        injury_client = None
+        if self.use_injuries:
+            injury_client = InjuryClient(self.team_mapper, league_slug=self.config.espn_slug,
+                                         session=self.session)
+        feature_builder = FeatureBuilder(self.elo_tracker, self.stats_tracker, injury_client=injury_client)
+
+        odds_dict: OddsDict = {}
+        if self.use_odds:
+            odds_client = OddsClient(team_mapper=self.team_mapper, sport_key=self.config.odds_sport_key,
+                                     session=self.session)
+            if odds_client.api_key:
+                odds_dict = odds_client.get_odds_dict()
+        if injury_client:
+            feature_builder.prefetch_all_injuries()
+
+        served: List[Tuple[GameResult, np.ndarray]] = []
+        predictions = predict_slate(games, self.predictor, feature_builder, odds_dict, served=served)
+        self._log(f"Predicted {len(predictions)} games ({len(odds_dict)} with odds)")
+
+        if self.record_training_rows:
+            from .model_refresh import record_served_features
+            try:
+                record_served_features(self.state_dir, served)
+            except Exception as e:
+                self._log(f"⚠ Could not record served features: {e}")
+        return predictions
+
+    def publish(self, predictions: List[GamePrediction]) -> Optional[Path]:
+        """Write the app-format JSON (nothing when the slate is empty)."""
+        if not predictions:
+            return None
+        PredictionOutput(predictions).save_json(self.output_path, app_format=True)
+        return self.output_path
+
+    # -------------------------------------------------------------------------
+
+    def run(
+        self,
+        update_date: DateLike,
+        predict_date: DateLike,
+        refresh: bool = False,
+        cache_dir: Optional[Path] = None,
+    ) -> LeagueRunResult:
+        """
+        Run every stage. Errors are caught and recorded so that one league
+        never stops the others; a failed refresh keeps the current model.
+        """
+        result = self.result
+        try:
+            with self._stage("load"):
+                if not self.load():
+                    return result
+            with self._stage("update"):
+                result.processed = self.update(update_date)
+            with self._stage("persist"):
+                self.persist()
+            with self._stage("schedule"):
+                try:
+                    self.refresh_schedule(predict_date)
+                except Exception as e:
+                    self._log(f"⚠ Schedule refresh failed ({e}); keeping the stored schedule")
+            if refresh:
+                with self._stage("refresh"):
+                    try:
+                        self.refresh(cache_dir or self.project_root / "data" / "cache" / "xgb")
+                    except Exception as e:
+                        self._log(f"⚠ Model refresh failed ({e}); keeping the current model")
+            with self._stage("predict"):
+                predictions = self.predict(predict_date)
+                result.predictions = len(predictions)
+            with self._stage("publish"):
+                result.output_path = self.publish(predictions)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            self._log(f"⚠ Failed: {result.error}")
+            traceback.print_exc()
+        return result
+
+
+# =============================================================================
+# All leagues
+# =============================================================================
+
+def run_daily_job(
+    update_date: DateLike,
+    predict_date: DateLike,
+    leagues: Iterable[str] = tuple(LEAGUE_CONFIGS),
+    refresh: bool = False,
+    project_root: Path = PROJECT_ROOT,
+    session: Optional[requests.Session] = None,
+    max_workers: Optional[int] = None,
+    **job_kwargs,
+) -> Dict[str, LeagueRunResult]:
+    """
+    Run the daily pipeline for several leagues concurrently.
+
+    Args:
+        update_date: Date whose completed games update the state
+        predict_date: Date to predict
+        leagues: League keys
+        refresh: Warm-start refresh each league's model after the update
+        project_root: Root the league config paths are relative to
+        session: Shared HTTP session. Default: make_http_session()
+        max_workers: Threads. Default: one per league
+        **job_kwargs: Passed on to every DailyLeagueJob
+
+    Returns:
+        Dict of league -> LeagueRunResult, in the order given
+    """
+    leagues = list(leagues)
+    session = session or make_http_session()
+    jobs = [DailyLeagueJob(league, session=session, project_root=project_root, **job_kwargs)
+            for league in leagues]
+
+    def run(job: DailyLeagueJob) -> LeagueRunResult:
+        return job.run(update_date, predict_date, refresh=refresh)
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(jobs)),
+                            thread_name_prefix="daily-job") as pool:
+        results = list(pool.map(run, jobs))
+    return dict(zip(leagues, results))
+
+
+def timing_report(results: Dict[str, LeagueRunResult]) -> str:
+    """Per-stage timing table, one row per league."""
+    stages = [s for s in STAGES if any(s in r.timings for r in results.values())]
+    header = f"{'league':<6} " + " ".join(f"{s:>8}" for s in stages) + f" {'total':>8}  games  preds  status"
+    lines = [header, "-" * len(header)]
+    for league, r in results.items():
+        cells = " ".join(
+            f"{r.timings[s]:>7.2f}s" if s in r.timings else f"{'-':>8}" for s in stages
+        )
+        status = "ok" if r.ok else "FAILED"
+        lines.append(f"{league:<6} {cells} {r.seconds:>7.2f}s  {r.processed:>5}  {r.predictions:>5}  {status}")
+    return "\n".join(lines)
@@ -0,0 +1,190 @@
+"""
+Elo engine: the rating math shared by training-data builds and live serving.
+
+build_elo.py / bootstrap_state.py replay the full game history to produce
+pre-game Elo features; EloTracker applies the same update one game at a
+time as results come in. Both call elo_update() and regress_rating() from
+this module with the same EloParams, so the features a model is trained on
+and the features it is served cannot drift apart.
+
+replay_elo() runs the history over NumPy arrays of team indices, outcomes
+and season boundaries in one pass (no DataFrame row access), which is what
+makes 350+ team CBB histories and parameter sweeps cheap.
+
+Elo formula:
+    P_home = 1 / (1 + 10^(-(E_home - E_away + HCA) / 400))
+    E_new  = E_old +/- K * (result - P_home)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class EloParams:
+    """Elo hyperparameters for one league."""
+    k_factor: float = 20.0
+    home_court_advantage: float = 70.0
+    season_carryover: float = 0.7       # share of rating kept across seasons
+    default_elo: float = 1500.0
+
+    @classmethod
+    def from_config(cls, config) -> "EloParams":
+        """Build params from a LeagueConfig."""
+        return cls(
+            k_factor=config.k_factor,
+            home_court_advantage=config.home_court_advantage,
+            season_carryover=config.season_carryover,
+            default_elo=config.default_elo,
+        )
+
+
+def expected_home_win(e_home: float, e_away: float, hca: float) -> float:
+    """Expected probability that the home team wins."""
+    return 1 / (1 + 10 ** (-(e_home - e_away + hca) / 400))
+
+
+def elo_update(
+    e_home: float,
+    e_away: float,
+    home_won: bool,
+    k: float,
+    hca: float,
+) -> tuple[float, float, float]:
+    """
+    Apply one game result.
+
+    Args:
+        e_home: Home team's pre-game rating
+        e_away: Away team's pre-game rating
+        home_won: True if home team won
+        k: K-factor
+        hca: Home-court advantage in Elo points
+
+    Returns:
+        Tuple of (new_home_elo, new_away_elo, pre-game home win probability)
+    """
+    p_home = expected_home_win(e_home, e_away, hca)
+    delta = k * ((1.0 if home_won else 0.0) - p_home)
+    return e_home + delta, e_away - delta, p_home
+
+
+def regress_rating(rating: float, carryover: float, mean: float) -> float:
+    """Season-start regression of one rating toward the mean."""
+    return carryover * rating + (1 - carryover) * mean
+
+
+@dataclass
+class EloReplay:
+    """Output of replay_elo(): per-game pre-game values plus final ratings."""
+    elo_home: np.ndarray      # pre-game home rating, one per game
+    elo_away: np.ndarray      # pre-game away rating
+    elo_prob: np.ndarray      # pre-game home win probability
+    ratings: np.ndarray       # final rating per team index
+
+
+def season_breaks(season_ids: np.ndarray) -> np.ndarray:
+    """Boolean mask marking the first game of every season after the first."""
+    season_ids = np.asarray(season_ids)
+    breaks = np.zeros(len(season_ids), dtype=bool)
+    breaks[1:] = season_ids[1:] != season_ids[:-1]
+    return breaks
+
+
+def replay_elo(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_win: np.ndarray,
+    season_break: np.ndarray,
+    n_teams: int,
+    params: EloParams = EloParams(),
+    initial_ratings: Optional[np.ndarray] = None,
+) -> EloReplay:
+    """
+    Replay a chronologically sorted game history.
+
+    Args:
+        home_idx: Home team index (0..n_teams-1) per game
+        away_idx: Away team index per game
+        home_win: 1/True where the home team won
+        season_break: True on a game that starts a new season; every team
+                      is regressed toward the mean before it is played
+        n_teams: Number of distinct teams
+        params: Elo hyperparameters
+        initial_ratings: Optional starting rating per team index
+
+    Returns:
+        EloReplay with pre-game ratings/probabilities and final ratings
+    """
+    n = len(home_idx)
+    if initial_ratings is None:
+        ratings = [float(params.default_elo)] * n_teams
+    else:
+        ratings = [float(r) for r in initial_ratings]
+
+    pre_home = [0.0] * n
+    pre_away = [0.0] * n
+    prob = [0.0] * n
+
+    k = params.k_factor
+    hca = params.home_court_advantage
+    carry = params.season_carryover
+    mean = params.default_elo
+    update = elo_update
+
+    # Python lists: per-element access is far cheaper than on ndarrays.
+    homes = np.asarray(home_idx).tolist()
+    aways = np.asarray(away_idx).tolist()
+    wins = np.asarray(home_win, dtype=bool).tolist()
+    break_positions = set(np.flatnonzero(season_break).tolist())
+
+    for i in range(n):
+        if i in break_positions:
+            ratings = [regress_rating(r, carry, mean) for r in ratings]
+        h = homes[i]
+        a = aways[i]
+        e_home = ratings[h]
+        e_away = ratings[a]
+        ratings[h], ratings[a], p = update(e_home, e_away, wins[i], k, hca)
+        pre_home[i] = e_home
+        pre_away[i] = e_away
+        prob[i] = p
+
+    return EloReplay(
+        elo_home=np.asarray(pre_home, dtype=np.float64),
+        elo_away=np.asarray(pre_away, dtype=np.float64),
+        elo_prob=np.asarray(prob, dtype=np.float64),
+        ratings=np.asarray(ratings, dtype=np.float64),
+    )
+
+
+def replay_games(games, params: EloParams = EloParams()) -> tuple[EloReplay, np.ndarray]:
+    """
+    Replay a games DataFrame (team_id_home, team_id_away, home_win, season_id),
+    already sorted chronologically.
+
+    Args:
+        games: Game history, one row per game
+        params: Elo hyperparameters
+
+    Returns:
+        Tuple of (EloReplay aligned with the rows of ``games``, team ids where
+        ``team_ids[i]`` is the team whose final rating is ``ratings[i]``)
+    """
+    home = games["team_id_home"].to_numpy()
+    away = games["team_id_away"].to_numpy()
+    team_ids, idx = np.unique(np.concatenate([home, away]), return_inverse=True)
+    n = len(home)
+    replay = replay_elo(
+        idx[:n],
+        idx[n:],
+        games["home_win"].to_numpy(dtype=bool),
+        season_breaks(games["season_id"].to_numpy()),
+        len(team_ids),
+        params=params,
+    )
+    return replay, team_ids
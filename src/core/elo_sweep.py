@@ -0,0 +1,389 @@
+"""
+Elo hyperparameter sweep.
+
+Scores (K, HCA, season carry-over) settings by how well the pre-game Elo
+win probability predicts each game: log loss and Brier score over every
+game after a burn-in period (the first season starts all teams at the
+default rating, so it says little about the parameters).
+
+Each league's history is loaded once, packed into a SharedMemory block,
+and attached read-only by the pool workers; a task only ships an
+EloParams over the pipe. Scores are cached on disk per league, keyed by a
+hash of the game arrays plus the parameters, so re-running a sweep only
+evaluates settings that have not been scored on the same data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .elo_engine import EloParams, replay_elo, season_breaks
+
+
+DEFAULT_K_VALUES = (10.0, 15.0, 20.0, 25.0, 30.0, 40.0)
+DEFAULT_HCA_VALUES = (40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0)
+DEFAULT_CARRYOVER_VALUES = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+# Clip probabilities before taking logs
+_EPS = 1e-15
+
+
+@dataclass
+class EloHistory:
+    """A league's game history as the arrays replay_elo() consumes."""
+    home_idx: np.ndarray        # int32 team index
+    away_idx: np.ndarray        # int32 team index
+    home_win: np.ndarray        # bool
+    season_break: np.ndarray    # bool, True on the first game of a new season
+    n_teams: int
+
+    @classmethod
+    def from_games(cls, games) -> "EloHistory":
+        """
+        Build from a games DataFrame (game_date, team_id_home, team_id_away,
+        home_win, season_id). Rows are sorted chronologically the same way
+        build_elo.py sorts them.
+        """
+        games = games.sort_values("game_date").reset_index(drop=True)
+        home = games["team_id_home"].to_numpy()
+        away = games["team_id_away"].to_numpy()
+        team_ids, idx = np.unique(np.concatenate([home, away]), return_inverse=True)
+        n = len(home)
+        return cls(
+            home_idx=idx[:n].astype(np.int32),
+            away_idx=idx[n:].astype(np.int32),
+            home_win=games["home_win"].to_numpy(dtype=bool),
+            season_break=season_breaks(games["season_id"].to_numpy()),
+            n_teams=len(team_ids),
+        )
+
+    @property
+    def n_games(self) -> int:
+        return len(self.home_idx)
+
+    def data_hash(self) -> str:
+        """Content hash of the game arrays (the cache key's data part)."""
+        h = hashlib.sha256()
+        h.update(str(self.n_teams).encode())
+        for arr in self._parts():
+            h.update(arr.tobytes())
+        return h.hexdigest()
+
+    def _parts(self) -> Tuple[np.ndarray, ...]:
+        return (
+            self.home_idx.astype(np.int32),
+            self.away_idx.astype(np.int32),
+            self.home_win.astype(np.bool_),
+            self.season_break.astype(np.bool_),
+        )
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """Score of one parameter setting on one league."""
+    params: EloParams
+    log_loss: float
+    brier: float
+    n_games: int            # games scored (after burn-in)
+
+
+# =============================================================================
+# Parameter sets
+# =============================================================================
+
+def grid_params(
+    k_values: Iterable[float] = DEFAULT_K_VALUES,
+    hca_values: Iterable[float] = DEFAULT_HCA_VALUES,
+    carryover_values: Iterable[float] = DEFAULT_CARRYOVER_VALUES,
+    default_elo: float = 1500.0,
+) -> List[EloParams]:
+    """Every combination of the given K, HCA and carry-over values."""
+    return [
+        EloParams(k_factor=float(k), home_court_advantage=float(hca),
+                  season_carryover=float(carry), default_elo=default_elo)
+        for k, hca, carry in itertools.product(k_values, hca_values, carryover_values)
+    ]
+
+
+def random_params(
+    n: int,
+    k_range: Tuple[float, float] = (5.0, 50.0),
+    hca_range: Tuple[float, float] = (0.0, 150.0),
+    carryover_range: Tuple[float, float] = (0.3, 1.0),
+    default_elo: float = 1500.0,
+    seed: int = 0,
+) -> List[EloParams]:
+    """
+    n settings drawn uniformly from the given ranges.
+
+    Values are rounded (K and HCA to 0.1, carry-over to 0.001) so that
+    repeated sweeps can hit the disk cache.
+    """
+    rng = np.random.default_rng(seed)
+    k = np.round(rng.uniform(*k_range, n), 1)
+    hca = np.round(rng.uniform(*hca_range, n), 1)
+    carry = np.round(rng.uniform(*carryover_range, n), 3)
+    return [
+        EloParams(k_factor=float(k[i]), home_court_advantage=float(hca[i]),
+                  season_carryover=float(carry[i]), default_elo=default_elo)
+        for i in range(n)
+    ]
+
+
+# =============================================================================
+# Scoring
+# =============================================================================
+
+def scored_mask(season_break: np.ndarray, burn_in_seasons: int = 1) -> np.ndarray:
+    """Games to score: everything after the first ``burn_in_seasons`` seasons."""
+    season_number = np.cumsum(season_break)
+    return season_number >= burn_in_seasons
+
+
+def score_params(
+    history: EloHistory,
+    params: EloParams,
+    burn_in_seasons: int = 1,
+) -> SweepResult:
+    """
+    Replay a history with one parameter setting and score its predictions.
+
+    Args:
+        history: League game history
+        params: Elo hyperparameters to evaluate
+        burn_in_seasons: Leading seasons excluded from scoring
+
+    Returns:
+        SweepResult with log loss and Brier score
+    """
+    replay = replay_elo(
+        history.home_idx,
+        history.away_idx,
+        history.home_win,
+        history.season_break,
+        history.n_teams,
+        params=params,
+    )
+    mask = scored_mask(history.season_break, burn_in_seasons)
+    p = replay.elo_prob[mask]
+    y = history.home_win[mask].astype(np.float64)
+    if len(p) == 0:
+        return SweepResult(params, float("nan"), float("nan"), 0)
+
+    clipped = np.clip(p, _EPS, 1 - _EPS)
+    log_loss = -np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped))
+    brier = np.mean((p - y) ** 2)
+    return SweepResult(params, float(log_loss), float(brier), int(len(p)))
+
+
+# =============================================================================
+# Shared memory
+# =============================================================================
+
+def _share_history(history: EloHistory) -> Tuple[shared_memory.SharedMemory, dict]:
+    """Copy a history into one SharedMemory block; returns (block, spec)."""
+    parts = history._parts()
+    size = sum(arr.nbytes for arr in parts)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    offset = 0
+    for arr in parts:
+        shm.buf[offset:offset + arr.nbytes] = arr.tobytes()
+        offset += arr.nbytes
+    spec = {"name": shm.name, "n_games": history.n_games, "n_teams": history.n_teams}
+    return shm, spec
+
+
+def _attach_history(spec: dict) -> Tuple[shared_memory.SharedMemory, EloHistory]:
+    """View a shared history without copying it."""
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    n = spec["n_games"]
+    offset = 0
+    views = []
+    for dtype in (np.int32, np.int32, np.bool_, np.bool_):
+        arr = np.ndarray((n,), dtype=dtype, buffer=shm.buf, offset=offset)
+        arr.flags.writeable = False
+        views.append(arr)
+        offset += arr.nbytes
+    return shm, EloHistory(*views, n_teams=spec["n_teams"])
+
+
+# Per-worker state, set by _init_worker
+_worker_blocks: Dict[str, shared_memory.SharedMemory] = {}
+_worker_histories: Dict[str, EloHistory] = {}
+
+
+def _init_worker(specs: Dict[str, dict]) -> None:
+    for league, spec in specs.items():
+        shm, history = _attach_history(spec)
+        _worker_blocks[league] = shm
+        _worker_histories[league] = history
+
+
+def _score_task(task: Tuple[str, EloParams, int]) -> Tuple[str, SweepResult]:
+    league, params, burn_in_seasons = task
+    return league, score_params(_worker_histories[league], params, burn_in_seasons)
+
+
+# =============================================================================
+# Disk cache
+# =============================================================================
+
+class SweepCache:
+    """
+    Sweep scores on disk: one JSON file per (league, data hash), mapping a
+    parameter key to its scores.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def param_key(params: EloParams, burn_in_seasons: int) -> str:
+        return (f"k={params.k_factor!r}|hca={params.home_court_advantage!r}"
+                f"|carry={params.season_carryover!r}|elo0={params.default_elo!r}"
+                f"|burn_in={burn_in_seasons}")
+
+    def _path(self, league: str, data_hash: str) -> Path:
+        return self.cache_dir / f"{league}_{data_hash[:16]}.json"
+
+    def load(self, league: str, data_hash: str) -> dict:
+        path = self._path(league, data_hash)
+        if not path.exists():
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, league: str, data_hash: str, entries: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(league, data_hash)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+
+# =============================================================================
+# Sweep
+# =============================================================================
+
+def run_sweep(
+    histories: Dict[str, EloHistory],
+    param_sets: Dict[str, Sequence[EloParams]],
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    burn_in_seasons: int = 1,
+) -> Dict[str, List[SweepResult]]:
+    """
+    Score every parameter setting on every league.
+
+    Args:
+        histories: League name -> game history
+        param_sets: League name -> settings to evaluate
+        workers: Process pool size (default: CPU count). 1 runs in-process.
+        cache_dir: Directory for cached scores (None disables caching)
+        burn_in_seasons: Leading seasons excluded from scoring
+
+    Returns:
+        League name -> results ranked by log loss (best first)
+    """
+    cache = SweepCache(cache_dir) if cache_dir is not None else None
+    results: Dict[str, List[SweepResult]] = {league: [] for league in histories}
+    cached_entries: Dict[str, dict] = {}
+    hashes: Dict[str, str] = {}
+    tasks: List[Tuple[str, EloParams, int]] = []
+
+    for league, history in histories.items():
+        entries = {}
+        if cache is not None:
+            hashes[league] = history.data_hash()
+            entries = cache.load(league, hashes[league])
+        cached_entries[league] = entries
+        for params in dict.fromkeys(param_sets.get(league, ())):
+            hit = entries.get(SweepCache.param_key(params, burn_in_seasons))
+            if hit is not None:
+                results[league].append(SweepResult(params, hit["log_loss"], hit["brier"], hit["n_games"]))
+            else:
+                tasks.append((league, params, burn_in_seasons))
+
+    workers = workers or os.cpu_count() or 1
+    if tasks and workers == 1:
+        for league, params, burn_in in tasks:
+            results[league].append(score_params(histories[league], params, burn_in))
+    elif tasks:
+        blocks = []
+        try:
+            specs = {}
+            for league in {task[0] for task in tasks}:
+                shm, specs[league] = _share_history(histories[league])
+                blocks.append(shm)
+            chunksize = max(1, len(tasks) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(specs,)) as pool:
+                for league, result in pool.map(_score_task, tasks, chunksize=chunksize):
+                    results[league].append(result)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    if cache is not None and tasks:
+        for league in {task[0] for task in tasks}:
+            entries = cached_entries[league]
+            for result in results[league]:
+                entries[SweepCache.param_key(result.params, burn_in_seasons)] = {
+                    "log_loss": result.log_loss,
+                    "brier": result.brier,
+                    "n_games": result.n_games,
+                }
+            cache.save(league, hashes[league], entries)
+
+    for league in results:
+        results[league].sort(key=lambda r: (np.nan_to_num(r.log_loss, nan=np.inf), r.brier))
+    return results
+
+
+def format_table(
+    results: Sequence[SweepResult],
+    top: int = 10,
+    current: Optional[EloParams] = None,
+) -> str:
+    """
+    Ranked text table of sweep results.
+
+    Args:
+        results: Ranked results for one league
+        top: Rows to show
+        current: Configured params; marked with '*' and always shown
+    """
+    lines = [f"{'rank':>4}  {'K':>6}  {'HCA':>6}  {'carry':>6}  {'log_loss':>9}  {'brier':>8}"]
+    for rank, r in enumerate(results, 1):
+        is_current = current is not None and r.params == current
+        if rank > top and not is_current:
+            continue
+        p = r.params
+        marker = "*" if is_current else " "
+        lines.append(f"{rank:>4}{marker} {p.k_factor:>6.1f}  {p.home_court_advantage:>6.1f}  "
+                     f"{p.season_carryover:>6.3f}  {r.log_loss:>9.5f}  {r.brier:>8.5f}")
+    return "\n".join(lines)
+
+
+def results_to_rows(league: str, results: Sequence[SweepResult]) -> List[dict]:
+    """Flatten results for CSV/DataFrame output."""
+    return [
+        {"league": league, "rank": rank, **asdict(r.params),
+         "log_loss": r.log_loss, "brier": r.brier, "n_games": r.n_games}
+        for rank, r in enumerate(results, 1)
+    ]
@@ -6,6 +6,9 @@ import json
 from pathlib import Path
 from typing import Optional
 
+from .atomic_io import write_json_atomic
+from .elo_engine import EloParams, elo_update, expected_home_win, regress_rating
+
 
 class EloTracker:
     """
@@ -18,20 +21,33 @@ class EloTracker:
         E_new = E_old + K * (result - expected)
     """
 
-    # Constants from build_elo.py
+    # NBA defaults (used when no league params are given)
     DEFAULT_ELO = 1500
     K_FACTOR = 20
     HOME_COURT_ADVANTAGE = 70
     SEASON_CARRYOVER = 0.7  # 70% carry-over, 30% regression to mean
 
-    def __init__(self, initial_ratings: Optional[dict[int, float]] = None):
+    def __init__(
+        self,
+        initial_ratings: Optional[dict[int, float]] = None,
+        params: Optional[EloParams] = None,
+    ):
         """
         Initialize EloTracker with optional starting ratings.
 
         Args:
             initial_ratings: Dict mapping team_id -> Elo rating.
                              If None, all teams start at DEFAULT_ELO.
-        """
+            params: League Elo parameters (EloParams.from_config). Must match
+                    the params the training features were built with.
+                    If None, the NBA class constants are used.
+        """
+        self.params = params or EloParams(
+            k_factor=self.K_FACTOR,
+            home_court_advantage=self.HOME_COURT_ADVANTAGE,
+            season_carryover=self.SEASON_CARRYOVER,
+            default_elo=self.DEFAULT_ELO,
+        )
         self._ratings: dict[int, float] = {}
         if initial_ratings:
             self._ratings = {int(k): float(v) for k, v in initial_ratings.items()}
@@ -46,7 +62,7 @@ class EloTracker:
         Returns:
             Current Elo rating (defaults to 1500 if team not tracked)
         """
-        return self._ratings.get(team_id, self.DEFAULT_ELO)
+        return self._ratings.get(team_id, self.params.default_elo)
 
     def set_elo(self, team_id: int, rating: float) -> None:
         """
@@ -69,12 +85,11 @@ class EloTracker:
         Returns:
             Probability of home win (0.0 to 1.0)
         """
-        e_home = self.get_elo(home_id)
-        e_away = self.get_elo(away_id)
-
-        # P_home = 1 / (1 + 10^((E_away - E_home - HCA) / 400))
-        exponent = -(e_home - e_away + self.HOME_COURT_ADVANTAGE) / 400
-        return 1 / (1 + 10 ** exponent)
+        return expected_home_win(
+            self.get_elo(home_id),
+            self.get_elo(away_id),
+            self.params.home_court_advantage,
+        )
 
     def update(self, home_id: int, away_id: int, home_won: bool) -> tuple[float, float]:
         """
@@ -88,15 +103,14 @@ class EloTracker:
         Returns:
             Tuple of (new_home_elo, new_away_elo)
         """
-        e_home = self.get_elo(home_id)
-        e_away = self.get_elo(away_id)
-        p_home = self.get_matchup_prob(home_id, away_id)
-
-        result = 1.0 if home_won else 0.0
-
-        # Update ratings
-        e_home_new = e_home + self.K_FACTOR * (result - p_home)
-        e_away_new = e_away - self.K_FACTOR * (result - p_home)
+        # Same update replay_elo() uses when building training features
+        e_home_new, e_away_new, _ = elo_update(
+            self.get_elo(home_id),
+            self.get_elo(away_id),
+            home_won,
+            self.params.k_factor,
+            self.params.home_court_advantage,
+        )
 
         self._ratings[home_id] = e_home_new
         self._ratings[away_id] = e_away_new
@@ -108,13 +122,15 @@ class EloTracker:
         Apply season-start regression toward mean.
         
         Should be called at the start of each new season.
-        Regresses all teams: 70% current + 30% mean (1500).
+        Regresses all teams toward the mean by the league's carry-over
+        (NBA: 70% current + 30% mean).
         """
         for team_id in list(self._ratings.keys()):
-            current = self._ratings[team_id]
-            regressed = (self.SEASON_CARRYOVER * current + 
-                        (1 - self.SEASON_CARRYOVER) * self.DEFAULT_ELO)
-            self._ratings[team_id] = regressed
+            self._ratings[team_id] = regress_rating(
+                self._ratings[team_id],
+                self.params.season_carryover,
+                self.params.default_elo,
+            )
 
     def to_dict(self) -> dict[int, float]:
         """
@@ -126,21 +142,22 @@ class EloTracker:
         return dict(self._ratings)
 
     @classmethod
-    def from_dict(cls, data: dict) -> "EloTracker":
+    def from_dict(cls, data: dict, params: Optional[EloParams] = None) -> "EloTracker":
         """
         Create EloTracker from dictionary.
 
         Args:
             data: Dict mapping team_id -> Elo rating
+            params: Optional league Elo parameters
 
         Returns:
             New EloTracker instance
         """
-        return cls(initial_ratings=data)
+        return cls(initial_ratings=data, params=params)
 
     def save(self, path: Path) -> None:
         """
-        Save ratings to JSON file.
+        Save ratings to JSON file (atomically: temp file, fsync, rename).
 
         Args:
             path: Output file path
@@ -148,16 +165,16 @@ class EloTracker:
         path.parent.mkdir(parents=True, exist_ok=True)
         # Convert int keys to strings for JSON compatibility
         data = {str(k): v for k, v in self._ratings.items()}
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        write_json_atomic(path, data, indent=2)
 
     @classmethod
-    def from_file(cls, path: Path) -> "EloTracker":
+    def from_file(cls, path: Path, params: Optional[EloParams] = None) -> "EloTracker":
         """
         Load ratings from JSON file.
 
         Args:
             path: Input file path
+            params: Optional league Elo parameters
 
         Returns:
             New EloTracker instance
@@ -166,7 +183,7 @@ class EloTracker:
             data = json.load(f)
         # Convert string keys back to int
         ratings = {int(k): v for k, v in data.items()}
-        return cls(initial_ratings=ratings)
+        return cls(initial_ratings=ratings, params=params)
 
     def get_all_ratings(self) -> dict[int, float]:
         """Return all current ratings."""
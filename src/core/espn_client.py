@@ -7,9 +7,14 @@ from datetime import datetime, date
 from typing import Optional, List
 import requests
 
+from .scoreboard_archive import ScoreboardArchive, date_key, default_archive
 from .team_mapper import TeamMapper
 
 
+# ESPN event["season"]["type"]
+PRESEASON, REGULAR_SEASON, POSTSEASON = 1, 2, 3
+
+
 @dataclass
 class GameResult:
     """Represents a game result from ESPN."""
@@ -23,6 +28,8 @@ class GameResult:
     away_team_id: Optional[int] = None  # NBA team ID
     game_time: Optional[str] = None     # HH:MM format (local time)
     game_datetime: Optional[datetime] = None  # Full datetime
+    event_id: Optional[str] = None      # ESPN event id
+    season_type: Optional[int] = None   # PRESEASON / REGULAR_SEASON / POSTSEASON (None: unknown)
 
     @property
     def is_final(self) -> bool:
@@ -40,6 +47,11 @@ class GameResult:
         status_lower = self.status.lower()
         return "progress" in status_lower or "halftime" in status_lower
 
+    @property
+    def is_regular_season(self) -> bool:
+        """Whether the game counts towards the standings (unknown type counts)."""
+        return self.season_type in (None, REGULAR_SEASON)
+
     @property
     def home_won(self) -> bool:
         """Check if home team won."""
@@ -61,17 +73,28 @@ class ESPNClient:
     BASE_TEMPLATE = "https://site.api.espn.com/apis/site/v2/sports/basketball/{slug}/{endpoint}"
     TIMEOUT = 10  # seconds
 
-    def __init__(self, team_mapper: Optional[TeamMapper] = None, league_slug: str = "nba"):
+    def __init__(
+        self,
+        team_mapper: Optional[TeamMapper] = None,
+        league_slug: str = "nba",
+        session: Optional[requests.Session] = None,
+        archive: Optional[ScoreboardArchive] = None,
+    ):
         """
         Initialize ESPN client.
 
         Args:
             team_mapper: TeamMapper for converting ESPN names to NBA IDs.
                         If None, a new one will be created.
+            session: HTTP session to share with other clients.
+                        If None, a new one will be created.
+            archive: Scoreboard archive to read through. If None, the
+                        shared default_archive() is used.
         """
         self.team_mapper = team_mapper or TeamMapper()
         self.league_slug = league_slug
-        self._session = requests.Session()
+        self.archive = archive or default_archive()
+        self._session = session or requests.Session()
         self._session.headers.update({
             "Accept": "application/json",
             "User-Agent": "NBA-Predictor/1.0",
@@ -84,6 +107,10 @@ class ESPNClient:
         """
         Fetch raw scoreboard data from ESPN.
 
+        Dated scoreboards are read through the scoreboard archive: settled
+        past days never hit ESPN again, live days are re-fetched after the
+        archive's TTL.
+
         Args:
             game_date: Date to fetch (YYYY-MM-DD or date object).
                       If None, fetches today's scoreboard.
@@ -91,15 +118,16 @@ class ESPNClient:
         Returns:
             Raw JSON response from ESPN API
         """
-        params = {}
-        if game_date:
-            if isinstance(game_date, date):
-                game_date = game_date.strftime("%Y%m%d")
-            else:
-                # Convert YYYY-MM-DD to YYYYMMDD
-                game_date = game_date.replace("-", "")
-            params["dates"] = game_date
+        if game_date is None:
+            # ESPN picks "today"; there is no date to archive it under
+            return self._fetch_scoreboard({})
 
+        params = {"dates": date_key(game_date)}
+        if self.archive is None:
+            return self._fetch_scoreboard(params)
+        return self.archive.get(self.league_slug, params["dates"], lambda: self._fetch_scoreboard(params))
+
+    def _fetch_scoreboard(self, params: dict) -> dict:
         response = self._session.get(
             self._url("scoreboard"),
             params=params,
@@ -135,6 +163,31 @@ class ESPNClient:
 
         return results
 
+    def get_games_range(self, start: str | date, end: str | date, limit: int = 1000) -> List[GameResult]:
+        """
+        Fetch all games from start through end in one request.
+
+        Range responses are not archived (the archive is keyed by day).
+
+        Args:
+            start: First date (YYYY-MM-DD or date object)
+            end: Last date (YYYY-MM-DD or date object)
+            limit: Maximum number of events ESPN returns
+
+        Returns:
+            List of GameResult objects
+        """
+        data = self._fetch_scoreboard({"dates": f"{date_key(start)}-{date_key(end)}", "limit": limit})
+        results = []
+        for event in data.get("events", []):
+            try:
+                result = self._parse_event(event)
+                if result:
+                    results.append(result)
+            except Exception as e:
+                print(f"Warning: Failed to parse game: {e}")
+        return results
+
     def get_completed_games(self, game_date: Optional[str | date] = None) -> List[GameResult]:
         """
         Fetch only completed games for a date.
@@ -214,6 +267,12 @@ class ESPNClient:
         # Extract status
         status = event.get("status", {}).get("type", {}).get("description", "Unknown")
 
+        # Preseason / regular season / postseason
+        try:
+            season_type = int(event.get("season", {}).get("type"))
+        except (TypeError, ValueError):
+            season_type = None
+
         # Extract team info
         home_team = ""
         away_team = ""
@@ -252,6 +311,8 @@ class ESPNClient:
             away_team_id=away_team_id,
             game_time=game_time,
             game_datetime=game_datetime,
+            event_id=str(event["id"]) if event.get("id") else None,
+            season_type=season_type,
         )
 
     def __repr__(self) -> str:
@@ -3,13 +3,17 @@ FeatureBuilder: Constructs feature vectors for model prediction.
 """
 
 from datetime import datetime, date
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
 from .elo_tracker import EloTracker
 from .stats_tracker import StatsTracker
 
+if TYPE_CHECKING:
+    from .espn_client import GameResult
+    from .schedule_store import ScheduleStore
+
 # Import injury-related components (optional dependencies)
 try:
     from .injury_client import InjuryClient, calculate_injury_adjustment
@@ -139,7 +143,9 @@ class FeatureBuilder:
         away_id: int,
         game_date: Union[str, date, datetime],
         ml_home: Optional[float] = None,
-        ml_away: Optional[float] = None
+        ml_away: Optional[float] = None,
+        home_rest: Optional[Tuple[int, bool]] = None,
+        away_rest: Optional[Tuple[int, bool]] = None,
     ) -> np.ndarray:
         """
         Build feature vector for a matchup.
@@ -150,6 +156,9 @@ class FeatureBuilder:
             game_date: Date of the game
             ml_home: Home team moneyline odds (optional)
             ml_away: Away team moneyline odds (optional)
+            home_rest: (rest_days, is_b2b) of the home team, e.g. projected
+                       from the schedule. Default: from the stats tracker
+            away_rest: Same for the away team
 
         Returns:
             numpy array of shape (31,) with features in FEATURE_COLS order
@@ -206,8 +215,8 @@ class FeatureBuilder:
         margin_roll_diff = margin_roll_home - margin_roll_away
 
         # Rest features
-        home_rest_days, home_b2b = self.stats_tracker.get_rest_days(home_id, game_date)
-        away_rest_days, away_b2b = self.stats_tracker.get_rest_days(away_id, game_date)
+        home_rest_days, home_b2b = home_rest or self.stats_tracker.get_rest_days(home_id, game_date)
+        away_rest_days, away_b2b = away_rest or self.stats_tracker.get_rest_days(away_id, game_date)
         rest_diff = home_rest_days - away_rest_days
 
         # Market probability features
@@ -345,6 +354,39 @@ class FeatureBuilder:
         """
         return self._get_injury_features(team_id)[0]
 
+    def build_matrix(
+        self,
+        games: Sequence["GameResult"],
+        odds_dict: Optional[dict] = None,
+        schedule: Optional["ScheduleStore"] = None,
+    ) -> np.ndarray:
+        """
+        Build the feature matrix of a slate, for one batched model call.
+
+        Args:
+            games: Games with home_team_id, away_team_id and game_date set
+            odds_dict: Optional (home_id, away_id) -> (ml_home, ml_away)
+            schedule: Optional ScheduleStore; rest days and back-to-backs are
+                      then projected from the schedule (games not yet played
+                      before a future date count)
+
+        Returns:
+            numpy array of shape (len(games), 31)
+        """
+        odds_dict = odds_dict or {}
+        rows = []
+        for g in games:
+            home_rest = away_rest = None
+            if schedule is not None:
+                home_rest = schedule.rest_days(self.stats_tracker, g.home_team_id, g.game_date)
+                away_rest = schedule.rest_days(self.stats_tracker, g.away_team_id, g.game_date)
+            rows.append(self.build_features(
+                g.home_team_id, g.away_team_id, g.game_date,
+                *odds_dict.get((g.home_team_id, g.away_team_id), (None, None)),
+                home_rest=home_rest, away_rest=away_rest,
+            ))
+        return np.vstack(rows) if rows else np.empty((0, len(FEATURE_COLS)))
+
     def build_features_dict(
         self,
         home_id: int,
@@ -0,0 +1,262 @@
+"""
+Vectorized training-feature pipeline.
+
+Builds every column of FEATURE_COLS for a league's game history in one
+pass over NumPy arrays:
+
+  - Each game is split into a home and an away team-game row, and the rows
+    are ordered by (team_id, game_date, game_id) with a single lexsort.
+  - Rolling means over a team's previous N games ("shift(1).rolling(N)")
+    come from cumulative sums: sum of the window = prefix[i] - prefix[start],
+    where start is clipped to the team's first row. Rest days come from the
+    previous row of the same team.
+  - Results are scattered straight back to game rows by position, so no
+    groupby-apply or merge is needed.
+
+Points and wins are integers, so the prefix sums are exact in float64 and
+the output is bit-for-bit what the old pandas groupby/rolling code
+(features_with_injuries.py, rest_features.py) produced.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .feature_builder import FEATURE_COLS
+
+
+# Rolling window (StatsTracker.WINDOW_SIZE)
+ROLLING_WINDOW = 10
+
+# Rest-day handling (same as StatsTracker)
+DEFAULT_REST_DAYS = 7       # first game of a team in the dataset
+MAX_REST_DAYS = 14
+
+# Neutral market probability for games without odds
+NEUTRAL_MARKET_PROB = 0.5
+
+INJURY_COLS = [
+    "home_players_out", "away_players_out",
+    "home_players_questionable", "away_players_questionable",
+    "home_injury_severity", "away_injury_severity",
+]
+
+
+class TeamGameIndex:
+    """
+    Home and away team-game rows of a games table, in team/date order.
+
+    Row r < n_games is the home side of game r, row n_games + r the away
+    side. ``order`` sorts those rows by (team_id, game_date, game_id) and
+    ``group_start[k]`` is the sorted position of the first row of the team
+    at sorted position k.
+    """
+
+    def __init__(self, games: pd.DataFrame):
+        self.n_games = len(games)
+        team = np.concatenate([games["team_id_home"].to_numpy(), games["team_id_away"].to_numpy()])
+        days = games["game_date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+        game_id = games["game_id"].to_numpy()
+
+        self.order = np.lexsort((np.tile(game_id, 2), np.tile(days, 2), team))
+        self.team = team[self.order]
+        self.days = np.tile(days, 2)[self.order]
+
+        new_team = np.ones(len(self.team), dtype=bool)
+        new_team[1:] = self.team[1:] != self.team[:-1]
+        starts = np.flatnonzero(new_team)
+        self.group_start = np.repeat(starts, np.diff(np.append(starts, len(self.team))))
+
+    def sort(self, home_values: np.ndarray, away_values: np.ndarray) -> np.ndarray:
+        """Stack per-game home/away values and put them in team/date order."""
+        return np.concatenate([home_values, away_values])[self.order]
+
+    def unsort(self, sorted_values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Inverse of sort(): (home values, away values) in game order."""
+        out = np.empty_like(sorted_values)
+        out[self.order] = sorted_values
+        return out[:self.n_games], out[self.n_games:]
+
+    def rolling_prior(self, values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Mean and count of each team's previous ``window`` values
+        (pandas: ``groupby(team).shift(1).rolling(window, min_periods=1)``).
+
+        Args:
+            values: Values in sorted (team/date) order; NaN is skipped
+
+        Returns:
+            (mean, count) in sorted order; mean is NaN where count is 0
+        """
+        valid = ~np.isnan(values)
+        prefix_sum = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+        prefix_cnt = np.concatenate([[0], np.cumsum(valid)])
+
+        idx = np.arange(len(values))
+        start = np.maximum(self.group_start, idx - window)
+        total = prefix_sum[idx] - prefix_sum[start]
+        count = (prefix_cnt[idx] - prefix_cnt[start]).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+        return mean, count
+
+    def rest_days(self) -> np.ndarray:
+        """Days since the team's previous game, NaN for its first game (sorted order)."""
+        rest = np.full(len(self.days), np.nan)
+        idx = np.arange(len(self.days))
+        has_prev = idx != self.group_start
+        rest[has_prev] = self.days[has_prev] - self.days[idx[has_prev] - 1]
+        return rest
+
+
+# =============================================================================
+# Feature groups
+# =============================================================================
+
+def add_rest_features(games: pd.DataFrame, index: Optional[TeamGameIndex] = None) -> pd.DataFrame:
+    """
+    Add home/away rest days, back-to-back flags and rest_diff
+    (the columns rest_features.py writes).
+
+    Args:
+        games: Game rows with game_id, game_date, team_id_home, team_id_away
+        index: Precomputed TeamGameIndex for ``games``
+
+    Returns:
+        Copy of ``games`` with the rest columns added
+    """
+    index = index or TeamGameIndex(games)
+    home_rest, away_rest = index.unsort(index.rest_days())
+
+    out = games.copy()
+    out["home_rest_days"] = np.clip(np.nan_to_num(home_rest, nan=DEFAULT_REST_DAYS), 0, MAX_REST_DAYS)
+    out["away_rest_days"] = np.clip(np.nan_to_num(away_rest, nan=DEFAULT_REST_DAYS), 0, MAX_REST_DAYS)
+    out["home_b2b"] = (out["home_rest_days"] == 1).astype(int)
+    out["away_b2b"] = (out["away_rest_days"] == 1).astype(int)
+    out["rest_diff"] = out["home_rest_days"] - out["away_rest_days"]
+    return out
+
+
+def rolling_features(
+    games: pd.DataFrame,
+    window: int = ROLLING_WINDOW,
+    index: Optional[TeamGameIndex] = None,
+) -> pd.DataFrame:
+    """
+    Rolling points for/against, win rate and margin over each team's
+    previous ``window`` games, for both sides of every game.
+
+    Returns:
+        DataFrame aligned with ``games`` holding the *_roll_home/away,
+        *_roll_diff and games_in_window_home/away columns
+    """
+    index = index or TeamGameIndex(games)
+    pts_home = games["pts_home"].to_numpy(dtype=np.float64)
+    pts_away = games["pts_away"].to_numpy(dtype=np.float64)
+    home_win = games["home_win"].to_numpy(dtype=np.float64)
+
+    stats = {
+        "pf": index.sort(pts_home, pts_away),
+        "pa": index.sort(pts_away, pts_home),
+        "win": index.sort(home_win, 1 - home_win),
+    }
+
+    out = {}
+    for name, values in stats.items():
+        mean, count = index.rolling_prior(values, window)
+        out[f"{name}_roll_home"], out[f"{name}_roll_away"] = index.unsort(mean)
+        if name == "win":
+            out["games_in_window_home"], out["games_in_window_away"] = index.unsort(count)
+
+    out["margin_roll_home"] = out["pf_roll_home"] - out["pa_roll_home"]
+    out["margin_roll_away"] = out["pf_roll_away"] - out["pa_roll_away"]
+    for name in ("pf", "pa", "win", "margin"):
+        out[f"{name}_roll_diff"] = out[f"{name}_roll_home"] - out[f"{name}_roll_away"]
+    return pd.DataFrame(out, index=games.index)
+
+
+def moneyline_to_prob(moneyline) -> np.ndarray:
+    """Convert American moneylines to implied probabilities (NaN stays NaN)."""
+    ml = np.asarray(moneyline, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(ml < 0, (-ml) / (-ml + 100), 100 / (ml + 100))
+
+
+def add_market_features(games: pd.DataFrame, odds: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Add market_prob_home/away from an odds table (date, team_id_home,
+    team_id_away, moneyline_home, moneyline_away); games without odds get 0.5.
+    """
+    if odds is None:
+        out = games.copy()
+        out["market_prob_home"] = NEUTRAL_MARKET_PROB
+        out["market_prob_away"] = NEUTRAL_MARKET_PROB
+        return out
+
+    odds = odds.rename(columns={"date": "game_date"})
+    odds_slim = pd.DataFrame({
+        "game_date": odds["game_date"],
+        "team_id_home": odds["team_id_home"],
+        "team_id_away": odds["team_id_away"],
+        "market_prob_home": moneyline_to_prob(odds["moneyline_home"]),
+        "market_prob_away": moneyline_to_prob(odds["moneyline_away"]),
+    })
+    out = games.merge(odds_slim, on=["game_date", "team_id_home", "team_id_away"], how="left")
+    out["market_prob_home"] = out["market_prob_home"].fillna(NEUTRAL_MARKET_PROB)
+    out["market_prob_away"] = out["market_prob_away"].fillna(NEUTRAL_MARKET_PROB)
+    return out
+
+
+# =============================================================================
+# Full pipeline
+# =============================================================================
+
+def build_features(
+    games: pd.DataFrame,
+    odds: Optional[pd.DataFrame] = None,
+    window: int = ROLLING_WINDOW,
+    elo_params=None,
+) -> pd.DataFrame:
+    """
+    Build the model training table for one league.
+
+    Args:
+        games: Game rows (game_id, game_date, season_id, team_id_home,
+               team_id_away, pts_home, pts_away, home_win), chronologically
+               sorted. Elo (elo_home, elo_away, elo_prob) and rest columns
+               are used if present, otherwise computed here.
+        odds: Optional odds table for the market probability columns
+        window: Rolling window in games
+        elo_params: EloParams for the Elo replay when ``games`` has no Elo
+                    columns (default: NBA values)
+
+    Returns:
+        DataFrame with game_date, season_id, FEATURE_COLS and home_win,
+        one row per game in input order
+    """
+    games = games.copy()
+    games["season_id"] = games["season_id"].astype(int)
+
+    if "elo_prob" not in games.columns:
+        from .elo_engine import EloParams, replay_games
+        replay, _ = replay_games(games, elo_params or EloParams())
+        games["elo_home"] = replay.elo_home
+        games["elo_away"] = replay.elo_away
+        games["elo_prob"] = replay.elo_prob
+    games["elo_diff"] = games["elo_home"] - games["elo_away"]
+
+    index = TeamGameIndex(games)
+    if "rest_diff" not in games.columns:
+        games = add_rest_features(games, index)
+
+    feat = pd.concat([games, rolling_features(games, window, index)], axis=1)
+    feat = add_market_features(feat, odds)
+
+    # Injury features are zero-imputed for history; live ESPN data at inference
+    for col in INJURY_COLS:
+        feat[col] = 0.0
+
+    return feat[["game_date", "season_id"] + FEATURE_COLS + ["home_win"]].copy()
@@ -0,0 +1,258 @@
+"""
+GameJournal: append-only log of games applied to tracker state.
+
+Tracker state lives in the state directory as a snapshot plus a journal:
+
+    elo.json / stats.json   snapshot of the trackers
+    snapshot.json           journal sequence number the snapshot includes,
+                            and the keys of every game applied up to it
+                            (StateManager keeps these three in a state
+                            generation)
+    journal.jsonl           one JSON line per game applied since then
+
+Applying a game appends (and fsyncs) a single line of a few hundred bytes
+instead of rewriting elo.json and stats.json. Loading replays the journal
+tail on top of the snapshot; compaction (StateManager.save) writes a fresh
+snapshot and empties the journal.
+
+Every entry is keyed by its ESPN event id (date + team ids when ESPN gave
+none), and the keys of all applied games form an idempotency index, so
+re-running an update for the same games never applies them twice.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from .atomic_io import write_bytes_atomic, write_json_atomic
+from .espn_client import GameResult
+
+
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_FILE = "snapshot.json"
+
+
+def game_key(result: GameResult) -> str:
+    """Idempotency key of a game: its ESPN event id, else date + team ids."""
+    if result.event_id:
+        return f"espn:{result.event_id}"
+    return f"{result.game_date}:{result.home_team_id or 0}:{result.away_team_id or 0}"
+
+
+@dataclass
+class JournalEntry:
+    """One applied game."""
+    seq: int
+    key: str
+    game_date: str
+    home_id: int
+    away_id: int
+    home_score: int
+    away_score: int
+    season_type: Optional[int] = None
+
+    @classmethod
+    def from_result(cls, seq: int, result: GameResult) -> "JournalEntry":
+        return cls(
+            seq=seq,
+            key=game_key(result),
+            game_date=result.game_date,
+            home_id=int(result.home_team_id),
+            away_id=int(result.away_team_id),
+            home_score=int(result.home_score),
+            away_score=int(result.away_score),
+            season_type=result.season_type,
+        )
+
+    def to_result(self) -> GameResult:
+        """GameResult to replay through GameProcessor."""
+        event_id = self.key[len("espn:"):] if self.key.startswith("espn:") else None
+        return GameResult(
+            game_date=self.game_date,
+            home_team="",
+            away_team="",
+            home_score=self.home_score,
+            away_score=self.away_score,
+            status="Final",
+            home_team_id=self.home_id,
+            away_team_id=self.away_id,
+            event_id=event_id,
+            season_type=self.season_type,
+        )
+
+
+class GameJournal:
+    """
+    Append-only journal of applied games with an idempotency index.
+
+    The files are read lazily on first use. A torn final line (a crash
+    mid-append) is ignored and cut off before the next append.
+    """
+
+    def __init__(self, state_dir: Path, snapshot_path: Optional[Path] = None):
+        """
+        Initialize GameJournal.
+
+        Args:
+            state_dir: State directory holding journal.jsonl
+            snapshot_path: Snapshot record to read (default:
+                           state_dir/snapshot.json)
+        """
+        self.state_dir = Path(state_dir)
+        self.path = self.state_dir / JOURNAL_FILE
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.state_dir / SNAPSHOT_FILE
+        self._loaded = False
+        self._snapshot_seq = 0
+        self._snapshot_keys: Set[str] = set()
+        self._entries: List[JournalEntry] = []
+        self._keys: Set[str] = set()
+        self._valid_bytes = 0
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._snapshot_seq = 0
+        self._snapshot_keys = set()
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._snapshot_seq = int(snapshot.get("seq", 0))
+            self._snapshot_keys = set(snapshot.get("keys", []))
+
+        self._entries = []
+        self._valid_bytes = 0
+        if self.path.exists():
+            data = self.path.read_bytes()
+            end = data.rfind(b"\n") + 1     # drop a torn final line
+            self._valid_bytes = end
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                entry = JournalEntry(**json.loads(line))
+                if entry.seq > self._snapshot_seq:
+                    self._entries.append(entry)
+
+        self._keys = self._snapshot_keys | {e.key for e in self._entries}
+        self._loaded = True
+
+    def reload(self) -> None:
+        """Re-read the files (after another process wrote them)."""
+        self._loaded = False
+        self._load()
+
+    @property
+    def snapshot_seq(self) -> int:
+        """Sequence number the snapshot includes."""
+        self._load()
+        return self._snapshot_seq
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest applied game."""
+        self._load()
+        return self._entries[-1].seq if self._entries else self._snapshot_seq
+
+    def __contains__(self, key: str) -> bool:
+        self._load()
+        return key in self._keys
+
+    def __len__(self) -> int:
+        """Number of entries not yet compacted into the snapshot."""
+        self._load()
+        return len(self._entries)
+
+    def tail(self) -> List[JournalEntry]:
+        """Entries after the snapshot, oldest first."""
+        self._load()
+        return list(self._entries)
+
+    def contains(self, result: GameResult) -> bool:
+        """Whether a game has already been applied."""
+        return game_key(result) in self
+
+    def append(self, result: GameResult) -> JournalEntry:
+        """
+        Record an applied game (durable once this returns).
+
+        Args:
+            result: The game just applied to the trackers
+
+        Returns:
+            The new JournalEntry
+        """
+        self._load()
+        entry = JournalEntry.from_result(self.last_seq + 1, result)
+        line = (json.dumps(asdict(entry), separators=(",", ":")) + "\n").encode("utf-8")
+
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            if f.tell() > self._valid_bytes:
+                f.truncate(self._valid_bytes)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._valid_bytes += len(line)
+
+        self._entries.append(entry)
+        self._keys.add(entry.key)
+        return entry
+
+    def snapshot_record(self) -> dict:
+        """Snapshot record covering every entry so far (for snapshot.json)."""
+        self._load()
+        return {"seq": self.last_seq, "keys": sorted(self._keys)}
+
+    def use_snapshot(self, snapshot_path: Path) -> None:
+        """Read the snapshot record from another file (a state generation)."""
+        self.snapshot_path = Path(snapshot_path)
+        self._loaded = False
+
+    def compact(self, record: dict) -> None:
+        """
+        Empty the journal once a snapshot holding ``record`` is durable.
+
+        Entries up to the record's seq are ignored from then on anyway;
+        dropping them only keeps the file short.
+        """
+        self._load()
+        seq = int(record["seq"])
+        remaining = [e for e in self._entries if e.seq > seq]
+        data = b"".join(
+            (json.dumps(asdict(e), separators=(",", ":")) + "\n").encode("utf-8") for e in remaining
+        )
+        write_bytes_atomic(self.path, data)
+
+        self._snapshot_seq = seq
+        self._snapshot_keys = set(record["keys"])
+        self._entries = remaining
+        self._keys = self._snapshot_keys | {e.key for e in remaining}
+        self._valid_bytes = len(data)
+
+    def mark_snapshot(self) -> int:
+        """
+        Record that the snapshot now includes every entry (writing
+        snapshot_path), and empty the journal. Call after the tracker
+        snapshot files have been written.
+
+        Returns:
+            Sequence number of the snapshot
+        """
+        record = self.snapshot_record()
+        write_json_atomic(self.snapshot_path, record, separators=(",", ":"))
+        self.compact(record)
+        return record["seq"]
+
+    def stats(self) -> Dict[str, int]:
+        """Sizes for status output."""
+        self._load()
+        return {
+            "snapshot_seq": self._snapshot_seq,
+            "tail_entries": len(self._entries),
+            "applied_games": len(self._keys),
+            "journal_bytes": self._valid_bytes,
+        }
+
+    def __repr__(self) -> str:
+        return f"GameJournal(seq={self.last_seq}, tail={len(self)})"
@@ -2,12 +2,14 @@
 GameProcessor: Updates tracker state after games complete.
 """
 
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 
 from .elo_tracker import EloTracker
 from .stats_tracker import StatsTracker
+from .standings_tracker import StandingsTracker
 from .team_mapper import TeamMapper
 from .espn_client import GameResult
+from .game_journal import GameJournal
 
 
 class GameProcessor:
@@ -23,6 +25,8 @@ class GameProcessor:
         elo_tracker: EloTracker,
         stats_tracker: StatsTracker,
         team_mapper: TeamMapper,
+        journal: Optional[GameJournal] = None,
+        standings_tracker: Optional[StandingsTracker] = None,
     ):
         """
         Initialize GameProcessor.
@@ -31,10 +35,15 @@ class GameProcessor:
             elo_tracker: EloTracker instance to update
             stats_tracker: StatsTracker instance to update
             team_mapper: TeamMapper for name -> ID conversion
+            journal: Optional GameJournal. Games it already holds are
+                     skipped, and every processed game is appended to it.
+            standings_tracker: Optional StandingsTracker to update as well
         """
         self.elo_tracker = elo_tracker
         self.stats_tracker = stats_tracker
         self.team_mapper = team_mapper
+        self.journal = journal
+        self.standings_tracker = standings_tracker
         self._processed_games: Set[Tuple[str, int, int]] = set()
 
     def _game_key(self, result: GameResult) -> Tuple[str, int, int]:
@@ -63,10 +72,12 @@ class GameProcessor:
             print(f"Warning: Could not map teams for {result}")
             return False
 
-        # Skip if already processed this session
+        # Skip if already processed this session (or in an earlier run)
         key = self._game_key(result)
         if not force and key in self._processed_games:
             return False
+        if not force and self.journal is not None and self.journal.contains(result):
+            return False
 
         home_id = result.home_team_id
         away_id = result.away_team_id
@@ -93,8 +104,16 @@ class GameProcessor:
             game_date=result.game_date,
         )
 
+        # Preseason and playoff games update ratings but not the W/L table
+        if self.standings_tracker is not None and result.is_regular_season:
+            self.standings_tracker.record_game(
+                home_id, away_id, result.home_score, result.away_score, result.game_date
+            )
+
         # Mark as processed
         self._processed_games.add(key)
+        if self.journal is not None:
+            self.journal.append(result)
 
         return True
 
@@ -147,6 +166,12 @@ class GameProcessor:
                 "reason": "Could not map team names to IDs",
             }
 
+        if self.journal is not None and self.journal.contains(result):
+            return {
+                "would_process": False,
+                "reason": f"Already applied: {result}",
+            }
+
         home_id = result.home_team_id
         away_id = result.away_team_id
 
@@ -156,7 +181,7 @@ class GameProcessor:
         # Calculate expected changes
         p_home = self.elo_tracker.get_matchup_prob(home_id, away_id)
         actual = 1.0 if result.home_won else 0.0
-        elo_change = self.elo_tracker.K_FACTOR * (actual - p_home)
+        elo_change = self.elo_tracker.params.k_factor * (actual - p_home)
 
         return {
             "would_process": True,
@@ -106,17 +106,23 @@ class InjuryClient:
     BASE_TEMPLATE = "https://site.api.espn.com/apis/site/v2/sports/basketball/{slug}"
     TIMEOUT = 10  # seconds
     
-    def __init__(self, team_mapper: Optional[TeamMapper] = None, league_slug: str = "nba"):
+    def __init__(
+        self,
+        team_mapper: Optional[TeamMapper] = None,
+        league_slug: str = "nba",
+        session: Optional[requests.Session] = None,
+    ):
         """
         Initialize injury client.
         
         Args:
             team_mapper: TeamMapper for converting ESPN names to NBA IDs
             league_slug: The league slug for the ESPN API
+            session: HTTP session to share with other clients (optional)
         """
         self.team_mapper = team_mapper or TeamMapper()
         self.league_slug = league_slug
-        self._session = requests.Session()
+        self._session = session or requests.Session()
         self._session.headers.update({
             "Accept": "application/json",
             "User-Agent": "NBA-Predictor/1.0",
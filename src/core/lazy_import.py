@@ -0,0 +1,66 @@
+"""
+LazyModule: Defer importing heavy optional dependencies until first use.
+
+xgboost (which pulls in scikit-learn), google.genai, google.cloud.storage
+and firebase_admin together account for most of the API's import time.
+Binding them through a LazyModule keeps the usual ``module.attr`` call
+sites while moving the import cost to the first attribute access, which
+on the API happens during (parallel) warm-up instead of before the server
+can bind its port.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Any, Optional
+
+
+class LazyModule:
+    """
+    Module proxy that imports the real module on first attribute access.
+
+    The proxy's own members are underscore-prefixed so they never shadow an
+    attribute of the wrapped module (e.g. ``joblib.load``).
+
+    Example:
+        xgboost = LazyModule("xgboost")
+        model = xgboost.XGBClassifier()   # import happens here
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize proxy.
+
+        Args:
+            name: Fully qualified module name (e.g. "firebase_admin.db")
+        """
+        self._lazy_name = name
+        self._lazy_module: Optional[ModuleType] = None
+        self._lazy_lock = threading.Lock()
+
+    def _lazy_load(self) -> ModuleType:
+        """Import (once) and return the real module."""
+        module = self._lazy_module
+        if module is None:
+            with self._lazy_lock:
+                module = self._lazy_module
+                if module is None:
+                    module = importlib.import_module(self._lazy_name)
+                    self._lazy_module = module
+        return module
+
+    @property
+    def _lazy_loaded(self) -> bool:
+        """True once the real module has been imported."""
+        return self._lazy_module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("_lazy_"):
+            raise AttributeError(attr)
+        return getattr(self._lazy_load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_loaded else "not loaded"
+        return f"LazyModule({self._lazy_name!r}, {state})"
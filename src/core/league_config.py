@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Union
 
 @dataclass
 class LeagueConfig:
@@ -6,7 +8,11 @@ class LeagueConfig:
     team_count: int
     espn_slug: str              # "nba", "wnba", "mens-college-basketball"
     default_elo: float = 1500.0
-    home_court_advantage: float = 70.0  # NBA: 70; tune per league
+    # Elo home-court advantage of training *and* serving (EloParams.from_config).
+    # It must match the HCA the league's Elo tables, model and state were
+    # built with: change it only together with a rebuild (build_elo ->
+    # features -> xgb_boost_model -> bootstrap_state). Tune with src/tune_elo.py.
+    home_court_advantage: float = 70.0
     k_factor: float = 20.0
     season_carryover: float = 0.7
     injury_source: str = "espn"          # "espn", "none"
@@ -33,7 +39,7 @@ WNBA_CONFIG = LeagueConfig(
     league_name="WNBA",
     team_count=13,
     espn_slug="wnba",
-    home_court_advantage=55.0,  # Tune empirically
+    home_court_advantage=70.0,  # Artifacts built with 70; tuned candidate 55 (needs a rebuild)
     injury_source="espn",
     odds_sport_key="basketball_wnba",
     team_lookup_csv="data/processed/wnba_team_lookup.csv",
@@ -46,7 +52,7 @@ CBB_CONFIG = LeagueConfig(
     league_name="NCAA Men's Basketball",
     team_count=352,  # D-I only
     espn_slug="mens-college-basketball",
-    home_court_advantage=80.0,  # Tune empirically; likely higher than NBA
+    home_court_advantage=70.0,  # Artifacts built with 70; tuned candidate 80 (needs a rebuild)
     injury_source="none",        # No ESPN college injury data
     odds_sport_key="basketball_ncaab",
     team_lookup_csv="data/processed/cbb_team_lookup.csv",
@@ -54,3 +60,24 @@ CBB_CONFIG = LeagueConfig(
     calibrator_path="models/calibrator_cbb_v1.pkl",
     state_dir="state/cbb/",
 )
+
+# League key -> config (--league choices, per-league services)
+LEAGUE_CONFIGS = {"nba": NBA_CONFIG, "wnba": WNBA_CONFIG, "cbb": CBB_CONFIG}
+
+
+def season_id_for(game_date: Union[str, date, datetime], league: str = "nba") -> int:
+    """
+    season_id of a game, in the convention of the league's history tables.
+
+    NBA seasons are keyed by their start year, CBB seasons by their end year
+    and WNBA seasons by the calendar year (all prefixed with "2").
+    """
+    if isinstance(game_date, str):
+        game_date = date.fromisoformat(game_date[:10])
+    if league == "wnba":
+        year = game_date.year
+    elif league == "cbb":
+        year = game_date.year + 1 if game_date.month >= 8 else game_date.year
+    else:
+        year = game_date.year if game_date.month >= 8 else game_date.year - 1
+    return int(f"2{year}")
@@ -0,0 +1,348 @@
+"""
+Model artifacts: fast on-disk formats and a process-level load cache.
+
+Training writes XGBoost models as JSON and calibrators as joblib pickles.
+Both are slow to load (JSON parsing of ~1 MB of trees; an sklearn unpickle),
+and every Predictor used to repeat that work: once per league, again on
+every state reload, and again in every uvicorn worker.
+
+This module provides:
+  - export_artifacts(): writes the model in XGBoost's binary UBJSON form
+    (``<stem>.ubj``) and the compiled calibrator (``<stem>.table.npz``:
+    Platt coefficients or an interpolation table, see core.calibration)
+    next to the originals.
+  - ArtifactCache: loads each artifact once per content hash and hands the
+    same object to every Predictor in the process.
+  - serving_paths(): the warm-started model promoted by model_refresh into
+    a league's state directory when it applies, else the configured files.
+
+Predictor picks up exported artifacts automatically when they are at least
+as new as their source files, so exporting is optional.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .calibration import (
+    DEFAULT_GRID_SIZE,
+    CalibratorTable,
+    PlattCalibrator,
+    compile_and_verify,
+    load_calibrator,
+    save_calibrator,
+)
+from .atomic_io import sha256_file
+from .lazy_import import LazyModule
+
+# Imported on first model load (xgboost also pulls in sklearn)
+xgboost = LazyModule("xgboost")
+joblib = LazyModule("joblib")
+
+
+UBJ_SUFFIX = ".ubj"
+TABLE_SUFFIX = ".table.npz"
+
+# Model variants: "default" is the trained model, "fast" a smaller export of
+# it (src/export_fast_model.py) stored alongside with this stem suffix
+MODEL_VARIANTS = ("default", "fast")
+FAST_STEM_SUFFIX = "_fast"
+
+# Warm-started model promoted by model_refresh. It lives in the league's
+# state directory (and is synced with it), so it outlives the job that
+# promoted it; the record is written last and names every file by hash.
+REFRESHED_MODEL = "refreshed_model.ubj"
+REFRESHED_CALIBRATOR = "refreshed_calibrator.table.npz"
+REFRESH_RECORD = "refreshed_model.json"
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def ubj_path_for(model_path: Union[str, Path]) -> Path:
+    """Path of the UBJSON export for a model file."""
+    return Path(model_path).with_suffix(UBJ_SUFFIX)
+
+
+def table_path_for(calibrator_path: Union[str, Path]) -> Path:
+    """Path of the lookup-table export for a calibrator file."""
+    return Path(calibrator_path).with_suffix(TABLE_SUFFIX)
+
+
+def fast_path_for(path: Union[str, Path]) -> Path:
+    """Path of the "fast" variant of a model or calibrator file."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}{FAST_STEM_SUFFIX}{path.suffix}")
+
+
+def variant_paths(
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]],
+    variant: str = "default",
+) -> tuple[Path, Optional[Path], str]:
+    """
+    Model and calibrator files for a variant.
+
+    The fast model is calibrated separately (its raw probabilities differ
+    from the full ensemble's), so it is only used when its own calibrator
+    was exported too; otherwise this falls back to the default files.
+
+    Returns:
+        (model path, calibrator path, variant actually used)
+    """
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"Unknown model variant {variant!r}; expected one of {MODEL_VARIANTS}")
+    model_path = Path(model_path)
+    calibrator_path = Path(calibrator_path) if calibrator_path else None
+    if variant == "fast":
+        fast_model = fast_path_for(model_path)
+        fast_calibrator = fast_path_for(calibrator_path) if calibrator_path else None
+        if fast_model.exists() and (fast_calibrator is None or fast_calibrator.exists()):
+            return fast_model, fast_calibrator, "fast"
+    return model_path, calibrator_path, "default"
+
+
+def export_artifacts(
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]] = None,
+    grid_size: int = DEFAULT_GRID_SIZE,
+) -> dict:
+    """
+    Export a model (and optional calibrator) to the fast-loading formats.
+
+    Args:
+        model_path: XGBoost JSON model
+        calibrator_path: Optional joblib-pickled calibrator
+        grid_size: Knots if the calibrator has to be tabulated on a grid
+
+    Returns:
+        Dict with "model" and (if exported) "calibrator" output paths. A
+        calibrator that cannot be compiled (or does not verify) is not
+        exported; the pickle keeps being served.
+    """
+    model_path = Path(model_path)
+    model = xgboost.XGBClassifier()
+    model.load_model(str(model_path))
+    out = {"model": ubj_path_for(model_path)}
+    model.save_model(str(out["model"]))
+
+    if calibrator_path is not None and Path(calibrator_path).exists():
+        compiled = compile_and_verify(joblib.load(calibrator_path), grid_size=grid_size)
+        if isinstance(compiled, (PlattCalibrator, CalibratorTable)):
+            out["calibrator"] = save_calibrator(compiled, table_path_for(calibrator_path))
+        else:
+            warnings.warn(f"Calibrator {calibrator_path} not exported; serving the pickle")
+
+    return out
+
+
+def _fresh_export(source: Path, exported: Path) -> Optional[Path]:
+    """Return the exported path if it exists and is not older than its source."""
+    try:
+        if exported.stat().st_mtime >= source.stat().st_mtime:
+            return exported
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def resolve_model_path(model_path: Union[str, Path]) -> Path:
+    """Prefer an up-to-date UBJSON export over the JSON model."""
+    model_path = Path(model_path)
+    if model_path.suffix == UBJ_SUFFIX:
+        return model_path
+    return _fresh_export(model_path, ubj_path_for(model_path)) or model_path
+
+
+def resolve_calibrator_path(calibrator_path: Union[str, Path]) -> Path:
+    """Prefer an up-to-date lookup-table export over the pickled calibrator."""
+    calibrator_path = Path(calibrator_path)
+    if calibrator_path.name.endswith(TABLE_SUFFIX):
+        return calibrator_path
+    return _fresh_export(calibrator_path, table_path_for(calibrator_path)) or calibrator_path
+
+
+# =============================================================================
+# Refreshed models
+# =============================================================================
+
+def read_refresh_record(state_dir: Union[str, Path]) -> Optional[dict]:
+    """The refresh record in a state directory (None if absent or unreadable)."""
+    path = Path(state_dir) / REFRESH_RECORD
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def refreshed_artifacts(
+    state_dir: Union[str, Path],
+    model_path: Union[str, Path],
+) -> Optional[tuple[Path, Path, dict]]:
+    """
+    The refreshed model and calibrator in ``state_dir``, if they apply.
+
+    They apply only while the configured model is the one they were
+    refreshed from (a full retrain ships a new base model) and the files
+    match the hashes in the record (a record synced ahead of its files is
+    ignored).
+
+    Returns:
+        (model path, calibrator path, record), or None
+    """
+    state_dir = Path(state_dir)
+    record = read_refresh_record(state_dir)
+    if record is None:
+        return None
+    model = state_dir / REFRESHED_MODEL
+    calibrator = state_dir / REFRESHED_CALIBRATOR
+    try:
+        if (record.get("base_model") != sha256_file(model_path)
+                or record.get("model_sha256") != sha256_file(model)
+                or record.get("calibrator_sha256") != sha256_file(calibrator)):
+            return None
+    except OSError:
+        return None
+    return model, calibrator, record
+
+
+def serving_paths(
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]],
+    state_dir: Optional[Union[str, Path]] = None,
+) -> tuple[Path, Optional[Path]]:
+    """
+    Model and calibrator to serve for a league.
+
+    The refreshed pair in ``state_dir`` when it applies (see
+    refreshed_artifacts), else the configured files; a calibrator that
+    does not exist is returned as None. There is no fast variant of a
+    refreshed model, so Predictor falls back to the refreshed default.
+    """
+    if state_dir is not None:
+        refreshed = refreshed_artifacts(state_dir, model_path)
+        if refreshed is not None:
+            return refreshed[0], refreshed[1]
+    calibrator_path = Path(calibrator_path) if calibrator_path else None
+    return Path(model_path), calibrator_path if calibrator_path and calibrator_path.exists() else None
+
+
+# =============================================================================
+# Process-level artifact cache
+# =============================================================================
+
+class ArtifactCache:
+    """
+    Thread-safe cache of loaded models and calibrators keyed by content hash.
+
+    Two paths with identical bytes share one object, and a file that is
+    rewritten with new content gets a new entry. File hashes are memoized
+    by (path, mtime, size) so a cache hit does not re-read the file.
+    """
+
+    def __init__(self, max_entries: int = 16):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Loaded artifacts kept before least-recently-used eviction
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: dict[tuple[str, str], threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def content_hash(self, path: Union[str, Path]) -> str:
+        """SHA-256 of a file's bytes (memoized on mtime and size)."""
+        path = Path(path)
+        stat = path.stat()
+        key = str(path.resolve())
+        with self._lock:
+            memo = self._hashes.get(key)
+        if memo and memo[0] == stat.st_mtime_ns and memo[1] == stat.st_size:
+            return memo[2]
+
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        with self._lock:
+            self._hashes[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def _get(self, kind: str, path: Path, loader) -> Any:
+        key = (kind, self.content_hash(path))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # One thread loads; concurrent callers for the same artifact wait.
+        with load_lock:
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    return self._entries[key]
+            obj = loader(path)
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = obj
+                self._load_locks.pop(key, None)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return obj
+
+    def get_model(self, model_path: Union[str, Path]) -> Any:
+        """Load (or reuse) an XGBClassifier from a .json or .ubj file."""
+        def _load(path: Path):
+            model = xgboost.XGBClassifier()
+            model.load_model(str(path))
+            return model
+        return self._get("model", Path(model_path), _load)
+
+    def get_calibrator(self, calibrator_path: Union[str, Path]) -> Any:
+        """
+        Load (or reuse) a calibrator from an exported table or joblib pickle.
+
+        Pickled sklearn calibrators are compiled to NumPy form on load
+        (see core.calibration) and verified against the original.
+        """
+        def _load(path: Path):
+            if path.name.endswith(TABLE_SUFFIX):
+                return load_calibrator(path)
+            return compile_and_verify(joblib.load(path))
+        return self._get("calibrator", Path(calibrator_path), _load)
+
+    def clear(self) -> None:
+        """Drop all cached artifacts and memoized hashes."""
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ArtifactCache({len(self)} artifacts, hits={self.hits}, misses={self.misses})"
+
+
+_artifact_cache: Optional[ArtifactCache] = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """Get the process-wide artifact cache."""
+    global _artifact_cache
+    if _artifact_cache is None:
+        _artifact_cache = ArtifactCache()
+    return _artifact_cache
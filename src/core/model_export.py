@@ -0,0 +1,242 @@
+"""
+Latency-aware model export.
+
+Serving cost of the XGBoost model grows with the number (and depth) of its
+trees. This module builds smaller candidates from a trained model:
+
+  - truncated: the first N trees of the existing booster (the same trees
+    iteration_range=(0, N) would use), and
+  - retrained: a shallower model trained with early stopping on val,
+
+recalibrates each on the val split the way training does, and measures on
+this machine what Predictor actually runs: XGBClassifier.predict_proba on
+one row and on a slate-sized batch. Each candidate is reported with its
+test-split log-loss delta against the current model + calibrator, and the
+fastest one within a loss budget can be written next to the default as the
+"fast" variant (see model_artifacts.variant_paths).
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from .calibration import compile_calibrator
+from .model_artifacts import export_artifacts, fast_path_for, joblib, xgboost
+from .xgb_training import LeagueData, log_loss, train_booster
+
+
+# Typical daily slate
+DEFAULT_BATCH_SIZE = 15
+
+
+@dataclass
+class Candidate:
+    """One model option with its accuracy and latency on this machine."""
+    name: str
+    kind: str                   # "default", "truncated" or "retrained"
+    n_trees: int
+    max_depth: int
+    test_log_loss: float        # calibrated, on the test split
+    log_loss_delta: float       # vs the default model
+    single_row_ms: float        # median predict_proba latency, 1 row
+    single_row_p95_ms: float
+    batch_ms: float             # median predict_proba latency, one slate
+    size_kb: float
+    booster: object = None
+    calibrator: object = None
+
+    def row(self) -> dict:
+        """Report fields (without the model objects)."""
+        return {k: v for k, v in self.__dict__.items() if k not in ("booster", "calibrator")}
+
+
+def _classifier(booster):
+    """XGBClassifier over a booster, as ArtifactCache loads it for Predictor."""
+    model = xgboost.XGBClassifier()
+    model.load_model(bytearray(booster.save_raw("ubj")))
+    return model
+
+
+def tree_depth(booster) -> int:
+    """Deepest tree in the ensemble (from the text dump: one tab per level)."""
+    return max(
+        (len(line) - len(line.lstrip("\t")) for tree in booster.get_dump() for line in tree.splitlines()),
+        default=0,
+    )
+
+
+def measure_latency(
+    booster,
+    X: np.ndarray,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    repeats: int = 200,
+) -> dict:
+    """
+    Time predict_proba through XGBClassifier on single rows and on batches.
+
+    Args:
+        booster: Model to time
+        X: Rows to draw inputs from
+        batch_size: Rows per batch call
+        repeats: Timed calls per measurement (after a short warm-up)
+
+    Returns:
+        Dict with single_row_ms, single_row_p95_ms, batch_ms
+    """
+    model = _classifier(booster)
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    batch = X[:batch_size] if len(X) >= batch_size else np.resize(X, (batch_size, X.shape[1]))
+
+    for i in range(10):
+        model.predict_proba(X[i % len(X):i % len(X) + 1])
+
+    single = np.empty(repeats)
+    for i in range(repeats):
+        row = X[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single[i] = time.perf_counter() - start
+
+    batched = np.empty(max(1, repeats // 4))
+    for i in range(len(batched)):
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        batched[i] = time.perf_counter() - start
+
+    return {
+        "single_row_ms": float(np.median(single) * 1e3),
+        "single_row_p95_ms": float(np.percentile(single, 95) * 1e3),
+        "batch_ms": float(np.median(batched) * 1e3),
+    }
+
+
+def fit_calibrator(booster, data: LeagueData):
+    """Platt calibrator on the val split, as xgb_boost_model.py fits it."""
+    from sklearn.linear_model import LogisticRegression
+
+    p_val = booster.inplace_predict(data.X["val"])
+    calibrator = LogisticRegression(solver="lbfgs")
+    calibrator.fit(p_val.reshape(-1, 1), data.y["val"].astype(int))
+    return calibrator
+
+
+def _test_log_loss(booster, calibrator, data: LeagueData) -> float:
+    p = booster.inplace_predict(data.X["test"])
+    if calibrator is not None:
+        p = compile_calibrator(calibrator).calibrate(p)
+    return log_loss(data.y["test"], p)
+
+
+def _candidate(name, kind, booster, calibrator, data, baseline, batch_size, repeats) -> Candidate:
+    loss = _test_log_loss(booster, calibrator, data)
+    timing = measure_latency(booster, data.X["test"], batch_size, repeats)
+    return Candidate(
+        name=name,
+        kind=kind,
+        n_trees=booster.num_boosted_rounds(),
+        max_depth=tree_depth(booster),
+        test_log_loss=loss,
+        log_loss_delta=loss - baseline if baseline is not None else 0.0,
+        size_kb=len(booster.save_raw("ubj")) / 1024,
+        booster=booster,
+        calibrator=calibrator,
+        **timing,
+    )
+
+
+def build_candidates(
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]],
+    data: LeagueData,
+    tree_counts: Sequence[int] = (50, 100, 200, 400),
+    depths: Sequence[int] = (),
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    repeats: int = 200,
+) -> List[Candidate]:
+    """
+    Evaluate the current model and smaller alternatives.
+
+    Args:
+        model_path: Current (default) model
+        calibrator_path: Its calibrator, if any
+        data: League splits the model was trained on
+        tree_counts: Truncation points (counts >= the model's size are skipped)
+        depths: Max depths to retrain at (with early stopping)
+        batch_size: Rows per batch latency call
+        repeats: Timed calls per latency measurement
+
+    Returns:
+        Candidates, the default first
+    """
+    booster = xgboost.Booster()
+    booster.load_model(str(model_path))
+    calibrator = joblib.load(calibrator_path) if calibrator_path and Path(calibrator_path).exists() else None
+
+    default = _candidate("default", "default", booster, calibrator, data, None, batch_size, repeats)
+    candidates = [default]
+    total = booster.num_boosted_rounds()
+
+    for n in sorted({int(n) for n in tree_counts}):
+        if n >= total:
+            continue
+        small = booster[:n]
+        candidates.append(_candidate(f"trees={n}", "truncated", small, fit_calibrator(small, data),
+                                     data, default.test_log_loss, batch_size, repeats))
+
+    for depth in sorted({int(d) for d in depths}):
+        retrained, n_trees = train_booster(data, {"max_depth": depth}, early_stopping_rounds=50)
+        retrained = retrained[:n_trees]
+        candidates.append(_candidate(f"depth={depth}", "retrained", retrained,
+                                     fit_calibrator(retrained, data), data,
+                                     default.test_log_loss, batch_size, repeats))
+    return candidates
+
+
+def select_fast(candidates: Sequence[Candidate], max_delta: float = 0.002) -> Optional[Candidate]:
+    """
+    Fastest non-default candidate whose test log loss is at most
+    ``max_delta`` worse than the default (None if none qualifies or none is
+    faster than the default).
+    """
+    default = next((c for c in candidates if c.kind == "default"), None)
+    eligible = [c for c in candidates if c.kind != "default" and c.log_loss_delta <= max_delta]
+    if not eligible:
+        return None
+    best = min(eligible, key=lambda c: (c.single_row_ms, c.test_log_loss))
+    if default is not None and best.single_row_ms >= default.single_row_ms:
+        return None
+    return best
+
+
+def write_fast_model(
+    candidate: Candidate,
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]] = None,
+) -> dict:
+    """
+    Save a candidate as the "fast" variant next to the default model.
+
+    Writes <model>_fast.json, <calibrator>_fast.pkl and their fast-load
+    exports (.ubj / .table.npz).
+
+    Returns:
+        Dict of written paths
+    """
+    fast_model = fast_path_for(model_path)
+    fast_model.parent.mkdir(parents=True, exist_ok=True)
+    candidate.booster.save_model(str(fast_model))
+    written = {"model_json": fast_model}
+
+    fast_calibrator = None
+    if calibrator_path is not None and candidate.calibrator is not None:
+        fast_calibrator = fast_path_for(calibrator_path)
+        joblib.dump(candidate.calibrator, fast_calibrator)
+        written["calibrator_pkl"] = fast_calibrator
+
+    written.update(export_artifacts(fast_model, fast_calibrator))
+    return written
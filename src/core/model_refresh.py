@@ -0,0 +1,443 @@
+"""
+Incremental in-season model refresh.
+
+Every game the daily job (or update_state.py) processes is recorded as a
+training row in the league state directory (``live_games.csv``): the
+feature vector FeatureBuilder produces from the pre-game state, plus the
+result. Market and injury features are not recomputed after the fact; they
+are taken from the vector actually served for the game, which the daily
+job records when it predicts a slate (``served_features.json``). Games
+that were never served keep those columns empty and are not trained on.
+
+Between full retrains, refresh_model() then
+
+  1. takes the served live games newer than anything the model has seen
+     (the booster's ``live_through`` attribute, else the last date of the
+     league's feature table),
+  2. continues boosting the current model on them for a few rounds,
+  3. refits the Platt calibrator on the val split, as training does, and
+  4. promotes the result only if its calibrated log loss on the test split
+     (which neither model trains on) does not regress.
+
+A promoted model is written to the state directory next to the live rows
+(see model_artifacts.REFRESHED_MODEL), so both are synced to GCS with the
+state and picked up by the next job run and by the API. The configured
+model files are never modified. Everything works on cached arrays and a
+handful of new rows, so a refresh takes seconds.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .atomic_io import sha256_file, write_bytes_atomic, write_json_atomic
+from .calibration import (
+    CalibratorTable,
+    PlattCalibrator,
+    compile_and_verify,
+    compile_calibrator,
+    load_calibrator,
+    save_calibrator,
+)
+from .espn_client import GameResult
+from .feature_builder import FEATURE_COLS
+from .league_config import season_id_for
+from .model_artifacts import (
+    REFRESH_RECORD,
+    REFRESHED_CALIBRATOR,
+    REFRESHED_MODEL,
+    joblib,
+    refreshed_artifacts,
+    xgboost,
+)
+from .model_export import fit_calibrator, tree_depth
+from .table_store import read_frame
+from .xgb_training import DEFAULT_PARAMS, TARGET_COL, DataCache, LeagueData, has_feature_table, log_loss
+
+
+LIVE_FILE = "live_games.csv"
+LIVE_KEY = ["game_date", "team_id_home", "team_id_away"]
+LIVE_COLUMNS = ["game_date", "season_id", "team_id_home", "team_id_away", *FEATURE_COLS, TARGET_COL]
+
+# Features only known at prediction time: taken from the served vector
+SERVED_FILE = "served_features.json"
+SERVED_COLS = [
+    "market_prob_home", "market_prob_away",
+    "home_players_out", "away_players_out",
+    "home_players_questionable", "away_players_questionable",
+    "home_injury_severity", "away_injury_severity",
+]
+# Served vectors kept for games this many days before the newest slate
+SERVED_KEEP_DAYS = 14
+
+# Booster attribute: last game_date the model has been boosted on
+LIVE_THROUGH_ATTR = "live_through"
+
+REFRESH_ROUNDS = 10
+MIN_NEW_GAMES = 10
+
+_SERVED_IDX = [FEATURE_COLS.index(c) for c in SERVED_COLS]
+
+
+# =============================================================================
+# Served features
+# =============================================================================
+
+def served_key(game_date: Union[str, date], home_team_id: int, away_team_id: int) -> str:
+    return f"{str(game_date)[:10]}:{int(home_team_id)}:{int(away_team_id)}"
+
+
+def load_served_features(state_dir: Union[str, Path]) -> Dict[str, List[float]]:
+    """Served market / injury values (SERVED_COLS order) by served_key()."""
+    path = Path(state_dir) / SERVED_FILE
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_served_features(
+    state_dir: Union[str, Path],
+    served: Sequence[Tuple[GameResult, np.ndarray]],
+) -> int:
+    """
+    Remember the market / injury features of a predicted slate.
+
+    Args:
+        state_dir: League state directory
+        served: (game, served feature vector) pairs
+
+    Returns:
+        Number of games recorded
+    """
+    if not served:
+        return 0
+    records = load_served_features(state_dir)
+    for game, features in served:
+        key = served_key(game.game_date, game.home_team_id, game.away_team_id)
+        records[key] = [float(features[i]) for i in _SERVED_IDX]
+    newest = max(key[:10] for key in records)
+    cutoff = (date.fromisoformat(newest) - timedelta(days=SERVED_KEEP_DAYS)).isoformat()
+    records = {k: v for k, v in sorted(records.items()) if k[:10] >= cutoff}
+    write_json_atomic(Path(state_dir) / SERVED_FILE, records, indent=0)
+    return len(served)
+
+
+# =============================================================================
+# Live training rows
+# =============================================================================
+
+def live_row(
+    result: GameResult,
+    features: np.ndarray,
+    league: str = "nba",
+    served: Optional[Sequence[float]] = None,
+) -> dict:
+    """
+    Training row for a completed game.
+
+    Args:
+        result: Completed game
+        features: Feature vector built from the pre-game state
+        league: League name (for the season id)
+        served: Market / injury values served for the game (SERVED_COLS
+                order); without them those columns are left empty
+    """
+    row = {
+        "game_date": pd.Timestamp(result.game_date),
+        "season_id": season_id_for(result.game_date, league),
+        "team_id_home": int(result.home_team_id),
+        "team_id_away": int(result.away_team_id),
+    }
+    row.update(zip(FEATURE_COLS, (float(v) for v in features)))
+    row.update(zip(SERVED_COLS, served if served is not None else [np.nan] * len(SERVED_COLS)))
+    row[TARGET_COL] = int(result.home_won)
+    return row
+
+
+def load_live_games(state_dir: Union[str, Path]) -> pd.DataFrame:
+    """All recorded live games in a state directory (empty frame if none)."""
+    path = Path(state_dir) / LIVE_FILE
+    if not path.exists():
+        return pd.DataFrame(columns=LIVE_COLUMNS)
+    return pd.read_csv(path, parse_dates=["game_date"])
+
+
+def append_live_games(rows: Iterable[dict], state_dir: Union[str, Path]) -> int:
+    """
+    Append live training rows, skipping games already recorded.
+
+    Returns:
+        Number of rows appended
+    """
+    new = pd.DataFrame(list(rows), columns=LIVE_COLUMNS)
+    if new.empty:
+        return 0
+    new = new.drop_duplicates(LIVE_KEY, keep="last")
+    existing = load_live_games(state_dir)
+    if not existing.empty:
+        seen = pd.MultiIndex.from_frame(existing[LIVE_KEY])
+        new = new[~pd.MultiIndex.from_frame(new[LIVE_KEY]).isin(seen)]
+    if new.empty:
+        return 0
+    frame = pd.concat([existing, new], ignore_index=True) if not existing.empty else new
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, date_format="%Y-%m-%d")
+    write_bytes_atomic(Path(state_dir) / LIVE_FILE, buffer.getvalue().encode("utf-8"))
+    return len(new)
+
+
+# =============================================================================
+# Refresh
+# =============================================================================
+
+@dataclass
+class RefreshResult:
+    """Outcome of one incremental refresh."""
+    league: str
+    new_games: int
+    rounds: int
+    n_trees: int
+    current_log_loss: Optional[float] = None     # calibrated, test split
+    candidate_log_loss: Optional[float] = None
+    promoted: bool = False
+    reason: str = ""
+    live_through: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def log_loss_delta(self) -> Optional[float]:
+        if self.current_log_loss is None or self.candidate_log_loss is None:
+            return None
+        return self.candidate_log_loss - self.current_log_loss
+
+
+def continue_boosting(booster, X: np.ndarray, y: np.ndarray, rounds: int = REFRESH_ROUNDS,
+                      params: Optional[dict] = None, nthread: int = 0):
+    """
+    Add ``rounds`` trees fitted to new rows on top of a copy of ``booster``.
+
+    Uses the production parameters at the booster's own tree depth.
+    """
+    params = {**DEFAULT_PARAMS, "max_depth": tree_depth(booster), **(params or {})}
+    if nthread:
+        params["nthread"] = nthread
+    dnew = xgboost.DMatrix(X, label=y, feature_names=FEATURE_COLS)
+    return xgboost.train(params, dnew, num_boost_round=rounds, xgb_model=booster.copy(),
+                         verbose_eval=False)
+
+
+def _calibrated_loss(booster, calibrator, X: np.ndarray, y: np.ndarray) -> float:
+    p = booster.inplace_predict(X)
+    if calibrator is not None:
+        p = compile_calibrator(calibrator).calibrate(p)
+    return log_loss(y, p)
+
+
+def _staged(path: Path, write) -> Tuple[Path, str]:
+    """Write via ``write(tmp_path)`` next to path. Returns the temp file and its SHA-256."""
+    tmp = path.with_name(f".{path.stem}.tmp-{os.getpid()}{path.suffix}")
+    write(tmp)
+    return tmp, sha256_file(tmp)
+
+
+def _current_model(model_path: Path, calibrator_path: Optional[Path], state_dir: Path):
+    """Booster and calibrator currently served: the refreshed pair if it applies."""
+    booster = xgboost.Booster()
+    refreshed = refreshed_artifacts(state_dir, model_path)
+    if refreshed is not None:
+        booster.load_model(str(refreshed[0]))
+        return booster, load_calibrator(refreshed[1])
+    booster.load_model(str(model_path))
+    if calibrator_path is not None and calibrator_path.exists():
+        return booster, joblib.load(calibrator_path)
+    return booster, None
+
+
+def promote_refreshed(state_dir: Path, booster, calibrator, base_model: Path, live_through: str) -> dict:
+    """
+    Write a refreshed model and calibrator into the state directory.
+
+    Both files are written next to their targets before either is swapped
+    in, and the record goes last: until it is replaced, readers keep using
+    the previous refresh (or the base model).
+
+    Returns:
+        The refresh record
+
+    Raises:
+        ValueError: The calibrator cannot be compiled to a lookup table
+                    (nothing is written)
+    """
+    compiled = compile_and_verify(calibrator)
+    if not isinstance(compiled, (PlattCalibrator, CalibratorTable)):
+        raise ValueError("refreshed calibrator cannot be exported as a lookup table")
+
+    state_dir.mkdir(parents=True, exist_ok=True)
+    booster.set_attr(**{LIVE_THROUGH_ATTR: live_through})
+    calibrator_tmp, calibrator_sha = _staged(state_dir / REFRESHED_CALIBRATOR,
+                                             lambda tmp: save_calibrator(compiled, tmp))
+    model_tmp, model_sha = _staged(state_dir / REFRESHED_MODEL, lambda tmp: booster.save_model(str(tmp)))
+    os.replace(model_tmp, state_dir / REFRESHED_MODEL)
+    os.replace(calibrator_tmp, state_dir / REFRESHED_CALIBRATOR)
+
+    record = {
+        "base_model": sha256_file(base_model),
+        "live_through": live_through,
+        "n_trees": booster.num_boosted_rounds(),
+        "promoted_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "model_sha256": model_sha,
+        "calibrator_sha256": calibrator_sha,
+    }
+    write_json_atomic(state_dir / REFRESH_RECORD, record, indent=2)
+    return record
+
+
+def refresh_model(
+    league: str,
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]],
+    data: LeagueData,
+    live: pd.DataFrame,
+    state_dir: Union[str, Path],
+    base_through: Optional[Union[str, date]] = None,
+    rounds: int = REFRESH_ROUNDS,
+    min_new_games: int = MIN_NEW_GAMES,
+    tolerance: float = 0.0,
+    promote: bool = True,
+    nthread: int = 0,
+) -> RefreshResult:
+    """
+    Warm-start the league model on its unseen live games.
+
+    Args:
+        league: League name
+        model_path: Configured (base) model
+        calibrator_path: Configured calibrator
+        data: League splits (val for recalibration, test as holdout)
+        live: Recorded live games (load_live_games)
+        state_dir: League state directory; holds the current refresh and
+                   receives the promoted one
+        base_through: Last game_date of the full training table; live games
+                      up to it are skipped when the model has no
+                      ``live_through`` attribute (i.e. after a full retrain)
+        rounds: Trees to add
+        min_new_games: Skip the refresh until this many new games exist
+        tolerance: Largest allowed holdout log-loss increase
+        promote: False to evaluate without writing anything
+        nthread: XGBoost threads (0: all cores)
+
+    Returns:
+        RefreshResult
+    """
+    start = time.perf_counter()
+    model_path, state_dir = Path(model_path), Path(state_dir)
+    calibrator_path = Path(calibrator_path) if calibrator_path is not None else None
+    booster, calibrator = _current_model(model_path, calibrator_path, state_dir)
+
+    seen_through = booster.attr(LIVE_THROUGH_ATTR) or base_through
+    # Only games whose market / injury features were recorded when served
+    games = live.dropna(subset=SERVED_COLS).sort_values("game_date", kind="stable")
+    if seen_through is not None:
+        games = games[games["game_date"] > pd.Timestamp(seen_through)]
+
+    result = RefreshResult(league, len(games), 0, booster.num_boosted_rounds(),
+                           live_through=str(seen_through)[:10] if seen_through is not None else None)
+    if len(games) < min_new_games:
+        result.reason = f"{len(games)} new games (< {min_new_games})"
+        result.seconds = time.perf_counter() - start
+        return result
+
+    X_new = np.ascontiguousarray(games[FEATURE_COLS].to_numpy(dtype=np.float32))
+    y_new = games[TARGET_COL].to_numpy(dtype=np.float32)
+    candidate = continue_boosting(booster, X_new, y_new, rounds, nthread=nthread)
+    candidate_calibrator = fit_calibrator(candidate, data)
+
+    X_test, y_test = data.X["test"], data.y["test"]
+    result.rounds = rounds
+    result.n_trees = candidate.num_boosted_rounds()
+    result.current_log_loss = _calibrated_loss(booster, calibrator, X_test, y_test)
+    result.candidate_log_loss = _calibrated_loss(candidate, candidate_calibrator, X_test, y_test)
+
+    if result.log_loss_delta > tolerance:
+        result.reason = f"holdout log loss regressed by {result.log_loss_delta:+.5f}"
+    elif not promote:
+        result.reason = "not promoted (evaluation only)"
+    else:
+        live_through = pd.Timestamp(games["game_date"].max()).date().isoformat()
+        try:
+            promote_refreshed(state_dir, candidate, candidate_calibrator, model_path, live_through)
+        except ValueError as e:
+            result.reason = f"not promoted: {e}"
+        else:
+            result.promoted = True
+            result.live_through = live_through
+            result.reason = "promoted"
+
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def refresh_league(
+    league: str,
+    model_path: Union[str, Path],
+    calibrator_path: Optional[Union[str, Path]],
+    cache_dir: Union[str, Path],
+    state_dir: Union[str, Path],
+    **kwargs,
+) -> RefreshResult:
+    """
+    refresh_model() with the league's cached splits and recorded live games.
+
+    Args:
+        league: League name
+        model_path: Configured (base) model
+        calibrator_path: Configured calibrator; ignored when it does not exist
+        cache_dir: DataCache directory for the val / test splits
+        state_dir: League state directory (live games, refreshed model)
+        **kwargs: Passed on to refresh_model (rounds, tolerance, promote, ...)
+
+    Returns:
+        RefreshResult
+
+    Raises:
+        FileNotFoundError: No model, or no feature table for the splits
+    """
+    model_path = Path(model_path)
+    if not model_path.exists():
+        raise FileNotFoundError(f"Model not found at {model_path}")
+    if not has_feature_table(league):
+        raise FileNotFoundError(f"{league.upper()}: no features_with_injuries table for the val / test splits")
+    if calibrator_path is not None and not Path(calibrator_path).exists():
+        calibrator_path = None
+
+    data = DataCache(Path(cache_dir)).load(league)
+    base_through = read_frame("features_with_injuries", league, columns=["game_date"])["game_date"].max()
+    return refresh_model(league, model_path, calibrator_path, data, load_live_games(state_dir), state_dir,
+                         base_through=base_through, **kwargs)
+
+
+def refresh_report(results: List[RefreshResult]) -> str:
+    """One line per league."""
+    lines = []
+    for r in results:
+        if r.log_loss_delta is None:
+            lines.append(f"{r.league.upper()}: skipped, {r.reason} ({r.seconds:.1f}s)")
+            continue
+        mark = "✓" if r.promoted else "⚠"
+        lines.append(
+            f"{mark} {r.league.upper()}: {r.new_games} new games, +{r.rounds} trees ({r.n_trees} total), "
+            f"holdout log loss {r.current_log_loss:.4f} -> {r.candidate_log_loss:.4f} "
+            f"({r.log_loss_delta:+.5f}); {r.reason} ({r.seconds:.1f}s)"
+        )
+    return "\n".join(lines)
@@ -89,6 +89,7 @@ class OddsClient:
         api_key: Optional[str] = None,
         team_mapper: Optional[TeamMapper] = None,
         sport_key: str = "basketball_nba",
+        session: Optional[requests.Session] = None,
     ):
         """
         Initialize OddsClient.
@@ -97,12 +98,14 @@ class OddsClient:
             api_key: The Odds API key. If None, reads from ODDS_API_KEY env var.
             team_mapper: TeamMapper for converting names to NBA IDs.
             sport_key: The sport key for The Odds API.
+            session: HTTP session to share with other clients. If None, a
+                     new one is created.
         """
         self.api_key = api_key or os.environ.get("ODDS_API_KEY", "")
         self.team_mapper = team_mapper or TeamMapper()
         self.sport_key = sport_key
         
-        self._session = requests.Session()
+        self._session = session or requests.Session()
         self._session.headers.update({
             "Accept": "application/json",
         })
@@ -0,0 +1,175 @@
+"""
+Training-serving parity check.
+
+The training table is built offline by core/feature_pipeline.py; at serving
+time FeatureBuilder computes the same 31 columns from EloTracker and
+StatsTracker. This module replays the serving trackers over a league's whole
+history (day by day, as the daily job would have seen it) to produce the
+serving-side feature matrix, and diffs it column by column against the
+training table so skew (defaults, rest-day rules, Elo parameters, odds
+joins) shows up before it costs accuracy.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .backtest import GAME_COLUMNS, odds_lookup, walk_slates
+from .elo_engine import EloParams
+from .elo_tracker import EloTracker
+from .feature_builder import FEATURE_COLS, FeatureBuilder
+from .game_processor import GameProcessor
+from .stats_tracker import StatsTracker
+
+
+# Values closer than this are treated as equal (float noise between the
+# prefix-sum means offline and the deque sums in StatsTracker)
+DEFAULT_ATOL = 1e-9
+
+
+def serving_features(
+    games: pd.DataFrame,
+    elo_params: EloParams,
+    odds: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    Feature matrix the serving trackers produce over a game history.
+
+    Starts from empty trackers and walks every game day in order: the day's
+    rows come from FeatureBuilder before its results are applied through
+    GameProcessor; Elo is regressed at season changes.
+
+    Args:
+        games: Game history (GAME_COLUMNS), any order
+        elo_params: League Elo parameters
+        odds: Optional odds table (see backtest.odds_lookup)
+
+    Returns:
+        DataFrame with game_id, game_date, season_id and FEATURE_COLS, one
+        row per input game in input order
+    """
+    frame = games[GAME_COLUMNS].copy()
+    frame["game_date"] = pd.to_datetime(frame["game_date"])
+    frame["season_id"] = frame["season_id"].astype(int)
+    order = np.argsort(frame["game_date"].to_numpy(), kind="stable")
+    ordered = frame.iloc[order].reset_index(drop=True)
+
+    elo_tracker = EloTracker(params=elo_params)
+    stats_tracker = StatsTracker()
+    feature_builder = FeatureBuilder(elo_tracker, stats_tracker)
+    processor = GameProcessor(elo_tracker, stats_tracker, team_mapper=None)
+
+    X_sorted = np.empty((len(ordered), len(FEATURE_COLS)), dtype=np.float64)
+    for _ in walk_slates(ordered, feature_builder, processor, X_sorted, odds_lookup(odds)):
+        pass
+
+    X = np.empty_like(X_sorted)
+    X[order] = X_sorted
+    out = frame[["game_id", "game_date", "season_id"]].reset_index(drop=True)
+    return pd.concat([out, pd.DataFrame(X, columns=FEATURE_COLS)], axis=1)
+
+
+def compare_features(
+    serving: pd.DataFrame,
+    training: pd.DataFrame,
+    columns: Sequence[str] = FEATURE_COLS,
+    atol: float = DEFAULT_ATOL,
+) -> pd.DataFrame:
+    """
+    Column-by-column diff of two row-aligned feature tables.
+
+    Args:
+        serving: Serving-side features (serving_features())
+        training: Training table rows for the same games, same order
+        columns: Columns to compare
+        atol: Absolute tolerance
+
+    Returns:
+        DataFrame with one row per column: mismatches, mismatch_rate,
+        nan_training / nan_serving (NaN on one side only), max_abs_diff,
+        mean_abs_diff (over rows where both are numbers), and first_row
+        (position of the first mismatch, -1 if none); sorted by mismatches
+
+    Raises:
+        ValueError: If the tables differ in length or game dates
+    """
+    if len(serving) != len(training):
+        raise ValueError(f"row count differs: serving {len(serving)}, training {len(training)}")
+    if "game_date" in serving.columns and "game_date" in training.columns:
+        same_dates = (pd.to_datetime(serving["game_date"]).to_numpy()
+                      == pd.to_datetime(training["game_date"]).to_numpy())
+        if not same_dates.all():
+            raise ValueError(f"tables are not row-aligned (first date mismatch at row "
+                             f"{int(np.argmin(same_dates))})")
+
+    rows = []
+    for col in columns:
+        s = serving[col].to_numpy(dtype=np.float64)
+        t = training[col].to_numpy(dtype=np.float64)
+        s_nan, t_nan = np.isnan(s), np.isnan(t)
+        both = ~s_nan & ~t_nan
+        diff = np.abs(s - t, where=both, out=np.zeros_like(s))
+        mismatch = (s_nan != t_nan) | (both & (diff > atol))
+        n_bad = int(mismatch.sum())
+        rows.append({
+            "column": col,
+            "mismatches": n_bad,
+            "mismatch_rate": n_bad / len(s) if len(s) else 0.0,
+            "nan_training": int((t_nan & ~s_nan).sum()),
+            "nan_serving": int((s_nan & ~t_nan).sum()),
+            "max_abs_diff": float(diff.max()) if both.any() else 0.0,
+            "mean_abs_diff": float(diff[both].mean()) if both.any() else 0.0,
+            "first_row": int(np.argmax(mismatch)) if n_bad else -1,
+        })
+    report = pd.DataFrame(rows)
+    return report.sort_values(["mismatches", "max_abs_diff"], ascending=False, kind="stable").reset_index(drop=True)
+
+
+def mismatch_examples(
+    serving: pd.DataFrame,
+    training: pd.DataFrame,
+    column: str,
+    n: int = 5,
+    atol: float = DEFAULT_ATOL,
+) -> pd.DataFrame:
+    """First ``n`` rows where ``column`` differs, with both values side by side."""
+    s = serving[column].to_numpy(dtype=np.float64)
+    t = training[column].to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        bad = (np.isnan(s) != np.isnan(t)) | (np.abs(s - t) > atol)
+    rows = np.flatnonzero(bad)[:n]
+    keys = [c for c in ("game_id", "game_date", "season_id") if c in serving.columns]
+    out = serving.iloc[rows][keys].copy()
+    out["serving"] = s[rows]
+    out["training"] = t[rows]
+    return out.reset_index().rename(columns={"index": "row"})
+
+
+def run_parity(
+    games: pd.DataFrame,
+    training: pd.DataFrame,
+    elo_params: EloParams,
+    odds: Optional[pd.DataFrame] = None,
+    atol: float = DEFAULT_ATOL,
+) -> tuple[pd.DataFrame, pd.DataFrame, float]:
+    """
+    Replay the serving trackers and diff against the training table.
+
+    Args:
+        games: Game history the training table was built from, same row order
+        training: Training feature table
+        elo_params: League Elo parameters
+        odds: Optional odds table
+        atol: Absolute tolerance
+
+    Returns:
+        (serving feature matrix, column report, replay seconds)
+    """
+    start = time.perf_counter()
+    serving = serving_features(games, elo_params, odds)
+    elapsed = time.perf_counter() - start
+    return serving, compare_features(serving, training, atol=atol), elapsed
@@ -0,0 +1,313 @@
+"""
+Content-hashed stage runner for the data-prep / training scripts.
+
+A Stage is one script invocation with declared input files, output files,
+code files and parameters. Before running a stage the runner computes its
+fingerprint, a hash over:
+
+    - the content of every input file (optional inputs hash as "missing")
+    - the content of the script and any declared code dependencies
+    - the stage parameters and script arguments
+
+If the fingerprint matches the one recorded in the manifest after the last
+successful run, and every output still exists with the recorded content,
+the stage is skipped. Because downstream stages hash the *content* of
+upstream outputs, a rerun that produces byte-identical files stops the
+cascade there; a parameter change only redoes the stages it actually
+affects.
+
+Each Pipeline (one league) runs its stages in dependency order; separate
+pipelines are independent and run in parallel.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+
+_MISSING = "missing"
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline."""
+    name: str
+    script: Path                            # Python script, run from the pipeline root
+    outputs: List[Path]
+    args: List[str] = field(default_factory=list)
+    inputs: List[Path] = field(default_factory=list)
+    optional_inputs: List[Path] = field(default_factory=list)
+    code: List[Path] = field(default_factory=list)      # modules the script relies on
+    params: dict = field(default_factory=dict)
+
+    @property
+    def command(self) -> List[str]:
+        return [sys.executable, str(self.script), *self.args]
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage in a run."""
+    pipeline: str
+    stage: str
+    status: str                 # "ran", "skipped", "would run", "failed", "blocked"
+    seconds: float = 0.0
+    message: str = ""
+
+
+class FileHasher:
+    """
+    SHA-256 of file contents, memoized by (size, mtime_ns).
+
+    The memo is persisted with the manifest so unchanged multi-MB CSVs are
+    not re-read on every run.
+    """
+
+    def __init__(self, memo: Optional[dict] = None):
+        self._memo: Dict[str, list] = dict(memo or {})
+        self._lock = threading.Lock()
+
+    def hash(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return _MISSING
+        key = str(path.resolve())
+        stamp = [st.st_size, st.st_mtime_ns]
+        with self._lock:
+            cached = self._memo.get(key)
+        if cached is not None and cached[:2] == stamp:
+            return cached[2]
+
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock:
+            self._memo[key] = stamp + [digest]
+        return digest
+
+    def memo(self) -> dict:
+        with self._lock:
+            return dict(self._memo)
+
+
+class Manifest:
+    """
+    Fingerprints and output hashes of the last successful run of each stage,
+    stored as JSON (one file per pipeline).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.stages: Dict[str, dict] = {}
+        self.file_memo: dict = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.stages = data.get("stages", {})
+                self.file_memo = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+
+    def save(self, file_memo: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.stages, "files": file_memo}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+class Pipeline:
+    """Stages for one league, run in dependency order."""
+
+    def __init__(self, name: str, stages: Sequence[Stage], root: Path, state_dir: Path):
+        """
+        Initialize pipeline.
+
+        Args:
+            name: Pipeline name (e.g. league)
+            stages: Stages; dependencies are inferred from inputs/outputs
+            root: Working directory for commands; relative paths resolve here
+            state_dir: Directory for the manifest and stage logs
+        """
+        self.name = name
+        self.root = Path(root)
+        self.state_dir = Path(state_dir)
+        self.stages = self._toposort(list(stages))
+        self.manifest = Manifest(self.state_dir / f"{name}.json")
+        self.hasher = FileHasher(self.manifest.file_memo)
+
+    def _abs(self, path: Path) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() else self.root / path
+
+    def _toposort(self, stages: List[Stage]) -> List[Stage]:
+        producer = {}
+        for stage in stages:
+            for out in stage.outputs:
+                producer[self._abs(out)] = stage.name
+        deps = {
+            s.name: {producer[self._abs(p)] for p in s.inputs + s.optional_inputs
+                     if self._abs(p) in producer and producer[self._abs(p)] != s.name}
+            for s in stages
+        }
+        ordered, done = [], set()
+        while len(ordered) < len(stages):
+            ready = [s for s in stages if s.name not in done and deps[s.name] <= done]
+            if not ready:
+                raise ValueError(f"{self.name}: dependency cycle among stages")
+            for s in ready:
+                ordered.append(s)
+                done.add(s.name)
+        return ordered
+
+    def dependencies(self) -> Dict[str, set]:
+        """Stage name -> names of the stages it (transitively) depends on."""
+        producer = {self._abs(o): s.name for s in self.stages for o in s.outputs}
+        result: Dict[str, set] = {}
+        for s in self.stages:
+            direct = {producer[self._abs(p)] for p in s.inputs + s.optional_inputs
+                      if self._abs(p) in producer}
+            result[s.name] = set(direct)
+            for d in direct:
+                result[s.name] |= result.get(d, set())
+        return result
+
+    def fingerprint(self, stage: Stage) -> str:
+        h = hashlib.sha256()
+        h.update(json.dumps({"args": stage.args, "params": stage.params},
+                            sort_keys=True, default=str).encode())
+        for group in (stage.inputs, stage.optional_inputs, [stage.script], stage.code):
+            for path in group:
+                h.update(str(path).encode())
+                h.update(self.hasher.hash(self._abs(path)).encode())
+        return h.hexdigest()
+
+    def _up_to_date(self, stage: Stage, fingerprint: str) -> bool:
+        record = self.manifest.stages.get(stage.name)
+        if not record or record.get("fingerprint") != fingerprint:
+            return False
+        outputs = record.get("outputs", {})
+        return all(
+            outputs.get(str(out)) == self.hasher.hash(self._abs(out)) != _MISSING
+            for out in stage.outputs
+        )
+
+    def run(
+        self,
+        force: Sequence[str] = (),
+        dry_run: bool = False,
+        until: Optional[str] = None,
+    ) -> List[StageResult]:
+        """
+        Run out-of-date stages.
+
+        Args:
+            force: Stage names to run even if up to date ("all" for every stage)
+            dry_run: Only report which stages would run
+            until: Stop after this stage (and what it depends on)
+
+        Returns:
+            One StageResult per considered stage
+        """
+        upstream = self.dependencies()
+        stages = self.stages
+        if until is not None:
+            keep = upstream.get(until, set()) | {until}
+            stages = [s for s in stages if s.name in keep]
+
+        results: List[StageResult] = []
+        dirty: set = set()  # stages that would run in a dry run
+        for stage in stages:
+            pending = bool(upstream.get(stage.name, set()) & dirty)
+            missing = [str(p) for p in stage.inputs if not self._abs(p).exists()]
+            if missing and not pending and "all" not in force and stage.name not in force:
+                if all(self._abs(out).exists() for out in stage.outputs):
+                    # Source data not on this machine; the committed outputs stand in
+                    results.append(StageResult(self.name, stage.name, "skipped",
+                                               message="inputs unavailable, using existing outputs"))
+                    continue
+                results.append(StageResult(self.name, stage.name, "blocked",
+                                           message=f"missing input: {', '.join(missing)}"))
+                break
+            if missing and not dry_run:
+                results.append(StageResult(self.name, stage.name, "blocked",
+                                           message=f"missing input: {', '.join(missing)}"))
+                break
+
+            fingerprint = self.fingerprint(stage)
+            forced = "all" in force or stage.name in force
+            if not forced and not pending and self._up_to_date(stage, fingerprint):
+                results.append(StageResult(self.name, stage.name, "skipped"))
+                continue
+
+            if dry_run:
+                dirty.add(stage.name)
+                results.append(StageResult(self.name, stage.name, "would run"))
+                continue
+
+            result = self._execute(stage)
+            results.append(result)
+            if result.status != "ran":
+                break
+            self.manifest.stages[stage.name] = {
+                "fingerprint": self.fingerprint(stage),
+                "outputs": {str(out): self.hasher.hash(self._abs(out)) for out in stage.outputs},
+                "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "seconds": round(result.seconds, 3),
+            }
+            self.manifest.save(self.hasher.memo())
+
+        if not dry_run:
+            self.manifest.save(self.hasher.memo())
+        return results
+
+    def _execute(self, stage: Stage) -> StageResult:
+        log_path = self.state_dir / "logs" / f"{self.name}_{stage.name}.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        with open(log_path, "w", encoding="utf-8") as log:
+            proc = subprocess.run(stage.command, cwd=self.root, stdout=log,
+                                  stderr=subprocess.STDOUT, text=True)
+        elapsed = time.perf_counter() - start
+
+        if proc.returncode != 0:
+            return StageResult(self.name, stage.name, "failed", elapsed,
+                               f"exit code {proc.returncode}, see {log_path}")
+        missing = [str(p) for p in stage.outputs if not self._abs(p).exists()]
+        if missing:
+            return StageResult(self.name, stage.name, "failed", elapsed,
+                               f"outputs not written: {', '.join(missing)}")
+        return StageResult(self.name, stage.name, "ran", elapsed)
+
+
+def run_pipelines(
+    pipelines: Sequence[Pipeline],
+    parallel: bool = True,
+    **run_kwargs,
+) -> Dict[str, List[StageResult]]:
+    """
+    Run independent pipelines, concurrently when ``parallel`` is set.
+
+    Returns:
+        Pipeline name -> its stage results
+    """
+    if not parallel or len(pipelines) <= 1:
+        return {p.name: p.run(**run_kwargs) for p in pipelines}
+    with ThreadPoolExecutor(max_workers=len(pipelines)) as pool:
+        futures = {p.name: pool.submit(p.run, **run_kwargs) for p in pipelines}
+        return {name: future.result() for name, future in futures.items()}
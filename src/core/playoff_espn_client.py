@@ -263,6 +263,7 @@ class PlayoffESPNClient:
             away_team_id=game.away_team_id,
             game_time=game.game_time,
             game_datetime=game.game_datetime,
+            event_id=game.event_id,
             series_id=series_id,
             game_number=game_number,
             higher_seed_wins=higher_seed_wins,
@@ -4,6 +4,7 @@ PlayoffStateManager: Unified state load/save for playoff tracker state.
 Mirrors StateManager but manages playoff-specific files:
   - state/playoff_bracket.json  (PlayoffSeriesTracker)
   - state/playoff_elo.json      (EloTracker, initialized from regular season Elo)
+  - state/playoff_stats.json    (StatsTracker, initialized from regular season stats)
   - state/playoff_metadata.json (round, dates, games processed)
 """
 
@@ -13,7 +14,9 @@ from datetime import datetime, date
 from pathlib import Path
 from typing import Optional, Tuple
 
+from .atomic_io import write_json_atomic
 from .elo_tracker import EloTracker
+from .state_manager import StateManager
 from .stats_tracker import StatsTracker
 from .playoff_series_tracker import PlayoffSeriesTracker
 
@@ -47,9 +50,10 @@ class PlayoffStateManager:
         self.bracket_path = self.state_dir / "playoff_bracket.json"
         self.elo_path = self.state_dir / "playoff_elo.json"
         self.metadata_path = self.state_dir / "playoff_metadata.json"
+        self.stats_path = self.state_dir / "playoff_stats.json"
 
-        # Regular season elo path (read-only, used for initialization)
-        self._regular_elo_path = self.state_dir / "elo.json"
+        # Regular season state (read-only, used for initialization)
+        self._regular_state = StateManager(self.state_dir)
 
     def _ensure_dir(self) -> None:
         """Ensure state directory exists."""
@@ -80,8 +84,7 @@ class PlayoffStateManager:
         """Save metadata file."""
         self._ensure_dir()
         metadata["version"] = self.VERSION
-        with open(self.metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+        write_json_atomic(self.metadata_path, metadata, indent=2)
 
     def exists(self) -> bool:
         """Check if playoff state files exist."""
@@ -92,26 +95,33 @@ class PlayoffStateManager:
         Load all playoff tracker state from files.
 
         For playoff Elo: loads from playoff_elo.json if it exists,
-        otherwise copies end-of-season Elo from the regular season file.
+        otherwise copies end-of-season Elo from the regular season state
+        (snapshot plus journal tail).
 
         Returns:
             Tuple of (EloTracker, StatsTracker, PlayoffSeriesTracker)
         """
+        # First run of playoffs: start from the end-of-season state, i.e. the
+        # regular-season snapshot plus the journaled games since
+        regular = None
+        if not (self.elo_path.exists() and self.stats_path.exists()) and self._regular_state.exists():
+            regular = self._regular_state.load()
+
         # Load playoff Elo (isolated copy from regular season)
         if self.elo_path.exists():
             elo_tracker = EloTracker.from_file(self.elo_path)
-        elif self._regular_elo_path.exists():
-            # First run of playoffs — copy regular season Elo as starting point
-            elo_tracker = EloTracker.from_file(self._regular_elo_path)
+        elif regular is not None:
+            elo_tracker = regular[0]
             print(f"  ℹ️  Initialized playoff Elo from regular season state")
         else:
             elo_tracker = EloTracker()
 
-        # Load regular-season rolling stats (used for early playoff predictions)
-        # Playoff games get appended to this window naturally over time
-        regular_stats_path = self.state_dir / "stats.json"
-        if regular_stats_path.exists():
-            stats_tracker = StatsTracker.from_file(regular_stats_path)
+        # Rolling stats start from the regular-season window (used for early
+        # playoff predictions); playoff games get appended to it over time
+        if self.stats_path.exists():
+            stats_tracker = StatsTracker.from_file(self.stats_path)
+        elif regular is not None:
+            stats_tracker = regular[1]
         else:
             stats_tracker = StatsTracker()
 
@@ -133,9 +143,10 @@ class PlayoffStateManager:
         """
         Save all playoff tracker state to files.
 
-        NOTE: This writes to playoff_elo.json and playoff_bracket.json only.
-        The regular season stats.json is also updated (playoff games flow
-        into the rolling window naturally).
+        NOTE: This writes to playoff_elo.json, playoff_stats.json and
+        playoff_bracket.json only. The regular season state generations are
+        never modified (playoff games flow into the rolling window copied
+        from them).
 
         Args:
             elo_tracker: Playoff EloTracker instance to save
@@ -155,11 +166,10 @@ class PlayoffStateManager:
         # Save series tracker (bracket state)
         series_tracker.save(self.bracket_path)
 
-        # Update shared rolling stats (playoff games extend the regular window)
-        regular_stats_path = self.state_dir / "stats.json"
+        # Update rolling stats (playoff games extend the regular window)
         if create_backup:
-            self._create_backup(regular_stats_path)
-        stats_tracker.save(regular_stats_path)
+            self._create_backup(self.stats_path)
+        stats_tracker.save(self.stats_path)
 
         # Update metadata
         metadata = self._load_metadata()
@@ -2,20 +2,42 @@
 Predictor: Main inference class for NBA game predictions.
 """
 
+import time
 from datetime import datetime, date
 from pathlib import Path
 from typing import Optional, Union
 
-import joblib
 import numpy as np
-from xgboost import XGBClassifier
 
+from .model_artifacts import (
+    get_artifact_cache,
+    joblib,
+    resolve_calibrator_path,
+    resolve_model_path,
+    variant_paths,
+    xgboost,
+)
 from .elo_tracker import EloTracker
 from .stats_tracker import StatsTracker
 from .feature_builder import FeatureBuilder
 from .confidence_scorer import ConfidenceScorer
 
 
+def preload_model_libraries() -> float:
+    """
+    Import xgboost and joblib now instead of on first Predictor construction.
+
+    Lets a caller overlap the import with other start-up work.
+
+    Returns:
+        Seconds spent importing (0.0 if already imported)
+    """
+    start = time.perf_counter()
+    xgboost._lazy_load()
+    joblib._lazy_load()
+    return time.perf_counter() - start
+
+
 def confidence_tier(prob: float) -> str:
     """
     Map probability to interpretable confidence tier.
@@ -49,6 +71,7 @@ class Predictor:
         model_path: Union[str, Path],
         calibrator_path: Optional[Union[str, Path]] = None,
         confidence_scorer: Optional[ConfidenceScorer] = None,
+        variant: str = "default",
     ):
         """
         Initialize Predictor with model artifacts.
@@ -59,19 +82,30 @@ class Predictor:
                             If provided, predictions are calibrated.
             confidence_scorer: Optional ConfidenceScorer instance.
                              If provided, confidence scores are calculated.
+            variant: "default", or "fast" for the smaller model exported
+                     next to model_path (falls back to default if absent)
         """
-        self.model_path = Path(model_path)
-        self.calibrator_path = Path(calibrator_path) if calibrator_path else None
+        self.model_path, self.calibrator_path, self.variant = variant_paths(
+            model_path, calibrator_path, variant
+        )
         self.confidence_scorer = confidence_scorer
 
-        # Load XGBoost model
-        self._model = XGBClassifier()
-        self._model.load_model(str(self.model_path))
+        # Seconds spent in each load stage (reported by API warm-up)
+        self.load_timings: dict = {}
+
+        # Load XGBoost model and calibrator through the process-level cache,
+        # preferring UBJSON / lookup-table exports when they are up to date.
+        cache = get_artifact_cache()
+        start = time.perf_counter()
+        self._model = cache.get_model(resolve_model_path(self.model_path))
+        self.load_timings["model"] = time.perf_counter() - start
 
         # Load calibrator if provided
         self._calibrator = None
         if self.calibrator_path and self.calibrator_path.exists():
-            self._calibrator = joblib.load(self.calibrator_path)
+            start = time.perf_counter()
+            self._calibrator = cache.get_calibrator(resolve_calibrator_path(self.calibrator_path))
+            self.load_timings["calibrator"] = time.perf_counter() - start
 
     def predict_proba(self, features: np.ndarray) -> float:
         """
@@ -90,9 +124,13 @@ class Predictor:
         # Get raw prediction
         proba = self._model.predict_proba(features)[:, 1]
 
-        # Apply calibration if available
+        # Apply calibration if available (compiled calibrators map the
+        # probabilities directly; raw sklearn ones go through predict_proba)
         if self._calibrator is not None:
-            proba = self._calibrator.predict_proba(proba.reshape(-1, 1))[:, 1]
+            if hasattr(self._calibrator, "calibrate"):
+                proba = self._calibrator.calibrate(proba)
+            else:
+                proba = self._calibrator.predict_proba(proba.reshape(-1, 1))[:, 1]
 
         # Return single value if single input
         if len(proba) == 1:
@@ -234,5 +272,5 @@ class Predictor:
 
     def __repr__(self) -> str:
         cal_status = "calibrated" if self.is_calibrated else "uncalibrated"
-        return f"Predictor({self.model_path.name}, {cal_status})"
+        return f"Predictor({self.model_path.name}, {cal_status}, {self.variant})"
 
@@ -0,0 +1,297 @@
+"""
+ScheduleStore: A league's season schedule, ingested once and kept fresh.
+
+The store holds every game of the remaining season (and whatever past days
+were ingested) keyed by ESPN event id, plus the time each day was last
+fetched. ESPN's scoreboard takes a date range (``dates=YYYYMMDD-YYYYMMDD``),
+so a whole season is ingested in a handful of requests; afterwards refresh()
+only re-fetches days that have gone stale:
+
+  - settled past days never (their games are final),
+  - the next LOOKAHEAD_DAYS after NEAR_MAX_AGE (times and postponements),
+  - later days after FAR_MAX_AGE.
+
+Stale days are grouped into contiguous runs and fetched RANGE_CHUNK_DAYS at
+a time. A response with RANGE_LIMIT events may have been cut off by ESPN;
+such a chunk is split in half and fetched again (a single day that is
+still cut off only adds games and stays stale). Saved as schedule.json
+next to the league's state:
+
+    {"league": "nba",
+     "fetched": {"20260110": 1767990000.0, ...},
+     "games": {"401810123": ["2026-01-10", "19:30", "Scheduled",
+                             1610612738, 1610612748, "Boston Celtics", "Miami Heat", 2]}}
+
+With the schedule, rest days can be projected forward: a team's previous
+game before a future date may be one that has not been played yet, which
+StatsTracker.get_rest_days (past games only) cannot see.
+"""
+
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .atomic_io import write_json_atomic
+from .espn_client import ESPNClient, GameResult
+from .league_config import season_id_for
+from .scoreboard_archive import date_key
+
+
+SCHEDULE_FILE = "schedule.json"
+
+LOOKAHEAD_DAYS = 7
+NEAR_MAX_AGE = 6 * 3600.0
+FAR_MAX_AGE = 3 * 86400.0
+RANGE_CHUNK_DAYS = 31
+RANGE_LIMIT = 1000
+MAX_REST_DAYS = 14
+
+# Last day of a season (month, day) in its final calendar year
+SEASON_END = {"nba": (6, 30), "wnba": (10, 31), "cbb": (4, 15)}
+
+# Stored game row layout (SEASON_TYPE: GameResult.season_type; missing in older files)
+DATE, TIME, STATUS, HOME_ID, AWAY_ID, HOME, AWAY, SEASON_TYPE = range(8)
+
+DateLike = Union[str, date, datetime]
+
+
+def _as_date(value: DateLike) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value[:10], "%Y-%m-%d").date()
+
+
+def season_end(today: DateLike, league: str = "nba") -> date:
+    """Last day of the season in progress (or starting next) on a date."""
+    today = _as_date(today)
+    year = int(str(season_id_for(today, league))[1:])
+    if league == "nba":
+        year += 1          # NBA seasons are keyed by their start year
+    month, day = SEASON_END.get(league, SEASON_END["nba"])
+    return date(year, month, day)
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class ScheduleStore:
+    """Season schedule of one league, refreshed incrementally from ESPN."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        league: str = "nba",
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: schedule.json path (loaded if it exists)
+            league: League key (decides the season end)
+            clock: Time source (tests)
+        """
+        self.path = Path(path)
+        self.league = league
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fetched: Dict[str, float] = {}
+        self._games: Dict[str, list] = {}
+        self._by_team: Optional[Dict[int, List[date]]] = None
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._fetched = data.get("fetched", {})
+            self._games = data.get("games", {})
+
+    # =========================================================================
+    # Refresh
+    # =========================================================================
+
+    def stale_days(self, start: DateLike, end: DateLike, today: Optional[date] = None) -> List[date]:
+        """
+        Days in [start, end] that need fetching.
+
+        Args:
+            start: First day
+            end: Last day
+            today: Reference date. Default: date.today()
+        """
+        today = today or date.today()
+        now = self._clock()
+        stale = []
+        for day in _days(_as_date(start), _as_date(end)):
+            fetched_at = self._fetched.get(date_key(day))
+            if fetched_at is None:
+                stale.append(day)
+            elif day < today:
+                # Past days are settled once fetched after they were over
+                if fetched_at < datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp():
+                    stale.append(day)
+            else:
+                max_age = NEAR_MAX_AGE if (day - today).days < LOOKAHEAD_DAYS else FAR_MAX_AGE
+                if now - fetched_at >= max_age:
+                    stale.append(day)
+        return stale
+
+    def refresh(
+        self,
+        client: ESPNClient,
+        start: DateLike,
+        end: DateLike,
+        today: Optional[date] = None,
+    ) -> int:
+        """
+        Re-fetch the stale days of [start, end].
+
+        Args:
+            client: ESPNClient of the league
+            start: First day
+            end: Last day
+            today: Reference date. Default: date.today()
+
+        Returns:
+            Number of ESPN requests made
+        """
+        with self._lock:
+            stale = self.stale_days(start, end, today)
+            if not stale:
+                return 0
+
+            # Contiguous runs of stale days, at most RANGE_CHUNK_DAYS long
+            chunks: List[Tuple[date, date]] = []
+            for day in stale:
+                if chunks and (day - chunks[-1][1]).days == 1 and (day - chunks[-1][0]).days < RANGE_CHUNK_DAYS:
+                    chunks[-1] = (chunks[-1][0], day)
+                else:
+                    chunks.append((day, day))
+
+            requests = 0
+            while chunks:
+                chunk_start, chunk_end = chunks.pop(0)
+                games = client.get_games_range(chunk_start, chunk_end, limit=RANGE_LIMIT)
+                requests += 1
+                truncated = len(games) >= RANGE_LIMIT
+                if truncated and chunk_start < chunk_end:
+                    middle = chunk_start + timedelta(days=(chunk_end - chunk_start).days // 2)
+                    chunks[:0] = [(chunk_start, middle), (middle + timedelta(days=1), chunk_end)]
+                    continue
+
+                fetched_at = self._clock()
+                lo, hi = chunk_start.isoformat(), chunk_end.isoformat()
+                # Swapped in whole, so readers never see a half-updated dict.
+                # A cut-off response cannot tell which stored games are gone.
+                updated = {k: g for k, g in self._games.items() if truncated or not lo <= g[DATE] <= hi}
+                for game in games:
+                    if game.event_id:
+                        updated[game.event_id] = [
+                            game.game_date, game.game_time, game.status,
+                            game.home_team_id, game.away_team_id, game.home_team, game.away_team,
+                            game.season_type,
+                        ]
+                self._games = updated
+                if truncated:
+                    print(f"⚠ ESPN returned {len(games)} games for {lo} (limit {RANGE_LIMIT}); "
+                          f"day left stale")
+                    continue
+                for day in _days(chunk_start, chunk_end):
+                    self._fetched[date_key(day)] = fetched_at
+            self._by_team = None
+            return requests
+
+    def ingest(self, client: ESPNClient, today: Optional[date] = None) -> int:
+        """
+        Fetch (or refresh) the rest of the season, from today to its end.
+
+        Returns:
+            Number of ESPN requests made
+        """
+        today = today or date.today()
+        return self.refresh(client, today, season_end(today, self.league), today)
+
+    def save(self) -> None:
+        """Save to schedule.json (atomically)."""
+        with self._lock:
+            data = {"league": self.league, "fetched": self._fetched, "games": self._games}
+            write_json_atomic(self.path, data, separators=(",", ":"))
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def games(self, start: DateLike, end: DateLike, scheduled_only: bool = True) -> List[GameResult]:
+        """
+        Games in [start, end], ordered by date and time.
+
+        Args:
+            start: First day
+            end: Last day
+            scheduled_only: Leave out games that are final or under way
+        """
+        lo, hi = _as_date(start).isoformat(), _as_date(end).isoformat()
+        games = []
+        for event_id, g in self._games.items():
+            if lo <= g[DATE] <= hi:
+                game = GameResult(g[DATE], g[HOME], g[AWAY], 0, 0, g[STATUS],
+                                  home_team_id=g[HOME_ID], away_team_id=g[AWAY_ID],
+                                  game_time=g[TIME], event_id=event_id,
+                                  season_type=g[SEASON_TYPE] if len(g) > SEASON_TYPE else None)
+                if not scheduled_only or game.is_scheduled:
+                    games.append(game)
+        games.sort(key=lambda g: (g.game_date, g.game_time or "", g.event_id))
+        return games
+
+    def _team_dates(self) -> Dict[int, List[date]]:
+        by_team = self._by_team
+        if by_team is None:
+            by_team = {}
+            for g in self._games.values():
+                day = _as_date(g[DATE])
+                for team_id in (g[HOME_ID], g[AWAY_ID]):
+                    if team_id is not None:
+                        by_team.setdefault(int(team_id), []).append(day)
+            for dates in by_team.values():
+                dates.sort()
+            self._by_team = by_team
+        return by_team
+
+    def previous_game(self, team_id: int, game_date: DateLike) -> Optional[date]:
+        """Date of a team's last scheduled game before game_date, or None."""
+        game_date = _as_date(game_date)
+        previous = None
+        for day in self._team_dates().get(int(team_id), ()):
+            if day >= game_date:
+                break
+            previous = day
+        return previous
+
+    def rest_days(self, stats_tracker, team_id: int, game_date: DateLike) -> Tuple[int, bool]:
+        """
+        Projected rest before a game: the later of the team's last played
+        game (stats_tracker) and its last scheduled game before the date.
+
+        Args:
+            stats_tracker: StatsTracker of the current state
+            team_id: Team ID
+            game_date: Date of the game
+
+        Returns:
+            Tuple of (rest_days, is_back_to_back), as StatsTracker.get_rest_days
+        """
+        rest, b2b = stats_tracker.get_rest_days(team_id, _as_date(game_date))
+        previous = self.previous_game(team_id, game_date)
+        if previous is not None:
+            scheduled_rest = max(0, min(MAX_REST_DAYS, (_as_date(game_date) - previous).days))
+            if scheduled_rest < rest:
+                rest, b2b = scheduled_rest, scheduled_rest == 1
+        return rest, b2b
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __repr__(self) -> str:
+        return f"ScheduleStore({self.league}, {len(self._games)} games, {len(self._fetched)} days)"
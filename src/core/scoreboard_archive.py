@@ -0,0 +1,233 @@
+"""
+Persistent archive of raw ESPN scoreboard responses.
+
+Every ESPN consumer (ESPNClient and everything built on it, plus the AI
+context generator) reads scoreboards through one on-disk archive, keyed by
+league and date:
+
+    <root>/objects/ab/abcdef...json.gz    response bodies, content-addressed
+                                          by the SHA-256 of the JSON
+    <root>/<league_slug>/YYYYMMDD.json    ref: {sha256, fetched_at, final}
+
+A day is *final* once it is in the past and every event on it is settled
+(completed, postponed or canceled). Final days are immutable: they are
+fetched once and served from disk forever. Any other day (today, future
+days, past days with unsettled games) is re-fetched once its ref is older
+than the live TTL.
+
+Writes are atomic, so concurrent readers never see partial files; a ref
+whose object has gone missing is simply a cache miss. With offline=True
+nothing is fetched, which makes an archive directory a replay fixture:
+reruns and tests see exactly the responses recorded earlier.
+
+Environment:
+    ESPN_ARCHIVE_DIR       archive root (default data/cache/espn)
+    ESPN_ARCHIVE=0         disable the shared archive (always fetch)
+    ESPN_ARCHIVE_LIVE_TTL  seconds a non-final day is served (default 60)
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from .atomic_io import write_bytes_atomic, write_json_atomic
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_ARCHIVE_DIR = PROJECT_ROOT / "data" / "cache" / "espn"
+OBJECTS_DIR = "objects"
+LIVE_TTL = 60.0
+
+# ESPN status names that settle a game without a final score
+_SETTLED_STATUSES = {"STATUS_POSTPONED", "STATUS_CANCELED", "STATUS_FORFEIT"}
+
+
+def date_key(game_date: Union[str, date, datetime]) -> str:
+    """YYYYMMDD, as ESPN's ``dates`` parameter takes it."""
+    if isinstance(game_date, (date, datetime)):
+        return game_date.strftime("%Y%m%d")
+    return game_date.replace("-", "")[:8]
+
+
+def is_final_day(scoreboard: dict, day: str, today: Optional[date] = None) -> bool:
+    """
+    Whether a scoreboard can no longer change.
+
+    Args:
+        scoreboard: Raw ESPN scoreboard JSON
+        day: Its date (YYYYMMDD)
+        today: Reference date. Default: date.today()
+
+    Returns:
+        True if the day is in the past and every event on it is settled
+    """
+    today = today or date.today()
+    if day >= today.strftime("%Y%m%d"):
+        return False
+    for event in scoreboard.get("events", []):
+        status = event.get("status", {}).get("type", {})
+        if not (status.get("completed") or status.get("state") == "post"
+                or status.get("name") in _SETTLED_STATUSES):
+            return False
+    return True
+
+
+class ScoreboardArchive:
+    """Read-through, content-addressed store of scoreboard responses."""
+
+    def __init__(
+        self,
+        root: Union[str, Path] = DEFAULT_ARCHIVE_DIR,
+        live_ttl: float = LIVE_TTL,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            root: Archive directory
+            live_ttl: Seconds a non-final day is served before re-fetching
+            offline: Never fetch; serve whatever is archived (replay)
+            clock: Time source (tests)
+        """
+        self.root = Path(root)
+        self.live_ttl = live_ttl
+        self.offline = offline
+        self._clock = clock
+        self._write_warned = False
+        self.hits = 0
+        self.fetches = 0
+
+    # -------------------------------------------------------------------------
+    # Paths
+    # -------------------------------------------------------------------------
+
+    def _ref_path(self, league_slug: str, day: str) -> Path:
+        return self.root / league_slug / f"{day}.json"
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.root / OBJECTS_DIR / sha256[:2] / f"{sha256}.json.gz"
+
+    # -------------------------------------------------------------------------
+    # Reads / writes
+    # -------------------------------------------------------------------------
+
+    def ref(self, league_slug: str, game_date: Union[str, date, datetime]) -> Optional[dict]:
+        """The archived ref of a day, or None."""
+        path = self._ref_path(league_slug, date_key(game_date))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def lookup(self, league_slug: str, game_date: Union[str, date, datetime]) -> Optional[dict]:
+        """Archived scoreboard of a day regardless of age, or None."""
+        ref = self.ref(league_slug, game_date)
+        return self._read_object(ref["sha256"]) if ref else None
+
+    def _read_object(self, sha256: str) -> Optional[dict]:
+        try:
+            with gzip.open(self._object_path(sha256), "rb") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def put(self, league_slug: str, game_date: Union[str, date, datetime], scoreboard: dict) -> dict:
+        """
+        Archive a scoreboard response.
+
+        Returns:
+            The new ref
+        """
+        day = date_key(game_date)
+        body = json.dumps(scoreboard, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        sha256 = hashlib.sha256(body).hexdigest()
+        ref = {"sha256": sha256, "fetched_at": self._clock(), "final": is_final_day(scoreboard, day)}
+
+        previous = self.ref(league_slug, day)
+        try:
+            object_path = self._object_path(sha256)
+            if not object_path.exists():
+                write_bytes_atomic(object_path, gzip.compress(body, mtime=0), sync_dir=False)
+            write_json_atomic(self._ref_path(league_slug, day), ref, sync_dir=False)
+        except OSError as e:
+            if not self._write_warned:
+                print(f"⚠ Scoreboard archive not writable ({self.root}): {e}")
+                self._write_warned = True
+            return ref
+
+        # A live day's superseded response is garbage (a shared object
+        # removed here is re-fetched on its next read)
+        if previous and previous["sha256"] != sha256 and not previous.get("final"):
+            self._object_path(previous["sha256"]).unlink(missing_ok=True)
+        return ref
+
+    def get(
+        self,
+        league_slug: str,
+        game_date: Union[str, date, datetime],
+        fetch: Callable[[], dict],
+    ) -> dict:
+        """
+        Scoreboard of a day: from the archive when final or still fresh,
+        otherwise from ``fetch()`` (which is then archived).
+
+        Args:
+            league_slug: ESPN league slug ("nba", "wnba", ...)
+            game_date: Date (YYYY-MM-DD, YYYYMMDD or date)
+            fetch: Returns the raw scoreboard JSON from ESPN
+
+        Returns:
+            Raw scoreboard JSON
+
+        Raises:
+            LookupError: Offline and the day is not archived
+        """
+        ref = self.ref(league_slug, game_date)
+        if ref is not None and (self.offline or ref.get("final")
+                                or self._clock() - ref.get("fetched_at", 0) < self.live_ttl):
+            data = self._read_object(ref["sha256"])
+            if data is not None:
+                self.hits += 1
+                return data
+
+        if self.offline:
+            raise LookupError(f"{league_slug} scoreboard for {date_key(game_date)} is not archived")
+
+        data = fetch()
+        self.fetches += 1
+        self.put(league_slug, game_date, data)
+        return data
+
+    def __repr__(self) -> str:
+        mode = "offline" if self.offline else f"live TTL {self.live_ttl:g}s"
+        return f"ScoreboardArchive({self.root}, {mode})"
+
+
+# =============================================================================
+# Shared instance
+# =============================================================================
+
+_default_lock = threading.Lock()
+_default: list = []
+
+
+def default_archive() -> Optional[ScoreboardArchive]:
+    """The process-wide archive (None when ESPN_ARCHIVE=0)."""
+    if os.getenv("ESPN_ARCHIVE", "1") == "0":
+        return None
+    with _default_lock:
+        if not _default:
+            _default.append(ScoreboardArchive(
+                os.getenv("ESPN_ARCHIVE_DIR", str(DEFAULT_ARCHIVE_DIR)),
+                live_ttl=float(os.getenv("ESPN_ARCHIVE_LIVE_TTL", str(LIVE_TTL))),
+            ))
+        return _default[0]
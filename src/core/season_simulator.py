@@ -0,0 +1,442 @@
+"""
+Monte Carlo simulation of the rest of a season: seeding, play-in and
+playoff odds per team.
+
+Starts from the current standings (StandingsTracker) and Elo ratings, and
+plays the remaining schedule (ScheduleStore) many times over. Simulations
+are vectorized: the state of S seasons is a set of NumPy arrays
+
+    ratings  (S, T)     Elo, updated in-simulation with the league's K / HCA
+    wins     (S, T)
+    h2h      (S, T, T)  h2h[s, a, b] = wins of a over b
+
+and the schedule is played in *rounds* (consecutive games with no team in
+two of them), so each round is a handful of array operations over all S
+seasons at once. Seasons are run in chunks of CHUNK_SIZE (bounded memory),
+each with its own random stream; the chunks are spread over a process pool.
+Results do not depend on the number of workers.
+
+Seeding ranks teams within their group (NBA conferences; the whole WNBA)
+by win percentage, then by the head-to-head record among the tied teams,
+then by a random draw. Where the league has a play-in (NBA seeds 7-10),
+it is played out with the simulated end-of-season ratings:
+
+    7 vs 8   winner is seed 7
+    9 vs 10  loser is out
+    loser(7/8) vs winner(9/10)  winner is seed 8
+
+Results are cached on disk, one file per league and iteration count,
+under a key derived from everything the simulation reads (ratings,
+standings, remaining games, Elo params, iterations, seed), i.e. per state
+version.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .atomic_io import write_json_atomic
+from .elo_tracker import EloTracker
+from .espn_client import GameResult
+from .league_config import season_id_for
+from .standings_tracker import StandingsTracker
+
+
+DEFAULT_ITERATIONS = 100_000
+CHUNK_SIZE = 10_000
+DEFAULT_SEED = 0
+
+
+@dataclass(frozen=True)
+class PlayoffFormat:
+    """How a league's regular season turns into a playoff field."""
+    groups: Optional[Dict[str, Tuple[int, ...]]]  # group -> team IDs; None: one league-wide table
+    direct: int                                    # seeds that go straight to the playoffs
+    play_in: int = 0                               # seeds after those that play in (0 or 4)
+
+
+NBA_CONFERENCES = {
+    "East": (1610612737, 1610612738, 1610612739, 1610612741, 1610612748, 1610612749, 1610612751,
+             1610612752, 1610612753, 1610612754, 1610612755, 1610612761, 1610612764, 1610612765,
+             1610612766),
+    "West": (1610612740, 1610612742, 1610612743, 1610612744, 1610612745, 1610612746, 1610612747,
+             1610612750, 1610612756, 1610612757, 1610612758, 1610612759, 1610612760, 1610612762,
+             1610612763),
+}
+
+PLAYOFF_FORMATS = {
+    "nba": PlayoffFormat(NBA_CONFERENCES, direct=6, play_in=4),
+    "wnba": PlayoffFormat(None, direct=8),
+}
+
+
+# =============================================================================
+# Inputs
+# =============================================================================
+
+@dataclass
+class SeasonInputs:
+    """Everything a worker needs, as plain arrays (cheap to pickle)."""
+    team_ids: np.ndarray      # (T,)
+    group: np.ndarray         # (T,) group index of each team
+    group_names: List[str]
+    wins: np.ndarray          # (T,) current wins
+    games: np.ndarray         # (T,) games at season end (played + remaining)
+    h2h: np.ndarray           # (T, T) current head-to-head wins
+    elo: np.ndarray           # (T,)
+    home: np.ndarray          # (G,) team index, in round order
+    away: np.ndarray          # (G,)
+    rounds: np.ndarray        # (R + 1,) offsets of the rounds into home/away
+    k_factor: float
+    hca: float
+    direct: int
+    play_in: int
+
+    @property
+    def max_group_size(self) -> int:
+        return int(np.bincount(self.group).max()) if len(self.group) else 0
+
+    def key(self, iterations: int, seed: int) -> str:
+        """Cache key: a digest of every input of the simulation."""
+        h = hashlib.sha256()
+        for arr in (self.team_ids, self.group, self.wins, self.games, self.h2h,
+                    np.round(self.elo, 4), self.home, self.away):
+            h.update(np.ascontiguousarray(arr).tobytes())
+        h.update(json.dumps([self.k_factor, self.hca, self.direct, self.play_in,
+                             iterations, seed]).encode())
+        return h.hexdigest()[:16]
+
+
+def _rounds(home: np.ndarray, away: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split games (in date order) into rounds in which no team plays twice,
+    so a round's Elo updates can be applied with one fancy-indexed add.
+    """
+    order_home, order_away, offsets = [], [], [0]
+    busy: set = set()
+    for h, a in zip(home.tolist(), away.tolist()):
+        if h in busy or a in busy:
+            offsets.append(len(order_home))
+            busy = set()
+        order_home.append(h)
+        order_away.append(a)
+        busy.update((h, a))
+    if order_home:
+        offsets.append(len(order_home))
+    return (np.asarray(order_home, dtype=np.int64), np.asarray(order_away, dtype=np.int64),
+            np.asarray(offsets, dtype=np.int64))
+
+
+def remaining_games(games: Sequence[GameResult]) -> List[GameResult]:
+    """Regular-season games of a schedule that still have to be played, in date order."""
+    left = [g for g in games if (g.is_scheduled or g.is_in_progress) and g.is_regular_season
+            and g.home_team_id is not None and g.away_team_id is not None]
+    return sorted(left, key=lambda g: (g.game_date, g.game_time or ""))
+
+
+def build_inputs(
+    league: str,
+    elo_tracker: EloTracker,
+    standings: StandingsTracker,
+    games: Sequence[GameResult],
+    playoff_format: Optional[PlayoffFormat] = None,
+    season_id: Optional[int] = None,
+) -> SeasonInputs:
+    """
+    Arrays for simulate_season().
+
+    Args:
+        league: League key ("nba", "wnba")
+        elo_tracker: Current ratings; its params give K and home court
+        standings: Current season standings
+        games: Remaining games (see remaining_games)
+        playoff_format: Default: PLAYOFF_FORMATS[league]
+        season_id: Season being simulated. Standings of another season
+                   (e.g. last season's, before opening night) are not
+                   carried over: every team starts from 0-0.
+
+    Raises:
+        ValueError: The league has no playoff format
+    """
+    fmt = playoff_format or PLAYOFF_FORMATS.get(league)
+    if fmt is None:
+        raise ValueError(f"No playoff format for league {league!r}")
+    if season_id is not None and standings.season_id != season_id:
+        standings = StandingsTracker(league)
+
+    if fmt.groups:
+        group_names = list(fmt.groups)
+        team_group = {int(t): i for i, name in enumerate(group_names) for t in fmt.groups[name]}
+    else:
+        group_names = ["League"]
+        known = set(standings.team_ids) or {t for g in games for t in (g.home_team_id, g.away_team_id)}
+        team_group = {int(t): 0 for t in known}
+
+    team_ids = np.array(sorted(team_group), dtype=np.int64)
+    index = {int(t): i for i, t in enumerate(team_ids)}
+    # Exhibitions and unknown opponents do not count
+    games = [g for g in games if g.home_team_id in index and g.away_team_id in index]
+
+    T = len(team_ids)
+    wins = np.zeros(T, dtype=np.int32)
+    played = np.zeros(T, dtype=np.int32)
+    for t, i in index.items():
+        row = standings.team(t)
+        wins[i], played[i] = row["wins"], row["games_played"]
+    h2h = np.zeros((T, T), dtype=np.int16)
+    for t in standings.team_ids:
+        if t in index:
+            for series in standings.opponents(t):
+                if series["team_b"] in index:
+                    h2h[index[t], index[series["team_b"]]] = series["team_a_wins"]
+
+    home = np.array([index[g.home_team_id] for g in games], dtype=np.int64)
+    away = np.array([index[g.away_team_id] for g in games], dtype=np.int64)
+    remaining = np.bincount(np.concatenate([home, away]), minlength=T) if games else np.zeros(T, dtype=np.int64)
+    home, away, rounds = _rounds(home, away)
+
+    return SeasonInputs(
+        team_ids=team_ids,
+        group=np.array([team_group[int(t)] for t in team_ids], dtype=np.int64),
+        group_names=group_names,
+        wins=wins,
+        games=(played + remaining).astype(np.int32),
+        h2h=h2h,
+        elo=np.array([elo_tracker.get_elo(int(t)) for t in team_ids], dtype=np.float64),
+        home=home,
+        away=away,
+        rounds=rounds,
+        k_factor=float(elo_tracker.params.k_factor),
+        hca=float(elo_tracker.params.home_court_advantage),
+        direct=fmt.direct,
+        play_in=fmt.play_in,
+    )
+
+
+# =============================================================================
+# Simulation
+# =============================================================================
+
+def _win_prob(r_home: np.ndarray, r_away: np.ndarray, hca: float) -> np.ndarray:
+    return 1.0 / (1.0 + 10.0 ** (-(r_home - r_away + hca) / 400.0))
+
+
+def simulate_chunk(inputs: SeasonInputs, n: int, seed) -> Dict[str, np.ndarray]:
+    """
+    Simulate n seasons.
+
+    Args:
+        inputs: SeasonInputs
+        n: Number of seasons
+        seed: Seed or SeedSequence of this chunk's random stream
+
+    Returns:
+        Dict of counts: "seed" (T, max_group_size), "play_in", "playoffs"
+        (T,), and "wins" (T,) summed over the n seasons
+    """
+    rng = np.random.default_rng(seed)
+    T, S = len(inputs.team_ids), n
+    k, hca = inputs.k_factor, inputs.hca
+    # Team-major during the season: a round gathers and scatters whole rows
+    ratings_t = np.repeat(inputs.elo[:, None], S, axis=1)
+    wins_t = np.repeat(inputs.wins[:, None], S, axis=1).astype(np.int32)
+    h2h_t = np.repeat(inputs.h2h[:, :, None], S, axis=2)
+
+    # Regular season, one round (no repeated team) at a time
+    for r in range(len(inputs.rounds) - 1):
+        lo, hi = inputs.rounds[r], inputs.rounds[r + 1]
+        h, a = inputs.home[lo:hi], inputs.away[lo:hi]
+        p = _win_prob(ratings_t[h], ratings_t[a], hca)
+        home_won = rng.random(p.shape) < p
+        delta = k * (home_won - p)
+        ratings_t[h] += delta
+        ratings_t[a] -= delta
+        wins_t[h] += home_won
+        wins_t[a] += ~home_won
+        h2h_t[h, a] += home_won
+        h2h_t[a, h] += ~home_won
+
+    ratings, wins, h2h = ratings_t.T, wins_t.T, h2h_t.transpose(2, 0, 1)
+
+    # Seeding key: win pct, then net head-to-head among the tied teams of
+    # the same group, then a random draw
+    pct = wins / np.maximum(inputs.games, 1)
+    same_group = inputs.group[:, None] == inputs.group[None, :]
+    np.fill_diagonal(same_group, False)
+    tied = (pct[:, :, None] == pct[:, None, :]) & same_group[None, :, :]
+    net_h2h = ((h2h - h2h.transpose(0, 2, 1)) * tied).sum(axis=2)
+    sort_key = pct * 1e6 + net_h2h * 10.0 + rng.random((S, T))
+
+    width = inputs.max_group_size
+    seeds = np.empty((S, T), dtype=np.int64)
+    playoffs = np.zeros((S, T), dtype=bool)
+    in_play_in = np.zeros((S, T), dtype=bool)
+    rows = np.arange(S)
+    for g in range(len(inputs.group_names)):
+        members = np.flatnonzero(inputs.group == g)
+        order = np.argsort(-sort_key[:, members], axis=1, kind="stable")
+        by_seed = members[order]                                  # (S, n) team at each seed
+        np.put_along_axis(seeds, by_seed, np.arange(len(members))[None, :].repeat(S, axis=0), axis=1)
+
+        direct = min(inputs.direct, len(members))
+        np.put_along_axis(playoffs, by_seed[:, :direct], True, axis=1)
+        if inputs.play_in and len(members) >= direct + inputs.play_in:
+            s7, s8, s9, s10 = (by_seed[:, direct + i] for i in range(4))
+            np.put_along_axis(in_play_in, by_seed[:, direct:direct + 4], True, axis=1)
+            # Played with the end-of-season ratings, higher seed at home
+            won_78 = rng.random(S) < _win_prob(ratings[rows, s7], ratings[rows, s8], hca)
+            loser_78 = np.where(won_78, s8, s7)
+            won_910 = rng.random(S) < _win_prob(ratings[rows, s9], ratings[rows, s10], hca)
+            winner_910 = np.where(won_910, s9, s10)
+            won_last = rng.random(S) < _win_prob(ratings[rows, loser_78], ratings[rows, winner_910], hca)
+            last_seed = np.where(won_last, loser_78, winner_910)
+            playoffs[rows, np.where(won_78, s7, s8)] = True
+            playoffs[rows, last_seed] = True
+
+    seed_counts = np.bincount((np.arange(T)[None, :] * width + seeds).ravel(),
+                              minlength=T * width).reshape(T, width)
+    return {
+        "seed": seed_counts,
+        "play_in": in_play_in.sum(axis=0),
+        "playoffs": playoffs.sum(axis=0),
+        "wins": wins.sum(axis=0, dtype=np.int64),
+    }
+
+
+def _run_chunk(task: tuple) -> Dict[str, np.ndarray]:
+    inputs, n, seed = task
+    return simulate_chunk(inputs, n, seed)
+
+
+def simulate_season(
+    inputs: SeasonInputs,
+    iterations: int = DEFAULT_ITERATIONS,
+    workers: Optional[int] = None,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate the rest of the season ``iterations`` times.
+
+    Args:
+        inputs: SeasonInputs (see build_inputs)
+        iterations: Number of simulated seasons
+        workers: Worker processes (default: CPU count; 1 runs inline)
+        seed: Seed of the random streams (one per chunk)
+
+    Returns:
+        Counts summed over all chunks (see simulate_chunk)
+    """
+    sizes = [CHUNK_SIZE] * (iterations // CHUNK_SIZE)
+    if iterations % CHUNK_SIZE:
+        sizes.append(iterations % CHUNK_SIZE)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(inputs, n, s) for n, s in zip(sizes, streams)]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        parts = [_run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_run_chunk, tasks))
+    return {name: sum(part[name] for part in parts) for name in parts[0]}
+
+
+# =============================================================================
+# Projections (cached)
+# =============================================================================
+
+def summarize(inputs: SeasonInputs, counts: Dict[str, np.ndarray], iterations: int) -> List[dict]:
+    """Per-team probabilities from simulation counts, best projection first."""
+    teams = []
+    for i, team_id in enumerate(inputs.team_ids.tolist()):
+        group_size = int((inputs.group == inputs.group[i]).sum())
+        seed_probs = counts["seed"][i, :group_size] / iterations
+        projected_wins = counts["wins"][i] / iterations
+        teams.append({
+            "team_id": team_id,
+            "group": inputs.group_names[inputs.group[i]],
+            "wins": int(inputs.wins[i]),
+            "games": int(inputs.games[i]),
+            "projected_wins": round(float(projected_wins), 1),
+            "projected_losses": round(float(inputs.games[i] - projected_wins), 1),
+            "seed_probs": [round(float(p), 4) for p in seed_probs],
+            "top_seed": round(float(seed_probs[0]), 4),
+            "direct": round(float(seed_probs[:inputs.direct].sum()), 4),
+            "play_in": round(float(counts["play_in"][i] / iterations), 4),
+            "playoffs": round(float(counts["playoffs"][i] / iterations), 4),
+        })
+    teams.sort(key=lambda t: (t["group"], -t["projected_wins"]))
+    return teams
+
+
+def project_season(
+    league: str,
+    elo_tracker: EloTracker,
+    standings: StandingsTracker,
+    games: Sequence[GameResult],
+    iterations: int = DEFAULT_ITERATIONS,
+    workers: Optional[int] = None,
+    seed: int = DEFAULT_SEED,
+    cache_dir: Optional[Path] = None,
+    today: Optional[date] = None,
+) -> dict:
+    """
+    Seeding, play-in and playoff odds for every team, cached per state.
+
+    Args:
+        league: League key ("nba", "wnba")
+        elo_tracker: Current ratings (with the league's Elo params)
+        standings: Current season standings
+        games: The season's schedule from today (unplayed games are used)
+        iterations: Number of simulated seasons
+        workers: Worker processes (default: CPU count)
+        seed: Random seed
+        cache_dir: Directory of the result cache (None: no caching)
+        today: Decides the season being simulated. Default: date.today()
+
+    Returns:
+        Dict with league, season_id, key, iterations, remaining_games,
+        generated_at, seconds and teams (see summarize)
+    """
+    season_id = season_id_for(today or date.today(), league)
+    inputs = build_inputs(league, elo_tracker, standings, remaining_games(games), season_id=season_id)
+    key = inputs.key(iterations, seed)
+
+    cache_path = Path(cache_dir) / f"{league}_season_sim_{iterations}.json" if cache_dir else None
+    if cache_path and cache_path.exists():
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return cached
+        except (OSError, ValueError):
+            pass
+
+    start = time.perf_counter()
+    counts = simulate_season(inputs, iterations, workers=workers, seed=seed)
+    result = {
+        "league": league,
+        "season_id": season_id,
+        "key": key,
+        "iterations": iterations,
+        "remaining_games": int(len(inputs.home)),
+        "generated_at": datetime.now().isoformat(),
+        "seconds": round(time.perf_counter() - start, 3),
+        "teams": summarize(inputs, counts, iterations),
+    }
+    if cache_path:
+        try:
+            write_json_atomic(cache_path, result, separators=(",", ":"))
+        except OSError as e:
+            print(f"⚠ Could not cache season simulation ({cache_path}): {e}")
+    return result
@@ -0,0 +1,271 @@
+"""
+StandingsTracker: Season standings maintained from applied games.
+
+Keeps, per team, W/L with home/away splits, points for/against, the current
+streak and the last-N results, plus head-to-head records per pair of teams.
+Each game is an O(1) update of two fixed-size team rows and one pair row,
+so the tracker can ride along with GameProcessor and the state journal;
+the API and the AI context then serve standings without calling ESPN.
+
+Only the current season is kept: a game from a later season (season_id_for)
+starts a fresh table, games from earlier seasons are ignored.
+
+Stored compactly as JSON:
+
+    {"league": "nba", "season_id": 22025, "games": 412,
+     "teams": {"1610612738": [w, l, hw, hl, aw, al, pf, pa, streak, recent, n, last_date]},
+     "h2h":   {"1610612737-1610612738": [wins_of_lower_id, wins_of_higher_id]}}
+
+``streak`` is signed (+3: won three, -2: lost two); ``recent`` holds the
+last ``n`` results as bits, most recent in bit 0.
+"""
+
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .atomic_io import write_json_atomic
+from .league_config import season_id_for
+
+
+LAST_N = 10
+
+# Team row layout
+W, L, HW, HL, AW, AL, PF, PA, STREAK, RECENT, RECENT_N, LAST_DATE = range(12)
+
+
+def _empty_row() -> list:
+    return [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, None]
+
+
+def _pair_key(team_a: int, team_b: int) -> str:
+    low, high = sorted((int(team_a), int(team_b)))
+    return f"{low}-{high}"
+
+
+def _record(wins: int, losses: int) -> str:
+    return f"{wins}-{losses}"
+
+
+class StandingsTracker:
+    """
+    Incrementally maintained standings, streaks and head-to-head records
+    for one league season.
+    """
+
+    def __init__(self, league: str = "nba", season_id: Optional[int] = None, state: Optional[dict] = None):
+        """
+        Args:
+            league: League key (decides the season boundaries)
+            season_id: Current season (set by the first recorded game)
+            state: Stored form (to_dict), e.g. from a state file
+        """
+        self.league = league
+        self.season_id = season_id
+        self.games = 0
+        self._teams: Dict[int, list] = {}
+        self._h2h: Dict[str, List[int]] = {}
+        if state:
+            self.league = state.get("league", league)
+            self.season_id = state.get("season_id")
+            self.games = int(state.get("games", 0))
+            self._teams = {int(k): list(v) for k, v in state.get("teams", {}).items()}
+            self._h2h = {k: list(v) for k, v in state.get("h2h", {}).items()}
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def _reset(self, season_id: int) -> None:
+        self.season_id = season_id
+        self.games = 0
+        self._teams.clear()
+        self._h2h.clear()
+
+    def _apply(self, team_id: int, pf: int, pa: int, won: bool, home: bool, game_date: str) -> None:
+        row = self._teams.get(team_id)
+        if row is None:
+            row = self._teams[team_id] = _empty_row()
+        row[W if won else L] += 1
+        if home:
+            row[HW if won else HL] += 1
+        else:
+            row[AW if won else AL] += 1
+        row[PF] += pf
+        row[PA] += pa
+        if won:
+            row[STREAK] = row[STREAK] + 1 if row[STREAK] > 0 else 1
+        else:
+            row[STREAK] = row[STREAK] - 1 if row[STREAK] < 0 else -1
+        row[RECENT] = ((row[RECENT] << 1) | int(won)) & ((1 << LAST_N) - 1)
+        row[RECENT_N] = min(row[RECENT_N] + 1, LAST_N)
+        row[LAST_DATE] = game_date
+
+    def record_game(
+        self,
+        home_id: int,
+        away_id: int,
+        home_score: int,
+        away_score: int,
+        game_date: Union[str, date, datetime],
+        season_id: Optional[int] = None,
+    ) -> bool:
+        """
+        Record a completed game.
+
+        Args:
+            home_id: Home team ID
+            away_id: Away team ID
+            home_score: Home points
+            away_score: Away points
+            game_date: Date of the game
+            season_id: Season of the game. Default: season_id_for(game_date)
+
+        Returns:
+            False if the game belongs to an earlier season (ignored)
+        """
+        if isinstance(game_date, (datetime, date)):
+            game_date = game_date.isoformat()[:10]
+        season_id = int(season_id or season_id_for(game_date, self.league))
+        if self.season_id is None or season_id > self.season_id:
+            self._reset(season_id)
+        elif season_id < self.season_id:
+            return False
+
+        home_id, away_id = int(home_id), int(away_id)
+        home_won = home_score > away_score
+        self._apply(home_id, int(home_score), int(away_score), home_won, True, game_date)
+        self._apply(away_id, int(away_score), int(home_score), not home_won, False, game_date)
+
+        pair = self._h2h.setdefault(_pair_key(home_id, away_id), [0, 0])
+        winner = home_id if home_won else away_id
+        pair[0 if winner == min(home_id, away_id) else 1] += 1
+        self.games += 1
+        return True
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    @property
+    def team_ids(self) -> List[int]:
+        return list(self._teams)
+
+    def team(self, team_id: int, last_n: int = LAST_N) -> dict:
+        """
+        Standing of one team.
+
+        Args:
+            team_id: Team ID
+            last_n: Games in the "last N" record (at most LAST_N)
+
+        Returns:
+            Dict with wins, losses, win_pct, home/away records, points per
+            game, streak ("W3"/"L2"), last-N record and last game date
+        """
+        row = self._teams.get(int(team_id), _empty_row())
+        played = row[W] + row[L]
+        n = min(last_n, LAST_N, row[RECENT_N])
+        recent_wins = bin(row[RECENT] & ((1 << n) - 1)).count("1")
+        streak = row[STREAK]
+        return {
+            "team_id": int(team_id),
+            "wins": row[W],
+            "losses": row[L],
+            "games_played": played,
+            "win_pct": round(row[W] / played, 3) if played else 0.0,
+            "home_record": _record(row[HW], row[HL]),
+            "away_record": _record(row[AW], row[AL]),
+            "points_for": round(row[PF] / played, 1) if played else 0.0,
+            "points_against": round(row[PA] / played, 1) if played else 0.0,
+            "point_diff": round((row[PF] - row[PA]) / played, 1) if played else 0.0,
+            "streak": f"{'W' if streak > 0 else 'L'}{abs(streak)}" if streak else "",
+            "last_n": n,
+            "last_n_record": _record(recent_wins, n - recent_wins),
+            "last_game": row[LAST_DATE],
+        }
+
+    def table(self, team_ids: Optional[List[int]] = None) -> List[dict]:
+        """
+        Standings ordered by win percentage (then wins, then point
+        differential), with rank and games back of the leader.
+
+        Args:
+            team_ids: Restrict to these teams (e.g. a conference)
+        """
+        ids = self._teams if team_ids is None else [int(t) for t in team_ids]
+        rows = sorted((self.team(t) for t in ids),
+                      key=lambda r: (-r["win_pct"], -r["wins"], -r["point_diff"]))
+        if not rows:
+            return []
+        leader = rows[0]
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+            row["games_back"] = ((leader["wins"] - row["wins"]) + (row["losses"] - leader["losses"])) / 2
+        return rows
+
+    def head_to_head(self, team_a: int, team_b: int) -> dict:
+        """Season series between two teams, from team_a's side."""
+        team_a, team_b = int(team_a), int(team_b)
+        low_wins, high_wins = self._h2h.get(_pair_key(team_a, team_b), (0, 0))
+        a_wins, b_wins = (low_wins, high_wins) if team_a < team_b else (high_wins, low_wins)
+        return {"team_a": team_a, "team_b": team_b, "team_a_wins": a_wins,
+                "team_b_wins": b_wins, "games": a_wins + b_wins}
+
+    def opponents(self, team_id: int) -> List[dict]:
+        """Every season series a team has played."""
+        team_id = int(team_id)
+        series = []
+        for key in self._h2h:
+            low, high = (int(t) for t in key.split("-"))
+            if team_id in (low, high):
+                series.append(self.head_to_head(team_id, high if team_id == low else low))
+        return series
+
+    # =========================================================================
+    # Serialization
+    # =========================================================================
+
+    def to_dict(self) -> dict:
+        return {
+            "league": self.league,
+            "season_id": self.season_id,
+            "games": self.games,
+            "teams": {str(k): v for k, v in self._teams.items()},
+            "h2h": self._h2h,
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Save to a JSON file (atomically)."""
+        write_json_atomic(path, self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path]) -> "StandingsTracker":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(state=json.load(f))
+
+    @classmethod
+    def from_games(cls, games, league: str = "nba") -> "StandingsTracker":
+        """
+        Standings of the last season in a games table.
+
+        Args:
+            games: DataFrame with game_date, season_id, team_id_home,
+                   team_id_away, pts_home, pts_away
+            league: League key
+        """
+        tracker = cls(league)
+        if len(games) == 0:
+            return tracker
+        season = games[games["season_id"] == games["season_id"].max()].sort_values("game_date", kind="stable")
+        for row in season.itertuples(index=False):
+            tracker.record_game(row.team_id_home, row.team_id_away, row.pts_home, row.pts_away,
+                                str(row.game_date)[:10], season_id=int(row.season_id))
+        return tracker
+
+    def __len__(self) -> int:
+        return self.games
+
+    def __repr__(self) -> str:
+        return f"StandingsTracker({self.league}, season {self.season_id}, {self.games} games, {len(self._teams)} teams)"
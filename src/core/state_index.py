@@ -0,0 +1,399 @@
+"""
+StateIndex: point-in-time tracker state for any past date.
+
+The live trackers only hold today's state, so features for a past date
+had to be built either from today's ratings (wrong) or by replaying the
+whole history (slow). The index keeps every team's Elo and rolling-window
+history in a compact columnar form instead:
+
+    team_ids / offsets   rows of team_ids[i] are offsets[i]:offsets[i + 1]
+    day                  game date (days since 1970-01-01)
+    pf / pa / won        the team's score line (StatsTracker window entry)
+    elo                  the team's rating after the game
+    season_days          first day of every season after the first (every
+                         rating is regressed toward the mean before it)
+
+Each game day only adds rows for the teams that played that day (the
+day's delta); idle teams store nothing. State "as of D" means before any
+game on D, i.e. what the features of D's games are built from. Looking
+a team up is a binary search in its own rows, O(log n) with no replay.
+
+Built from a games table with build_state_index.py (the same replay as
+the offline Elo features) and extended by update_state.py with every
+game day it applies.
+"""
+
+from __future__ import annotations
+
+import io
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .atomic_io import write_bytes_atomic
+from .elo_engine import EloParams, elo_update, regress_rating, replay_games
+from .elo_tracker import EloTracker
+from .espn_client import GameResult
+from .lazy_import import LazyModule
+from .stats_tracker import StatsTracker
+
+# Only the builders need pandas; the API only loads and queries indexes.
+pd = LazyModule("pandas")
+
+
+INDEX_FILE = "state_index.npz"
+
+_EPOCH = date(1970, 1, 1)
+
+DateLike = Union[str, date, datetime]       # pd.Timestamp is a datetime
+
+
+def _day(value: DateLike) -> int:
+    """Days since 1970-01-01 (ints pass through)."""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    elif isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH).days
+
+
+def _iso(day: int) -> str:
+    return (_EPOCH + timedelta(days=int(day))).isoformat()
+
+
+class StateIndex:
+    """
+    Elo ratings and rolling windows of every team as of any date.
+
+    Instances are immutable snapshots; append_games() returns a new index.
+    """
+
+    def __init__(
+        self,
+        team_ids: np.ndarray,
+        offsets: np.ndarray,
+        day: np.ndarray,
+        pf: np.ndarray,
+        pa: np.ndarray,
+        won: np.ndarray,
+        elo: np.ndarray,
+        season_days: np.ndarray,
+        last_season: int,
+        params: EloParams = EloParams(),
+        window: int = StatsTracker.WINDOW_SIZE,
+    ):
+        self.team_ids = np.asarray(team_ids, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.day = np.asarray(day, dtype=np.int32)
+        self.pf = np.asarray(pf, dtype=np.int32)
+        self.pa = np.asarray(pa, dtype=np.int32)
+        self.won = np.asarray(won, dtype=bool)
+        self.elo = np.asarray(elo, dtype=np.float64)
+        self.season_days = np.asarray(season_days, dtype=np.int32)
+        self.last_season = int(last_season)
+        self.params = params
+        self.window = int(window)
+        self._team_pos = {int(t): i for i, t in enumerate(self.team_ids)}
+
+    # =========================================================================
+    # Building
+    # =========================================================================
+
+    @classmethod
+    def _from_rows(
+        cls,
+        team: np.ndarray,
+        rows: Dict[str, np.ndarray],
+        season_days: np.ndarray,
+        last_season: int,
+        params: EloParams,
+        window: int,
+    ) -> "StateIndex":
+        """Group chronological team-game rows by team (stable, so each team
+        keeps its chronological order)."""
+        order = np.argsort(team, kind="stable")
+        team_ids, counts = np.unique(team[order], return_counts=True)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        return cls(
+            team_ids, offsets,
+            **{name: values[order] for name, values in rows.items()},
+            season_days=season_days, last_season=last_season,
+            params=params, window=window,
+        )
+
+    @staticmethod
+    def _team_rows(games: pd.DataFrame, post_home: np.ndarray, post_away: np.ndarray):
+        """Two rows (home, away) per game, in game order."""
+        dates = pd.to_datetime(games["game_date"]).dt.date
+        day = np.array([_day(d) for d in dates], dtype=np.int32)
+        pts_home = games["pts_home"].to_numpy(dtype=np.int64)
+        pts_away = games["pts_away"].to_numpy(dtype=np.int64)
+        home_win = games["home_win"].to_numpy().astype(bool)
+
+        n = len(games)
+        order = np.repeat(np.arange(n), 2)
+        team = np.empty(2 * n, dtype=np.int64)
+        team[0::2] = games["team_id_home"].to_numpy(dtype=np.int64)
+        team[1::2] = games["team_id_away"].to_numpy(dtype=np.int64)
+        rows = {
+            "day": day[order],
+            "pf": np.ravel(np.column_stack([pts_home, pts_away])),
+            "pa": np.ravel(np.column_stack([pts_away, pts_home])),
+            "won": np.ravel(np.column_stack([home_win, ~home_win])),
+            "elo": np.ravel(np.column_stack([post_home, post_away])),
+        }
+        return team, rows
+
+    @classmethod
+    def from_games(
+        cls,
+        games: pd.DataFrame,
+        params: EloParams = EloParams(),
+        window: int = StatsTracker.WINDOW_SIZE,
+    ) -> "StateIndex":
+        """
+        Build the index by replaying a game history.
+
+        Args:
+            games: One row per game with game_date, season_id, team_id_home,
+                   team_id_away, pts_home, pts_away, home_win
+            params: League Elo parameters (same replay as the Elo features)
+            window: Rolling window length (StatsTracker.WINDOW_SIZE)
+
+        Returns:
+            New StateIndex
+        """
+        games = games.copy()
+        games["game_date"] = pd.to_datetime(games["game_date"])
+        games["season_id"] = games["season_id"].astype(int)
+        games = games.sort_values("game_date", kind="stable").reset_index(drop=True)
+        if len(games) == 0:
+            empty = np.empty(0)
+            return cls(empty, [0], empty, empty, empty, empty, empty, empty, 0, params, window)
+
+        replay, _ = replay_games(games, params)
+        wins = games["home_win"].to_numpy().astype(bool).tolist()
+        post_home = np.empty(len(games))
+        post_away = np.empty(len(games))
+        k, hca = params.k_factor, params.home_court_advantage
+        for i, (e_home, e_away) in enumerate(zip(replay.elo_home.tolist(), replay.elo_away.tolist())):
+            post_home[i], post_away[i], _ = elo_update(e_home, e_away, wins[i], k, hca)
+
+        seasons = games["season_id"].to_numpy()
+        starts = np.flatnonzero(seasons[1:] != seasons[:-1]) + 1
+        season_days = np.array(
+            [_day(d) for d in games["game_date"].iloc[starts]], dtype=np.int32
+        )
+
+        team, rows = cls._team_rows(games, post_home, post_away)
+        return cls._from_rows(team, rows, season_days, int(seasons[-1]), params, window)
+
+    def append_games(self, games: pd.DataFrame) -> "StateIndex":
+        """
+        Extend the index with newer games (none may precede last_date).
+
+        Ratings continue from the index's latest state; a season_id that
+        differs from the last indexed season regresses every rating first,
+        like the offline replay.
+
+        Args:
+            games: Games in the from_games() format
+
+        Returns:
+            New StateIndex including the games
+        """
+        if len(games) == 0:
+            return self
+        games = games.copy()
+        games["game_date"] = pd.to_datetime(games["game_date"])
+        games = games.sort_values("game_date", kind="stable").reset_index(drop=True)
+        last = self.last_date
+        if last is not None and games["game_date"].iloc[0].date() < last:
+            raise ValueError(
+                f"Cannot append games from {games['game_date'].iloc[0].date()} "
+                f"before the last indexed date {last}"
+            )
+
+        first_day = _day(games["game_date"].iloc[0])
+        ratings = self.ratings_at(first_day + 1, pending_regression=False)
+        season_days = list(self.season_days)
+        season = self.last_season if len(self) else None
+
+        k, hca = self.params.k_factor, self.params.home_court_advantage
+        carry, mean = self.params.season_carryover, self.params.default_elo
+        post_home = np.empty(len(games))
+        post_away = np.empty(len(games))
+        for i, row in enumerate(games.itertuples(index=False)):
+            if season is not None and int(row.season_id) != season:
+                ratings = {t: regress_rating(r, carry, mean) for t, r in ratings.items()}
+                season_days.append(_day(row.game_date))
+            season = int(row.season_id)
+            home, away = int(row.team_id_home), int(row.team_id_away)
+            post_home[i], post_away[i], _ = elo_update(
+                ratings.get(home, mean), ratings.get(away, mean), bool(row.home_win), k, hca
+            )
+            ratings[home], ratings[away] = post_home[i], post_away[i]
+
+        team, rows = self._team_rows(games, post_home, post_away)
+        old_team = np.repeat(self.team_ids, np.diff(self.offsets))
+        return self._from_rows(
+            np.concatenate([old_team, team]),
+            {name: np.concatenate([getattr(self, name), values]) for name, values in rows.items()},
+            np.array(season_days, dtype=np.int32), season, self.params, self.window,
+        )
+
+    def append_results(self, results: Iterable[GameResult], season_id: int) -> "StateIndex":
+        """append_games() for GameResults (e.g. the games update_state applied)."""
+        records = [
+            {
+                "game_date": r.game_date,
+                "season_id": season_id,
+                "team_id_home": int(r.home_team_id),
+                "team_id_away": int(r.away_team_id),
+                "pts_home": int(r.home_score),
+                "pts_away": int(r.away_score),
+                "home_win": int(r.home_won),
+            }
+            for r in results
+            if r.is_final and r.home_team_id is not None and r.away_team_id is not None
+        ]
+        return self.append_games(pd.DataFrame.from_records(records))
+
+    # =========================================================================
+    # Queries
+    # =========================================================================
+
+    def __len__(self) -> int:
+        """Number of indexed games."""
+        return len(self.day) // 2
+
+    @property
+    def first_date(self) -> Optional[date]:
+        return date.fromisoformat(_iso(self.day.min())) if len(self.day) else None
+
+    @property
+    def last_date(self) -> Optional[date]:
+        return date.fromisoformat(_iso(self.day.max())) if len(self.day) else None
+
+    def covers(self, as_of: DateLike) -> bool:
+        """Whether every game before ``as_of`` is indexed (some game on or
+        after it has been)."""
+        return len(self.day) > 0 and _day(as_of) <= int(self.day.max())
+
+    def _team_slice(self, team_id: int, as_of: int) -> Tuple[int, int]:
+        """Rows of a team's games before ``as_of``: (first row, end row)."""
+        pos = self._team_pos.get(int(team_id))
+        if pos is None:
+            return 0, 0
+        lo, hi = int(self.offsets[pos]), int(self.offsets[pos + 1])
+        return lo, lo + int(np.searchsorted(self.day[lo:hi], as_of, side="left"))
+
+    def _regressions(self, last_day: int, as_of: int, pending_regression: bool) -> int:
+        """Season starts in (last_day, as_of] (or (last_day, as_of))."""
+        side = "right" if pending_regression else "left"
+        return int(np.searchsorted(self.season_days, as_of, side=side)
+                   - np.searchsorted(self.season_days, last_day, side="right"))
+
+    def elo_at(self, team_id: int, as_of: DateLike, pending_regression: bool = True) -> float:
+        """
+        A team's Elo before any game on ``as_of``.
+
+        Args:
+            team_id: Team ID
+            as_of: Date
+            pending_regression: Apply the season-start regression of a
+                                season that begins on ``as_of`` itself
+
+        Returns:
+            Elo rating (default rating for a team with no earlier game)
+        """
+        as_of = _day(as_of)
+        lo, end = self._team_slice(team_id, as_of)
+        if end == lo:
+            return float(self.params.default_elo)
+        rating = float(self.elo[end - 1])
+        for _ in range(self._regressions(int(self.day[end - 1]), as_of, pending_regression)):
+            rating = regress_rating(rating, self.params.season_carryover, self.params.default_elo)
+        return rating
+
+    def ratings_at(self, as_of: DateLike, pending_regression: bool = True) -> Dict[int, float]:
+        """Elo of every team that had played before ``as_of``."""
+        as_of = _day(as_of)
+        ratings = {}
+        for team in self.team_ids:
+            lo, end = self._team_slice(team, as_of)
+            if end > lo:
+                ratings[int(team)] = self.elo_at(team, as_of, pending_regression)
+        return ratings
+
+    def window_at(self, team_id: int, as_of: DateLike) -> List[dict]:
+        """A team's last ``window`` games before ``as_of`` (StatsTracker format)."""
+        lo, end = self._team_slice(team_id, _day(as_of))
+        start = max(lo, end - self.window)
+        return [
+            {"pf": int(self.pf[i]), "pa": int(self.pa[i]), "won": bool(self.won[i]), "date": _iso(self.day[i])}
+            for i in range(start, end)
+        ]
+
+    def stats_state_at(self, as_of: DateLike) -> Dict[int, List[dict]]:
+        """Rolling windows of every team that had played before ``as_of``."""
+        state = {}
+        for team in self.team_ids:
+            games = self.window_at(team, as_of)
+            if games:
+                state[int(team)] = games
+        return state
+
+    def trackers_at(self, as_of: DateLike) -> Tuple[EloTracker, StatsTracker]:
+        """
+        Trackers holding the state before any game on ``as_of``.
+
+        Args:
+            as_of: Date
+
+        Returns:
+            Tuple of (EloTracker, StatsTracker)
+        """
+        return (
+            EloTracker(initial_ratings=self.ratings_at(as_of), params=self.params),
+            StatsTracker(initial_state=self.stats_state_at(as_of)),
+        )
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    def save(self, path: Path) -> None:
+        """Save as a compressed .npz (atomically)."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            team_ids=self.team_ids, offsets=self.offsets, day=self.day,
+            pf=self.pf, pa=self.pa, won=self.won, elo=self.elo,
+            season_days=self.season_days,
+            meta=np.array([
+                self.last_season, self.window, self.params.k_factor,
+                self.params.home_court_advantage, self.params.season_carryover,
+                self.params.default_elo,
+            ], dtype=np.float64),
+        )
+        write_bytes_atomic(path, buffer.getvalue())
+
+    @classmethod
+    def load(cls, path: Path) -> "StateIndex":
+        """Load an index written by save()."""
+        with np.load(path) as data:
+            last_season, window, k, hca, carry, default = data["meta"].tolist()
+            return cls(
+                data["team_ids"], data["offsets"], data["day"], data["pf"], data["pa"],
+                data["won"], data["elo"], data["season_days"], int(last_season),
+                params=EloParams(k, hca, carry, default), window=int(window),
+            )
+
+    def __repr__(self) -> str:
+        return (f"StateIndex({len(self)} games, {len(self.team_ids)} teams, "
+                f"{self.first_date} to {self.last_date})")
@@ -1,5 +1,27 @@
 """
 StateManager: Unified state load/save for all tracker state.
+
+Tracker state is a snapshot (elo.json / stats.json) plus the GameJournal of
+games applied since: load() replays the journal tail on top of the
+snapshot, and save() writes a new snapshot and compacts the journal.
+
+Snapshots are written as versioned generations:
+
+    MANIFEST.json                   current generation, file checksums,
+                                    previous generations and metadata
+    generations/000012/elo.json
+    generations/000012/stats.json
+    generations/000012/snapshot.json
+    generations/000012/standings.json   (optional, see load_standings)
+    journal.jsonl
+
+save() writes and fsyncs a complete new generation directory, then swaps
+in MANIFEST.json (temp file, fsync, rename). The manifest rename is the
+single commit point, so a crash or preemption at any moment leaves either
+the old generation or the new one, never a truncated file. Readers only
+have to watch MANIFEST.json to notice any change. State directories
+written before generations existed (flat elo.json / stats.json /
+metadata.json) are read as generation 0 and upgraded on the next write.
 """
 
 import json
@@ -8,117 +30,394 @@ from datetime import datetime, date
 from pathlib import Path
 from typing import Optional, Tuple
 
+from .atomic_io import fsync_dir, sha256_file, write_json_atomic
+from .elo_engine import EloParams
 from .elo_tracker import EloTracker
+from .game_journal import SNAPSHOT_FILE, GameJournal
+from .game_processor import GameProcessor
+from .standings_tracker import StandingsTracker
 from .stats_tracker import StatsTracker
 
 
+MANIFEST_FILE = "MANIFEST.json"
+GENERATIONS_DIR = "generations"
+ELO_FILE = "elo.json"
+STATS_FILE = "stats.json"
+STANDINGS_FILE = "standings.json"
+
+
 class StateManager:
     """
     Manages all state files for the prediction system.
-    
+
     Provides atomic load/save operations with backup support
     and metadata tracking.
     """
 
     VERSION = "1.0"
 
-    def __init__(self, state_dir: Optional[Path] = None):
+    # Journal entries after which checkpoint() compacts into a new snapshot
+    COMPACT_EVERY = 200
+
+    # Generations kept on disk (the current one plus backups)
+    KEEP_GENERATIONS = 3
+
+    def __init__(
+        self,
+        state_dir: Optional[Path] = None,
+        elo_params: Optional[EloParams] = None,
+    ):
         """
         Initialize StateManager.
 
         Args:
             state_dir: Directory for state files. If None, uses default location.
+            elo_params: League Elo parameters for loaded trackers.
+                        If None, EloTracker's NBA defaults are used.
         """
         if state_dir is None:
             state_dir = Path(__file__).parent.parent.parent / "state"
-        
-        self.state_dir = Path(state_dir)
-        self.elo_path = self.state_dir / "elo.json"
-        self.stats_path = self.state_dir / "stats.json"
-        self.metadata_path = self.state_dir / "metadata.json"
-
-    def _ensure_dir(self) -> None:
-        """Ensure state directory exists."""
-        self.state_dir.mkdir(parents=True, exist_ok=True)
 
-    def _create_backup(self, path: Path) -> None:
-        """Create backup of a file before overwriting."""
-        if path.exists():
-            backup_path = path.with_suffix(path.suffix + ".bak")
-            shutil.copy2(path, backup_path)
-
-    def _load_metadata(self) -> dict:
-        """Load metadata file or return defaults."""
-        if self.metadata_path.exists():
-            with open(self.metadata_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return {
+        self.state_dir = Path(state_dir)
+        self.elo_params = elo_params
+        self.manifest_path = self.state_dir / MANIFEST_FILE
+        self.metadata_path = self.state_dir / "metadata.json"     # pre-manifest layout
+        self.journal = GameJournal(self.state_dir)
+        self._manifest_cache: Optional[Tuple[tuple, dict]] = None
+
+    # =========================================================================
+    # Manifest
+    # =========================================================================
+
+    def manifest_signature(self) -> Optional[tuple]:
+        """Cheap change token for MANIFEST.json (None if there is none)."""
+        try:
+            st = self.manifest_path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def state_version(self) -> tuple:
+        """
+        Change token for the tracker state: the generation plus the journal
+        length. Changes with every snapshot and every journaled game, but
+        not with metadata-only commits (last processed date, counters).
+        """
+        try:
+            journal_bytes = self.journal.path.stat().st_size
+        except FileNotFoundError:
+            journal_bytes = 0
+        return (self.generation, journal_bytes)
+
+    def _legacy_manifest(self) -> dict:
+        """Manifest view of a flat (pre-generation) state directory."""
+        files = {}
+        for name in (ELO_FILE, STATS_FILE, SNAPSHOT_FILE):
+            if (self.state_dir / name).exists():
+                files[name] = {"path": name}
+        metadata = {
             "last_processed_date": None,
             "last_updated": None,
             "games_processed_total": 0,
+        }
+        if self.metadata_path.exists():
+            with open(self.metadata_path, "r", encoding="utf-8") as f:
+                metadata.update(json.load(f))
+        metadata.pop("version", None)
+        return {
             "version": self.VERSION,
+            "generation": 0,
+            "revision": 0,
+            "files": files,
+            "previous": [],
+            "metadata": metadata,
         }
 
-    def _save_metadata(self, metadata: dict) -> None:
-        """Save metadata file."""
-        self._ensure_dir()
-        metadata["version"] = self.VERSION
-        with open(self.metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+    def _manifest(self) -> dict:
+        """Current manifest (re-read only when the file has changed)."""
+        signature = self.manifest_signature()
+        if signature is None:
+            return self._legacy_manifest()
+        if self._manifest_cache is not None and self._manifest_cache[0] == signature:
+            return self._manifest_cache[1]
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self._manifest_cache = (signature, manifest)
+        return manifest
+
+    def _commit(self, manifest: dict) -> None:
+        """Atomically replace MANIFEST.json (the commit point of every write)."""
+        manifest = dict(manifest)
+        manifest["version"] = self.VERSION
+        manifest["revision"] = int(manifest.get("revision", 0)) + 1
+        manifest["updated_at"] = datetime.now().isoformat()
+        write_json_atomic(self.manifest_path, manifest, indent=2)
+        self._manifest_cache = (self.manifest_signature(), manifest)
+
+    def _file_path(self, name: str, manifest: Optional[dict] = None) -> Path:
+        entry = (manifest or self._manifest())["files"].get(name)
+        return self.state_dir / (entry["path"] if entry else name)
+
+    @property
+    def elo_path(self) -> Path:
+        """elo.json of the current generation."""
+        return self._file_path(ELO_FILE)
+
+    @property
+    def stats_path(self) -> Path:
+        """stats.json of the current generation."""
+        return self._file_path(STATS_FILE)
+
+    @property
+    def generation(self) -> int:
+        """Current generation number (0: flat pre-generation layout)."""
+        return int(self._manifest().get("generation", 0))
+
+    def _verify(self, manifest: dict) -> None:
+        """Check the current generation's files against their checksums."""
+        for name, entry in manifest["files"].items():
+            expected = entry.get("sha256")
+            if expected and sha256_file(self.state_dir / entry["path"]) != expected:
+                raise RuntimeError(
+                    f"State file {entry['path']} does not match MANIFEST.json "
+                    f"(generation {manifest.get('generation')})"
+                )
+
+    def _next_generation(self, manifest: dict) -> int:
+        numbers = [int(manifest.get("generation", 0))]
+        root = self.state_dir / GENERATIONS_DIR
+        if root.exists():
+            numbers += [int(p.name) for p in root.iterdir() if p.name.isdigit()]
+        return max(numbers) + 1
+
+    def _prune_generations(self, manifest: dict) -> None:
+        """Delete generation directories the manifest no longer references."""
+        root = self.state_dir / GENERATIONS_DIR
+        if not root.exists():
+            return
+        keep = {f"{int(manifest['generation']):06d}"}
+        keep |= {f"{int(p['generation']):06d}" for p in manifest.get("previous", [])}
+        for path in root.iterdir():
+            if path.name not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+    # =========================================================================
+    # Trackers
+    # =========================================================================
+
+    def _ensure_dir(self) -> None:
+        """Ensure state directory exists."""
+        self.state_dir.mkdir(parents=True, exist_ok=True)
 
     def exists(self) -> bool:
         """Check if state files exist."""
-        return self.elo_path.exists() and self.stats_path.exists()
+        manifest = self._manifest()
+        return all(
+            name in manifest["files"] and self._file_path(name, manifest).exists()
+            for name in (ELO_FILE, STATS_FILE)
+        )
 
     def load(self) -> Tuple[EloTracker, StatsTracker]:
         """
-        Load all tracker state from files.
+        Load all tracker state: the snapshot files plus a replay of the
+        journal tail.
 
         Returns:
             Tuple of (EloTracker, StatsTracker) instances.
             Returns fresh trackers if files don't exist.
+
+        Raises:
+            RuntimeError: If a snapshot file does not match its checksum
         """
-        if self.elo_path.exists():
-            elo_tracker = EloTracker.from_file(self.elo_path)
+        manifest = self._manifest()
+        self._verify(manifest)
+        elo_path = self._file_path(ELO_FILE, manifest)
+        stats_path = self._file_path(STATS_FILE, manifest)
+
+        if elo_path.exists():
+            elo_tracker = EloTracker.from_file(elo_path, params=self.elo_params)
         else:
-            elo_tracker = EloTracker()
+            elo_tracker = EloTracker(params=self.elo_params)
 
-        if self.stats_path.exists():
-            stats_tracker = StatsTracker.from_file(self.stats_path)
+        if stats_path.exists():
+            stats_tracker = StatsTracker.from_file(stats_path)
         else:
             stats_tracker = StatsTracker()
 
+        self.journal.use_snapshot(self._file_path(SNAPSHOT_FILE, manifest))
+        tail = self.journal.tail()
+        if tail:
+            replay = GameProcessor(elo_tracker, stats_tracker, team_mapper=None)
+            for entry in tail:
+                replay.process_game(entry.to_result(), force=True)
+
         return elo_tracker, stats_tracker
 
+    def has_standings(self) -> bool:
+        """Whether the current generation includes standings."""
+        return STANDINGS_FILE in self._manifest()["files"]
+
+    def load_standings(self, league: str = "nba") -> StandingsTracker:
+        """
+        Load the season standings: the generation's standings.json plus the
+        journal tail (games applied since the snapshot).
+
+        Args:
+            league: League of a new tracker when the state has no standings
+                    (stored standings keep their own)
+
+        Returns:
+            StandingsTracker (empty apart from the journal tail if the
+            state has no standings yet; see src/build_standings.py)
+        """
+        manifest = self._manifest()
+        path = self._file_path(STANDINGS_FILE, manifest)
+        if STANDINGS_FILE in manifest["files"] and path.exists():
+            standings = StandingsTracker.from_file(path)
+        else:
+            standings = StandingsTracker(league)
+
+        self.journal.use_snapshot(self._file_path(SNAPSHOT_FILE, manifest))
+        for entry in self.journal.tail():
+            game = entry.to_result()
+            if not game.is_regular_season:
+                continue
+            standings.record_game(game.home_team_id, game.away_team_id,
+                                  game.home_score, game.away_score, game.game_date)
+        return standings
+
     def save(
         self,
         elo_tracker: EloTracker,
         stats_tracker: StatsTracker,
         create_backup: bool = True,
+        standings: Optional[StandingsTracker] = None,
+        applied: Optional[dict] = None,
     ) -> None:
         """
-        Save all tracker state to files.
+        Save all tracker state as a new generation, compacting the journal
+        (the trackers must include every journaled game).
 
         Args:
             elo_tracker: EloTracker instance to save
             stats_tracker: StatsTracker instance to save
-            create_backup: Whether to create .bak files before saving
+            create_backup: Keep previous generations for restore_backup()
+            standings: StandingsTracker to save. Default: the current
+                       generation's standings with the journal tail folded
+                       in (none if the state has no standings yet)
+            applied: Snapshot record (seq and keys of the games the
+                     trackers include) to store instead of the journal's;
+                     the whole journal is dropped (see adopt())
         """
         self._ensure_dir()
+        current = self._manifest()
+        if standings is None and STANDINGS_FILE in current["files"]:
+            standings = self.load_standings()
+        self.journal.use_snapshot(self._file_path(SNAPSHOT_FILE, current))
+        record = self.journal.snapshot_record()
+        if applied is not None:
+            record = {"seq": max(int(applied["seq"]), record["seq"]), "keys": sorted(applied["keys"])}
+
+        generation = self._next_generation(current)
+        gen_dir = self.state_dir / GENERATIONS_DIR / f"{generation:06d}"
+        shutil.rmtree(gen_dir, ignore_errors=True)      # leftover of a crashed save
+        gen_dir.mkdir(parents=True)
+
+        elo_tracker.save(gen_dir / ELO_FILE)
+        stats_tracker.save(gen_dir / STATS_FILE)
+        write_json_atomic(gen_dir / SNAPSHOT_FILE, record, separators=(",", ":"))
+        names = [ELO_FILE, STATS_FILE, SNAPSHOT_FILE]
+        if standings is not None:
+            standings.save(gen_dir / STANDINGS_FILE)
+            names.append(STANDINGS_FILE)
+        fsync_dir(gen_dir.parent)
+
+        files = {}
+        for name in names:
+            path = gen_dir / name
+            files[name] = {
+                "path": path.relative_to(self.state_dir).as_posix(),
+                "sha256": sha256_file(path),
+                "bytes": path.stat().st_size,
+            }
+
+        previous = []
+        if create_backup and current["files"]:
+            previous = [{"generation": current["generation"], "files": current["files"]},
+                        *current.get("previous", [])][: self.KEEP_GENERATIONS - 1]
+
+        metadata = dict(current["metadata"])
+        metadata["last_updated"] = datetime.now().isoformat()
+        manifest = {**current, "generation": generation, "files": files,
+                    "previous": previous, "metadata": metadata}
+        self._commit(manifest)
+
+        self.journal.use_snapshot(gen_dir / SNAPSHOT_FILE)
+        self.journal.compact(record)
+        self._prune_generations(manifest)
+
+    def checkpoint(
+        self,
+        elo_tracker: EloTracker,
+        stats_tracker: StatsTracker,
+        every: Optional[int] = None,
+        standings: Optional[StandingsTracker] = None,
+    ) -> bool:
+        """
+        Compact the journal into a new snapshot once it has grown long.
 
-        # Create backups if requested
-        if create_backup:
-            self._create_backup(self.elo_path)
-            self._create_backup(self.stats_path)
+        Games applied through a journaled GameProcessor are already durable,
+        so between compactions nothing else needs to be written.
 
-        # Save tracker states
-        elo_tracker.save(self.elo_path)
-        stats_tracker.save(self.stats_path)
+        Args:
+            elo_tracker: Current EloTracker (snapshot + journal)
+            stats_tracker: Current StatsTracker (snapshot + journal)
+            every: Journal entries that trigger compaction (default: COMPACT_EVERY)
+            standings: Current StandingsTracker (default: folded from the journal)
 
-        # Update metadata
-        metadata = self._load_metadata()
-        metadata["last_updated"] = datetime.now().isoformat()
-        self._save_metadata(metadata)
+        Returns:
+            True if a new snapshot was written
+        """
+        every = self.COMPACT_EVERY if every is None else every
+        if len(self.journal) < every and self.exists():
+            return False
+        self.save(elo_tracker, stats_tracker, standings=standings)
+        return True
+
+    def adopt(self, source: "StateManager", league: str = "nba") -> None:
+        """
+        Take over another state directory's state as a new generation.
+
+        The trackers (with the source's journal tail replayed), the keys of
+        the games they include, the standings and the processing metadata
+        all come from ``source``; this directory's journal is dropped.
+
+        Args:
+            source: StateManager of the directory to adopt
+            league: League of the standings when the source has none
+        """
+        elo_tracker, stats_tracker = source.load()
+        standings = source.load_standings(league)
+        applied = source.journal.snapshot_record()
+        self.save(elo_tracker, stats_tracker, standings=standings, applied=applied)
+
+        metadata = source.get_metadata()
+        self._update_metadata(
+            last_processed_date=metadata.get("last_processed_date"),
+            games_processed_total=metadata.get("games_processed_total", 0),
+            adopted_from=str(source.state_dir),
+        )
+
+    # =========================================================================
+    # Metadata
+    # =========================================================================
+
+    def _update_metadata(self, **changes) -> dict:
+        manifest = self._manifest()
+        metadata = {**manifest["metadata"], **changes}
+        self._ensure_dir()
+        self._commit({**manifest, "metadata": metadata})
+        return metadata
 
     def get_last_processed_date(self) -> Optional[date]:
         """
@@ -127,8 +426,7 @@ class StateManager:
         Returns:
             date object or None if never processed
         """
-        metadata = self._load_metadata()
-        date_str = metadata.get("last_processed_date")
+        date_str = self._manifest()["metadata"].get("last_processed_date")
         if date_str:
             return datetime.fromisoformat(date_str).date()
         return None
@@ -143,10 +441,10 @@ class StateManager:
         if isinstance(processed_date, date):
             processed_date = processed_date.isoformat()
 
-        metadata = self._load_metadata()
-        metadata["last_processed_date"] = processed_date
-        metadata["last_updated"] = datetime.now().isoformat()
-        self._save_metadata(metadata)
+        self._update_metadata(
+            last_processed_date=processed_date,
+            last_updated=datetime.now().isoformat(),
+        )
 
     def increment_games_processed(self, count: int = 1) -> int:
         """
@@ -158,38 +456,54 @@ class StateManager:
         Returns:
             New total count
         """
-        metadata = self._load_metadata()
-        metadata["games_processed_total"] = metadata.get("games_processed_total", 0) + count
-        self._save_metadata(metadata)
-        return metadata["games_processed_total"]
+        total = self.get_games_processed_total() + count
+        self._update_metadata(games_processed_total=total)
+        return total
 
     def get_games_processed_total(self) -> int:
         """Get total number of games processed."""
-        metadata = self._load_metadata()
-        return metadata.get("games_processed_total", 0)
+        return self._manifest()["metadata"].get("games_processed_total", 0)
 
     def get_metadata(self) -> dict:
         """Get all metadata."""
-        return self._load_metadata()
+        manifest = self._manifest()
+        return {
+            **manifest["metadata"],
+            "version": self.VERSION,
+            "generation": int(manifest.get("generation", 0)),
+            "revision": int(manifest.get("revision", 0)),
+        }
 
     def restore_backup(self) -> bool:
         """
-        Restore state from backup files.
+        Roll back to the previous generation.
+
+        The journal is rolled back with the snapshot: games applied since
+        the backup leave the idempotency index and can be applied again.
 
         Returns:
             True if backup was restored, False if no backup exists
         """
-        elo_backup = self.elo_path.with_suffix(".json.bak")
-        stats_backup = self.stats_path.with_suffix(".json.bak")
-
-        if not (elo_backup.exists() and stats_backup.exists()):
-            return False
-
-        shutil.copy2(elo_backup, self.elo_path)
-        shutil.copy2(stats_backup, self.stats_path)
+        manifest = self._manifest()
+        previous = manifest.get("previous", [])
+        if previous:
+            restored = {**manifest, "generation": previous[0]["generation"],
+                        "files": previous[0]["files"], "previous": previous[1:]}
+            self._commit(restored)
+        else:
+            # Flat layout: .bak copies written by earlier versions
+            elo_backup = self.state_dir / f"{ELO_FILE}.bak"
+            stats_backup = self.state_dir / f"{STATS_FILE}.bak"
+            if manifest.get("generation") or not (elo_backup.exists() and stats_backup.exists()):
+                return False
+            shutil.copy2(elo_backup, self.state_dir / ELO_FILE)
+            shutil.copy2(stats_backup, self.state_dir / STATS_FILE)
+            restored = manifest
+
+        self.journal.path.unlink(missing_ok=True)
+        self.journal.use_snapshot(self._file_path(SNAPSHOT_FILE, restored))
         return True
 
     def __repr__(self) -> str:
         exists = "exists" if self.exists() else "missing"
-        return f"StateManager({self.state_dir}, {exists})"
-
+        return f"StateManager({self.state_dir}, {exists}, generation {self.generation})"
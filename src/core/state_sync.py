@@ -1,17 +1,65 @@
 """
 Cloud Storage sync helpers for prediction state files.
+
+Covers the state root and the per-league directories (state/nba,
+state/wnba, state/cbb). Every sync is incremental:
+
+- One bucket listing gives the generation of every remote object, and a
+  local record (.sync.json in the state root) holds the generation and
+  SHA-256 of every file last transferred. Downloads skip objects whose
+  generation has not changed; uploads skip files whose contents have not.
+- Transfers run concurrently on a thread pool (STATE_SYNC_WORKERS).
+- JSON state is gzip-compressed in transit (Content-Encoding: gzip);
+  files that do not shrink (e.g. .npz) are sent as is.
+
+State directories written by StateManager hold a MANIFEST.json that names
+the files of the current generation. Uploads send those files first and
+the manifests last; downloads fetch the manifests, then the files they
+reference, and write the manifests locally last. A reader on either side
+therefore never sees a manifest pointing at files that are not there yet.
+Once the manifests are up, uploads delete the generations StateManager has
+pruned locally from the bucket as well.
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, List, Optional
+
+from .atomic_io import write_bytes_atomic, write_json_atomic
+from .lazy_import import LazyModule
+from .league_config import LEAGUE_CONFIGS
+from .state_manager import GENERATIONS_DIR
+
+# Only needed when STATE_BUCKET is set; keep it off the import path otherwise.
+storage = LazyModule("google.cloud.storage")
+
+
+DEFAULT_STATE_FILES = ("elo.json", "stats.json", "metadata.json", "snapshot.json", "journal.jsonl", "state_index.npz",
+                       "schedule.json",
+                       # Model refresh (model_refresh.py): training rows, served
+                       # features and the promoted model with its record
+                       "live_games.csv", "served_features.json",
+                       "refreshed_model.ubj", "refreshed_calibrator.table.npz", "refreshed_model.json")
+MANIFEST_FILE = "MANIFEST.json"
+SYNC_RECORD_FILE = ".sync.json"
 
-from google.cloud import storage
+# State root ("") plus every league's directory, relative to the state root
+STATE_DIRS = ("",) + tuple(Path(c.state_dir).name for c in LEAGUE_CONFIGS.values())
 
+SYNC_WORKERS = int(os.getenv("STATE_SYNC_WORKERS", "8"))
 
-DEFAULT_STATE_FILES = ("elo.json", "stats.json", "metadata.json")
+# Compress only when it saves at least this share of the bytes
+_MIN_COMPRESSION_GAIN = 0.1
+
+_client_lock = threading.Lock()
+_clients: Dict[str, object] = {}
 
 
 def _state_prefix() -> str:
@@ -25,40 +73,186 @@ def _state_bucket(required: bool = False) -> str | None:
     return bucket
 
 
+def _get_bucket(bucket_name: str):
+    """Bucket handle on a storage.Client shared by every sync in the process."""
+    with _client_lock:
+        client = _clients.get("client")
+        if client is None:
+            client = _clients["client"] = storage.Client()
+    return client.bucket(bucket_name)
+
+
 def _blob_name(prefix: str, file_name: str) -> str:
     return f"{prefix}/{file_name}" if prefix else file_name
 
 
+def _join(directory: str, name: str) -> str:
+    return f"{directory}/{name}" if directory else name
+
+
+def _manifest_files(manifest: dict) -> list[str]:
+    """Relative paths of every generation a manifest references."""
+    generations = [manifest, *manifest.get("previous", [])]
+    return [entry["path"] for gen in generations for entry in gen.get("files", {}).values()]
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _content_type(name: str) -> str:
+    if name.endswith(".json"):
+        return "application/json"
+    if name.endswith(".jsonl"):
+        return "application/x-ndjson"
+    if name.endswith(".csv"):
+        return "text/csv"
+    return "application/octet-stream"
+
+
+# =============================================================================
+# Sync record
+# =============================================================================
+
+def _load_record(state_dir: Path) -> Dict[str, dict]:
+    """Generation and SHA-256 of every file last transferred, by relative path."""
+    path = state_dir / SYNC_RECORD_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}       # a damaged record only costs one full sync
+
+
+def _save_record(state_dir: Path, record: Dict[str, dict]) -> None:
+    write_json_atomic(state_dir / SYNC_RECORD_FILE, record, indent=1, sort_keys=True)
+
+
+def _local_unchanged(state_dir: Path, rel_path: str, entry: Optional[dict]) -> bool:
+    """Whether a local file still holds exactly what was last transferred."""
+    path = state_dir / rel_path
+    if entry is None or not path.exists():
+        return False
+    return _sha256(path.read_bytes()) == entry.get("sha256")
+
+
+# =============================================================================
+# Transfers
+# =============================================================================
+
+def _fetch(blob) -> bytes:
+    """Object contents, decompressed."""
+    data = blob.download_as_bytes(raw_download=True)
+    if blob.content_encoding == "gzip":
+        data = gzip.decompress(data)
+    return data
+
+
+def _put(blob, data: bytes, name: str) -> None:
+    """Upload (gzip-compressed when that pays off)."""
+    compressed = gzip.compress(data, compresslevel=6, mtime=0)
+    if len(compressed) <= len(data) * (1 - _MIN_COMPRESSION_GAIN):
+        blob.content_encoding = "gzip"
+        data = compressed
+    else:
+        blob.content_encoding = None
+    blob.upload_from_string(data, content_type=_content_type(name))
+
+
+def _map(fn, items: List, workers: int) -> List:
+    if not items:
+        return []
+    if workers <= 1 or len(items) == 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix="state-sync") as pool:
+        return list(pool.map(fn, items))
+
+
+# =============================================================================
+# Download / upload
+# =============================================================================
+
 def download_state_from_gcs(
     state_dir: Path,
     *,
     files: Iterable[str] = DEFAULT_STATE_FILES,
     required: bool = False,
+    bucket=None,
+    workers: int = SYNC_WORKERS,
 ) -> int:
     """
-    Download state files from GCS into state_dir.
+    Download changed state files from GCS into state_dir (and its league
+    directories).
+
+    Args:
+        state_dir: Local state root
+        files: File names to sync in every state directory (manifest
+               referenced generation files are always included)
+        required: Raise if STATE_BUCKET is not set
+        bucket: Bucket object to use instead of STATE_BUCKET (tests)
+        workers: Concurrent transfers
 
-    Returns number of downloaded files.
+    Returns:
+        Number of downloaded files (unchanged files are not counted)
     """
-    bucket_name = _state_bucket(required=required)
-    if not bucket_name:
-        return 0
+    if bucket is None:
+        bucket_name = _state_bucket(required=required)
+        if not bucket_name:
+            return 0
+        bucket = _get_bucket(bucket_name)
 
     prefix = _state_prefix()
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
+    strip = len(prefix) + 1 if prefix else 0
+    remote = {
+        blob.name[strip:]: blob
+        for blob in bucket.list_blobs(prefix=f"{prefix}/" if prefix else None)
+    }
+    record = _load_record(state_dir)
+
+    def changed(rel_path: str) -> bool:
+        blob = remote[rel_path]
+        entry = record.get(rel_path)
+        return not (entry and entry.get("generation") == blob.generation
+                    and _local_unchanged(state_dir, rel_path, entry))
+
+    # Manifests first: they name the generation files to fetch
+    manifest_paths = [
+        path for path in (_join(d, MANIFEST_FILE) for d in STATE_DIRS)
+        if path in remote and changed(path)
+    ]
+    new_manifests = dict(zip(manifest_paths, _map(lambda p: _fetch(remote[p]), manifest_paths, workers)))
+
+    wanted = []
+    for directory in STATE_DIRS:
+        names = list(files)
+        manifest_path = _join(directory, MANIFEST_FILE)
+        if manifest_path in new_manifests:
+            names += _manifest_files(json.loads(new_manifests[manifest_path]))
+        elif manifest_path in remote and (state_dir / manifest_path).exists():
+            with open(state_dir / manifest_path, "r", encoding="utf-8") as f:
+                names += _manifest_files(json.load(f))
+        wanted += [_join(directory, name) for name in names]
+    wanted = [p for p in dict.fromkeys(wanted) if p in remote and changed(p)]
+
+    def download(rel_path: str) -> str:
+        data = _fetch(remote[rel_path])
+        write_bytes_atomic(state_dir / rel_path, data, sync_dir=False)
+        return _sha256(data)
 
-    state_dir.mkdir(parents=True, exist_ok=True)
+    for rel_path, sha in zip(wanted, _map(download, wanted, workers)):
+        record[rel_path] = {"generation": remote[rel_path].generation, "sha256": sha}
 
-    downloaded = 0
-    for file_name in files:
-        blob = bucket.blob(_blob_name(prefix, file_name))
-        if not blob.exists(client=client):
-            continue
-        blob.download_to_filename(str(state_dir / file_name))
-        downloaded += 1
+    # Commit points last
+    for rel_path, data in new_manifests.items():
+        write_bytes_atomic(state_dir / rel_path, data)
+        record[rel_path] = {"generation": remote[rel_path].generation, "sha256": _sha256(data)}
 
-    return downloaded
+    transferred = len(wanted) + len(new_manifests)
+    if transferred:
+        _save_record(state_dir, record)
+    return transferred
 
 
 def upload_state_to_gcs(
@@ -66,27 +260,91 @@ def upload_state_to_gcs(
     *,
     files: Iterable[str] = DEFAULT_STATE_FILES,
     required: bool = False,
+    bucket=None,
+    workers: int = SYNC_WORKERS,
 ) -> int:
     """
-    Upload state files from state_dir to GCS.
+    Upload changed state files from state_dir (and its league directories)
+    to GCS.
 
-    Returns number of uploaded files.
+    Args:
+        state_dir: Local state root
+        files: File names to sync in every state directory (manifest
+               referenced generation files are always included)
+        required: Raise if STATE_BUCKET is not set
+        bucket: Bucket object to use instead of STATE_BUCKET (tests)
+        workers: Concurrent transfers
+
+    Returns:
+        Number of uploaded files (unchanged files and deletions of pruned
+        generations are not counted)
     """
-    bucket_name = _state_bucket(required=required)
-    if not bucket_name:
-        return 0
+    if bucket is None:
+        bucket_name = _state_bucket(required=required)
+        if not bucket_name:
+            return 0
+        bucket = _get_bucket(bucket_name)
 
     prefix = _state_prefix()
-    client = storage.Client()
-    bucket = client.bucket(bucket_name)
+    record = _load_record(state_dir)
+
+    data_files, manifests, referenced = [], [], {}
+    for directory in STATE_DIRS:
+        names = list(files)
+        manifest_path = state_dir / directory / MANIFEST_FILE
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                generation_files = _manifest_files(json.load(f))
+            names += generation_files
+            manifests.append(_join(directory, MANIFEST_FILE))
+            referenced[directory] = {_join(directory, name) for name in generation_files}
+        data_files += [_join(directory, name) for name in names]
+
+    def pending(paths: List[str]) -> List[str]:
+        return [
+            p for p in dict.fromkeys(paths)
+            if (state_dir / p).exists() and not _local_unchanged(state_dir, p, record.get(p))
+        ]
+
+    def upload(rel_path: str) -> dict:
+        data = (state_dir / rel_path).read_bytes()
+        blob = bucket.blob(_blob_name(prefix, rel_path))
+        _put(blob, data, rel_path)
+        return {"generation": blob.generation, "sha256": _sha256(data)}
 
     uploaded = 0
-    for file_name in files:
-        file_path = state_dir / file_name
-        if not file_path.exists():
-            continue
-        blob = bucket.blob(_blob_name(prefix, file_name))
-        blob.upload_from_filename(str(file_path), content_type="application/json")
-        uploaded += 1
+    # Manifests only after every file they reference is in the bucket
+    for batch in (pending(data_files), pending(manifests)):
+        for rel_path, entry in zip(batch, _map(upload, batch, workers)):
+            record[rel_path] = entry
+        uploaded += len(batch)
+
+    pruned = _prune_remote_generations(bucket, prefix, referenced, workers)
+    for rel_path in pruned:
+        record.pop(rel_path, None)
 
+    if uploaded or pruned:
+        _save_record(state_dir, record)
     return uploaded
+
+
+def _prune_remote_generations(bucket, prefix: str, referenced: Dict[str, set], workers: int) -> List[str]:
+    """
+    Delete remote generation files no local manifest references any more
+    (StateManager keeps KEEP_GENERATIONS locally). Only directories with a
+    local manifest are touched.
+
+    Returns:
+        Relative paths of the deleted objects
+    """
+    strip = len(prefix) + 1 if prefix else 0
+    stale = []
+    for directory, keep in referenced.items():
+        gen_prefix = _blob_name(prefix, _join(directory, GENERATIONS_DIR)) + "/"
+        stale += [blob for blob in bucket.list_blobs(prefix=gen_prefix) if blob.name[strip:] not in keep]
+
+    def delete(blob) -> str:
+        blob.delete()
+        return blob.name[strip:]
+
+    return _map(delete, stale, workers)
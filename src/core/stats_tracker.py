@@ -8,6 +8,8 @@ from datetime import datetime, date
 from pathlib import Path
 from typing import Optional, Any
 
+from .atomic_io import write_json_atomic
+
 
 class StatsTracker:
     """
@@ -239,7 +241,7 @@ class StatsTracker:
 
     def save(self, path: Path) -> None:
         """
-        Save tracker state to JSON file.
+        Save tracker state to JSON file (atomically: temp file, fsync, rename).
 
         Args:
             path: Output file path
@@ -247,8 +249,7 @@ class StatsTracker:
         path.parent.mkdir(parents=True, exist_ok=True)
         # Convert int keys to strings for JSON compatibility
         data = {str(k): list(v) for k, v in self._team_games.items()}
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        write_json_atomic(path, data, indent=2)
 
     @classmethod
     def from_file(cls, path: Path) -> "StatsTracker":
@@ -0,0 +1,328 @@
+"""
+Columnar store for the processed game / feature tables.
+
+Each table is kept as typed Arrow IPC files partitioned by league and
+season:
+
+    data/store/<table>/league=<league>/season=<season_id>/part.arrow
+    data/store/<table>/league=<league>/part.arrow      (tables without season_id)
+
+Files are uncompressed Arrow IPC, so reads are memory-mapped and
+zero-copy: only the partitions (seasons) and columns a reader asks for
+are ever paged in, and nothing is parsed. A ``__row`` column keeps the
+original row order across partitions.
+
+The CSVs under data/processed stay the interchange format (and what the
+pipeline fingerprints). Scripts write both; read_frame() prefers the store
+when it is at least as new as the CSV and falls back to the CSV otherwise.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .lazy_import import LazyModule
+
+pa = LazyModule("pyarrow")
+pa_ipc = LazyModule("pyarrow.ipc")
+
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_STORE_DIR = PROJECT_ROOT / "data" / "store"
+PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+PART_FILE = "part.arrow"
+ROW_COL = "__row"
+SEASON_COL = "season_id"
+DATE_COLS = ("game_date", "date")
+
+
+def csv_path_for(table: str, league: str, processed_dir: Path = PROCESSED_DIR) -> Path:
+    """CSV file a table is exported to (NBA files have no league prefix)."""
+    prefix = "" if league == "nba" else f"{league}_"
+    return Path(processed_dir) / f"{prefix}{table}.csv"
+
+
+def _league_dir(table: str, league: str, root: Path) -> Path:
+    return Path(root) / table / f"league={league}"
+
+
+def _partition_files(league_dir: Path, seasons: Optional[Iterable[int]]) -> List[Path]:
+    """Partition files in season order, optionally restricted to some seasons."""
+    single = league_dir / PART_FILE
+    if single.exists():
+        return [single]
+    wanted = None if seasons is None else {int(s) for s in seasons}
+    found = []
+    for path in league_dir.glob(f"season=*/{PART_FILE}"):
+        season = int(path.parent.name.split("=", 1)[1])
+        if wanted is None or season in wanted:
+            found.append((season, path))
+    return [path for _, path in sorted(found)]
+
+
+def store_mtime(table: str, league: str, root: Path = DEFAULT_STORE_DIR) -> Optional[float]:
+    """Time the table was last written, or None if it is not in the store."""
+    marker = _league_dir(table, league, root) / "_SUCCESS"
+    return marker.stat().st_mtime if marker.exists() else None
+
+
+# =============================================================================
+# Write
+# =============================================================================
+
+def write_table(
+    df: pd.DataFrame,
+    table: str,
+    league: str,
+    root: Path = DEFAULT_STORE_DIR,
+) -> Path:
+    """
+    Write a DataFrame as one league's partition set of ``table``.
+
+    Replaces whatever was stored for that league. Files are written to a
+    temporary directory and swapped in, so readers never see half a table.
+
+    Args:
+        df: Table rows
+        table: Table name, e.g. "games_with_elo_rest"
+        league: "nba", "wnba" or "cbb"
+        root: Store directory
+
+    Returns:
+        The league directory
+    """
+    league_dir = _league_dir(table, league, root)
+    tmp_dir = league_dir.with_name(f".{league_dir.name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    frame = df.reset_index(drop=True)
+    frame[ROW_COL] = np.arange(len(frame), dtype=np.int64)
+    arrow_table = pa.Table.from_pandas(frame, preserve_index=False)
+
+    if SEASON_COL in frame.columns:
+        seasons = frame[SEASON_COL].to_numpy()
+        for season in np.unique(seasons):
+            part_dir = tmp_dir / f"season={int(season)}"
+            part_dir.mkdir()
+            rows = np.flatnonzero(seasons == season)
+            _write_ipc(arrow_table.take(pa.array(rows)), part_dir / PART_FILE)
+    else:
+        _write_ipc(arrow_table, tmp_dir / PART_FILE)
+
+    (tmp_dir / "_SUCCESS").write_text(time.strftime("%Y-%m-%dT%H:%M:%S"))
+
+    old_dir = league_dir.with_name(f".{league_dir.name}.old-{os.getpid()}")
+    if league_dir.exists():
+        os.replace(league_dir, old_dir)
+    os.replace(tmp_dir, league_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return league_dir
+
+
+def append_table(
+    df: pd.DataFrame,
+    table: str,
+    league: str,
+    root: Path = DEFAULT_STORE_DIR,
+) -> Path:
+    """
+    Append rows to one league's stored table.
+
+    Only the season partitions the new rows land in are rewritten (each
+    swapped in atomically); a missing table is created. Appended rows sort
+    after every existing row.
+
+    Args:
+        df: New rows, with the stored table's columns
+        table: Table name
+        league: "nba", "wnba" or "cbb"
+        root: Store directory
+
+    Returns:
+        The league directory
+    """
+    league_dir = _league_dir(table, league, root)
+    if not (league_dir / "_SUCCESS").exists():
+        return write_table(df, table, league, root)
+    if len(df) == 0:
+        return league_dir
+    if (league_dir / PART_FILE).exists() or SEASON_COL not in df.columns:
+        existing = read_arrow(table, league, root=root).to_pandas()
+        return write_table(pd.concat([existing, df], ignore_index=True), table, league, root)
+
+    parts = _partition_files(league_dir, None)
+    next_row = 0
+    for path in parts:
+        rows = pa_ipc.open_file(pa.memory_map(str(path), "r")).read_all().column(ROW_COL).to_numpy()
+        if len(rows):
+            next_row = max(next_row, int(rows.max()) + 1)
+
+    frame = df.reset_index(drop=True)
+    frame[ROW_COL] = np.arange(next_row, next_row + len(frame), dtype=np.int64)
+    new_rows = pa.Table.from_pandas(frame, preserve_index=False)
+    seasons = frame[SEASON_COL].to_numpy()
+
+    for season in np.unique(seasons):
+        part_dir = league_dir / f"season={int(season)}"
+        part = new_rows.take(pa.array(np.flatnonzero(seasons == season)))
+        path = part_dir / PART_FILE
+        if path.exists():
+            old = pa_ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+            part = pa.concat_tables([old, part.select(old.schema.names).cast(old.schema)])
+        part_dir.mkdir(parents=True, exist_ok=True)
+        tmp = part_dir / f".{PART_FILE}.tmp-{os.getpid()}"
+        _write_ipc(part, tmp)
+        os.replace(tmp, path)
+
+    (league_dir / "_SUCCESS").write_text(time.strftime("%Y-%m-%dT%H:%M:%S"))
+    return league_dir
+
+
+def _write_ipc(arrow_table, path: Path) -> None:
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa_ipc.new_file(sink, arrow_table.schema) as writer:
+            writer.write_table(arrow_table)
+
+
+# =============================================================================
+# Read
+# =============================================================================
+
+def read_arrow(
+    table: str,
+    league: str,
+    columns: Optional[Sequence[str]] = None,
+    seasons: Optional[Iterable[int]] = None,
+    root: Path = DEFAULT_STORE_DIR,
+):
+    """
+    Memory-map a stored table (zero-copy).
+
+    Args:
+        table: Table name
+        league: League
+        columns: Columns to load (default: all)
+        seasons: season_id values to load (default: all)
+        root: Store directory
+
+    Returns:
+        pyarrow.Table in original row order
+
+    Raises:
+        FileNotFoundError: If the table is not in the store
+    """
+    league_dir = _league_dir(table, league, root)
+    if not (league_dir / "_SUCCESS").exists():
+        raise FileNotFoundError(f"{table}/{league} not in store at {root}")
+
+    parts = []
+    for path in _partition_files(league_dir, seasons):
+        part = pa_ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+        if columns is not None:
+            part = part.select([*columns, ROW_COL])
+        parts.append(part)
+
+    if not parts:
+        schema_source = _partition_files(league_dir, None)
+        if not schema_source:
+            raise FileNotFoundError(f"{table}/{league} has no partitions")
+        empty = pa_ipc.open_file(pa.memory_map(str(schema_source[0]), "r")).schema.empty_table()
+        return empty.select(list(columns)) if columns is not None else empty.drop_columns([ROW_COL])
+
+    result = pa.concat_tables(parts)
+    row = result.column(ROW_COL).to_numpy()
+    if len(parts) > 1 and np.any(row[1:] < row[:-1]):
+        result = result.take(pa.array(np.argsort(row, kind="stable")))
+    return result.drop_columns([ROW_COL])
+
+
+def read_frame(
+    table: str,
+    league: str,
+    columns: Optional[Sequence[str]] = None,
+    seasons: Optional[Iterable[int]] = None,
+    root: Path = DEFAULT_STORE_DIR,
+    processed_dir: Path = PROCESSED_DIR,
+    prefer_store: bool = True,
+) -> pd.DataFrame:
+    """
+    Load a table as a DataFrame from the store, or from its CSV when the
+    store copy is missing or older than the CSV.
+
+    Args:
+        table: Table name (CSV name without league prefix / extension)
+        league: League
+        columns: Columns to load (default: all)
+        seasons: season_id values to load (default: all)
+        root: Store directory
+        processed_dir: Directory of the CSV exports
+        prefer_store: False to always read the CSV
+
+    Returns:
+        DataFrame with dates parsed, in original row order
+    """
+    csv_path = csv_path_for(table, league, processed_dir)
+    written = store_mtime(table, league, root) if prefer_store else None
+    csv_mtime = csv_path.stat().st_mtime if csv_path.exists() else None
+
+    if written is not None and (csv_mtime is None or written >= csv_mtime):
+        return read_arrow(table, league, columns, seasons, root).to_pandas(split_blocks=True)
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    parse_dates = [c for c in DATE_COLS if c in header and (columns is None or c in columns)]
+    usecols = None
+    if columns is not None:
+        usecols = list(columns)
+        if seasons is not None and SEASON_COL not in usecols:
+            usecols.append(SEASON_COL)
+    # round_trip: parse floats exactly, so CSV and store reads agree bit-for-bit
+    df = pd.read_csv(csv_path, usecols=usecols, parse_dates=parse_dates, float_precision="round_trip")
+    if seasons is not None:
+        df = df[df[SEASON_COL].isin([int(s) for s in seasons])].reset_index(drop=True)
+    if columns is not None:
+        df = df[list(columns)]
+    return df
+
+
+def save_frame(
+    df: pd.DataFrame,
+    table: str,
+    league: str,
+    root: Path = DEFAULT_STORE_DIR,
+    processed_dir: Path = PROCESSED_DIR,
+    csv: bool = True,
+) -> Path:
+    """
+    Write a table to the store and (by default) its CSV export.
+
+    Returns:
+        The CSV path if written, else the store directory
+    """
+    csv_path = csv_path_for(table, league, processed_dir)
+    if csv:
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_csv(csv_path, index=False)
+    store_dir = write_table(df, table, league, root)
+    return csv_path if csv else store_dir
+
+
+def export_csv(
+    table: str,
+    league: str,
+    out_path: Optional[Union[str, Path]] = None,
+    root: Path = DEFAULT_STORE_DIR,
+) -> Path:
+    """Write a stored table back out as CSV (default: its data/processed path)."""
+    out_path = Path(out_path) if out_path else csv_path_for(table, league)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    read_arrow(table, league, root=root).to_pandas().to_csv(out_path, index=False)
+    return out_path
@@ -0,0 +1,484 @@
+"""
+XGBoost training subsystem: cached matrices, trials and parallel search.
+
+  - LeagueData holds a league's feature matrix split by season
+    (train / val / test). DataCache keys it by the content hash of the
+    source table and keeps the arrays as .npy files under
+    data/cache/xgb/, so repeat runs skip the CSV parse entirely.
+  - quantile_matrices() builds the QuantileDMatrix objects once per
+    process and data hash (val shares the train quantile cuts), so a search
+    worker reuses them across all of its trials.
+  - train_booster() is the native-API equivalent of the XGBClassifier the
+    training script used to fit, with optional early stopping on val.
+  - run_search() evaluates parameter sets on a process pool sized to a CPU
+    budget (workers x threads per trial) and caches every trial result on
+    disk keyed by data hash + parameters, like the Elo sweep.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import random
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .feature_builder import FEATURE_COLS
+from .model_artifacts import xgboost
+from .pipeline import FileHasher
+from .table_store import DEFAULT_STORE_DIR, csv_path_for, read_frame, store_mtime
+
+
+TARGET_COL = "home_win"
+SPLITS = ("train", "val", "test")
+
+# Native-API form of the production XGBClassifier (800 trees, depth 3)
+DEFAULT_PARAMS = {
+    "objective": "binary:logistic",
+    "eval_metric": "logloss",
+    "tree_method": "hist",
+    "eta": 0.03,
+    "max_depth": 3,
+    "subsample": 0.9,
+    "colsample_bytree": 0.9,
+    "min_child_weight": 5,
+    "lambda": 1.0,
+    "alpha": 0.0,
+    "seed": 42,
+}
+DEFAULT_ROUNDS = 800
+
+# Random-search ranges: (low, high, "log" | "linear" | "int")
+SEARCH_SPACE = {
+    "eta": (0.01, 0.15, "log"),
+    "max_depth": (2, 6, "int"),
+    "subsample": (0.6, 1.0, "linear"),
+    "colsample_bytree": (0.5, 1.0, "linear"),
+    "min_child_weight": (1.0, 30.0, "log"),
+    "lambda": (0.1, 10.0, "log"),
+    "alpha": (0.0, 1.0, "linear"),
+}
+
+_EPS = 1e-15
+
+
+# =============================================================================
+# Splits
+# =============================================================================
+
+def split_by_season(df: pd.DataFrame, league: str = "nba") -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Train / val / test rows of a feature table by season_id."""
+    if league == "wnba":
+        train = df[df["season_id"] <= 22023]
+        val   = df[df["season_id"] == 22024]
+        test  = df[df["season_id"] >= 22025]
+    elif league == "cbb":
+        train = df[df["season_id"] <= 22023]
+        val   = df[df["season_id"] == 22024]
+        test  = df[df["season_id"] >= 22025]
+    else:
+        df = df[df["season_id"] >= 22004].copy()
+        train = df[(df["season_id"] >= 22004) & (df["season_id"] <= 22018)]
+        val   = df[(df["season_id"] >= 22019) & (df["season_id"] <= 22020)]
+        test  = df[df["season_id"] >= 22022]
+
+    return train, val, test
+
+
+def log_loss(y: np.ndarray, p: np.ndarray) -> float:
+    """Binary log loss with clipped probabilities."""
+    y = np.asarray(y, dtype=np.float64)
+    p = np.clip(np.asarray(p, dtype=np.float64), _EPS, 1 - _EPS)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+# =============================================================================
+# Data
+# =============================================================================
+
+@dataclass
+class LeagueData:
+    """A league's model matrix split by season."""
+    league: str
+    data_hash: str
+    X: Dict[str, np.ndarray]        # split -> (n, len(FEATURE_COLS)) float32
+    y: Dict[str, np.ndarray]        # split -> (n,) float32
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, league: str, data_hash: str = "") -> "LeagueData":
+        df = df.copy()
+        df["season_id"] = df["season_id"].astype(int)
+        parts = dict(zip(SPLITS, split_by_season(df, league)))
+        X = {s: np.ascontiguousarray(p[FEATURE_COLS].to_numpy(dtype=np.float32)) for s, p in parts.items()}
+        y = {s: p[TARGET_COL].to_numpy(dtype=np.float32) for s, p in parts.items()}
+        if not data_hash:
+            h = hashlib.sha256()
+            for s in SPLITS:
+                h.update(X[s].tobytes())
+                h.update(y[s].tobytes())
+            data_hash = h.hexdigest()
+        return cls(league, data_hash, X, y)
+
+    def sizes(self) -> Dict[str, int]:
+        return {s: len(self.y[s]) for s in SPLITS}
+
+
+class DataCache:
+    """
+    LeagueData on disk, one directory of .npy arrays per (league, source
+    content hash). Source hashes are memoized by size/mtime in files.json,
+    so an unchanged feature table is neither parsed nor re-hashed.
+    """
+
+    def __init__(self, cache_dir: Path, store_root: Path = DEFAULT_STORE_DIR,
+                 processed_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir)
+        self.store_root = Path(store_root)
+        self.processed_dir = processed_dir
+        memo_path = self.cache_dir / "files.json"
+        memo = {}
+        if memo_path.exists():
+            try:
+                memo = json.loads(memo_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                memo = {}
+        self.hasher = FileHasher(memo)
+
+    def _csv(self, table: str, league: str) -> Path:
+        if self.processed_dir is None:
+            return csv_path_for(table, league)
+        return csv_path_for(table, league, self.processed_dir)
+
+    def source_hash(self, league: str, table: str = "features_with_injuries") -> str:
+        """Content hash of a league's feature table (CSV, else stored partitions)."""
+        csv_path = self._csv(table, league)
+        if csv_path.exists():
+            return self.hasher.hash(csv_path)
+        league_dir = self.store_root / table / f"league={league}"
+        parts = sorted(league_dir.rglob("*.arrow"))
+        if not parts:
+            raise FileNotFoundError(f"{table}/{league} not found")
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(str(part.relative_to(league_dir)).encode())
+            h.update(self.hasher.hash(part).encode())
+        return h.hexdigest()
+
+    def load(self, league: str, table: str = "features_with_injuries") -> LeagueData:
+        """
+        Load a league's splits, building and caching them on first use.
+
+        Raises:
+            FileNotFoundError: If the league has no feature table
+        """
+        data_hash = self.source_hash(league, table)
+        entry = self.cache_dir / f"{league}_{data_hash[:16]}"
+        if (entry / "_SUCCESS").exists():
+            X = {s: np.load(entry / f"X_{s}.npy") for s in SPLITS}
+            y = {s: np.load(entry / f"y_{s}.npy") for s in SPLITS}
+            data = LeagueData(league, data_hash, X, y)
+        else:
+            kwargs = {} if self.processed_dir is None else {"processed_dir": self.processed_dir}
+            df = read_frame(table, league, columns=["season_id", *FEATURE_COLS, TARGET_COL],
+                            root=self.store_root, **kwargs)
+            data = LeagueData.from_frame(df, league, data_hash)
+            self._write(entry, data)
+        self._save_memo()
+        return data
+
+    def _write(self, entry: Path, data: LeagueData) -> None:
+        tmp = entry.with_name(f".{entry.name}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for s in SPLITS:
+            np.save(tmp / f"X_{s}.npy", data.X[s])
+            np.save(tmp / f"y_{s}.npy", data.y[s])
+        (tmp / "_SUCCESS").write_text(time.strftime("%Y-%m-%dT%H:%M:%S"))
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+
+    def _save_memo(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / "files.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.hasher.memo(), indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def has_feature_table(league: str, table: str = "features_with_injuries") -> bool:
+    return csv_path_for(table, league).exists() or store_mtime(table, league) is not None
+
+
+# =============================================================================
+# Matrices and training
+# =============================================================================
+
+# (data_hash, nthread) -> (train, val) QuantileDMatrix, per process
+_matrices: Dict[Tuple[str, int], tuple] = {}
+
+
+def quantile_matrices(data: LeagueData, nthread: int = 0) -> tuple:
+    """
+    Train and val QuantileDMatrix for a league (val uses the train cuts).
+
+    Built once per process and data hash.
+    """
+    key = (data.data_hash, nthread)
+    if key not in _matrices:
+        dtrain = xgboost.QuantileDMatrix(data.X["train"], label=data.y["train"],
+                                         feature_names=FEATURE_COLS, nthread=nthread or -1)
+        dval = xgboost.QuantileDMatrix(data.X["val"], label=data.y["val"], ref=dtrain,
+                                       feature_names=FEATURE_COLS, nthread=nthread or -1)
+        _matrices[key] = (dtrain, dval)
+    return _matrices[key]
+
+
+def train_booster(
+    data: LeagueData,
+    params: Optional[dict] = None,
+    num_boost_round: int = DEFAULT_ROUNDS,
+    early_stopping_rounds: Optional[int] = None,
+    nthread: int = 0,
+):
+    """
+    Train a booster on the train split, evaluating on val.
+
+    Args:
+        data: League splits
+        params: Booster parameters (default: DEFAULT_PARAMS)
+        num_boost_round: Maximum trees
+        early_stopping_rounds: Stop when val log loss has not improved for
+                               this many rounds (None: train all rounds)
+        nthread: Threads (0: all cores)
+
+    Returns:
+        (booster, number of trees to use)
+    """
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    if nthread:
+        params["nthread"] = nthread
+    dtrain, dval = quantile_matrices(data, nthread)
+    booster = xgboost.train(
+        params,
+        dtrain,
+        num_boost_round=num_boost_round,
+        evals=[(dval, "val")],
+        early_stopping_rounds=early_stopping_rounds,
+        verbose_eval=False,
+    )
+    n_trees = booster.best_iteration + 1 if early_stopping_rounds else num_boost_round
+    return booster, n_trees
+
+
+def predict(booster, X: np.ndarray, n_trees: Optional[int] = None) -> np.ndarray:
+    """Home-win probabilities from the first ``n_trees`` trees."""
+    iteration_range = (0, n_trees) if n_trees else (0, 0)
+    return booster.inplace_predict(X, iteration_range=iteration_range)
+
+
+# =============================================================================
+# Trials
+# =============================================================================
+
+@dataclass
+class TrialResult:
+    """Outcome of one hyperparameter setting."""
+    params: dict
+    num_boost_round: int
+    n_trees: int
+    val_log_loss: float
+    test_log_loss: float
+    seconds: float
+
+
+def param_key(params: dict, num_boost_round: int, early_stopping_rounds: Optional[int]) -> str:
+    merged = {**DEFAULT_PARAMS, **params}
+    merged.pop("nthread", None)
+    return json.dumps({"params": merged, "rounds": num_boost_round, "es": early_stopping_rounds},
+                      sort_keys=True)
+
+
+def run_trial(
+    data: LeagueData,
+    params: dict,
+    num_boost_round: int = DEFAULT_ROUNDS,
+    early_stopping_rounds: Optional[int] = 50,
+    nthread: int = 0,
+) -> TrialResult:
+    """Train one setting and score it on val and test."""
+    start = time.perf_counter()
+    booster, n_trees = train_booster(data, params, num_boost_round, early_stopping_rounds, nthread)
+    return TrialResult(
+        params=dict(params),
+        num_boost_round=num_boost_round,
+        n_trees=n_trees,
+        val_log_loss=log_loss(data.y["val"], predict(booster, data.X["val"], n_trees)),
+        test_log_loss=log_loss(data.y["test"], predict(booster, data.X["test"], n_trees)),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def random_params(n: int, seed: int = 0) -> List[dict]:
+    """``n`` settings drawn from SEARCH_SPACE."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        params = {}
+        for name, (low, high, scale) in SEARCH_SPACE.items():
+            if scale == "int":
+                params[name] = rng.randint(int(low), int(high))
+            elif scale == "log":
+                params[name] = round(math.exp(rng.uniform(math.log(low), math.log(high))), 5)
+            else:
+                params[name] = round(rng.uniform(low, high), 4)
+        out.append(params)
+    return out
+
+
+class TrialCache:
+    """
+    Trial results on disk: one JSON file per (league, data hash), mapping a
+    parameter key to its result.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, league: str, data_hash: str) -> Path:
+        return self.cache_dir / f"{league}_{data_hash[:16]}.json"
+
+    def load(self, league: str, data_hash: str) -> dict:
+        path = self._path(league, data_hash)
+        if not path.exists():
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self, league: str, data_hash: str, entries: dict) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(league, data_hash)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+
+    def best(self, league: str, data_hash: str) -> Optional[TrialResult]:
+        """Lowest val log loss recorded for this data, if any."""
+        entries = self.load(league, data_hash)
+        if not entries:
+            return None
+        return min((TrialResult(**e) for e in entries.values()), key=lambda r: r.val_log_loss)
+
+
+def plan_workers(cpu_budget: Optional[int], threads_per_trial: int, n_tasks: int) -> int:
+    """Pool size so that workers x threads stays within the CPU budget."""
+    budget = cpu_budget or os.cpu_count() or 1
+    return max(1, min(n_tasks, budget // max(1, threads_per_trial)))
+
+
+# Per-worker state, set by _init_worker
+_worker_data: Dict[str, LeagueData] = {}
+
+
+def _init_worker(data: Dict[str, LeagueData]) -> None:
+    _worker_data.update(data)
+
+
+def _trial_task(task: Tuple[str, dict, int, Optional[int], int]) -> Tuple[str, TrialResult]:
+    league, params, rounds, es, nthread = task
+    return league, run_trial(_worker_data[league], params, rounds, es, nthread)
+
+
+def run_search(
+    data: Dict[str, LeagueData],
+    param_sets: Dict[str, Sequence[dict]],
+    num_boost_round: int = DEFAULT_ROUNDS,
+    early_stopping_rounds: Optional[int] = 50,
+    cpu_budget: Optional[int] = None,
+    threads_per_trial: int = 1,
+    cache_dir: Optional[Path] = None,
+) -> Dict[str, List[TrialResult]]:
+    """
+    Evaluate parameter settings for one or more leagues.
+
+    Args:
+        data: League -> splits
+        param_sets: League -> settings (overrides of DEFAULT_PARAMS)
+        num_boost_round: Maximum trees per trial
+        early_stopping_rounds: Early stopping patience on val
+        cpu_budget: Cores to use in total (default: CPU count)
+        threads_per_trial: XGBoost threads per trial
+        cache_dir: Directory for cached trial results (None disables caching)
+
+    Returns:
+        League -> results ranked by val log loss (best first)
+    """
+    cache = TrialCache(cache_dir) if cache_dir is not None else None
+    results: Dict[str, List[TrialResult]] = {league: [] for league in data}
+    entries: Dict[str, dict] = {}
+    tasks = []
+
+    for league, league_data in data.items():
+        entries[league] = cache.load(league, league_data.data_hash) if cache else {}
+        seen = set()
+        for params in param_sets.get(league, ()):
+            key = param_key(params, num_boost_round, early_stopping_rounds)
+            if key in seen:
+                continue
+            seen.add(key)
+            hit = entries[league].get(key)
+            if hit is not None:
+                results[league].append(TrialResult(**hit))
+            else:
+                tasks.append((league, dict(params), num_boost_round, early_stopping_rounds, threads_per_trial))
+
+    workers = plan_workers(cpu_budget, threads_per_trial, len(tasks))
+    if tasks and workers == 1:
+        done = [_run_inline(data, task) for task in tasks]
+    elif tasks:
+        needed = {task[0]: data[task[0]] for task in tasks}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(needed,)) as pool:
+            done = list(pool.map(_trial_task, tasks))
+    else:
+        done = []
+
+    for league, result in done:
+        results[league].append(result)
+        entries[league][param_key(result.params, result.num_boost_round, early_stopping_rounds)] = asdict(result)
+    if cache is not None:
+        for league in {league for league, _ in done}:
+            cache.save(league, data[league].data_hash, entries[league])
+
+    for league in results:
+        results[league].sort(key=lambda r: r.val_log_loss)
+    return results
+
+
+def _run_inline(data: Dict[str, LeagueData], task) -> Tuple[str, TrialResult]:
+    league, params, rounds, es, nthread = task
+    return league, run_trial(data[league], params, rounds, es, nthread)
+
+
+def format_trials(results: Sequence[TrialResult], top: int = 10) -> str:
+    """Ranked text table of trial results."""
+    lines = [f"{'rank':>4}  {'eta':>7}  {'depth':>5}  {'sub':>5}  {'col':>5}  {'mcw':>6}  "
+             f"{'lambda':>7}  {'alpha':>6}  {'trees':>5}  {'val_ll':>8}  {'test_ll':>8}"]
+    for rank, r in enumerate(results[:top], 1):
+        p = {**DEFAULT_PARAMS, **r.params}
+        lines.append(f"{rank:>4}  {p['eta']:>7.4f}  {p['max_depth']:>5}  {p['subsample']:>5.2f}  "
+                     f"{p['colsample_bytree']:>5.2f}  {p['min_child_weight']:>6.2f}  {p['lambda']:>7.3f}  "
+                     f"{p['alpha']:>6.3f}  {r.n_trees:>5}  {r.val_log_loss:>8.5f}  {r.test_log_loss:>8.5f}")
+    return "\n".join(lines)
@@ -31,11 +31,11 @@ from core import (
     ESPNClient,
     FeatureBuilder,
     Predictor,
-    GamePrediction,
     PredictionOutput,
     OddsClient,
     InjuryClient,
 )
+from core.daily_job import predict_slate
 
 
 def parse_args():
@@ -111,6 +111,7 @@ def main():
     else:
         target_date = date.today()
 
+    from core.elo_engine import EloParams
     from core.league_config import NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG
 
     if args.league == "wnba":
@@ -133,7 +134,7 @@ def main():
     # Initialize components
     print("\nLoading components...")
     
-    state_manager = StateManager(state_dir)
+    state_manager = StateManager(state_dir, elo_params=EloParams.from_config(config))
     team_mapper = TeamMapper(lookup_path=project_root / config.team_lookup_csv) if config.team_lookup_csv else TeamMapper()
     espn_client = ESPNClient(team_mapper, league_slug=config.espn_slug)
 
@@ -216,59 +217,12 @@ def main():
         else:
             print("  No injury data available (predictions unaffected)")
 
-    # Generate predictions
+    # Generate predictions (one batched model call for the slate)
     print("\nGenerating predictions...")
-    predictions = []
-
-    for game in games:
-        # Skip if we can't map teams
-        if game.home_team_id is None or game.away_team_id is None:
-            print(f"  ⚠ Skipping {game.away_team} @ {game.home_team}: Could not map team IDs")
-            continue
-
-        home_id = game.home_team_id
-        away_id = game.away_team_id
-
-        # Look up odds for this matchup
-        ml_home, ml_away = None, None
-        if odds_dict:
-            key = (home_id, away_id)
-            if key in odds_dict:
-                ml_home, ml_away = odds_dict[key]
-
-        # Get prediction (with odds if available)
-        result = predictor.predict_game(
-            home_id, away_id, game.game_date, feature_builder,
-            ml_home=ml_home, ml_away=ml_away
-        )
-
-        # Get feature details for context (with odds)
-        features = feature_builder.build_features_dict(home_id, away_id, game.game_date)
-
-        # Build prediction object
-        pred = GamePrediction(
-            game_date=game.game_date,
-            game_time=game.game_time,
-            home_team=game.home_team,
-            away_team=game.away_team,
-            home_team_id=home_id,
-            away_team_id=away_id,
-            prob_home_win=result["prob_home_win"],
-            prob_away_win=result["prob_away_win"],
-            confidence_tier=result["confidence_tier"],
-            home_elo=features["elo_home"],
-            away_elo=features["elo_away"],
-            elo_diff=features["elo_diff"],
-            home_win_pct=features["win_roll_home"],
-            away_win_pct=features["win_roll_away"],
-            home_margin=features["margin_roll_home"],
-            away_margin=features["margin_roll_away"],
-            home_rest_days=int(features["home_rest_days"]),
-            away_rest_days=int(features["away_rest_days"]),
-            home_b2b=bool(features["home_b2b"]),
-            away_b2b=bool(features["away_b2b"]),
-        )
-        predictions.append(pred)
+    predictions = predict_slate(games, predictor, feature_builder, odds_dict)
+    skipped = len(games) - len(predictions)
+    if skipped:
+        print(f"  ⚠ Skipped {skipped} game(s): could not map team IDs")
 
     # Create output
     output = PredictionOutput(predictions)
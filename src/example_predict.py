@@ -7,7 +7,7 @@ Prerequisites:
 """
 
 from pathlib import Path
-from core import TeamMapper, EloTracker, StatsTracker, FeatureBuilder, Predictor
+from core import TeamMapper, StateManager, FeatureBuilder, Predictor
 
 
 def main():
@@ -19,8 +19,6 @@ def main():
     STATE_DIR = PROJECT_ROOT / "state"
     MODELS_DIR = PROJECT_ROOT / "models"
     
-    ELO_STATE_PATH = STATE_DIR / "elo.json"
-    STATS_STATE_PATH = STATE_DIR / "stats.json"
     MODEL_PATH = MODELS_DIR / "xgb_v2_modern.json"
     CALIBRATOR_PATH = MODELS_DIR / "calibrator.pkl"
     
@@ -33,8 +31,7 @@ def main():
     mapper = TeamMapper()
     
     # Load state from files (created by bootstrap_state.py)
-    elo_tracker = EloTracker.from_file(ELO_STATE_PATH)
-    stats_tracker = StatsTracker.from_file(STATS_STATE_PATH)
+    elo_tracker, stats_tracker = StateManager(STATE_DIR).load()
     
     # Feature builder combines trackers
     feature_builder = FeatureBuilder(elo_tracker, stats_tracker)
@@ -0,0 +1,107 @@
+"""
+Export a low-latency "fast" variant of a league's model.
+
+Builds candidates from the configured model (first N trees of the ensemble,
+and optionally shallower retrains), recalibrates each on the val split,
+times single-row and slate-sized predict_proba calls on this machine, and
+reports each candidate's test log-loss delta against the current model.
+With --write the fastest candidate within --max-delta is saved next to the
+default as models/<model>_fast.json + <calibrator>_fast.pkl (plus the
+.ubj / .table.npz exports). The API serves it when MODEL_VARIANT=fast;
+Predictor(..., variant="fast") loads it directly.
+
+Usage:
+    # Report only
+    python src/export_fast_model.py --league wnba
+
+    # Also try depth-2 retrains, write the winner
+    python src/export_fast_model.py --league wnba --depths 2 --write
+
+    # Custom truncation points and loss budget
+    python src/export_fast_model.py --league nba --trees 100 200 300 --max-delta 0.001 --write
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.league_config import LEAGUE_CONFIGS
+from core.model_export import DEFAULT_BATCH_SIZE, build_candidates, select_fast, write_fast_model
+from core.xgb_training import DataCache, has_feature_table
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "xgb"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export a truncated / shallower fast model variant.")
+    parser.add_argument("--league", default="nba", choices=list(LEAGUE_CONFIGS))
+    parser.add_argument("--trees", type=int, nargs="+", default=[50, 100, 200, 400],
+                        help="Truncation points (first N trees)")
+    parser.add_argument("--depths", type=int, nargs="*", default=[],
+                        help="Max depths to retrain at with early stopping")
+    parser.add_argument("--max-delta", type=float, default=0.002,
+                        help="Largest allowed test log-loss increase over the default. Default: 0.002")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per batch timing")
+    parser.add_argument("--repeats", type=int, default=200, help="Timed calls per measurement")
+    parser.add_argument("--write", action="store_true", help="Save the selected candidate as the fast variant")
+    parser.add_argument("--out", default=None, help="Write the candidate report as CSV")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+    model_path = PROJECT_ROOT / config.model_path
+    calibrator_path = PROJECT_ROOT / config.calibrator_path
+
+    if not model_path.exists():
+        print(f"⚠ Model not found at {model_path}")
+        sys.exit(1)
+    if not has_feature_table(args.league):
+        print(f"⚠ {args.league.upper()}: no features_with_injuries table to score candidates on")
+        sys.exit(1)
+
+    data = DataCache(DATA_CACHE_DIR).load(args.league)
+    candidates = build_candidates(
+        model_path,
+        calibrator_path if calibrator_path.exists() else None,
+        data,
+        tree_counts=args.trees,
+        depths=args.depths,
+        batch_size=args.batch_size,
+        repeats=args.repeats,
+    )
+
+    report = pd.DataFrame([c.row() for c in candidates])
+    print(f"\n{'=' * 60}")
+    print(f"{config.league_name}: {model_path.name} (test split: {data.sizes()['test']} games)")
+    print(f"{'=' * 60}")
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.4f}"))
+
+    chosen = select_fast(candidates, args.max_delta)
+    if chosen is None:
+        print(f"\n⚠ No candidate is faster than the default within +{args.max_delta} log loss")
+    else:
+        default = candidates[0]
+        print(f"\n✓ Fast candidate: {chosen.name} ({chosen.single_row_ms:.3f} ms vs "
+              f"{default.single_row_ms:.3f} ms per row, log loss {chosen.log_loss_delta:+.4f})")
+        if args.write:
+            written = write_fast_model(chosen, model_path, calibrator_path if calibrator_path.exists() else None)
+            for kind, path in written.items():
+                print(f"  Saved {kind}: {Path(path).relative_to(PROJECT_ROOT)}")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        report.to_csv(out_path, index=False)
+        print(f"Saved report to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
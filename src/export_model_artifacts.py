@@ -0,0 +1,72 @@
+"""
+Export models to fast-loading artifacts.
+
+Writes, next to each league's configured model and calibrator:
+    models/<model>.ubj                 XGBoost binary (UBJSON) model
+    models/<calibrator>.table.npz      Compiled calibrator (Platt coefficients or lookup table)
+
+Predictor uses these automatically when they are at least as new as the
+JSON model / pickled calibrator they were exported from.
+
+Usage:
+    # Export every league
+    python src/export_model_artifacts.py
+
+    # Export one league
+    python src/export_model_artifacts.py --league wnba
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.league_config import LEAGUE_CONFIGS
+from core.model_artifacts import DEFAULT_GRID_SIZE, export_artifacts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Export XGBoost models and calibrators to fast-loading formats."
+    )
+    parser.add_argument(
+        "--league",
+        type=str,
+        default="all",
+        choices=["all", *LEAGUE_CONFIGS],
+        help="League to export. Default: all",
+    )
+    parser.add_argument(
+        "--grid-size",
+        type=int,
+        default=DEFAULT_GRID_SIZE,
+        help=f"Knots if a calibrator must be tabulated on a grid. Default: {DEFAULT_GRID_SIZE}",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    project_root = Path(__file__).parent.parent
+    leagues = list(LEAGUE_CONFIGS) if args.league == "all" else [args.league]
+
+    for league in leagues:
+        config = LEAGUE_CONFIGS[league]
+        model_path = project_root / config.model_path
+        if not model_path.exists():
+            print(f"⚠ {league.upper()}: model not found at {model_path}, skipping")
+            continue
+
+        exported = export_artifacts(
+            model_path,
+            project_root / config.calibrator_path,
+            grid_size=args.grid_size,
+        )
+        for kind, path in exported.items():
+            print(f"✓ {league.upper()} {kind}: {path.relative_to(project_root)} "
+                  f"({path.stat().st_size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
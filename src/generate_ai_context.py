@@ -20,8 +20,10 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -34,6 +36,8 @@ from core import (
     InjuryClient,
 )
 from core.injury_client import calculate_injury_adjustment
+from core.atomic_io import write_json_atomic
+from core.scoreboard_archive import default_archive, is_final_day
 
 
 # ---------------------------------------------------------------------------
@@ -41,6 +45,7 @@ from core.injury_client import calculate_injury_adjustment
 # ---------------------------------------------------------------------------
 
 ESPN_BASE = "https://site.api.espn.com/apis/site/v2/sports/basketball/nba"
+FETCH_WORKERS = 8
 _SESSION = requests.Session()
 _SESSION.headers.update({"Accept": "application/json", "User-Agent": "NBA-Predictor/1.0"})
 
@@ -58,6 +63,172 @@ def _date_str(days_ago: int = 0) -> str:
     return d.strftime("%Y%m%d")
 
 
+def _scoreboard(ds: str) -> dict:
+    """NBA scoreboard for a YYYYMMDD date, read through the scoreboard archive."""
+    url = f"{ESPN_BASE}/scoreboard?dates={ds}"
+    archive = default_archive()
+    if archive is None:
+        return _get(url)
+    return archive.get("nba", ds, lambda: _get(url))
+
+
+def _load_days(days: List[date]) -> List[Optional[dict]]:
+    """Scoreboards for the given days, fetched concurrently (None on failure)."""
+    def load(day: date) -> Optional[dict]:
+        try:
+            return _scoreboard(day.strftime("%Y%m%d"))
+        except Exception:
+            return None
+
+    if not days:
+        return []
+    with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(days))) as pool:
+        return list(pool.map(load, days))
+
+
+def _final_games(scoreboard: dict) -> List[dict]:
+    """Finished games on a scoreboard, in ESPN order."""
+    games = []
+    for event in scoreboard.get("events", []):
+        comp       = (event.get("competitions") or [{}])[0]
+        status_desc = event.get("status", {}).get("type", {}).get("description", "")
+        if status_desc.lower() != "final":
+            continue
+
+        competitors = comp.get("competitors", [])
+        if len(competitors) < 2:
+            continue
+
+        home = away = None
+        for c in competitors:
+            obj = {
+                "name":   c.get("team", {}).get("displayName", ""),
+                "score":  int(c.get("score", 0) or 0),
+                "winner": bool(c.get("winner", False)),
+            }
+            if c.get("homeAway") == "home":
+                home = obj
+            else:
+                away = obj
+
+        if not home or not away:
+            continue
+
+        games.append({"date": event.get("date", "")[:10], "home": home, "away": away})
+    return games
+
+
+class ResultsIndex:
+    """
+    Finished games by scoreboard day, kept across runs in the output
+    directory. Each run only loads the days after the last fully settled
+    one (plus any day still in progress), so recent results and
+    head-to-head are updated from newly finished games instead of
+    rescanning the whole window.
+    """
+
+    FILE_NAME = ".results_index.json"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.days: Dict[str, List[dict]] = {}
+        self.settled_through: Optional[str] = None
+        if path.exists():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    stored = json.load(f)
+                self.days = stored.get("days", {})
+                self.settled_through = stored.get("settled_through")
+            except (OSError, ValueError):
+                pass    # rebuilt below
+
+    def update(self, days: int, today: Optional[date] = None) -> int:
+        """
+        Bring the index up to yesterday, covering the last `days` days.
+
+        Returns:
+            Number of scoreboard days loaded
+        """
+        today = today or date.today()
+        window = [today - timedelta(days=i) for i in range(days, 0, -1)]
+        todo = [d for d in window
+                if self.settled_through is None or d.strftime("%Y%m%d") > self.settled_through]
+
+        settled = True
+        for day, board in zip(todo, _load_days(todo)):
+            key = day.strftime("%Y%m%d")
+            if board is None:
+                settled = False
+                continue
+            self.days[key] = _final_games(board)
+            if settled and is_final_day(board, key, today):
+                self.settled_through = key
+            else:
+                settled = False
+
+        first = window[0].strftime("%Y%m%d") if window else ""
+        self.days = {k: v for k, v in self.days.items() if k >= first}
+        return len(todo)
+
+    def games(self, days: int, today: Optional[date] = None) -> List[dict]:
+        """Finished games of the last `days` days, most recent day first."""
+        today = today or date.today()
+        first = (today - timedelta(days=days)).strftime("%Y%m%d")
+        last = (today - timedelta(days=1)).strftime("%Y%m%d")
+        return [g for key in sorted(self.days, reverse=True) if first <= key <= last for g in self.days[key]]
+
+    def save(self) -> None:
+        write_json_atomic(self.path, {"settled_through": self.settled_through, "days": self.days})
+
+
+def _recent_games(days: int, index: Optional[ResultsIndex] = None) -> List[dict]:
+    """Finished games of the last `days` days, most recent day first."""
+    if index is not None:
+        return index.games(days)
+    window = [date.today() - timedelta(days=i) for i in range(1, days + 1)]
+    return [g for board in _load_days(window) if board is not None for g in _final_games(board)]
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed sections
+# ---------------------------------------------------------------------------
+
+MANIFEST_NAME = ".context_manifest.json"
+_VOLATILE_KEYS = ("generated_at", "last_updated")
+
+
+def content_hash(data: Dict) -> str:
+    """SHA-256 of a section, ignoring its generation timestamps."""
+    stable = {k: v for k, v in data.items() if k not in _VOLATILE_KEYS}
+    return hashlib.sha256(json.dumps(stable, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _load_manifest(output_dir: Path) -> Dict[str, dict]:
+    try:
+        with open(output_dir / MANIFEST_NAME, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_section(output_dir: Path, file_name: str, data: Dict, manifest: Dict[str, dict]) -> bool:
+    """
+    Write a context file unless its content is unchanged since the last run.
+
+    Returns:
+        True if the file was written
+    """
+    digest = content_hash(data)
+    entry = manifest.setdefault(file_name, {})
+    if entry.get("sha256") == digest and (output_dir / file_name).exists():
+        print(f"  = {file_name} unchanged")
+        return False
+    write_json_atomic(output_dir / file_name, data, sync_dir=False, indent=2)
+    entry["sha256"] = digest
+    print(f"✓ Saved {file_name}")
+    return True
+
+
 # ---------------------------------------------------------------------------
 # 1. Injury Report
 # ---------------------------------------------------------------------------
@@ -226,62 +397,36 @@ def generate_standings(output_path: Optional[Path] = None) -> Dict:
 # 4. Recent Results
 # ---------------------------------------------------------------------------
 
-def generate_recent_results(days: int = 7, output_path: Optional[Path] = None) -> Dict:
+def generate_recent_results(
+    days: int = 7,
+    output_path: Optional[Path] = None,
+    index: Optional[ResultsIndex] = None,
+) -> Dict:
     """
-    Fetch game results from the past `days` days and build per-team last-5 summaries.
+    Build per-team last-5 summaries from the past `days` days of results
+    (from `index` when given, else from the scoreboards).
     """
-    print(f"Fetching recent results (last {days} days) from ESPN...")
+    print(f"Collecting recent results (last {days} days)...")
     team_results: Dict[str, List[dict]] = {}
 
-    for i in range(1, days + 1):
-        ds = _date_str(i)
-        try:
-            data = _get(f"{ESPN_BASE}/scoreboard?dates={ds}")
-        except Exception:
-            continue
+    for game in _recent_games(days, index):
+        home, away, game_date = game["home"], game["away"], game["date"]
 
-        for event in data.get("events", []):
-            comp       = (event.get("competitions") or [{}])[0]
-            status_desc = event.get("status", {}).get("type", {}).get("description", "")
-            if status_desc.lower() != "final":
-                continue
-
-            competitors = comp.get("competitors", [])
-            if len(competitors) < 2:
-                continue
-
-            home = away = None
-            for c in competitors:
-                obj = {
-                    "name":   c.get("team", {}).get("displayName", ""),
-                    "score":  int(c.get("score", 0) or 0),
-                    "winner": c.get("winner", False),
-                }
-                if c.get("homeAway") == "home":
-                    home = obj
-                else:
-                    away = obj
-
-            if not home or not away:
-                continue
-
-            game_date = event.get("date", "")[:10]
-
-            home_entry = {
-                "date": game_date, "opponent": away["name"], "location": "home",
-                "team_score": home["score"], "opp_score": away["score"],
-                "result": "W" if home["winner"] else "L",
-                "label": f"{'W' if home['winner'] else 'L'} {home['score']}-{away['score']} vs {away['name']}",
-            }
-            away_entry = {
-                "date": game_date, "opponent": home["name"], "location": "away",
-                "team_score": away["score"], "opp_score": home["score"],
-                "result": "W" if away["winner"] else "L",
-                "label": f"{'W' if away['winner'] else 'L'} {away['score']}-{home['score']} @ {home['name']}",
-            }
+        home_entry = {
+            "date": game_date, "opponent": away["name"], "location": "home",
+            "team_score": home["score"], "opp_score": away["score"],
+            "result": "W" if home["winner"] else "L",
+            "label": f"{'W' if home['winner'] else 'L'} {home['score']}-{away['score']} vs {away['name']}",
+        }
+        away_entry = {
+            "date": game_date, "opponent": home["name"], "location": "away",
+            "team_score": away["score"], "opp_score": home["score"],
+            "result": "W" if away["winner"] else "L",
+            "label": f"{'W' if away['winner'] else 'L'} {away['score']}-{home['score']} @ {home['name']}",
+        }
 
-            team_results.setdefault(home["name"], []).insert(0, home_entry)
-            team_results.setdefault(away["name"], []).insert(0, away_entry)
+        team_results.setdefault(home["name"], []).insert(0, home_entry)
+        team_results.setdefault(away["name"], []).insert(0, away_entry)
 
     teams_out = []
     for team_name, results in sorted(team_results.items()):
@@ -313,59 +458,38 @@ def generate_recent_results(days: int = 7, output_path: Optional[Path] = None) -
 # 5. Head-to-Head Records
 # ---------------------------------------------------------------------------
 
-def generate_head_to_head(days: int = 120, output_path: Optional[Path] = None) -> Dict:
+def generate_head_to_head(
+    days: int = 120,
+    output_path: Optional[Path] = None,
+    index: Optional[ResultsIndex] = None,
+) -> Dict:
     """
-    Build season head-to-head records by scanning the last `days` days of scoreboards.
+    Build season head-to-head records from the last `days` days of results
+    (from `index` when given, else from the scoreboards).
     """
-    print(f"Building head-to-head records (last {days} days from ESPN)...")
+    print(f"Building head-to-head records (last {days} days)...")
     matchups: Dict[str, dict] = {}
 
-    for i in range(1, days + 1):
-        ds = _date_str(i)
-        try:
-            data = _get(f"{ESPN_BASE}/scoreboard?dates={ds}")
-        except Exception:
-            continue
-
-        for event in data.get("events", []):
-            comp       = (event.get("competitions") or [{}])[0]
-            status_desc = event.get("status", {}).get("type", {}).get("description", "")
-            if status_desc.lower() != "final":
-                continue
-
-            competitors = comp.get("competitors", [])
-            if len(competitors) < 2:
-                continue
-
-            home = away = None
-            for c in competitors:
-                obj = {"name": c.get("team", {}).get("displayName", ""), "score": int(c.get("score", 0) or 0), "winner": c.get("winner", False)}
-                if c.get("homeAway") == "home":
-                    home = obj
-                else:
-                    away = obj
-
-            if not home or not away:
-                continue
-
-            team_a, team_b = sorted([home["name"], away["name"]])
-            key = f"{team_a} vs {team_b}"
-            if key not in matchups:
-                matchups[key] = {"team_a": team_a, "team_b": team_b, "team_a_wins": 0, "team_b_wins": 0, "games": []}
-
-            winner = home["name"] if home["winner"] else away["name"]
-            if winner == team_a:
-                matchups[key]["team_a_wins"] += 1
-            else:
-                matchups[key]["team_b_wins"] += 1
-
-            matchups[key]["games"].append({
-                "date":   event.get("date", "")[:10],
-                "home":   home["name"],
-                "away":   away["name"],
-                "score":  f"{home['score']}-{away['score']}",
-                "winner": winner,
-            })
+    for game in _recent_games(days, index):
+        home, away = game["home"], game["away"]
+        team_a, team_b = sorted([home["name"], away["name"]])
+        key = f"{team_a} vs {team_b}"
+        if key not in matchups:
+            matchups[key] = {"team_a": team_a, "team_b": team_b, "team_a_wins": 0, "team_b_wins": 0, "games": []}
+
+        winner = home["name"] if home["winner"] else away["name"]
+        if winner == team_a:
+            matchups[key]["team_a_wins"] += 1
+        else:
+            matchups[key]["team_b_wins"] += 1
+
+        matchups[key]["games"].append({
+            "date":   game["date"],
+            "home":   home["name"],
+            "away":   away["name"],
+            "score":  f"{home['score']}-{away['score']}",
+            "winner": winner,
+        })
 
     result = {
         "generated_at": datetime.now().isoformat(),
@@ -658,9 +782,21 @@ def generate_model_context(output_path: Optional[Path] = None) -> Dict:
 # Orchestrator
 # ---------------------------------------------------------------------------
 
-def generate_all_context_files(output_dir: Path) -> None:
+RECENT_DAYS = 7
+H2H_DAYS = 120
+
+
+def generate_all_context_files(output_dir: Path) -> Dict[str, bool]:
     """
     Generate all 7 context files for the Vertex AI agent.
+
+    The ESPN-backed sections (injuries, standings, new scoreboard days) are
+    fetched concurrently while the local ones are built. Recent results and
+    head-to-head come from the incremental ResultsIndex, and files whose
+    content did not change since the last run are left untouched.
+
+    Returns:
+        Dict of file name -> whether it was (re)written
     """
     print(f"\n{'=' * 70}")
     print("  NBA Prediction — AI Context File Generator (v3)")
@@ -671,91 +807,120 @@ def generate_all_context_files(output_dir: Path) -> None:
 
     team_mapper   = TeamMapper()
     state_manager = StateManager(state_dir)
-    injury_client = InjuryClient(team_mapper)
+    injury_client = InjuryClient(team_mapper, session=_SESSION)
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+    index = ResultsIndex(output_dir / ResultsIndex.FILE_NAME)
+    sections: Dict[str, Dict] = {}
 
-    # 1. Injuries (needed first — used by daily predictions enrichment)
-    injury_report = generate_injury_report(
-        injury_client,
-        output_path=output_dir / "injury_report.json",
-    )
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        injuries_future  = pool.submit(generate_injury_report, injury_client)
+        standings_future = pool.submit(generate_standings)
+        index_future     = pool.submit(index.update, H2H_DAYS)
 
-    # 2. Team info (Elo + rolling stats)
-    generate_team_info(
-        team_mapper,
-        state_manager,
-        output_path=output_dir / "team_info.json",
-    )
+        # Local sections while ESPN responds
+        sections["team_info.json"] = generate_team_info(team_mapper, state_manager)
+        sections["model_context.json"] = generate_model_context()
 
-    # 3. Standings
-    try:
-        generate_standings(output_path=output_dir / "standings.json")
-    except Exception as e:
-        print(f"⚠  Standings fetch failed: {e}")
+        # 1. Injuries (needed first — used by daily predictions enrichment)
+        injury_report = injuries_future.result()
+        sections["injury_report.json"] = injury_report
 
-    # 4. Recent results (last 7 days)
-    try:
-        generate_recent_results(days=7, output_path=output_dir / "recent_results.json")
-    except Exception as e:
-        print(f"⚠  Recent results fetch failed: {e}")
+        # 3. Standings
+        try:
+            sections["standings.json"] = standings_future.result()
+        except Exception as e:
+            print(f"⚠  Standings fetch failed: {e}")
 
-    # 5. Head-to-head (season — last 120 days)
-    try:
-        generate_head_to_head(days=120, output_path=output_dir / "head_to_head.json")
-    except Exception as e:
-        print(f"⚠  Head-to-head fetch failed: {e}")
+        # 4 + 5. Recent results and head-to-head from the results index
+        try:
+            loaded = index_future.result()
+            index.save()
+            print(f"  Results index: {loaded} scoreboard day(s) loaded, settled through {index.settled_through}")
+            sections["recent_results.json"] = generate_recent_results(RECENT_DAYS, index=index)
+            sections["head_to_head.json"] = generate_head_to_head(H2H_DAYS, index=index)
+        except Exception as e:
+            print(f"⚠  Results fetch failed: {e}")
 
     # 6. Daily predictions (injury-enriched)
-    generate_daily_predictions(
-        injury_report,
-        project_root,
-        output_path=output_dir / "daily_predictions.json",
-    )
+    daily = generate_daily_predictions(injury_report, project_root)
+    if daily:
+        sections["daily_predictions.json"] = daily
 
-    # 7. Model context
-    generate_model_context(output_path=output_dir / "model_context.json")
+    written = {name: write_section(output_dir, name, data, manifest) for name, data in sections.items()}
+    write_json_atomic(output_dir / MANIFEST_NAME, manifest, indent=2, sort_keys=True)
 
     print(f"\n{'=' * 70}")
     print(f"  ✓ All context files generated in: {output_dir}")
     print(f"{'=' * 70}\n")
 
-    print("Files created:")
-    for file in sorted(output_dir.glob("*.json")):
-        size_kb = file.stat().st_size / 1024
-        print(f"  - {file.name:35s} ({size_kb:.1f} KB)")
+    print("Files:")
+    for name in sorted(written):
+        size_kb = (output_dir / name).stat().st_size / 1024
+        status = "updated" if written[name] else "unchanged"
+        print(f"  - {name:35s} ({size_kb:.1f} KB, {status})")
 
     print("\nNext steps:")
     print("  python src/generate_ai_context.py --upload-to-gcs")
     print("  — or —")
     print("  firebase deploy --only functions   (refreshDailyContext auto-uploads every 9 AM ET)")
+    return written
 
 
 # ---------------------------------------------------------------------------
 # GCS Upload
 # ---------------------------------------------------------------------------
 
-def upload_to_gcs(output_dir: Path, bucket_name: str) -> None:
+def upload_to_gcs(output_dir: Path, bucket_name: str) -> int:
     """
-    Upload all JSON files in output_dir to gs://<bucket_name>/ai_context/.
+    Upload the JSON files in output_dir to gs://<bucket_name>/ai_context/,
+    concurrently, skipping files whose content was already uploaded.
+
+    Returns:
+        Number of uploaded files
     """
     try:
         from google.cloud import storage as gcs
     except ImportError:
         print("Error: google-cloud-storage not installed.")
         print("  pip install google-cloud-storage")
-        return
+        return 0
+
+    manifest = _load_manifest(output_dir)
+    pending = []
+    for file in sorted(output_dir.glob("*.json")):
+        if file.name.startswith("."):
+            continue
+        entry = manifest.get(file.name, {})
+        if entry.get("sha256") and entry.get("uploaded_sha256") == entry["sha256"]:
+            print(f"  = {file.name} unchanged since last upload")
+            continue
+        pending.append(file)
 
-    print(f"\nUploading files to gs://{bucket_name}/ai_context/...")
+    if not pending:
+        print(f"\nNothing to upload to gs://{bucket_name}/ai_context/")
+        return 0
+
+    print(f"\nUploading {len(pending)} file(s) to gs://{bucket_name}/ai_context/...")
     client = gcs.Client()
     bucket = client.bucket(bucket_name)
 
-    for file in sorted(output_dir.glob("*.json")):
+    def upload(file: Path) -> str:
         blob = bucket.blob(f"ai_context/{file.name}")
-        blob.upload_from_filename(str(file))
-        print(f"  ✓ Uploaded {file.name}")
-
-    print(f"\n✓ All files uploaded to gs://{bucket_name}/ai_context/")
+        blob.upload_from_filename(str(file), content_type="application/json")
+        return file.name
+
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        for name in pool.map(upload, pending):
+            entry = manifest.get(name)
+            if entry and entry.get("sha256"):
+                entry["uploaded_sha256"] = entry["sha256"]
+            print(f"  ✓ Uploaded {name}")
+
+    write_json_atomic(output_dir / MANIFEST_NAME, manifest, indent=2, sort_keys=True)
+    print(f"\n✓ Uploaded to gs://{bucket_name}/ai_context/")
+    return len(pending)
 
 
 # ---------------------------------------------------------------------------
@@ -3,17 +3,30 @@ Daily Cloud Run job entrypoint.
 
 Flow:
 1) Sync latest state from GCS
-2) Update state using yesterday's completed games (ET)
-3) Upload updated state to GCS
-4) Generate today's predictions (ET)
+2) For every league (DAILY_LEAGUES, default nba,wnba,cbb), concurrently and
+   in this process (see core/daily_job.py):
+   update state with the completed games of every day since the last
+   processed one, through yesterday (ET) -> persist ->
+   warm-start the model (MODEL_REFRESH=1; promoted only if holdout loss
+   does not regress) -> predict today's games (ET) -> publish
+   (predictions/daily.json for NBA, predictions/<league>_daily.json otherwise)
+3) Upload updated state to GCS (with the live training rows, the served
+   market / injury features and any refreshed model, which live in the
+   league state directories so that the next run and the API see them)
+4) Trigger the API state reload
+
+Each league's state and model are loaded once, and all HTTP clients share
+one connection pool. Per-stage timings are printed at the end. NBA state
+kept in the state root by earlier versions of this job (gs://.../state/
+elo.json) is adopted into state/nba once, if it is newer.
 """
 
 from __future__ import annotations
 
-import subprocess
+import os
 import sys
+import time
 from datetime import datetime, timedelta
-import os
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
@@ -22,49 +35,61 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 STATE_DIR = PROJECT_ROOT / "state"
 sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
-import requests
-
+from core.daily_job import LEAGUE_CONFIGS, make_http_session, run_daily_job, timing_report
 from core.state_sync import download_state_from_gcs, upload_state_to_gcs
 
 
-def _run(args: list[str]) -> None:
-    subprocess.run([sys.executable, *args], cwd=str(PROJECT_ROOT), check=True)
+def _leagues() -> list[str]:
+    leagues = [l.strip().lower() for l in os.getenv("DAILY_LEAGUES", ",".join(LEAGUE_CONFIGS)).split(",")]
+    unknown = [l for l in leagues if l and l not in LEAGUE_CONFIGS]
+    if unknown:
+        raise ValueError(f"Unknown league(s) in DAILY_LEAGUES: {', '.join(unknown)}")
+    return [l for l in leagues if l]
 
 
 def main() -> None:
     now_et = datetime.now(ET)
     yesterday_et = (now_et - timedelta(days=1)).date().isoformat()
     today_et = now_et.date().isoformat()
+    timings = {}
 
+    start = time.perf_counter()
     synced = download_state_from_gcs(STATE_DIR, required=True)
+    timings["download"] = time.perf_counter() - start
     print(f"Downloaded {synced} state file(s) from GCS.")
 
-    _run(["src/update_state.py", "--date", yesterday_et])
+    session = make_http_session()
+    results = run_daily_job(
+        yesterday_et,
+        today_et,
+        leagues=_leagues(),
+        refresh=os.getenv("MODEL_REFRESH", "0") == "1",
+        project_root=PROJECT_ROOT,
+        session=session,
+    )
 
+    start = time.perf_counter()
     uploaded = upload_state_to_gcs(STATE_DIR, required=True)
+    timings["upload"] = time.perf_counter() - start
     print(f"Uploaded {uploaded} state file(s) to GCS.")
 
     api_base_url = os.getenv("API_BASE_URL", "").rstrip("/")
     if api_base_url:
         reload_url = f"{api_base_url}/state/reload"
         try:
-            response = requests.post(reload_url, timeout=20)
+            response = session.post(reload_url, timeout=20)
             response.raise_for_status()
             print(f"Triggered API state reload via {reload_url}.")
         except Exception as e:
             print(f"Warning: API state reload failed ({reload_url}): {e}")
 
-    _run(
-        [
-            "src/daily_predictions.py",
-            "--date",
-            today_et,
-            "--output",
-            "predictions/daily.json",
-            "--app-format",
-        ]
-    )
+    print()
+    print(timing_report(results))
+    print("  " + ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()))
 
+    failed = [league for league, r in results.items() if not r.ok]
+    if failed:
+        raise SystemExit(f"Daily job failed for: {', '.join(failed)}")
     print("Daily Cloud Run job finished successfully.")
 
 
@@ -29,26 +29,26 @@ sys.path.insert(0, str(PROJECT_ROOT / "src"))
 
 import requests
 
-from core.state_sync import download_state_from_gcs, upload_state_to_gcs
+from core.state_sync import DEFAULT_STATE_FILES, download_state_from_gcs, upload_state_to_gcs
 
 
 # GCS file patterns for playoff state (separate from regular season files)
 PLAYOFF_STATE_FILES = [
     "playoff_bracket.json",
     "playoff_elo.json",
+    "playoff_stats.json",
     "playoff_metadata.json",
 ]
 
 
 def _download_playoff_state(state_dir: Path) -> int:
     """
-    Download playoff-specific state files from GCS.
-
-    Falls back to full download if per-file download is not supported.
+    Download regular-season and playoff state files from GCS (only the
+    ones that changed since the last sync).
     """
     try:
-        # Try to download only playoff files
-        count = download_state_from_gcs(state_dir, required=False)
+        count = download_state_from_gcs(state_dir, files=(*DEFAULT_STATE_FILES, *PLAYOFF_STATE_FILES),
+                                        required=False)
         return count
     except Exception as e:
         print(f"Warning: GCS playoff state download failed: {e}")
@@ -58,7 +58,8 @@ def _download_playoff_state(state_dir: Path) -> int:
 def _upload_playoff_state(state_dir: Path) -> int:
     """Upload playoff-specific state files to GCS."""
     try:
-        count = upload_state_to_gcs(state_dir, required=False)
+        count = upload_state_to_gcs(state_dir, files=(*DEFAULT_STATE_FILES, *PLAYOFF_STATE_FILES),
+                                    required=False)
         return count
     except Exception as e:
         print(f"Warning: GCS playoff state upload failed: {e}")
@@ -3,15 +3,10 @@ import re
 from pathlib import Path
 
 # Paths
-odds_path = Path(
-    "/mnt/c/Users/sandy/Desktop/dev/Basketball_Prediction/data/raw/nba_2008-2025.csv"
-)
-team_path = Path(
-    "/mnt/c/Users/sandy/Desktop/dev/Basketball_Prediction/data/processed/team_lookup.csv"
-)
-out_path = Path(
-    "/mnt/c/Users/sandy/Desktop/dev/Basketball_Prediction/data/processed/odds_with_team_ids.csv"
-)
+PROJECT_ROOT = Path(__file__).parent.parent
+odds_path = PROJECT_ROOT / "data" / "raw" / "nba_2008-2025.csv"
+team_path = PROJECT_ROOT / "data" / "processed" / "team_lookup.csv"
+out_path = PROJECT_ROOT / "data" / "processed" / "odds_with_team_ids.csv"
 
 # Known aliases (historical + sportsbook quirks)
 ALIASES = {
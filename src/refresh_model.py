@@ -0,0 +1,77 @@
+"""
+Incremental daily model refresh (warm start).
+
+Continues boosting a league's model on the completed games recorded in its
+state directory since the model last saw data, refits the calibrator on
+val, and promotes the result only if the test-split log loss does not
+regress. A promoted model is written to the state directory, where the
+daily job and the API pick it up; the configured model files are left
+alone. See core/model_refresh.py.
+
+Usage:
+    python src/refresh_model.py --league nba
+
+    # Evaluate only, never overwrite the model
+    python src/refresh_model.py --league nba --dry-run
+
+    # More trees per refresh, allow a tiny holdout regression
+    python src/refresh_model.py --league wnba --rounds 20 --tolerance 0.0005
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.league_config import LEAGUE_CONFIGS
+from core.model_refresh import MIN_NEW_GAMES, REFRESH_ROUNDS, refresh_league, refresh_report
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "xgb"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Warm-start the model on newly completed games.")
+    parser.add_argument("--league", default="nba", choices=list(LEAGUE_CONFIGS))
+    parser.add_argument("--state-dir", type=str, default=None,
+                        help="State directory. Default: the league's state dir")
+    parser.add_argument("--rounds", type=int, default=REFRESH_ROUNDS, help="Trees to add per refresh")
+    parser.add_argument("--min-games", type=int, default=MIN_NEW_GAMES,
+                        help="Wait until this many new games have been recorded")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Largest allowed test log-loss increase. Default: 0")
+    parser.add_argument("--dry-run", action="store_true", help="Evaluate without promoting")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+    model_path = PROJECT_ROOT / config.model_path
+    calibrator_path = PROJECT_ROOT / config.calibrator_path
+    state_dir = Path(args.state_dir) if args.state_dir else PROJECT_ROOT / config.state_dir
+
+    try:
+        result = refresh_league(
+            args.league,
+            model_path,
+            calibrator_path,
+            DATA_CACHE_DIR,
+            state_dir,
+            rounds=args.rounds,
+            min_new_games=args.min_games,
+            tolerance=args.tolerance,
+            promote=not args.dry_run,
+        )
+    except FileNotFoundError as e:
+        print(f"⚠ {e}")
+        sys.exit(1)
+    print(refresh_report([result]))
+    if result.promoted:
+        print(f"  Saved model to: {state_dir} (live games through {result.live_through})")
+
+
+if __name__ == "__main__":
+    main()
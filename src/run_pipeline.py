@@ -0,0 +1,179 @@
+"""
+Run the data-prep and training chain for one or more leagues.
+
+Stages (per league):
+    labels     build_pd_df.py           nba.sqlite -> games_with_labels.csv (NBA only)
+    odds       map_odds_teams.py        raw odds -> odds_with_team_ids.csv (NBA only)
+    elo        build_elo.py             games_with_labels -> games_with_elo
+    rest       rest_features.py         games_with_elo -> games_with_elo_rest
+    features   features_with_injuries   games_with_elo_rest (+ odds) -> features_with_injuries
+    train      xgb_boost_model.py       features -> model, calibrator, predictions
+
+A stage only runs when the content of its inputs, its script / core
+modules, or its parameters (e.g. the league's Elo K/HCA/carry-over) changed
+since its last successful run; see core/pipeline.py. Leagues run in
+parallel. Manifests and per-stage logs are kept in data/cache/pipeline/.
+
+Usage:
+    # Bring every league up to date
+    python src/run_pipeline.py
+
+    # One league, show what would run
+    python src/run_pipeline.py --league wnba --dry-run
+
+    # Rebuild features even if nothing changed, stop before training
+    python src/run_pipeline.py --league cbb --force features --until features
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.elo_engine import EloParams
+from core.league_config import LEAGUE_CONFIGS, LeagueConfig
+from core.model_artifacts import table_path_for, ubj_path_for
+from core.pipeline import Pipeline, Stage, run_pipelines
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+STATE_DIR = PROJECT_ROOT / "data" / "cache" / "pipeline"
+
+SRC = Path("src")
+CORE = SRC / "core"
+PROCESSED = Path("data") / "processed"
+
+
+def league_stages(league: str, config: LeagueConfig) -> List[Stage]:
+    """
+    Stage definitions for one league (paths relative to the project root).
+
+    Args:
+        league: "nba", "wnba" or "cbb"
+        config: League configuration
+
+    Returns:
+        Stages in run order
+    """
+    prefix = "" if league == "nba" else f"{league}_"
+    labels = PROCESSED / f"{prefix}games_with_labels.csv"
+    elo = PROCESSED / f"{prefix}games_with_elo.csv"
+    elo_rest = PROCESSED / f"{prefix}games_with_elo_rest.csv"
+    odds = PROCESSED / f"{prefix}odds_with_team_ids.csv"
+    features = PROCESSED / f"{prefix}features_with_injuries.csv"
+    predictions = PROCESSED / f"{prefix}model_predictions.csv"
+    model = Path(config.model_path)
+    calibrator = Path(config.calibrator_path)
+
+    stages = []
+    if league == "nba":
+        # WNBA/CBB labels and odds are collected outside this repo
+        stages.append(Stage(
+            name="labels",
+            script=SRC / "build_pd_df.py",
+            inputs=[Path("data") / "nba.sqlite"],
+            outputs=[labels],
+        ))
+        stages.append(Stage(
+            name="odds",
+            script=SRC / "map_odds_teams.py",
+            inputs=[Path("data") / "raw" / "nba_2008-2025.csv", PROCESSED / "team_lookup.csv"],
+            outputs=[odds],
+        ))
+
+    league_args = ["--league", league]
+    # Every stage reads and writes through table_store and takes its league
+    # settings (Elo params, season_id_for) from league_config
+    shared = [CORE / "table_store.py", CORE / "league_config.py"]
+    stages += [
+        Stage(
+            name="elo",
+            script=SRC / "build_elo.py",
+            args=league_args,
+            inputs=[labels],
+            outputs=[elo],
+            code=[*shared, CORE / "elo_engine.py"],
+            params=asdict(EloParams.from_config(config)),
+        ),
+        Stage(
+            name="rest",
+            script=SRC / "rest_features.py",
+            args=league_args,
+            inputs=[elo],
+            outputs=[elo_rest],
+            code=[*shared, CORE / "feature_pipeline.py", CORE / "feature_builder.py"],
+        ),
+        Stage(
+            name="features",
+            script=SRC / "features_with_injuries.py",
+            args=league_args,
+            inputs=[elo_rest],
+            optional_inputs=[odds],
+            outputs=[features],
+            code=[*shared, CORE / "feature_pipeline.py", CORE / "feature_builder.py"],
+        ),
+        Stage(
+            name="train",
+            script=SRC / "xgb_boost_model.py",
+            args=league_args,
+            inputs=[features, elo_rest],
+            outputs=[model, calibrator, predictions, ubj_path_for(model), table_path_for(calibrator)],
+            code=[*shared, CORE / "model_artifacts.py", CORE / "calibration.py", CORE / "xgb_training.py",
+                  CORE / "feature_builder.py"],
+            params={"model_path": config.model_path, "calibrator_path": config.calibrator_path},
+        ),
+    ]
+    return stages
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the data-prep / training pipeline.")
+    parser.add_argument("--league", default="all", choices=["all", *LEAGUE_CONFIGS])
+    parser.add_argument("--force", nargs="+", default=[], metavar="STAGE",
+                        help="Stages to run even if up to date ('all' for every stage)")
+    parser.add_argument("--until", default=None, metavar="STAGE",
+                        help="Stop after this stage")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would run")
+    parser.add_argument("--serial", action="store_true", help="Run leagues one after another")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    leagues = list(LEAGUE_CONFIGS) if args.league == "all" else [args.league]
+    pipelines = [
+        Pipeline(league, league_stages(league, LEAGUE_CONFIGS[league]), PROJECT_ROOT, STATE_DIR)
+        for league in leagues
+    ]
+
+    start = time.perf_counter()
+    results = run_pipelines(
+        pipelines,
+        parallel=not args.serial,
+        force=args.force,
+        dry_run=args.dry_run,
+        until=args.until,
+    )
+    elapsed = time.perf_counter() - start
+
+    icons = {"ran": "✓", "skipped": "·", "would run": "→", "failed": "✗", "blocked": "⚠"}
+    failed = False
+    for league, stage_results in results.items():
+        print(f"\n{LEAGUE_CONFIGS[league].league_name}")
+        for r in stage_results:
+            timing = f" ({r.seconds:.1f}s)" if r.status in ("ran", "failed") else ""
+            note = f"  {r.message}" if r.message else ""
+            print(f"  {icons.get(r.status, '?')} {r.stage:<9} {r.status}{timing}{note}")
+            failed |= r.status in ("failed", "blocked")
+
+    print(f"\nPipeline finished in {elapsed:.1f}s")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Simulate the rest of a league's season and print seeding, play-in and
+playoff odds.
+
+Uses the league's state (Elo ratings and standings) and its season
+schedule (state/<league>/schedule.json, refreshed from ESPN where stale).
+See core/season_simulator.py. The API serves the same projections at
+GET /standings/projections.
+
+Usage:
+    python src/simulate_season.py --league nba
+
+    # More seasons, fixed number of worker processes
+    python src/simulate_season.py --league wnba --iterations 200000 --workers 4
+"""
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.elo_engine import EloParams
+from core.espn_client import ESPNClient
+from core.league_config import LEAGUE_CONFIGS
+from core.schedule_store import SCHEDULE_FILE, ScheduleStore, season_end
+from core.season_simulator import DEFAULT_ITERATIONS, DEFAULT_SEED, PLAYOFF_FORMATS, project_season
+from core.state_manager import StateManager
+from core.team_mapper import TeamMapper
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulate the rest of the season.")
+    parser.add_argument("--league", default="nba", choices=list(PLAYOFF_FORMATS))
+    parser.add_argument("--state-dir", type=str, default=None,
+                        help="State directory. Default: the league's state dir")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--no-cache", action="store_true", help="Always simulate")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = LEAGUE_CONFIGS[args.league]
+    state_dir = Path(args.state_dir) if args.state_dir else PROJECT_ROOT / config.state_dir
+
+    manager = StateManager(state_dir, elo_params=EloParams.from_config(config))
+    if not manager.exists():
+        print(f"⚠ No state in {state_dir}; run bootstrap_state.py first")
+        sys.exit(1)
+    elo_tracker, _ = manager.load()
+    standings = manager.load_standings(args.league)
+
+    lookup = PROJECT_ROOT / config.team_lookup_csv if config.team_lookup_csv else None
+    team_mapper = TeamMapper(lookup_path=lookup) if lookup else TeamMapper()
+    today = date.today()
+    end = season_end(today, args.league)
+    schedule = ScheduleStore(state_dir / SCHEDULE_FILE, args.league)
+    if schedule.refresh(ESPNClient(team_mapper, league_slug=config.espn_slug), today, end):
+        schedule.save()
+
+    result = project_season(
+        args.league, elo_tracker, standings, schedule.games(today, end, scheduled_only=False),
+        iterations=args.iterations, workers=args.workers, seed=args.seed,
+        cache_dir=None if args.no_cache else PROJECT_ROOT / "data" / "cache" / "season_sim",
+        today=today,
+    )
+    print(f"✓ {result['iterations']:,} seasons, {result['remaining_games']} games left "
+          f"({result['seconds']:.2f}s, key {result['key']})")
+
+    group = None
+    for team in result["teams"]:
+        if team["group"] != group:
+            group = team["group"]
+            print(f"\n{group}")
+            print(f"  {'Team':<6} {'W':>3} {'Proj':>11}  {'#1':>6} {'Direct':>7} {'Play-in':>8} {'Playoffs':>9}")
+        abbr = team_mapper.get_team_abbreviation(team["team_id"]) or str(team["team_id"])
+        print(f"  {abbr:<6} {team['wins']:>3} {team['projected_wins']:>5.1f}-{team['projected_losses']:<5.1f} "
+              f"{team['top_seed']:>6.1%} {team['direct']:>7.1%} {team['play_in']:>8.1%} {team['playoffs']:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Tune Elo hyperparameters (K, home-court advantage, season carry-over).
+
+Replays each league's game history for every setting in a grid or random
+search on a process pool and ranks the settings by the log loss and Brier
+score of the pre-game Elo win probability. Scores are cached under
+data/cache/elo_sweep/, so re-runs only evaluate new settings.
+
+Usage:
+    # Default grid, every league with data
+    python src/tune_elo.py
+
+    # One league, custom grid
+    python src/tune_elo.py --league wnba --k 15 20 25 --hca 40 55 70 --carry 0.6 0.7 0.8
+
+    # Random search
+    python src/tune_elo.py --league cbb --random 300 --seed 1
+
+    # Save the full ranked table
+    python src/tune_elo.py --out data/processed/elo_sweep.csv
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.elo_engine import EloParams
+from core.elo_sweep import (
+    DEFAULT_CARRYOVER_VALUES,
+    DEFAULT_HCA_VALUES,
+    DEFAULT_K_VALUES,
+    EloHistory,
+    format_table,
+    grid_params,
+    random_params,
+    results_to_rows,
+    run_sweep,
+)
+from core.league_config import LEAGUE_CONFIGS
+from core.table_store import read_frame, store_mtime
+
+
+# Input of build_elo.py for each league
+GAMES_FILES = {
+    "nba": "games_with_labels.csv",
+    "wnba": "wnba_games_with_labels.csv",
+    "cbb": "cbb_games_with_labels.csv",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sweep Elo hyperparameters per league.")
+    parser.add_argument("--league", default="all", choices=["all", *LEAGUE_CONFIGS])
+    parser.add_argument("--k", type=float, nargs="+", default=list(DEFAULT_K_VALUES),
+                        help="K-factor grid values")
+    parser.add_argument("--hca", type=float, nargs="+", default=list(DEFAULT_HCA_VALUES),
+                        help="Home-court advantage grid values")
+    parser.add_argument("--carry", type=float, nargs="+", default=list(DEFAULT_CARRYOVER_VALUES),
+                        help="Season carry-over grid values")
+    parser.add_argument("--random", type=int, default=0,
+                        help="Random search with this many settings instead of the grid")
+    parser.add_argument("--seed", type=int, default=0, help="Random search seed")
+    parser.add_argument("--burn-in", type=int, default=1,
+                        help="Leading seasons excluded from scoring. Default: 1")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes. Default: CPU count")
+    parser.add_argument("--top", type=int, default=10, help="Rows to print per league")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write the cache")
+    parser.add_argument("--out", type=str, default=None, help="Write the full ranked table as CSV")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    project_root = Path(__file__).parent.parent
+    processed_dir = project_root / "data" / "processed"
+    cache_dir = None if args.no_cache else project_root / "data" / "cache" / "elo_sweep"
+    leagues = list(LEAGUE_CONFIGS) if args.league == "all" else [args.league]
+
+    histories = {}
+    param_sets = {}
+    for league in leagues:
+        config = LEAGUE_CONFIGS[league]
+        games_path = processed_dir / GAMES_FILES[league]
+        if not games_path.exists() and not store_mtime("games_with_labels", league):
+            print(f"⚠ {league.upper()}: {games_path.name} not found, skipping")
+            continue
+        games = read_frame(
+            "games_with_labels", league,
+            columns=["game_date", "season_id", "team_id_home", "team_id_away", "home_win"],
+        )
+        histories[league] = EloHistory.from_games(games)
+
+        if args.random:
+            params = random_params(args.random, default_elo=config.default_elo, seed=args.seed)
+        else:
+            params = grid_params(args.k, args.hca, args.carry, default_elo=config.default_elo)
+        # Always score the configured setting for comparison
+        param_sets[league] = [EloParams.from_config(config), *params]
+
+    if not histories:
+        print("No game data found.")
+        return
+
+    start = time.perf_counter()
+    results = run_sweep(histories, param_sets, workers=args.workers,
+                        cache_dir=cache_dir, burn_in_seasons=args.burn_in)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for league, ranked in results.items():
+        config = LEAGUE_CONFIGS[league]
+        history = histories[league]
+        print(f"\n{'=' * 60}")
+        print(f"{config.league_name}: {history.n_games} games, {history.n_teams} teams, "
+              f"{len(ranked)} settings (* = current config)")
+        print(f"{'=' * 60}")
+        print(format_table(ranked, top=args.top, current=EloParams.from_config(config)))
+        rows.extend(results_to_rows(league, ranked))
+
+    print(f"\nSweep finished in {elapsed:.1f}s")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(rows).to_csv(out_path, index=False)
+        print(f"Saved ranked table to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Search XGBoost hyperparameters per league.
+
+Draws random settings around the production model (see
+core/xgb_training.SEARCH_SPACE), trains each with early stopping on the
+validation season(s) on a process pool sized to --cpu-budget, and ranks
+them by validation log loss. Feature matrices and trial results are cached
+under data/cache/ keyed by the feature table's content hash, so re-runs
+only train settings that have not been tried on the same data.
+
+Train the winner with: python src/xgb_boost_model.py --league <l> --from-search
+
+Usage:
+    # 40 random settings for every league with a feature table
+    python src/tune_xgb.py
+
+    # One league, 100 settings, 8 cores with 2 threads per trial
+    python src/tune_xgb.py --league wnba --trials 100 --cpu-budget 8 --threads 2
+
+    # Save the ranked table
+    python src/tune_xgb.py --out data/processed/xgb_search.csv
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.xgb_training import (
+    DEFAULT_ROUNDS,
+    DataCache,
+    format_trials,
+    has_feature_table,
+    random_params,
+    run_search,
+)
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "xgb"
+SEARCH_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "xgb_search"
+LEAGUES = ["nba", "wnba", "cbb"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Search XGBoost hyperparameters per league.")
+    parser.add_argument("--league", default="all", choices=["all", *LEAGUES])
+    parser.add_argument("--trials", type=int, default=40, help="Random settings per league")
+    parser.add_argument("--seed", type=int, default=0, help="Random search seed")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="Maximum trees per trial")
+    parser.add_argument("--early-stopping", type=int, default=50,
+                        help="Early stopping patience (rounds) on val")
+    parser.add_argument("--cpu-budget", type=int, default=None, help="Total cores. Default: CPU count")
+    parser.add_argument("--threads", type=int, default=1, help="XGBoost threads per trial")
+    parser.add_argument("--top", type=int, default=10, help="Rows to print per league")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and don't write trial results")
+    parser.add_argument("--out", type=str, default=None, help="Write the full ranked table as CSV")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    leagues = LEAGUES if args.league == "all" else [args.league]
+    data_cache = DataCache(DATA_CACHE_DIR)
+
+    data = {}
+    for league in leagues:
+        if not has_feature_table(league):
+            print(f"⚠ {league.upper()}: no features_with_injuries table, skipping")
+            continue
+        data[league] = data_cache.load(league)
+
+    if not data:
+        print("No feature tables found.")
+        return
+
+    # The production setting ({} = defaults) is always part of the search
+    param_sets = {league: [{}, *random_params(args.trials, seed=args.seed)] for league in data}
+
+    start = time.perf_counter()
+    results = run_search(
+        data, param_sets,
+        num_boost_round=args.rounds,
+        early_stopping_rounds=args.early_stopping,
+        cpu_budget=args.cpu_budget,
+        threads_per_trial=args.threads,
+        cache_dir=None if args.no_cache else SEARCH_CACHE_DIR,
+    )
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for league, ranked in results.items():
+        print(f"\n{'=' * 60}")
+        print(f"{league.upper()}: {data[league].sizes()}, {len(ranked)} settings")
+        print(f"{'=' * 60}")
+        print(format_trials(ranked, top=args.top))
+        default = next((r for r in ranked if not r.params), None)
+        if default is not None:
+            print(f"  production setting: val {default.val_log_loss:.5f}, "
+                  f"test {default.test_log_loss:.5f} ({default.n_trees} trees)")
+        for rank, r in enumerate(ranked, 1):
+            row = asdict(r)
+            rows.append({"league": league, "rank": rank, **row.pop("params"), **row})
+
+    print(f"\nSearch finished in {elapsed:.1f}s")
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(rows).to_csv(out_path, index=False)
+        print(f"Saved ranked table to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
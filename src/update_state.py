@@ -11,8 +11,13 @@ Usage:
     # Dry run (show what would be processed)
     python src/update_state.py --dry-run
 
-    # Force re-process even if date was already processed
+    # Re-check a date that was already processed (games already applied
+    # are skipped via the state journal, so this is always safe)
     python src/update_state.py --force
+
+Each processed game is also appended, with the features the model saw
+before tip-off, to the live training rows in the state directory that
+src/refresh_model.py warm-starts the model on (skip with --no-training-rows).
 """
 
 import argparse
@@ -23,8 +28,12 @@ from core import (
     TeamMapper,
     StateManager,
     ESPNClient,
+    FeatureBuilder,
     GameProcessor,
 )
+from core.league_config import season_id_for
+from core.model_refresh import LIVE_FILE, append_live_games, live_row, load_served_features, served_key
+from core.state_index import INDEX_FILE, StateIndex
 
 
 def parse_args():
@@ -45,7 +54,7 @@ def parse_args():
     parser.add_argument(
         "--force",
         action="store_true",
-        help="Process even if date was already processed",
+        help="Process even if date was already processed (applied games are still skipped)",
     )
     parser.add_argument(
         "--state-dir",
@@ -53,6 +62,11 @@ def parse_args():
         default=None,
         help="State directory path. Default: ./state",
     )
+    parser.add_argument(
+        "--no-training-rows",
+        action="store_true",
+        help="Do not record processed games for the incremental model refresh",
+    )
     return parser.parse_args()
 
 
@@ -108,8 +122,8 @@ def main():
         print("\nNo completed games to process.")
         return
 
-    # Create processor
-    processor = GameProcessor(elo_tracker, stats_tracker, team_mapper)
+    # Create processor (journals each game; skips games already applied)
+    processor = GameProcessor(elo_tracker, stats_tracker, team_mapper, journal=state_manager.journal)
 
     # Dry run mode
     if args.dry_run:
@@ -130,16 +144,24 @@ def main():
         print(f"\nWould process {len([p for p in previews if p['would_process']])} games")
         return
 
-    # Process games
+    # Process games (features are built from the pre-game state first)
     print("\nProcessing games...")
     processed_count = 0
+    feature_builder = FeatureBuilder(elo_tracker, stats_tracker)
+    served = load_served_features(state_manager.state_dir)
+    training_rows = []
+    applied_games = []
     
     for game in completed_games:
         preview = processor.preview_game(game)
         if preview["would_process"]:
+            features = feature_builder.build_features(game.home_team_id, game.away_team_id, game.game_date)
             success = processor.process_game(game)
             if success:
                 processed_count += 1
+                key = served_key(game.game_date, game.home_team_id, game.away_team_id)
+                training_rows.append(live_row(game, features, "nba", served.get(key)))
+                applied_games.append(game)
                 print(f"  ✓ {game.away_team} @ {game.home_team}: {game.home_score}-{game.away_score}")
                 print(f"    Elo: {preview['current_home_elo']} → {preview['new_home_elo']} (home), "
                       f"{preview['current_away_elo']} → {preview['new_away_elo']} (away)")
@@ -150,9 +172,12 @@ def main():
         print("\nNo games were processed.")
         return
 
-    # Save updated state
+    # Games are already durable in the journal; compact it once it has grown
     print(f"\nSaving state...")
-    state_manager.save(elo_tracker, stats_tracker)
+    if state_manager.checkpoint(elo_tracker, stats_tracker):
+        print("  Wrote new snapshot (journal compacted)")
+    else:
+        print(f"  Journaled {processed_count} games ({len(state_manager.journal)} since last snapshot)")
     state_manager.set_last_processed_date(target_date)
     total = state_manager.increment_games_processed(processed_count)
 
@@ -160,6 +185,24 @@ def main():
     print(f"  Total games processed: {total}")
     print(f"  Last processed date: {target_date}")
 
+    if not args.no_training_rows:
+        try:
+            appended = append_live_games(training_rows, state_manager.state_dir)
+            print(f"  Recorded {appended} games in {LIVE_FILE}")
+        except Exception as e:
+            print(f"  ⚠ Could not record training rows: {e}")
+
+    index_path = state_manager.state_dir / INDEX_FILE
+    if index_path.exists():
+        try:
+            index = StateIndex.load(index_path).append_results(
+                applied_games, season_id_for(target_date, "nba")
+            )
+            index.save(index_path)
+            print(f"  Extended point-in-time index through {index.last_date}")
+        except Exception as e:
+            print(f"  ⚠ Could not extend the state index (rebuild with build_state_index.py): {e}")
+
     # Show updated Elo for recently played teams
     print("\n" + "-" * 60)
     print("Updated Elo Ratings (teams that played today)")
@@ -1,65 +1,58 @@
+"""
+Train the XGBoost model and calibrator for one or more leagues.
+
+Feature matrices come from core/xgb_training.py's on-disk cache (keyed by
+the feature table's content hash), and the model is trained with the native
+XGBoost API on cached QuantileDMatrix objects. With --league all the leagues
+train concurrently, sharing --cpu-budget cores.
+
+Usage:
+    python src/xgb_boost_model.py --league nba
+
+    # Every league with a feature table, 4 cores in total
+    python src/xgb_boost_model.py --league all --cpu-budget 4
+
+    # Use the best setting found by src/tune_xgb.py for this data
+    python src/xgb_boost_model.py --league wnba --from-search
+"""
+
 import pandas as pd
 import joblib
 from pathlib import Path
 import argparse
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.metrics import log_loss, accuracy_score, roc_auc_score
 from sklearn.linear_model import LogisticRegression
-from xgboost import XGBClassifier
 
 # Add core path to import LeagueConfig
 sys.path.insert(0, str(Path(__file__).parent))
-from core.league_config import NBA_CONFIG, WNBA_CONFIG, CBB_CONFIG
+from core.league_config import LEAGUE_CONFIGS
+from core.model_artifacts import export_artifacts
+from core.table_store import read_frame, save_frame
+from core.xgb_training import (
+    DEFAULT_ROUNDS,
+    DataCache,
+    TrialCache,
+    has_feature_table,
+    predict,
+    train_booster,
+)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "xgb"
+SEARCH_CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "xgb_search"
 
-# ==========================
-# Feature columns
-# ==========================
-FEATURE_COLS = [
-    # Elo ratings
-    "elo_home", "elo_away", "elo_diff", "elo_prob",
-    # Rolling scoring stats
-    "pf_roll_home", "pf_roll_away", "pf_roll_diff",
-    "pa_roll_home", "pa_roll_away", "pa_roll_diff",
-    # Rolling win/margin stats
-    "win_roll_home", "win_roll_away", "win_roll_diff",
-    "margin_roll_home", "margin_roll_away", "margin_roll_diff",
-    # Game-window context
-    "games_in_window_home", "games_in_window_away",
-    # Rest / fatigue
-    "home_rest_days", "away_rest_days",
-    "home_b2b", "away_b2b", "rest_diff",
-    # Betting market probabilities
-    "market_prob_home", "market_prob_away",
-    # Injury features (zero-imputed for training; live ESPN data at inference)
-    "home_players_out", "away_players_out",
-    "home_players_questionable", "away_players_questionable",
-    "home_injury_severity", "away_injury_severity",
-]
-
-TARGET_COL = "home_win"
+
+# First season of the exported test predictions (matches split_by_season)
+TEST_START = {"nba": 22022, "wnba": 22025, "cbb": 22025}
 
 
 # ==========================
 # Helpers
 # ==========================
-def split_by_season(df, league="nba"):
-    if league == "wnba":
-        train = df[df["season_id"] <= 22023]
-        val   = df[df["season_id"] == 22024]
-        test  = df[df["season_id"] >= 22025]
-    elif league == "cbb":
-        train = df[df["season_id"] <= 22023]
-        val   = df[df["season_id"] == 22024]
-        test  = df[df["season_id"] >= 22025]
-    else:
-        df = df[df["season_id"] >= 22004].copy()
-        train = df[(df["season_id"] >= 22004) & (df["season_id"] <= 22018)]
-        val   = df[(df["season_id"] >= 22019) & (df["season_id"] <= 22020)]
-        test  = df[df["season_id"] >= 22022]
-
-    return train, val, test
-
-
 def eval_split(name, y_true, p_pred):
     y_hat = (p_pred >= 0.5).astype(int)
     return {
@@ -73,93 +66,55 @@ def eval_split(name, y_true, p_pred):
 
 
 # ==========================
-# Main
+# Training
 # ==========================
-def main():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--league", default="nba", choices=["nba", "wnba", "cbb"])
-    args = parser.parse_args()
-    
-    if args.league == "wnba":
-        features_path = Path(__file__).parent.parent / "data" / "processed" / "wnba_features_with_injuries.csv"
-        games_path = Path(__file__).parent.parent / "data" / "processed" / "wnba_games_with_elo_rest.csv"
-        model_out_path = Path(__file__).parent.parent / "models" / "xgb_wnba_v1.json"
-        calibrator_out_path = Path(__file__).parent.parent / "models" / "calibrator_wnba_v1.pkl"
-        preds_out_path = Path(__file__).parent.parent / "data" / "processed" / "wnba_model_predictions.csv"
-    elif args.league == "cbb":
-        features_path = Path(__file__).parent.parent / "data" / "processed" / "cbb_features_with_injuries.csv"
-        games_path = Path(__file__).parent.parent / "data" / "processed" / "cbb_games_with_elo_rest.csv"
-        model_out_path = Path(__file__).parent.parent / "models" / "xgb_cbb_v1.json"
-        calibrator_out_path = Path(__file__).parent.parent / "models" / "calibrator_cbb_v1.pkl"
-        preds_out_path = Path(__file__).parent.parent / "data" / "processed" / "cbb_model_predictions.csv"
-    else:
-        features_path = Path(__file__).parent.parent / "data" / "processed" / "features_with_injuries.csv"
-        games_path = Path(__file__).parent.parent / "data" / "processed" / "games_with_elo_rest.csv"
-        model_out_path = Path(__file__).parent.parent / "models" / "xgb_v3_with_injuries.json"
-        calibrator_out_path = Path(__file__).parent.parent / "models" / "calibrator_v3.pkl"
-        preds_out_path = Path(__file__).parent.parent / "data" / "processed" / "model_predictions.csv"
-
-    # ----------------------
-    # Load features
-    # ----------------------
-    df = pd.read_csv(features_path, parse_dates=["game_date"])
-    df["season_id"] = df["season_id"].astype(int)
-
-    train, val, test = split_by_season(df, league=args.league)
-
-    print("Split sizes:", {
-        "train": len(train),
-        "val": len(val),
-        "test": len(test),
-    })
-
-    print("Season ranges:", {
-        "train": (train["season_id"].min(), train["season_id"].max()),
-        "val": (val["season_id"].min(), val["season_id"].max()),
-        "test": (test["season_id"].min(), test["season_id"].max()),
-    })
-
-    X_train, y_train = train[FEATURE_COLS], train[TARGET_COL]
-    X_val,   y_val   = val[FEATURE_COLS],   val[TARGET_COL]
-    X_test,  y_test  = test[FEATURE_COLS],  test[TARGET_COL]
+def train_league(league, params=None, num_boost_round=DEFAULT_ROUNDS, nthread=0, verbose=True):
+    """
+    Train, calibrate and save one league's model.
+
+    Args:
+        league: "nba", "wnba" or "cbb"
+        params: Booster parameter overrides (default: production setting)
+        num_boost_round: Trees
+        nthread: XGBoost threads (0: all cores)
+        verbose: Print progress and the full report
+
+    Returns:
+        Dict with league, split sizes, per-split metrics and seconds
+    """
+    start = time.perf_counter()
+    config = LEAGUE_CONFIGS[league]
+    model_out_path = PROJECT_ROOT / config.model_path
+    calibrator_out_path = PROJECT_ROOT / config.calibrator_path
+    log = print if verbose else (lambda *a, **k: None)
 
     # ----------------------
-    # Train model
+    # Load features (cached arrays; parsed from the store / CSV on first use)
     # ----------------------
-    model = XGBClassifier(
-        n_estimators=800,
-        learning_rate=0.03,
-        max_depth=3,
-        subsample=0.9,
-        colsample_bytree=0.9,
-        min_child_weight=5,
-        reg_lambda=1.0,
-        reg_alpha=0.0,
-        objective="binary:logistic",
-        eval_metric="logloss",
-        random_state=42,
-        n_jobs=-1,
-    )
+    data = DataCache(DATA_CACHE_DIR).load(league)
+    log("Split sizes:", data.sizes())
 
-    model.fit(
-        X_train,
-        y_train,
-        eval_set=[(X_val, y_val)],
-        verbose=False,
-    )
+    X_train, y_train = data.X["train"], data.y["train"]
+    X_val,   y_val   = data.X["val"],   data.y["val"]
+    X_test,  y_test  = data.X["test"],  data.y["test"]
+
+    # ----------------------
+    # Train model
+    # ----------------------
+    booster, n_trees = train_booster(data, params, num_boost_round, nthread=nthread)
 
     # ----------------------
     # Raw predictions
     # ----------------------
-    p_train = model.predict_proba(X_train)[:, 1]
-    p_val   = model.predict_proba(X_val)[:, 1]
-    p_test  = model.predict_proba(X_test)[:, 1]
+    p_train = predict(booster, X_train, n_trees)
+    p_val   = predict(booster, X_val, n_trees)
+    p_test  = predict(booster, X_test, n_trees)
 
     # ----------------------
     # Calibration (VAL → TEST)
     # ----------------------
     calibrator = LogisticRegression(solver="lbfgs")
-    calibrator.fit(p_val.reshape(-1, 1), y_val)
+    calibrator.fit(p_val.reshape(-1, 1), y_val.astype(int))
 
     p_val_cal  = calibrator.predict_proba(p_val.reshape(-1, 1))[:, 1]
     p_test_cal = calibrator.predict_proba(p_test.reshape(-1, 1))[:, 1]
@@ -169,7 +124,7 @@ def main():
     # ----------------------
     calibrator_out_path.parent.mkdir(parents=True, exist_ok=True)
     joblib.dump(calibrator, calibrator_out_path)
-    print(f"\nSaved calibrator to: {calibrator_out_path}")
+    log(f"\nSaved calibrator to: {calibrator_out_path}")
 
     # ----------------------
     # Evaluation
@@ -182,37 +137,40 @@ def main():
         eval_split("test_cal", y_test, p_test_cal),
     ]
 
-    print("\nPerformance:")
-    print(pd.DataFrame(results))
+    log("\nPerformance:")
+    log(pd.DataFrame(results))
 
     # ----------------------
     # Feature importance
     # ----------------------
-    importances = model.get_booster().get_score(importance_type="gain")
+    importances = booster.get_score(importance_type="gain")
     imp_df = (
         pd.DataFrame([{"feature": k, "gain": v} for k, v in importances.items()])
         .sort_values("gain", ascending=False)
     )
 
-    print("\nFeature importance (gain):")
-    print(imp_df)
+    log("\nFeature importance (gain):")
+    log(imp_df)
 
     # ----------------------
     # Save model
     # ----------------------
     model_out_path.parent.mkdir(parents=True, exist_ok=True)
-    model.get_booster().save_model(str(model_out_path))
-    print(f"\nSaved model to: {model_out_path}")
+    booster.save_model(str(model_out_path))
+    log(f"\nSaved model to: {model_out_path}")
+
+    # UBJSON model + calibrator lookup table for fast API loading
+    exported = export_artifacts(model_out_path, calibrator_out_path)
+    log(f"Exported fast-load artifacts: {', '.join(str(p) for p in exported.values())}")
 
     # ----------------------
     # EXPORT DEPLOYABLE PREDICTIONS
     # ----------------------
-    games = pd.read_csv(games_path, parse_dates=["game_date"])
-    
-    if args.league == "wnba" or args.league == "cbb":
-        games_test = games[games["season_id"] >= 22025].copy()
-    else:
-        games_test = games[games["season_id"] >= 22022].copy()
+    games = read_frame(
+        "games_with_elo_rest", league,
+        columns=["game_date", "season_id", "team_id_home", "team_id_away", "home_win"],
+    )
+    games_test = games[games["season_id"] >= TEST_START[league]].copy()
 
     assert len(games_test) == len(p_test_cal), "Prediction length mismatch!"
 
@@ -222,11 +180,76 @@ def main():
 
     pred_out["model_prob_home"] = p_test_cal
 
-    preds_out_path.parent.mkdir(parents=True, exist_ok=True)
-    pred_out.to_csv(preds_out_path, index=False)
+    preds_out_path = save_frame(pred_out.reset_index(drop=True), "model_predictions", league)
+
+    log(f"\nSaved model predictions to: {preds_out_path}")
+    log(pred_out.head())
+
+    return {
+        "league": league,
+        "sizes": data.sizes(),
+        "trees": n_trees,
+        "metrics": results,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _train_task(task):
+    league, params, rounds, nthread = task
+    return train_league(league, params, rounds, nthread, verbose=False)
+
+
+# ==========================
+# Main
+# ==========================
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--league", default="nba", choices=["all", "nba", "wnba", "cbb"])
+    parser.add_argument("--cpu-budget", type=int, default=None,
+                        help="Cores shared by all leagues. Default: CPU count")
+    parser.add_argument("--from-search", action="store_true",
+                        help="Use the best cached src/tune_xgb.py setting for the current data")
+    args = parser.parse_args()
 
-    print(f"\nSaved model predictions to: {preds_out_path}")
-    print(pred_out.head())
+    leagues = list(LEAGUE_CONFIGS) if args.league == "all" else [args.league]
+    if args.league == "all":
+        leagues = [lg for lg in leagues if has_feature_table(lg)]
+        if not leagues:
+            print("No feature tables found.")
+            sys.exit(1)
+
+    tasks = []
+    for league in leagues:
+        params, rounds = None, DEFAULT_ROUNDS
+        if args.from_search:
+            data_hash = DataCache(DATA_CACHE_DIR).source_hash(league)
+            best = TrialCache(SEARCH_CACHE_DIR).best(league, data_hash)
+            if best is None:
+                print(f"⚠ {league.upper()}: no search results for the current data, using defaults")
+            else:
+                params, rounds = best.params, best.n_trees
+                print(f"✓ {league.upper()}: using searched setting ({rounds} trees, "
+                      f"val log loss {best.val_log_loss:.4f})")
+        tasks.append((league, params, rounds))
+
+    budget = args.cpu_budget or os.cpu_count() or 1
+    if len(tasks) == 1:
+        league, params, rounds = tasks[0]
+        train_league(league, params, rounds, nthread=args.cpu_budget or 0)
+        return
+
+    nthread = max(1, budget // len(tasks))
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(len(tasks), budget)) as pool:
+        summaries = list(pool.map(_train_task, [(*t, nthread) for t in tasks]))
+
+    for summary in summaries:
+        metrics = {m["split"]: m for m in summary["metrics"]}
+        print(f"✓ {LEAGUE_CONFIGS[summary['league']].league_name}: {summary['trees']} trees, "
+              f"test_cal log loss {metrics['test_cal']['log_loss']:.4f}, "
+              f"accuracy {metrics['test_cal']['accuracy']:.3f} ({summary['seconds']:.1f}s)")
+    print(f"\nTrained {len(summaries)} leagues in {time.perf_counter() - start:.1f}s "
+          f"({nthread} threads each)")
 
 
 if __name__ == "__main__":
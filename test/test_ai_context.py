@@ -0,0 +1,74 @@
+"""
+Tests for incremental AI-context generation (src/generate_ai_context.py).
+"""
+
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import generate_ai_context as ctx
+
+
+def _board(*games, completed=True):
+    events = []
+    for home, away, hs, as_ in games:
+        events.append({
+            "date": "2026-01-10T00:30Z",
+            "status": {"type": {"completed": completed, "state": "post" if completed else "in",
+                                "description": "Final" if completed else "In Progress"}},
+            "competitions": [{"competitors": [
+                {"homeAway": "home", "team": {"displayName": home}, "score": str(hs), "winner": hs > as_},
+                {"homeAway": "away", "team": {"displayName": away}, "score": str(as_), "winner": as_ > hs},
+            ]}],
+        })
+    return {"events": events}
+
+
+def test_results_index_loads_only_new_days(tmp_path, monkeypatch):
+    today = date.today()
+    day = lambda n: (today - timedelta(days=n)).strftime("%Y%m%d")
+    boards = {day(n): _board() for n in range(1, 11)}
+    boards[day(3)] = _board(("Boston Celtics", "Miami Heat", 110, 100))
+    boards[day(1)] = _board(("Miami Heat", "Boston Celtics", 99, 104), completed=False)
+    fetched = []
+
+    def scoreboard(ds):
+        fetched.append(ds)
+        return boards[ds]
+
+    monkeypatch.setattr(ctx, "_scoreboard", scoreboard)
+
+    index = ctx.ResultsIndex(tmp_path / ctx.ResultsIndex.FILE_NAME)
+    assert index.update(10) == 10
+    assert index.settled_through == day(2)      # yesterday is still in progress
+    index.save()
+
+    # Next run: only the unsettled day is loaded again
+    boards[day(1)] = _board(("Miami Heat", "Boston Celtics", 99, 104))
+    fetched.clear()
+    index = ctx.ResultsIndex(tmp_path / ctx.ResultsIndex.FILE_NAME)
+    assert index.update(10) == 1 and fetched == [day(1)]
+
+    h2h = ctx.generate_head_to_head(10, index=index)
+    (matchup,) = h2h["matchups"]
+    assert matchup["team_a"] == "Boston Celtics" and matchup["team_a_wins"] == 2
+
+    recent = ctx.generate_recent_results(2, index=index)
+    assert [t["last_5_record"] for t in recent["teams"]] == ["1-0", "0-1"]
+
+
+def test_unchanged_sections_are_not_rewritten(tmp_path):
+    manifest = {}
+    section = {"generated_at": "t1", "last_updated": "t1", "teams": [1, 2]}
+    assert ctx.write_section(tmp_path, "team_info.json", section, manifest)
+    mtime = (tmp_path / "team_info.json").stat().st_mtime_ns
+
+    # Only the timestamps differ: skipped
+    assert not ctx.write_section(tmp_path, "team_info.json", dict(section, generated_at="t2"), manifest)
+    assert (tmp_path / "team_info.json").stat().st_mtime_ns == mtime
+
+    assert ctx.write_section(tmp_path, "team_info.json", dict(section, teams=[1]), manifest)
+    assert json.loads((tmp_path / "team_info.json").read_text())["teams"] == [1]
@@ -77,10 +77,43 @@ def _mock_prediction_service():
     # odds
     svc.get_odds_for_game.return_value = (None, None)
 
+    # point-in-time state: serve every date from the live trackers
+    svc.is_historical.return_value = False
+    svc.feature_builder_for.return_value = svc.feature_builder
+
     # espn_client
     svc.espn_client.get_games.return_value = []
     svc.espn_client.get_scheduled_games.return_value = []
 
+    # standings: Lakers 2-0 (one win over Boston)
+    from core.standings_tracker import StandingsTracker
+    svc.standings = StandingsTracker("nba")
+    svc.standings.record_game(1, 2, 110, 100, "2026-03-10")
+    svc.standings.record_game(3, 1, 95, 101, "2026-03-12")
+
+    # season schedule (GET /predict/range): one game tomorrow, scored in one batch
+    import numpy as np
+    from datetime import date, timedelta
+    from core.espn_client import GameResult
+    from core.feature_builder import FEATURE_COLS
+    tomorrow = (date.today() + timedelta(days=1)).isoformat()
+    svc.schedule_for.return_value.games.return_value = [
+        GameResult(tomorrow, "Los Angeles Lakers", "Boston Celtics", 0, 0, "Scheduled",
+                   home_team_id=1, away_team_id=2, game_time="19:30", event_id="401"),
+    ]
+    row = np.zeros(len(FEATURE_COLS))
+    row[FEATURE_COLS.index("away_b2b")] = 1
+    svc.feature_builder.build_matrix.return_value = row.reshape(1, -1)
+    svc.predictor.predict_proba.return_value = np.array([0.64])
+    svc.predictor.confidence_scorer = None
+
+    # remaining-season simulation
+    svc.season_projections.return_value = {
+        "season_id": 22025, "iterations": 1000, "remaining_games": 12, "generated_at": "2026-03-14T09:00:00",
+        "teams": [{"team_id": 1, "group": "West", "wins": 40, "projected_wins": 51.2, "projected_losses": 30.8,
+                   "seed_probs": [0.6, 0.4], "top_seed": 0.6, "direct": 1.0, "play_in": 0.0, "playoffs": 1.0}],
+    }
+
     # reload
     svc.reload_state.return_value = None
 
@@ -186,6 +219,66 @@ class TestGamesEndpoints:
         assert r.status_code == 400
 
 
+class TestPredictRange:
+    def test_predict_range(self, client):
+        from datetime import date, timedelta
+        start = date.today()
+        r = client.get("/predict/range", params={"start": start.isoformat(),
+                                                 "end": (start + timedelta(days=6)).isoformat()})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["count"] == 1
+        game = body["games"][0]
+        assert game["prediction"]["home_win_prob"] == 0.64
+        assert game["context"]["away_b2b"] is True
+
+    def test_predict_range_invalid(self, client):
+        from datetime import date, timedelta
+        start = date.today()
+        too_long = {"start": start.isoformat(), "end": (start + timedelta(days=30)).isoformat()}
+        assert client.get("/predict/range", params=too_long).status_code == 400
+        assert client.get("/predict/range", params={"start": "bad", "end": "bad"}).status_code == 400
+
+
+class TestStandingsEndpoints:
+    def test_standings(self, client):
+        r = client.get("/standings")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["games"] == 2
+        leader = body["teams"][0]
+        assert leader["abbreviation"] == "LAL"
+        assert leader["wins"] == 2 and leader["streak"] == "W2"
+
+    def test_team_standing(self, client):
+        r = client.get("/standings/team/Lakers")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["standing"]["away_record"] == "1-0"
+        assert len(body["head_to_head"]) == 2
+
+    def test_head_to_head(self, client):
+        r = client.get("/standings/h2h", params={"team_a": "Celtics", "team_b": "Lakers"})
+        assert r.status_code == 200
+        assert r.json()["team_b_wins"] == 1
+
+    def test_projections(self, client):
+        r = client.get("/standings/projections", params={"iterations": 10000})
+        assert r.status_code == 200
+        (team,) = r.json()["teams"]
+        assert team["abbreviation"] == "LAL" and team["conference"] == "West"
+        assert team["playoffs"] == 1.0
+
+    def test_projections_iteration_counts(self, client):
+        for iterations in (10, 20000):
+            r = client.get("/standings/projections", params={"iterations": iterations})
+            assert r.status_code == 422
+
+    def test_unknown_team(self, client):
+        r = client.get("/standings/team/Nope")
+        assert r.status_code == 400
+
+
 class TestStateReload:
     def test_reload(self, client):
         r = client.post("/state/reload")
@@ -0,0 +1,228 @@
+"""
+Tests for the Firebase token-claims and subscription-tier caches.
+
+Tokens are real RS256 JWTs signed with a locally generated key; a stand-in
+for the Firebase key endpoint verifies them against that key's certificate,
+so signature and ``exp`` checks behave like the real verifier. RTDB is
+replaced by a small in-memory fake.
+"""
+
+import asyncio
+import datetime as dt
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from fastapi.security import HTTPAuthorizationCredentials
+from google.auth import crypt, jwt
+
+from api.middleware import auth_cache, firebase_auth
+from api.middleware.auth_cache import SubscriptionTierCache, TokenClaimsCache
+from api.routes import chat
+
+
+PROJECT_ID = "signal-sports-test"
+KEY_ID = "local-test-key"
+
+
+# ---------------------------------------------------------------------------
+# Local stand-ins for the Firebase key endpoint and RTDB
+# ---------------------------------------------------------------------------
+
+class LocalKeyEndpoint:
+    """Signs ID tokens and verifies them against a locally served certificate."""
+
+    def __init__(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.local")])
+        now = dt.datetime.now(dt.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name).issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - dt.timedelta(days=1))
+            .not_valid_after(now + dt.timedelta(days=1))
+            .sign(key, hashes.SHA256())
+        )
+        pem_key = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self.certs = {KEY_ID: cert.public_bytes(serialization.Encoding.PEM).decode()}
+        self._signer = crypt.RSASigner.from_string(pem_key, key_id=KEY_ID)
+        self.verify_calls = 0
+
+    def mint(self, uid: str, lifetime: int = 3600) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+            "aud": PROJECT_ID,
+            "sub": uid,
+            "iat": now,
+            "exp": now + lifetime,
+        }
+        return jwt.encode(self._signer, payload).decode()
+
+    def verify_id_token(self, token: str) -> dict:
+        """Same contract as firebase_auth.verify_id_token for our purposes."""
+        self.verify_calls += 1
+        claims = jwt.decode(token, certs=self.certs, audience=PROJECT_ID)
+        claims["uid"] = claims["sub"]
+        return claims
+
+
+class FakeRTDB:
+    """Minimal firebase_admin.db stand-in backed by a dict of paths."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.reads = 0
+
+    def reference(self, path: str):
+        db = self
+
+        class _Ref:
+            def get(self):
+                db.reads += 1
+                return db.data.get(path)
+
+        return _Ref()
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def key_endpoint():
+    endpoint = LocalKeyEndpoint()
+    with patch.object(auth_cache, "_token_cache", TokenClaimsCache()), \
+         patch.object(auth_cache, "_tier_cache", SubscriptionTierCache(ttl=300)), \
+         patch.object(firebase_auth, "_ensure_firebase", lambda: None), \
+         patch.object(chat, "_ensure_firebase", lambda: None), \
+         patch.object(firebase_auth.firebase_auth, "verify_id_token", endpoint.verify_id_token):
+        yield endpoint
+
+
+def _verify(token: str):
+    cred = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return asyncio.run(firebase_auth.verify_firebase_token(None, cred))
+
+
+# ---------------------------------------------------------------------------
+# TokenClaimsCache
+# ---------------------------------------------------------------------------
+
+class TestTokenClaimsCache:
+    def test_hit_until_exp(self):
+        clock = FakeClock()
+        cache = TokenClaimsCache(max_size=10, max_ttl=3600, clock=clock)
+        assert cache.set("tok", {"uid": "u1", "exp": clock.now + 120})
+        assert cache.get("tok")["uid"] == "u1"
+
+        clock.now += 120 - auth_cache.EXPIRY_MARGIN_SECONDS
+        assert cache.get("tok") is None
+        assert len(cache) == 0
+
+    def test_max_ttl_caps_long_lived_tokens(self):
+        clock = FakeClock()
+        cache = TokenClaimsCache(max_size=10, max_ttl=60, clock=clock)
+        cache.set("tok", {"uid": "u1", "exp": clock.now + 3600})
+        clock.now += 61
+        assert cache.get("tok") is None
+
+    def test_tokens_without_exp_or_already_expired_not_cached(self):
+        clock = FakeClock()
+        cache = TokenClaimsCache(clock=clock)
+        assert not cache.set("a", {"uid": "u1"})
+        assert not cache.set("b", {"uid": "u1", "exp": clock.now - 1})
+        assert len(cache) == 0
+
+    def test_bounded_lru_eviction(self):
+        clock = FakeClock()
+        cache = TokenClaimsCache(max_size=2, clock=clock)
+        exp = clock.now + 600
+        cache.set("a", {"uid": "a", "exp": exp})
+        cache.set("b", {"uid": "b", "exp": exp})
+        cache.get("a")  # refresh a; b becomes least recently used
+        cache.set("c", {"uid": "c", "exp": exp})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+
+    def test_raw_token_not_stored(self):
+        cache = TokenClaimsCache(clock=FakeClock())
+        cache.set("secret-token", {"uid": "u1", "exp": 2_000_000})
+        assert "secret-token" not in cache._entries
+
+
+# ---------------------------------------------------------------------------
+# verify_firebase_token against the local key endpoint
+# ---------------------------------------------------------------------------
+
+class TestVerifyFirebaseTokenCached:
+    def test_repeat_token_skips_signature_check(self, key_endpoint):
+        token = key_endpoint.mint("user-1")
+        first = _verify(token)
+        second = _verify(token)
+        assert first.uid == second.uid == "user-1"
+        assert key_endpoint.verify_calls == 1
+
+    def test_distinct_tokens_verified_separately(self, key_endpoint):
+        _verify(key_endpoint.mint("user-1"))
+        _verify(key_endpoint.mint("user-2"))
+        assert key_endpoint.verify_calls == 2
+
+    def test_invalid_token_not_cached(self, key_endpoint):
+        token = key_endpoint.mint("user-1")
+        tampered = token[:-4] + ("AAAA" if not token.endswith("AAAA") else "BBBB")
+        assert _verify(tampered) is None
+        assert _verify(tampered) is None
+        assert key_endpoint.verify_calls == 2
+        assert len(auth_cache.get_token_cache()) == 0
+
+
+# ---------------------------------------------------------------------------
+# Subscription tier cache
+# ---------------------------------------------------------------------------
+
+class TestSubscriptionTierCache:
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = SubscriptionTierCache(ttl=30, clock=clock)
+        cache.set("u1", "pro")
+        assert cache.get("u1") == "pro"
+        clock.now += 30
+        assert cache.get("u1") is None
+
+    def test_daily_limit_reads_rtdb_once(self, key_endpoint):
+        fake_db = FakeRTDB({"users/pro-user/subscription/tier": "pro"})
+        with patch.object(chat, "rtdb", fake_db):
+            assert chat._get_daily_limit("pro-user") == 9999
+            assert chat._get_daily_limit("pro-user") == 9999
+            assert chat._get_daily_limit("free-user") == chat.DAILY_FREE_CHAT_LIMIT
+            assert chat._get_daily_limit("free-user") == chat.DAILY_FREE_CHAT_LIMIT
+        assert fake_db.reads == 2
+
+    def test_rtdb_failure_not_cached(self, key_endpoint):
+        class _Broken:
+            def reference(self, path):
+                raise ConnectionError("rtdb down")
+
+        with patch.object(chat, "rtdb", _Broken()):
+            assert chat._get_daily_limit("u1") == chat.DAILY_FREE_CHAT_LIMIT
+        assert auth_cache.get_tier_cache().get("u1") is None
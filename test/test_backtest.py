@@ -0,0 +1,89 @@
+"""
+Tests for the walk-forward backtest.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.backtest import (
+    backtest_season,
+    calibration_table,
+    prepare_tasks,
+    run_backtest,
+    score,
+)
+from core.elo_engine import EloParams, replay_games
+from core.league_config import WNBA_CONFIG
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GAMES_PATH = PROJECT_ROOT / "data" / "processed" / "wnba_games_with_labels.csv"
+MODEL_PATH = PROJECT_ROOT / WNBA_CONFIG.model_path
+PARAMS = EloParams.from_config(WNBA_CONFIG)
+
+
+@pytest.fixture(scope="module")
+def games():
+    if not GAMES_PATH.exists() or not MODEL_PATH.exists():
+        pytest.skip("WNBA games / model not available")
+    return pd.read_csv(GAMES_PATH, parse_dates=["game_date"])
+
+
+@pytest.fixture(scope="module")
+def tasks(games):
+    seasons = sorted(games["season_id"].unique())[-2:]
+    return prepare_tasks(games, seasons, PARAMS, str(MODEL_PATH))
+
+
+def test_walk_forward_elo_matches_full_replay(games, tasks):
+    """Warm-started, day-by-day trackers reproduce the offline Elo exactly."""
+    ordered = games.sort_values("game_date", kind="stable").reset_index(drop=True)
+    replay, _ = replay_games(ordered, PARAMS)
+
+    for task in tasks:
+        result = backtest_season(task)
+        expected = replay.elo_prob[(ordered["season_id"] == task.season_id).to_numpy()]
+        np.testing.assert_allclose(result.elo_prob, expected, rtol=0, atol=1e-12)
+
+
+def test_no_lookahead_within_a_day(tasks):
+    """Changing the scores of a day's games does not change that day's predictions."""
+    task = tasks[0]
+    base = backtest_season(task)
+
+    last_day = task.games["game_date"] == task.games["game_date"].iloc[-1]
+    flipped = task.games.copy()
+    flipped.loc[last_day, ["pts_home", "pts_away"]] = flipped.loc[last_day, ["pts_away", "pts_home"]].to_numpy()
+    flipped.loc[last_day, "home_win"] = 1 - flipped.loc[last_day, "home_win"]
+    task_flipped = type(task)(**{**task.__dict__, "games": flipped})
+
+    np.testing.assert_array_equal(backtest_season(task_flipped).prob, base.prob)
+
+
+def test_pool_matches_inline(tasks):
+    inline = run_backtest(tasks, workers=1)
+    pooled = run_backtest(tasks, workers=2)
+    for a, b in zip(inline, pooled):
+        assert a.season_id == b.season_id
+        np.testing.assert_array_equal(a.prob, b.prob)
+
+
+def test_metrics():
+    y = np.array([1, 0, 1, 1, 0])
+    p = np.array([0.9, 0.2, 0.55, 0.4, 0.05])
+    result = score(y, p)
+    assert result["n"] == 5
+    assert result["brier"] == pytest.approx(np.mean((p - y) ** 2))
+    assert result["log_loss"] == pytest.approx(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+    assert result["accuracy"] == pytest.approx(0.8)
+
+    table = calibration_table(y, p, bins=10)
+    assert table["n"].sum() == 5
+    row = table[np.isclose(table["bin_lo"], 0.9)].iloc[0]
+    assert row["mean_pred"] == pytest.approx(0.9) and row["win_rate"] == 1.0
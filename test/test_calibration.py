@@ -0,0 +1,121 @@
+"""
+Tests for compiled (NumPy-only) calibrators.
+"""
+
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.calibration import (
+    CalibratorTable,
+    PlattCalibrator,
+    compile_and_verify,
+    compile_calibrator,
+    load_calibrator,
+    save_calibrator,
+    verify_calibrator,
+)
+
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+GRID = np.linspace(0.0, 1.0, 5001)
+
+
+def _load_pickle(path):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return joblib.load(path)
+
+
+def _synthetic(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    p = rng.uniform(0.05, 0.95, n)
+    y = (rng.uniform(size=n) < p ** 1.3).astype(int)
+    return p, y
+
+
+class TestPlatt:
+    @pytest.mark.parametrize("name", sorted(p.name for p in MODELS_DIR.glob("calibrator*.pkl")))
+    def test_repo_calibrators_match_sklearn(self, name):
+        estimator = _load_pickle(MODELS_DIR / name)
+        compiled = compile_calibrator(estimator)
+        assert isinstance(compiled, PlattCalibrator)
+        expected = estimator.predict_proba(GRID.reshape(-1, 1))[:, 1]
+        np.testing.assert_allclose(compiled.calibrate(GRID), expected, rtol=0, atol=1e-12)
+
+    def test_predict_proba_shape(self):
+        p, y = _synthetic()
+        estimator = LogisticRegression().fit(p.reshape(-1, 1), y)
+        out = compile_calibrator(estimator).predict_proba(p[:5].reshape(-1, 1))
+        assert out.shape == (5, 2)
+        np.testing.assert_allclose(out.sum(axis=1), 1.0)
+
+
+class TestIsotonic:
+    def test_exact_thresholds_including_out_of_range(self):
+        p, y = _synthetic()
+        estimator = IsotonicRegression(out_of_bounds="clip").fit(p, y)
+        compiled = compile_calibrator(estimator)
+        assert isinstance(compiled, CalibratorTable) and compiled.kind == "isotonic"
+        # GRID extends beyond the fitted range [0.05, 0.95] -> clipping path
+        np.testing.assert_allclose(compiled.calibrate(GRID), estimator.predict(GRID), atol=1e-12)
+
+
+class TestFallbacks:
+    def test_unknown_estimator_tabulated(self):
+        class Cubic:
+            def predict_proba(self, X):
+                p = np.asarray(X).reshape(-1) ** 3
+                return np.column_stack([1 - p, p])
+
+        compiled = compile_calibrator(Cubic())
+        assert compiled.kind == "grid"
+        assert verify_calibrator(compiled, Cubic()) < 1e-6
+
+    def test_mismatch_keeps_estimator(self):
+        class Wiggly:
+            def predict_proba(self, X):
+                p = (np.sin(np.asarray(X).reshape(-1) * 5000) + 1) / 2
+                return np.column_stack([1 - p, p])
+
+        estimator = Wiggly()
+        with pytest.warns(UserWarning):
+            assert compile_and_verify(estimator) is estimator
+
+
+@pytest.mark.parametrize("kind", ["platt", "isotonic"])
+def test_save_load_roundtrip(tmp_path, kind):
+    p, y = _synthetic()
+    if kind == "platt":
+        estimator = LogisticRegression().fit(p.reshape(-1, 1), y)
+    else:
+        estimator = IsotonicRegression(out_of_bounds="clip").fit(p, y)
+    compiled = compile_calibrator(estimator)
+    loaded = load_calibrator(save_calibrator(compiled, tmp_path / "cal.table.npz"))
+    assert loaded.kind == compiled.kind
+    np.testing.assert_array_equal(loaded.calibrate(GRID), compiled.calibrate(GRID))
+
+
+def test_single_game_cheaper_than_sklearn():
+    estimator = _load_pickle(MODELS_DIR / "calibrator_v3.pkl")
+    compiled = compile_calibrator(estimator)
+    x = np.array([0.61])
+
+    def per_call(fn, n=500):
+        start = time.perf_counter()
+        for _ in range(n):
+            fn()
+        return (time.perf_counter() - start) / n
+
+    sk = per_call(lambda: estimator.predict_proba(x.reshape(-1, 1))[:, 1])
+    fast = per_call(lambda: compiled.calibrate(x))
+    assert fast * 3 < sk
@@ -0,0 +1,194 @@
+"""
+Tests for the in-process daily pipeline (core/daily_job.py).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.daily_job import DailyLeagueJob, predict_slate, run_daily_job, timing_report
+from core.elo_tracker import EloTracker
+from core.espn_client import GameResult
+from core.feature_builder import FeatureBuilder
+from core.game_processor import GameProcessor
+from core.league_config import WNBA_CONFIG
+from core.predictor import Predictor
+from core.state_manager import StateManager
+from core.stats_tracker import StatsTracker
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MODEL_PATH = PROJECT_ROOT / WNBA_CONFIG.model_path
+
+pytestmark = pytest.mark.skipif(not MODEL_PATH.exists(), reason="WNBA model not available")
+
+
+class FakeESPN:
+    """Serves a fixed slate instead of calling ESPN."""
+
+    def __init__(self):
+        self.calls = []
+        self.finals = [
+            GameResult("2026-07-01", "Dream", "Sky", 88, 80, "Final", 20, 19, event_id="1"),
+            GameResult("2026-07-01", "Liberty", "Sun", 70, 75, "Final", 9, 18, event_id="2"),
+        ]
+        self.scheduled = [
+            GameResult("2026-07-02", "Sky", "Liberty", 0, 0, "Scheduled", 19, 9, game_time="19:30"),
+            GameResult("2026-07-02", "Sun", "Dream", 0, 0, "Scheduled", 18, 20, game_time="20:00"),
+            GameResult("2026-07-02", "Unknown", "Dream", 0, 0, "Scheduled", None, 20),
+        ]
+
+    def get_games(self, game_date):
+        self.calls.append(("games", str(game_date)))
+        return self.finals
+
+    def get_scheduled_games(self, game_date):
+        self.calls.append(("scheduled", str(game_date)))
+        return self.scheduled
+
+    def get_games_range(self, start, end, limit=1000):
+        self.calls.append(("range", str(start)))
+        return []
+
+
+def _job(tmp_path, espn):
+    return DailyLeagueJob(
+        "wnba", project_root=PROJECT_ROOT, state_dir=tmp_path / "wnba",
+        output_path=tmp_path / "wnba_daily.json", use_odds=False, use_injuries=False,
+        record_training_rows=False, espn_client=espn,
+    )
+
+
+@pytest.fixture
+def state(tmp_path):
+    StateManager(tmp_path / "wnba").save(EloTracker(), StatsTracker())
+    return tmp_path
+
+
+def test_predict_slate_matches_per_game_predictions():
+    elo = EloTracker()
+    elo.update(20, 19, home_won=True)
+    builder = FeatureBuilder(elo, StatsTracker())
+    predictor = Predictor(MODEL_PATH)
+    games = FakeESPN().scheduled
+
+    predictions = predict_slate(games, predictor, builder)
+    assert len(predictions) == 2        # unmapped team skipped
+    for game, pred in zip(games, predictions):
+        expected = predictor.predict_game(game.home_team_id, game.away_team_id, game.game_date, builder)
+        assert pred.prob_home_win == pytest.approx(expected["prob_home_win"], abs=1e-4)
+        assert pred.confidence_tier == expected["confidence_tier"]
+        assert pred.game_time == game.game_time
+
+
+def test_league_job_runs_every_stage_once(state):
+    espn = FakeESPN()
+    result = _job(state, espn).run("2026-07-01", "2026-07-02")
+
+    assert result.ok and result.processed == 2 and result.predictions == 2
+    assert set(result.timings) == {"load", "update", "persist", "schedule", "predict", "publish"}
+    assert [c for c in espn.calls if c[0] != "range"] == [("games", "2026-07-01"), ("scheduled", "2026-07-02")]
+    # Rest of the season's schedule ingested in month-sized range requests
+    assert ("range", "2026-07-02") in espn.calls and (state / "wnba" / "schedule.json").exists()
+
+    published = json.loads((state / "wnba_daily.json").read_text())
+    assert len(published["games"]) == 2
+
+    manager = StateManager(state / "wnba")
+    assert manager.get_metadata()["last_processed_date"] == "2026-07-01"
+    assert manager.load()[0].get_elo(20) > 1500.0
+
+    # The date is recorded as processed: a rerun does not touch the state
+    rerun = _job(state, FakeESPN()).run("2026-07-01", "2026-07-02")
+    assert rerun.processed == 0 and rerun.predictions == 2
+    assert StateManager(state / "wnba").get_games_processed_total() == 2
+
+
+def test_run_daily_job_reports_failures_instead_of_raising(state, tmp_path):
+    class BrokenESPN(FakeESPN):
+        def get_games(self, game_date):
+            raise ConnectionError("ESPN unavailable")
+
+    results = run_daily_job(
+        "2026-07-01", "2026-07-02", leagues=["wnba"], project_root=PROJECT_ROOT,
+        state_dir=state / "wnba", output_path=tmp_path / "out.json",
+        use_odds=False, use_injuries=False, record_training_rows=False, espn_client=BrokenESPN(),
+    )
+    assert not results["wnba"].ok and "ESPN unavailable" in results["wnba"].error
+    assert "FAILED" in timing_report(results)
+    assert not (tmp_path / "out.json").exists()
+
+
+def test_training_rows_carry_served_features(state):
+    job = _job(state, FakeESPN())
+    job.record_training_rows = True
+    assert job.run("2026-07-01", "2026-07-02").ok
+
+    from core.model_refresh import SERVED_COLS, load_live_games, load_served_features, served_key
+
+    # Yesterday's games were never served: no market / injury values
+    live = load_live_games(state / "wnba")
+    assert len(live) == 2 and live[SERVED_COLS].isna().all().all()
+    assert served_key("2026-07-02", 19, 9) in load_served_features(state / "wnba")
+
+    # Today's slate is final tomorrow and trains on the values it was served with
+    espn = FakeESPN()
+    espn.finals = [GameResult("2026-07-02", "Sky", "Liberty", 80, 70, "Final", 19, 9, event_id="3")]
+    job = _job(state, espn)
+    job.record_training_rows = True
+    assert job.run("2026-07-02", "2026-07-03").processed == 1
+    row = load_live_games(state / "wnba").iloc[-1]
+    assert row["market_prob_home"] == 0.5 and not row[SERVED_COLS].isna().any()
+
+
+def test_update_catches_up_on_missed_days(state):
+    manager = StateManager(state / "wnba")
+    manager.set_last_processed_date("2026-06-28")
+
+    class FlakyESPN(FakeESPN):
+        def get_games(self, game_date):
+            if str(game_date) == "2026-06-30" and self.fail:
+                raise ConnectionError("ESPN unavailable")
+            return super().get_games(game_date)
+
+    # A failed run keeps the last processed date; the games it did apply stay journaled
+    espn = FlakyESPN()
+    espn.fail = True
+    assert not _job(state, espn).run("2026-07-01", "2026-07-02").ok
+    assert StateManager(state / "wnba").get_last_processed_date().isoformat() == "2026-06-28"
+
+    espn = FlakyESPN()
+    espn.fail = False
+    result = _job(state, espn).run("2026-07-01", "2026-07-02")
+    assert result.ok and result.processed == 0         # same events: already applied
+    assert [c[1] for c in espn.calls if c[0] == "games"] == ["2026-06-29", "2026-06-30", "2026-07-01"]
+    manager = StateManager(state / "wnba")
+    assert manager.get_last_processed_date().isoformat() == "2026-07-01"
+    assert len(manager.journal) == 2
+
+
+def test_nba_job_adopts_newer_root_state(tmp_path):
+    root = StateManager(tmp_path)
+    elo, stats = EloTracker(), StatsTracker()
+    GameProcessor(elo, stats, None, journal=root.journal).process_game(
+        GameResult("2026-03-01", "Celtics", "Lakers", 110, 100, "Final", 2, 13, event_id="401"))
+    root.save(elo, stats)
+    root.set_last_processed_date("2026-03-01")
+
+    league = StateManager(tmp_path / "nba")
+    league.save(EloTracker(), StatsTracker())
+    league.set_last_processed_date("2026-01-24")
+
+    job = DailyLeagueJob("nba", project_root=PROJECT_ROOT, state_dir=tmp_path / "nba", espn_client=FakeESPN())
+    job.state_manager = StateManager(tmp_path / "nba")
+    assert job.adopt_root_state()
+
+    adopted = StateManager(tmp_path / "nba")
+    assert adopted.get_last_processed_date().isoformat() == "2026-03-01"
+    assert adopted.load()[0].get_elo(2) == elo.get_elo(2) > 1500.0
+    assert "espn:401" in adopted.journal
+    # Only once
+    assert not job.adopt_root_state()
@@ -0,0 +1,104 @@
+"""
+Tests for the array Elo replay engine shared by build_elo.py and EloTracker.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_engine import EloParams, replay_games
+from core.elo_tracker import EloTracker
+from core.league_config import CBB_CONFIG, NBA_CONFIG, WNBA_CONFIG
+
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+
+
+def _games(name):
+    path = PROCESSED_DIR / name
+    if not path.exists():
+        pytest.skip(f"{name} not available")
+    df = pd.read_csv(path, parse_dates=["game_date"])
+    return df.sort_values("game_date").reset_index(drop=True)
+
+
+def _legacy_iterrows(df, params):
+    """The row-by-row replay build_elo.py used before the array engine."""
+    teams = pd.concat([df["team_id_home"], df["team_id_away"]]).unique()
+    elo = {team: params.default_elo for team in teams}
+    out = np.zeros((len(df), 3))
+    current_season = None
+    for i, row in df.iterrows():
+        season = row["season_id"]
+        if current_season is None:
+            current_season = season
+        if season != current_season:
+            for team in elo:
+                elo[team] = (params.season_carryover * elo[team]
+                             + (1 - params.season_carryover) * params.default_elo)
+            current_season = season
+        e_home, e_away = elo[row["team_id_home"]], elo[row["team_id_away"]]
+        p = 1 / (1 + 10 ** (-(e_home - e_away + params.home_court_advantage) / 400))
+        delta = params.k_factor * ((1.0 if row["home_win"] else 0.0) - p)
+        elo[row["team_id_home"]], elo[row["team_id_away"]] = e_home + delta, e_away - delta
+        out[i] = (e_home, e_away, p)
+    return out
+
+
+def test_matches_legacy_replay():
+    df = _games("wnba_games_with_labels.csv")
+    params = EloParams.from_config(WNBA_CONFIG)
+    replay, _ = replay_games(df, params)
+    expected = _legacy_iterrows(df, params)
+    np.testing.assert_array_equal(replay.elo_home, expected[:, 0])
+    np.testing.assert_array_equal(replay.elo_away, expected[:, 1])
+    np.testing.assert_array_equal(replay.elo_prob, expected[:, 2])
+
+
+@pytest.mark.parametrize("config", [NBA_CONFIG, WNBA_CONFIG])
+def test_matches_elo_tracker(config):
+    """Training features and serving updates come from the same math."""
+    df = _games("wnba_games_with_labels.csv")
+    params = EloParams.from_config(config)
+    replay, team_ids = replay_games(df, params)
+
+    tracker = EloTracker({int(t): params.default_elo for t in team_ids}, params=params)
+    previous_season = None
+    for i, row in enumerate(df.itertuples()):
+        if previous_season is not None and row.season_id != previous_season:
+            tracker.apply_season_regression()
+        previous_season = row.season_id
+        assert tracker.get_matchup_prob(row.team_id_home, row.team_id_away) == replay.elo_prob[i]
+        tracker.update(row.team_id_home, row.team_id_away, bool(row.home_win))
+
+    final = tracker.to_dict()
+    assert [final[int(t)] for t in team_ids] == replay.ratings.tolist()
+
+
+def test_uses_params_home_court_advantage():
+    df = _games("wnba_games_with_labels.csv")
+    low, _ = replay_games(df, EloParams(home_court_advantage=55.0))
+    default, _ = replay_games(df, EloParams.from_config(WNBA_CONFIG))
+    # The committed WNBA artifacts were built with HCA 70
+    assert WNBA_CONFIG.home_court_advantage == 70
+    assert low.elo_prob[0] < default.elo_prob[0]
+
+
+def test_faster_than_iterrows():
+    df = _games("cbb_games_with_labels.csv").head(4000)
+    params = EloParams.from_config(CBB_CONFIG)
+
+    start = time.perf_counter()
+    _legacy_iterrows(df, params)
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    replay_games(df, params)
+    fast = time.perf_counter() - start
+    assert fast * 5 < legacy
@@ -0,0 +1,73 @@
+"""
+Tests for the Elo hyperparameter sweep.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import elo_sweep
+from core.elo_engine import EloParams, replay_games
+from core.elo_sweep import EloHistory, grid_params, random_params, run_sweep, score_params
+
+
+GAMES_PATH = Path(__file__).parent.parent / "data" / "processed" / "wnba_games_with_labels.csv"
+
+
+@pytest.fixture(scope="module")
+def games():
+    if not GAMES_PATH.exists():
+        pytest.skip("WNBA games not available")
+    return pd.read_csv(GAMES_PATH, parse_dates=["game_date"])
+
+
+@pytest.fixture(scope="module")
+def history(games):
+    return EloHistory.from_games(games)
+
+
+def test_score_matches_replay(games, history):
+    params = EloParams(k_factor=25.0, home_court_advantage=60.0, season_carryover=0.8)
+    result = score_params(history, params, burn_in_seasons=1)
+
+    df = games.sort_values("game_date").reset_index(drop=True)
+    replay, _ = replay_games(df, params)
+    scored = (df["season_id"] != df["season_id"].iloc[0]).to_numpy()
+    p, y = replay.elo_prob[scored], df["home_win"].to_numpy()[scored]
+    expected = -np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))
+
+    assert result.n_games == scored.sum()
+    assert result.log_loss == pytest.approx(expected, rel=1e-12)
+    assert result.brier == pytest.approx(np.mean((p - y) ** 2), rel=1e-12)
+
+
+def test_pool_matches_in_process(history):
+    params = grid_params([15, 30], [50, 80], [0.6, 0.9])
+    serial = run_sweep({"wnba": history}, {"wnba": params}, workers=1)
+    pooled = run_sweep({"wnba": history}, {"wnba": params}, workers=2)
+    assert serial == pooled
+    ranked = [r.log_loss for r in serial["wnba"]]
+    assert ranked == sorted(ranked)
+
+
+def test_cache_skips_scored_settings(history, tmp_path, monkeypatch):
+    params = random_params(6, seed=3)
+    first = run_sweep({"wnba": history}, {"wnba": params}, workers=1, cache_dir=tmp_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("setting should have come from the cache")
+
+    monkeypatch.setattr(elo_sweep, "score_params", fail)
+    again = run_sweep({"wnba": history}, {"wnba": params}, workers=1, cache_dir=tmp_path)
+    assert again == first
+
+    # Different data -> different key, so it is evaluated again
+    changed = EloHistory(history.home_idx, history.away_idx, ~history.home_win,
+                         history.season_break, history.n_teams)
+    with pytest.raises(AssertionError):
+        run_sweep({"wnba": changed}, {"wnba": params}, workers=1, cache_dir=tmp_path)
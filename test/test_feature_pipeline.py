@@ -0,0 +1,102 @@
+"""
+Tests for the vectorized training-feature pipeline.
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_engine import EloParams, replay_games
+from core.feature_builder import FEATURE_COLS
+from core.feature_pipeline import add_rest_features, build_features, rolling_features
+
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+
+
+def _read(name):
+    path = PROCESSED_DIR / name
+    if not path.exists():
+        pytest.skip(f"{name} not available")
+    return pd.read_csv(path, parse_dates=["game_date"])
+
+
+def _legacy_rolling(df, n=10):
+    """The groupby-apply rolling code features_with_injuries.py used before."""
+    home = df[["game_id", "game_date", "team_id_home", "pts_home", "pts_away", "home_win"]].copy()
+    home.columns = ["game_id", "game_date", "team_id", "pf", "pa", "win"]
+    home["is_home"] = 1
+    away = df[["game_id", "game_date", "team_id_away", "pts_away", "pts_home", "home_win"]].copy()
+    away.columns = ["game_id", "game_date", "team_id", "pf", "pa", "win"]
+    away["win"] = 1 - away["win"]
+    away["is_home"] = 0
+    tg = pd.concat([home, away], ignore_index=True)
+    tg = tg.sort_values(["team_id", "game_date", "game_id"]).reset_index(drop=True)
+
+    g = tg.groupby("team_id", group_keys=False)
+    for col in ("pf", "pa", "win"):
+        tg[f"{col}_roll"] = g[col].apply(lambda s: s.shift(1).rolling(n, min_periods=1).mean())
+    tg["margin_roll"] = tg["pf_roll"] - tg["pa_roll"]
+    tg["games_in_window"] = g["win"].apply(lambda s: s.shift(1).rolling(n, min_periods=1).count())
+
+    cols = ["pf_roll", "pa_roll", "win_roll", "margin_roll", "games_in_window"]
+    out = df[["game_id", "team_id_home", "team_id_away"]]
+    for side, flag in (("home", 1), ("away", 0)):
+        part = tg[tg["is_home"] == flag][["game_id", "team_id"] + cols]
+        part.columns = ["game_id", f"team_id_{side}"] + [f"{c}_{side}" for c in cols]
+        out = out.merge(part, on=["game_id", f"team_id_{side}"], how="left")
+    for col in ("pf", "pa", "win", "margin"):
+        out[f"{col}_roll_diff"] = out[f"{col}_roll_home"] - out[f"{col}_roll_away"]
+    return out
+
+
+def test_wnba_features_csv_identical():
+    expected = (PROCESSED_DIR / "wnba_features_with_injuries.csv")
+    games = _read("wnba_games_with_elo_rest.csv")
+    buf = io.StringIO()
+    build_features(games).to_csv(buf, index=False)
+    assert buf.getvalue() == expected.read_text()
+
+
+@pytest.mark.parametrize("league", ["wnba", "cbb"])
+def test_rest_features_match_csv(league):
+    games = _read(f"{league}_games_with_elo.csv")
+    games["season_id"] = games["season_id"].astype(int)
+    expected = _read(f"{league}_games_with_elo_rest.csv")
+    pd.testing.assert_frame_equal(add_rest_features(games), expected, check_exact=True)
+
+
+def test_cbb_rolling_matches_groupby_apply():
+    games = _read("cbb_games_with_elo_rest.csv")
+    legacy = _legacy_rolling(games)
+    fast = rolling_features(games)
+    for col in fast.columns:
+        np.testing.assert_array_equal(fast[col].to_numpy(), legacy[col].to_numpy(), err_msg=col)
+
+
+def test_builds_elo_and_market_when_missing():
+    games = _read("wnba_games_with_labels.csv").sort_values("game_date").reset_index(drop=True)
+    params = EloParams(home_court_advantage=55.0)
+    first = games.iloc[0]
+    odds = pd.DataFrame({
+        "date": [first["game_date"]],
+        "team_id_home": [first["team_id_home"]],
+        "team_id_away": [first["team_id_away"]],
+        "moneyline_home": [-150],
+        "moneyline_away": [130],
+    })
+
+    feat = build_features(games, odds=odds, elo_params=params)
+    replay, _ = replay_games(games, params)
+
+    assert list(feat.columns) == ["game_date", "season_id"] + FEATURE_COLS + ["home_win"]
+    np.testing.assert_array_equal(feat["elo_prob"].to_numpy(), replay.elo_prob)
+    assert feat["market_prob_home"].iloc[0] == pytest.approx(0.6)
+    assert feat["market_prob_away"].iloc[0] == pytest.approx(100 / 230)
+    assert (feat["market_prob_home"].iloc[1:] == 0.5).all()
@@ -0,0 +1,128 @@
+"""
+Tests for the state journal: replay, idempotency and compaction.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_tracker import EloTracker
+from core.espn_client import GameResult
+from core.game_journal import GameJournal, game_key
+from core.game_processor import GameProcessor
+from core.state_manager import StateManager
+from core.stats_tracker import StatsTracker
+
+
+def _games(start_id=0, n=6):
+    """n final games with distinct event ids, on a day derived from start_id."""
+    day = f"2026-01-{10 + start_id // 10:02d}"
+    return [
+        GameResult(day, f"Home {i}", f"Away {i}", 100 + i, 98 + (i % 5), "Final",
+                   home_team_id=1 + i % 4, away_team_id=10 + i % 3, event_id=str(401000 + start_id + i))
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """State with a snapshot on disk and no journal yet."""
+    manager = StateManager(tmp_path)
+    manager.save(EloTracker(), StatsTracker(), create_backup=False)
+    return manager
+
+
+def _assert_same_state(a, b):
+    assert a[0].get_all_ratings() == b[0].get_all_ratings()
+    assert a[1].to_dict() == b[1].to_dict()
+
+
+def test_load_replays_journal_tail(manager, tmp_path):
+    elo, stats = manager.load()
+    processor = GameProcessor(elo, stats, team_mapper=None, journal=manager.journal)
+    assert processor.process_games(_games()) == 6
+
+    # Snapshot files untouched; the journal carries the six games
+    assert manager.load()[0].get_all_ratings() == elo.get_all_ratings()
+    assert EloTracker.from_file(manager.elo_path).get_all_ratings() == {}
+    assert len(manager.journal) == 6
+    assert (tmp_path / "journal.jsonl").stat().st_size < 6 * 200
+
+    _assert_same_state(StateManager(tmp_path).load(), (elo, stats))
+
+
+def test_journal_makes_reruns_idempotent(manager, tmp_path):
+    elo, stats = manager.load()
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games(_games())
+
+    # A later run (new process) sees the same games again
+    rerun = StateManager(tmp_path)
+    elo2, stats2 = rerun.load()
+    processor = GameProcessor(elo2, stats2, None, journal=rerun.journal)
+    assert processor.process_games(_games() + _games(start_id=100, n=2)) == 2
+    assert not processor.preview_game(_games()[0])["would_process"]
+    assert len(rerun.journal) == 8
+
+    # Without an event id the key falls back to date + teams
+    game = _games(n=1)[0]
+    game.event_id = None
+    assert game_key(game) == "2026-01-10:1:10"
+
+
+def test_checkpoint_compacts_and_keeps_index(manager, tmp_path):
+    elo, stats = manager.load()
+    processor = GameProcessor(elo, stats, None, journal=manager.journal)
+    processor.process_games(_games(n=2))
+    assert not manager.checkpoint(elo, stats, every=5)
+
+    processor.process_games(_games(start_id=10, n=4))
+    assert manager.checkpoint(elo, stats, every=5)
+    assert len(manager.journal) == 0
+    assert (tmp_path / "journal.jsonl").stat().st_size == 0
+    assert manager.journal.snapshot_seq == 6
+
+    reloaded = StateManager(tmp_path)
+    _assert_same_state(reloaded.load(), (elo, stats))
+    assert reloaded.journal.contains(_games(n=1)[0])
+    assert reloaded.journal.append(_games(start_id=50, n=1)[0]).seq == 7
+
+
+def test_torn_journal_line_is_ignored(manager, tmp_path):
+    elo, stats = manager.load()
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games(_games(n=3))
+    with open(tmp_path / "journal.jsonl", "ab") as f:
+        f.write(b'{"seq":4,"key":"espn:9')
+
+    journal = GameJournal(tmp_path)
+    assert len(journal) == 3
+    journal.append(_games(start_id=20, n=1)[0])
+    lines = (tmp_path / "journal.jsonl").read_text().splitlines()
+    assert len(lines) == 4 and lines[-1].startswith('{"seq":4,"key":"espn:401020"')
+
+
+def test_restore_backup_rolls_back_journal(manager, tmp_path):
+    elo, stats = manager.load()
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games(_games(n=2))
+    manager.save(elo, stats)
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games(_games(start_id=10, n=2))
+
+    assert manager.restore_backup()
+    elo_restored, _ = manager.load()
+    assert elo_restored.get_all_ratings() == {}
+    assert len(manager.journal) == 0
+    assert not manager.journal.contains(_games(n=1)[0])
+
+
+def test_playoff_state_starts_from_journaled_season_end(manager, tmp_path):
+    from core.playoff_state_manager import PlayoffStateManager
+
+    elo, stats = manager.load()
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games(_games())
+    assert len(manager.journal) == 6        # not compacted into the snapshot
+
+    playoff_elo, playoff_stats, _ = PlayoffStateManager(tmp_path).load()
+    _assert_same_state((playoff_elo, playoff_stats), manager.load())
+    assert playoff_elo.get_elo(1) != 1500.0
@@ -0,0 +1,118 @@
+"""
+Tests for UBJSON / calibrator-table export and the process-level artifact cache.
+"""
+
+import os
+import shutil
+import sys
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.calibration import PlattCalibrator, load_calibrator
+from core.model_artifacts import (
+    ArtifactCache,
+    export_artifacts,
+    resolve_calibrator_path,
+    resolve_model_path,
+)
+from core.predictor import Predictor
+from core import model_artifacts
+
+
+MODELS_DIR = Path(__file__).parent.parent / "models"
+
+
+@pytest.fixture()
+def artifacts(tmp_path):
+    """Copy of the WNBA model and calibrator in a scratch directory."""
+    model = tmp_path / "xgb_wnba_v1.json"
+    calibrator = tmp_path / "calibrator_wnba_v1.pkl"
+    shutil.copy(MODELS_DIR / "xgb_wnba_v1.json", model)
+    shutil.copy(MODELS_DIR / "calibrator_wnba_v1.pkl", calibrator)
+    return model, calibrator
+
+
+@pytest.fixture()
+def fresh_cache(monkeypatch):
+    cache = ArtifactCache()
+    monkeypatch.setattr(model_artifacts, "_artifact_cache", cache)
+    return cache
+
+
+def _features(n=64, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, 31)).astype(np.float32)
+
+
+class TestExport:
+    def test_ubj_matches_json_predictions(self, artifacts, fresh_cache):
+        model_path, _ = artifacts
+        out = export_artifacts(model_path)
+        X = _features()
+        p_json = fresh_cache.get_model(model_path).predict_proba(X)[:, 1]
+        p_ubj = fresh_cache.get_model(out["model"]).predict_proba(X)[:, 1]
+        np.testing.assert_array_equal(p_json, p_ubj)
+
+    def test_table_matches_sklearn_calibrator(self, artifacts):
+        model_path, calibrator_path = artifacts
+        out = export_artifacts(model_path, calibrator_path)
+        table = load_calibrator(out["calibrator"])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            sk = joblib.load(calibrator_path)
+        p = np.random.default_rng(1).uniform(0, 1, 1000)
+        expected = sk.predict_proba(p.reshape(-1, 1))[:, 1]
+        np.testing.assert_allclose(table.predict_proba(p.reshape(-1, 1))[:, 1], expected, atol=1e-6)
+
+    def test_uncompilable_calibrator_keeps_pickle(self, artifacts, monkeypatch):
+        model_path, calibrator_path = artifacts
+        monkeypatch.setattr(model_artifacts, "compile_and_verify", lambda estimator, grid_size: estimator)
+        with pytest.warns(UserWarning, match="not exported"):
+            out = export_artifacts(model_path, calibrator_path)
+        assert "calibrator" not in out
+        assert resolve_calibrator_path(calibrator_path) == calibrator_path
+
+    def test_stale_exports_ignored(self, artifacts):
+        model_path, calibrator_path = artifacts
+        out = export_artifacts(model_path, calibrator_path)
+        assert resolve_model_path(model_path) == out["model"]
+        assert resolve_calibrator_path(calibrator_path) == out["calibrator"]
+
+        # Retrained model written after the export -> fall back to the JSON
+        newer = out["model"].stat().st_mtime + 10
+        os.utime(model_path, (newer, newer))
+        assert resolve_model_path(model_path) == model_path
+
+
+class TestArtifactCache:
+    def test_predictors_share_loaded_artifacts(self, artifacts, fresh_cache):
+        model_path, calibrator_path = artifacts
+        first = Predictor(model_path, calibrator_path)
+        second = Predictor(model_path, calibrator_path)
+        assert first._model is second._model
+        assert first._calibrator is second._calibrator
+        assert fresh_cache.misses == 2
+
+    def test_keyed_by_content_not_path(self, artifacts, fresh_cache, tmp_path):
+        model_path, _ = artifacts
+        copy = tmp_path / "copy.json"
+        shutil.copy(model_path, copy)
+        assert fresh_cache.get_model(model_path) is fresh_cache.get_model(copy)
+
+        # Different bytes at the same path -> a new model
+        shutil.copy(MODELS_DIR / "xgb_cbb_v1.json", copy)
+        assert fresh_cache.get_model(copy) is not fresh_cache.get_model(model_path)
+
+    def test_predictor_uses_exports(self, artifacts, fresh_cache):
+        model_path, calibrator_path = artifacts
+        baseline = Predictor(model_path, calibrator_path).predict_proba(_features())
+        export_artifacts(model_path, calibrator_path)
+        exported = Predictor(model_path, calibrator_path)
+        assert isinstance(exported._calibrator, PlattCalibrator)
+        np.testing.assert_allclose(exported.predict_proba(_features()), baseline, atol=1e-6)
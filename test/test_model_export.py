@@ -0,0 +1,107 @@
+"""
+Tests for the latency-aware fast model export and Predictor model variants.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.feature_builder import FEATURE_COLS
+from core.model_artifacts import fast_path_for, variant_paths
+from core.model_export import Candidate, build_candidates, select_fast, write_fast_model
+from core.predictor import Predictor
+from core.xgb_training import LeagueData, train_booster
+
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+FEATURES_PATH = PROCESSED_DIR / "wnba_features_with_injuries.csv"
+
+
+@pytest.fixture(scope="module")
+def data():
+    if not FEATURES_PATH.exists():
+        pytest.skip("WNBA features not available")
+    frame = pd.read_csv(FEATURES_PATH, parse_dates=["game_date"])
+    return LeagueData.from_frame(frame, "wnba")
+
+
+@pytest.fixture(scope="module")
+def model_files(data, tmp_path_factory):
+    """A small trained model + calibrator in a scratch models/ directory."""
+    from core.model_export import fit_calibrator
+    import joblib
+
+    models = tmp_path_factory.mktemp("models")
+    booster, _ = train_booster(data, num_boost_round=60, nthread=1)
+    booster.save_model(str(models / "xgb_test.json"))
+    joblib.dump(fit_calibrator(booster, data), models / "calibrator_test.pkl")
+    return models / "xgb_test.json", models / "calibrator_test.pkl"
+
+
+def test_truncated_candidate_matches_iteration_range(data, model_files):
+    model_path, calibrator_path = model_files
+    candidates = build_candidates(model_path, calibrator_path, data, tree_counts=(20, 500), repeats=5)
+
+    assert [c.name for c in candidates] == ["default", "trees=20"]
+    default, small = candidates
+    assert default.log_loss_delta == 0.0 and small.n_trees == 20
+    assert small.max_depth == 3
+    np.testing.assert_array_equal(
+        small.booster.inplace_predict(data.X["test"]),
+        default.booster.inplace_predict(data.X["test"], iteration_range=(0, 20)),
+    )
+
+
+def test_predictor_loads_fast_variant(data, model_files, tmp_path):
+    model_path = tmp_path / model_files[0].name
+    calibrator_path = tmp_path / model_files[1].name
+    shutil.copy(model_files[0], model_path)
+    shutil.copy(model_files[1], calibrator_path)
+
+    # No fast files yet: falls back to the default model
+    fallback = Predictor(str(model_path), str(calibrator_path), variant="fast")
+    assert fallback.variant == "default"
+    assert Path(fallback.model_path) == model_path
+
+    candidates = build_candidates(model_path, calibrator_path, data, tree_counts=(20,), repeats=5)
+    written = write_fast_model(candidates[1], model_path, calibrator_path)
+    assert written["model_json"] == fast_path_for(model_path)
+    assert (tmp_path / "xgb_test_fast.json").exists()
+    assert (tmp_path / "calibrator_test_fast.pkl").exists()
+
+    fast = Predictor(str(model_path), str(calibrator_path), variant="fast")
+    assert fast.variant == "fast"
+    features = pd.DataFrame(data.X["test"][:5], columns=FEATURE_COLS)
+    expected = candidates[1].calibrator.predict_proba(
+        candidates[1].booster.inplace_predict(data.X["test"][:5]).reshape(-1, 1)
+    )[:, 1]
+    np.testing.assert_allclose(fast.predict_proba(features), expected, atol=1e-6)
+
+
+def test_variant_paths_rejects_unknown_variant(tmp_path):
+    with pytest.raises(ValueError):
+        variant_paths(tmp_path / "xgb.json", None, "tiny")
+    assert variant_paths(tmp_path / "xgb.json", None, "fast")[2] == "default"
+
+
+def _candidate(name, kind, single_row_ms, delta):
+    return Candidate(name=name, kind=kind, n_trees=1, max_depth=1, test_log_loss=0.6 + delta,
+                     log_loss_delta=delta, single_row_ms=single_row_ms, single_row_p95_ms=single_row_ms,
+                     batch_ms=single_row_ms, size_kb=1.0)
+
+
+def test_select_fast_respects_loss_budget():
+    default = _candidate("default", "default", 1.0, 0.0)
+    quick_but_worse = _candidate("trees=10", "truncated", 0.2, 0.01)
+    ok = _candidate("trees=100", "truncated", 0.5, 0.001)
+
+    assert select_fast([default, quick_but_worse, ok], max_delta=0.002) is ok
+    assert select_fast([default, quick_but_worse, ok], max_delta=0.05) is quick_but_worse
+    assert select_fast([default, quick_but_worse], max_delta=0.002) is None
+    assert select_fast([default, _candidate("slow", "retrained", 1.5, -0.01)]) is None
@@ -0,0 +1,168 @@
+"""
+Tests for the live training table and the incremental model refresh.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.espn_client import GameResult
+from core.feature_builder import FEATURE_COLS
+from core.model_artifacts import REFRESH_RECORD, REFRESHED_MODEL, serving_paths, xgboost
+from core.model_refresh import (
+    LIVE_COLUMNS,
+    LIVE_THROUGH_ATTR,
+    SERVED_COLS,
+    append_live_games,
+    live_row,
+    load_live_games,
+    load_served_features,
+    record_served_features,
+    refresh_model,
+    season_id_for,
+    served_key,
+)
+from core.xgb_training import LeagueData, train_booster
+from core import model_refresh
+
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+FEATURES_PATH = PROCESSED_DIR / "wnba_features_with_injuries.csv"
+
+
+@pytest.fixture(scope="module")
+def frame():
+    if not FEATURES_PATH.exists():
+        pytest.skip("WNBA features not available")
+    return pd.read_csv(FEATURES_PATH, parse_dates=["game_date"])
+
+
+@pytest.fixture(scope="module")
+def data(frame):
+    return LeagueData.from_frame(frame, "wnba")
+
+
+@pytest.fixture
+def model_files(data, tmp_path):
+    from core.model_export import fit_calibrator
+    import joblib
+
+    booster, _ = train_booster(data, num_boost_round=60, nthread=1)
+    booster.save_model(str(tmp_path / "xgb_test.json"))
+    joblib.dump(fit_calibrator(booster, data), tmp_path / "calibrator_test.pkl")
+    return tmp_path / "xgb_test.json", tmp_path / "calibrator_test.pkl"
+
+
+def _live_games(frame, n, start="2026-06-01"):
+    """Last season's feature rows re-dated as n new games, two per day."""
+    live = frame.tail(n).copy()
+    live["game_date"] = pd.Timestamp(start) + pd.to_timedelta(np.arange(n) // 2, unit="D")
+    live["season_id"] = 22026
+    live["team_id_home"] = np.arange(n) % 13
+    live["team_id_away"] = 100 + np.arange(n)
+    return live[LIVE_COLUMNS]
+
+
+def test_season_id_conventions():
+    assert season_id_for("2025-11-02", "nba") == 22025
+    assert season_id_for("2026-03-10", "nba") == 22025
+    assert season_id_for("2025-11-10", "cbb") == 22026
+    assert season_id_for("2026-03-10", "cbb") == 22026
+    assert season_id_for("2026-07-01", "wnba") == 22026
+
+
+def test_live_games_append_and_dedup(frame, tmp_path):
+    live = _live_games(frame, 30)
+    assert append_live_games(live.head(20).to_dict("records"), tmp_path) == 20
+    assert append_live_games(live.to_dict("records"), tmp_path) == 10
+    assert append_live_games(live.to_dict("records"), tmp_path) == 0
+
+    stored = load_live_games(tmp_path)
+    assert len(stored) == 30
+    pd.testing.assert_frame_equal(stored[FEATURE_COLS], live[FEATURE_COLS].reset_index(drop=True),
+                                  check_dtype=False)
+    assert load_live_games(tmp_path / "cbb").empty
+
+    result = GameResult("2026-06-20", "Home", "Away", 80, 75, "Final", home_team_id=3, away_team_id=5)
+    row = live_row(result, np.arange(len(FEATURE_COLS), dtype=float), "wnba")
+    assert row["season_id"] == 22026 and row["home_win"] == 1
+    assert row["elo_home"] == 0.0
+    # Market / injury values only come from the served vector
+    assert all(np.isnan(row[c]) for c in SERVED_COLS)
+    served = live_row(result, np.zeros(len(FEATURE_COLS)), "wnba", served=[0.6, 0.4, 1, 0, 0, 2, 0.3, 0])
+    assert served["market_prob_home"] == 0.6 and served["away_players_questionable"] == 2
+
+
+def test_served_features_recorded_and_pruned(tmp_path):
+    features = np.arange(len(FEATURE_COLS), dtype=float)
+    old = GameResult("2026-06-01", "A", "B", 0, 0, "Scheduled", home_team_id=1, away_team_id=2)
+    new = GameResult("2026-06-20", "C", "D", 0, 0, "Scheduled", home_team_id=3, away_team_id=4)
+    record_served_features(tmp_path, [(old, features)])
+    record_served_features(tmp_path, [(new, features)])
+
+    served = load_served_features(tmp_path)
+    assert list(served) == [served_key("2026-06-20", 3, 4)]
+    assert served[served_key("2026-06-20", 3, 4)] == [FEATURE_COLS.index(c) for c in SERVED_COLS]
+
+
+def test_refresh_promotes_into_state_dir(frame, data, model_files, tmp_path):
+    model_path, calibrator_path = model_files
+    state_dir = tmp_path / "state"
+    before = model_path.read_bytes()
+    live = _live_games(frame, 50)
+    live.loc[live.index[-10:], SERVED_COLS] = np.nan      # never served: not trained on
+
+    result = refresh_model("wnba", model_path, calibrator_path, data, live, state_dir,
+                           base_through=frame["game_date"].max(), rounds=5, tolerance=1.0, nthread=1)
+    assert result.promoted and result.new_games == 40
+    assert result.n_trees == 65
+
+    # The configured model is untouched; the state directory serves the refresh
+    assert model_path.read_bytes() == before
+    served_model, served_calibrator = serving_paths(model_path, calibrator_path, state_dir)
+    assert served_model == state_dir / REFRESHED_MODEL and served_calibrator.exists()
+    booster = xgboost.Booster()
+    booster.load_model(str(served_model))
+    assert booster.num_boosted_rounds() == 65
+    assert booster.attr(LIVE_THROUGH_ATTR) == "2026-06-20"
+
+    # Nothing new since the promoted model, which the next refresh starts from
+    again = refresh_model("wnba", model_path, calibrator_path, data, live, state_dir, rounds=5, nthread=1)
+    assert not again.promoted and again.new_games == 0 and again.current_log_loss is None
+    assert again.n_trees == 65
+
+    # A retrained base model makes the refresh obsolete
+    model_path.write_bytes(before + b" ")
+    assert serving_paths(model_path, calibrator_path, state_dir) == (model_path, calibrator_path)
+
+
+def test_uncompilable_calibrator_is_not_promoted(frame, data, model_files, tmp_path, monkeypatch):
+    model_path, calibrator_path = model_files
+    state_dir = tmp_path / "state"
+    monkeypatch.setattr(model_refresh, "compile_and_verify", lambda estimator: estimator)
+
+    result = refresh_model("wnba", model_path, calibrator_path, data, _live_games(frame, 40), state_dir,
+                           base_through=frame["game_date"].max(), rounds=5, tolerance=1.0, nthread=1)
+    assert not result.promoted and "lookup table" in result.reason
+    assert not (state_dir / REFRESHED_MODEL).exists() and not (state_dir / REFRESH_RECORD).exists()
+
+
+def test_refresh_rejects_regression(frame, data, model_files, tmp_path):
+    model_path, calibrator_path = model_files
+    state_dir = tmp_path / "state"
+
+    # Only games up to base_through: nothing to learn from
+    stale = refresh_model("wnba", model_path, calibrator_path, data, _live_games(frame, 20, "2020-06-01"),
+                          state_dir, base_through=frame["game_date"].max(), nthread=1)
+    assert stale.new_games == 0 and not stale.promoted
+
+    rejected = refresh_model("wnba", model_path, calibrator_path, data, _live_games(frame, 40),
+                             state_dir, rounds=5, tolerance=-1.0, nthread=1)
+    assert not rejected.promoted and "regressed" in rejected.reason
+    assert not (state_dir / REFRESH_RECORD).exists()
+    assert serving_paths(model_path, calibrator_path, state_dir) == (model_path, calibrator_path)
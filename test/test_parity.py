@@ -0,0 +1,74 @@
+"""
+Tests for the training-serving parity replay.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_engine import EloParams
+from core.feature_builder import FEATURE_COLS
+from core.feature_pipeline import build_features
+from core.parity import compare_features, serving_features
+
+
+GAMES_PATH = Path(__file__).parent.parent / "data" / "processed" / "wnba_games_with_labels.csv"
+PARAMS = EloParams(home_court_advantage=55.0)
+ROLLING_COLS = [c for c in FEATURE_COLS if "_roll_" in c]
+
+
+@pytest.fixture(scope="module")
+def games():
+    if not GAMES_PATH.exists():
+        pytest.skip("WNBA games not available")
+    return pd.read_csv(GAMES_PATH, parse_dates=["game_date"])
+
+
+@pytest.fixture(scope="module")
+def tables(games):
+    training = build_features(games, elo_params=PARAMS)
+    return serving_features(games, PARAMS), training
+
+
+def test_only_first_game_defaults_differ(tables):
+    """With the same Elo parameters the only skew is the rolling-stat fill rule."""
+    serving, training = tables
+    report = compare_features(serving, training).set_index("column")
+
+    clean = [c for c in FEATURE_COLS if c not in ROLLING_COLS]
+    assert (report.loc[clean, "mismatches"] == 0).all()
+    # Offline leaves rolling stats NaN before a team's first game; serving uses defaults
+    rolling = report.loc[ROLLING_COLS]
+    assert (rolling["mismatches"] == rolling["nan_training"]).all()
+    assert (rolling["mismatches"] > 0).all()
+
+    first_game = training["games_in_window_home"].to_numpy() == 0
+    assert (serving.loc[first_game, "pf_roll_home"] == 110.0).all()
+
+
+def test_reports_elo_parameter_skew(games, tables):
+    serving, _ = tables
+    stale = build_features(games, elo_params=EloParams(home_court_advantage=70.0))
+    report = compare_features(serving, stale).set_index("column")
+    assert report.loc["elo_prob", "mismatch_rate"] == 1.0
+    assert report.loc["rest_diff", "mismatches"] == 0
+
+
+def test_input_order_preserved(games):
+    shuffled = games.sample(frac=1.0, random_state=0)
+    ordered = serving_features(games, PARAMS)
+    back = serving_features(shuffled, PARAMS).set_index("game_id").loc[ordered["game_id"]]
+    np.testing.assert_array_equal(back[FEATURE_COLS].to_numpy(), ordered[FEATURE_COLS].to_numpy())
+
+
+def test_misaligned_tables_rejected(tables):
+    serving, training = tables
+    with pytest.raises(ValueError):
+        compare_features(serving, training.iloc[::-1].reset_index(drop=True))
+    with pytest.raises(ValueError):
+        compare_features(serving, training.iloc[1:])
@@ -0,0 +1,122 @@
+"""
+Tests for the content-hashed pipeline runner.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.pipeline import Pipeline, Stage, run_pipelines
+
+
+# Appends a line to a counter file so tests can see how often a stage ran,
+# then writes upper-cased input (or a constant) to the output.
+SCRIPT = '''
+import sys
+from pathlib import Path
+src, dst, counter, mode = sys.argv[1:5]
+with open(counter, "a") as f:
+    f.write(dst + "\\n")
+text = Path(src).read_text()
+Path(dst).write_text({"const": "constant", "lower": text.lower()}.get(mode, text.upper()))
+'''
+
+
+def _stage(name, src, dst, mode="upper", params=None):
+    return Stage(
+        name=name,
+        script=Path("step.py"),
+        args=[src, dst, "runs.log", mode],
+        inputs=[Path(src)],
+        outputs=[Path(dst)],
+        params=params or {},
+    )
+
+
+@pytest.fixture()
+def project(tmp_path):
+    (tmp_path / "step.py").write_text(SCRIPT)
+    (tmp_path / "raw.txt").write_text("games")
+    return tmp_path
+
+
+def _pipeline(root, name="wnba", const_middle=False, params=None, first_mode="upper"):
+    return Pipeline(name, [
+        # Declared out of order; the runner sorts by inputs/outputs
+        _stage("c", "b.txt", "c.txt"),
+        _stage("b", "a.txt", "b.txt", mode="const" if const_middle else "upper"),
+        _stage("a", "raw.txt", "a.txt", mode=first_mode, params=params),
+    ], root=root, state_dir=root / "state")
+
+
+def _runs(root):
+    path = root / "runs.log"
+    return path.read_text().split() if path.exists() else []
+
+
+def test_skips_unchanged_stages(project):
+    first = _pipeline(project).run()
+    assert [r.stage for r in first] == ["a", "b", "c"]
+    assert [r.status for r in first] == ["ran", "ran", "ran"]
+    assert (project / "c.txt").read_text() == "GAMES"
+
+    second = _pipeline(project).run()
+    assert [r.status for r in second] == ["skipped"] * 3
+    assert len(_runs(project)) == 3
+
+
+def test_parameter_change_reruns_downstream_only(project):
+    _pipeline(project, const_middle=True).run()
+    (project / "runs.log").unlink()
+
+    # New params for "a" that don't change its output -> only a reruns
+    results = _pipeline(project, const_middle=True, params={"k_factor": 25}).run()
+    assert [r.status for r in results] == ["ran", "skipped", "skipped"]
+
+    # Changed output of "a" -> b reruns; b's output is byte-identical, so c is skipped
+    results = _pipeline(project, const_middle=True, params={"k_factor": 25}, first_mode="lower").run()
+    assert [r.status for r in results] == ["ran", "ran", "skipped"]
+    assert _runs(project) == ["a.txt", "a.txt", "b.txt"]
+
+
+def test_input_and_output_changes(project):
+    _pipeline(project).run()
+    (project / "runs.log").unlink()
+
+    (project / "raw.txt").write_text("more games")
+    assert [r.status for r in _pipeline(project).run()] == ["ran", "ran", "ran"]
+
+    # A deleted or hand-edited output is rebuilt
+    (project / "c.txt").write_text("edited")
+    assert [r.status for r in _pipeline(project).run()] == ["skipped", "skipped", "ran"]
+    assert (project / "c.txt").read_text() == "MORE GAMES"
+
+
+def test_dry_run_and_failures(project):
+    dry = _pipeline(project).run(dry_run=True)
+    assert [r.status for r in dry] == ["would run"] * 3
+    assert not (project / "a.txt").exists()
+
+    (project / "raw.txt").unlink()
+    blocked = _pipeline(project).run()
+    assert blocked[0].status == "blocked"
+
+
+def test_independent_pipelines_run_in_parallel(project):
+    results = run_pipelines([_pipeline(project, "wnba"), _pipeline(project, "cbb")], parallel=True)
+    assert set(results) == {"wnba", "cbb"}
+    assert all(r.status in ("ran", "skipped") for rs in results.values() for r in rs)
+    assert (project / "state" / "wnba.json").exists()
+    assert (project / "state" / "cbb.json").exists()
+
+
+def test_league_stages_hash_shared_core_modules():
+    from run_pipeline import CORE, LEAGUE_CONFIGS, league_stages
+
+    for league, config in LEAGUE_CONFIGS.items():
+        for stage in league_stages(league, config):
+            if stage.code:
+                assert {CORE / "table_store.py", CORE / "league_config.py"} <= set(stage.code), stage.name
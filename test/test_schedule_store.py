@@ -0,0 +1,112 @@
+"""
+Tests for the season schedule store and schedule-projected rest days.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_tracker import EloTracker
+from core.espn_client import GameResult
+from core.feature_builder import FEATURE_COLS, FeatureBuilder
+from core import schedule_store
+from core.schedule_store import ScheduleStore, season_end
+from core.stats_tracker import StatsTracker
+
+
+TODAY = date(2026, 1, 10)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeESPN:
+    """Serves a fixed season: team 1 plays on days 0, 1 and 4, team 2 on 1 and 4."""
+
+    def __init__(self):
+        self.calls = []
+        self.games = [
+            self._game(0, 1, 3, "1"),
+            self._game(1, 2, 1, "2"),
+            self._game(4, 1, 2, "3"),
+        ]
+
+    @staticmethod
+    def _game(offset, home, away, event_id):
+        return GameResult((TODAY + timedelta(days=offset)).isoformat(), f"Team {home}", f"Team {away}",
+                          0, 0, "Scheduled", home_team_id=home, away_team_id=away,
+                          game_time="19:30", event_id=event_id)
+
+    def get_games_range(self, start, end, limit=1000):
+        self.calls.append((start, end))
+        return [g for g in self.games if start.isoformat() <= g.game_date <= end.isoformat()][:limit]
+
+
+def test_ingest_once_then_refresh_only_stale_days(tmp_path):
+    clock, espn = Clock(), FakeESPN()
+    store = ScheduleStore(tmp_path / "schedule.json", "nba", clock=clock)
+
+    # Whole remaining season in ~31-day chunks
+    assert store.ingest(espn, TODAY) == len(espn.calls) == 6
+    assert espn.calls[-1][1] == season_end(TODAY, "nba") == date(2026, 6, 30)
+    assert len(store) == 3
+    store.save()
+
+    # A later run: nothing is stale yet
+    store = ScheduleStore(tmp_path / "schedule.json", "nba", clock=clock)
+    espn.calls.clear()
+    assert store.ingest(espn, TODAY) == 0
+
+    # After the near-term TTL only the lookahead window is re-fetched, and a
+    # postponed game disappears from it
+    clock.now += 7 * 3600
+    espn.games.pop(1)
+    assert store.refresh(espn, TODAY, TODAY + timedelta(days=30), TODAY) == 1
+    assert espn.calls == [(TODAY, TODAY + timedelta(days=6))]
+    assert [g.event_id for g in store.games(TODAY, TODAY + timedelta(days=30))] == ["1", "3"]
+
+
+def test_truncated_ranges_are_split(tmp_path, monkeypatch):
+    monkeypatch.setattr(schedule_store, "RANGE_LIMIT", 2)
+    clock, espn = Clock(), FakeESPN()
+    store = ScheduleStore(tmp_path / "schedule.json", "nba", clock=clock)
+    end = TODAY + timedelta(days=30)
+
+    assert store.refresh(espn, TODAY, end, TODAY) > 1
+    assert [g.event_id for g in store.games(TODAY, end)] == ["1", "2", "3"]
+    assert store.stale_days(TODAY, end, TODAY) == []
+
+    # A single day over the limit keeps what it had and stays stale
+    espn.games += [FakeESPN._game(4, 5, 6, "4"), FakeESPN._game(4, 7, 8, "5")]
+    clock.now += 7 * 3600
+    store.refresh(espn, TODAY, TODAY + timedelta(days=6), TODAY)
+    assert {"3", "4"} <= {g.event_id for g in store.games(TODAY + timedelta(days=4), TODAY + timedelta(days=4))}
+    assert store.stale_days(TODAY, TODAY + timedelta(days=6), TODAY) == [TODAY + timedelta(days=4)]
+
+
+def test_projected_rest_uses_unplayed_games(tmp_path):
+    store = ScheduleStore(tmp_path / "schedule.json", "nba", clock=Clock())
+    store.ingest(FakeESPN(), TODAY)
+
+    stats = StatsTracker()
+    stats.record_game(1, 100, 90, True, (TODAY - timedelta(days=3)).isoformat())
+
+    day1 = TODAY + timedelta(days=1)
+    # From past games only, team 1 looks rested; the schedule has it playing the day before
+    assert stats.get_rest_days(1, day1) == (4, False)
+    assert store.rest_days(stats, 1, day1) == (1, True)
+    assert store.rest_days(stats, 2, day1) == (StatsTracker.DEFAULT_REST_DAYS, False)
+    assert store.rest_days(stats, 2, TODAY + timedelta(days=4)) == (3, False)
+
+    builder = FeatureBuilder(EloTracker(), stats)
+    X = builder.build_matrix(store.games(TODAY, TODAY + timedelta(days=6)), schedule=store)
+    assert X.shape == (3, len(FEATURE_COLS))
+    assert list(X[:, FEATURE_COLS.index("away_b2b")]) == [0, 1, 0]
+    assert list(X[:, FEATURE_COLS.index("home_rest_days")]) == [3, 7, 3]
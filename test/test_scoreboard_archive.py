@@ -0,0 +1,121 @@
+"""
+Tests for the persistent ESPN scoreboard archive.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.espn_client import ESPNClient
+from core.scoreboard_archive import ScoreboardArchive, is_final_day
+
+
+def _event(state, name="STATUS_FINAL", home=("Boston Celtics", 110), away=("Miami Heat", 101)):
+    return {
+        "id": "401",
+        "date": "2026-01-10T00:30Z",
+        "status": {"type": {"state": state, "name": name, "completed": state == "post",
+                            "description": "Final" if state == "post" else "Scheduled"}},
+        "competitions": [{"competitors": [
+            {"homeAway": "home", "team": {"displayName": home[0]}, "score": str(home[1])},
+            {"homeAway": "away", "team": {"displayName": away[0]}, "score": str(away[1])},
+        ]}],
+    }
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Fetcher:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.responses[min(self.calls, len(self.responses)) - 1]
+
+
+def test_final_day_is_fetched_once(tmp_path):
+    archive = ScoreboardArchive(tmp_path, live_ttl=0)
+    fetch = Fetcher({"events": [_event("post")]})
+
+    for _ in range(3):
+        assert archive.get("nba", "2026-01-09", fetch)["events"][0]["id"] == "401"
+    assert fetch.calls == 1
+    assert archive.ref("nba", "20260109")["final"]
+
+    # A fresh instance (a later run) reads it from disk without fetching
+    assert ScoreboardArchive(tmp_path).get("nba", "20260109", Fetcher()) == fetch.responses[0]
+
+
+def test_live_day_refetched_after_ttl(tmp_path):
+    clock = Clock()
+    archive = ScoreboardArchive(tmp_path, live_ttl=60, clock=clock)
+    today = date.today().isoformat()
+    fetch = Fetcher({"events": [_event("in", "STATUS_IN_PROGRESS")]}, {"events": [_event("post")]})
+
+    archive.get("wnba", today, fetch)
+    clock.now += 30
+    archive.get("wnba", today, fetch)
+    assert fetch.calls == 1
+
+    old_object = archive._object_path(archive.ref("wnba", today)["sha256"])
+    clock.now += 31
+    assert archive.get("wnba", today, fetch)["events"][0]["status"]["type"]["completed"]
+    assert fetch.calls == 2
+    # Today never becomes immutable; the superseded live response is dropped
+    assert not archive.ref("wnba", today)["final"]
+    assert not old_object.exists()
+
+
+def test_final_requires_past_day_and_settled_events():
+    yesterday = (date.today() - timedelta(days=1)).strftime("%Y%m%d")
+    assert is_final_day({"events": []}, yesterday)
+    assert is_final_day({"events": [_event("post"), _event("post", "STATUS_POSTPONED")]}, yesterday)
+    assert is_final_day({"events": [_event("pre", "STATUS_POSTPONED")]}, yesterday)
+    assert not is_final_day({"events": [_event("in", "STATUS_IN_PROGRESS")]}, yesterday)
+    assert not is_final_day({"events": [_event("post")]}, date.today().strftime("%Y%m%d"))
+
+
+def test_offline_archive_replays_or_raises(tmp_path):
+    ScoreboardArchive(tmp_path).get("nba", "2026-01-09", Fetcher({"events": [_event("post")]}))
+
+    replay = ScoreboardArchive(tmp_path, offline=True)
+    assert replay.get("nba", "2026-01-09", Fetcher())["events"]
+    with pytest.raises(LookupError):
+        replay.get("nba", "2026-01-10", Fetcher())
+
+
+def test_espn_client_reads_through_archive(tmp_path):
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"events": [_event("post")]}
+
+    class Session:
+        headers = {}
+        calls = 0
+
+        def get(self, url, params=None, timeout=None):
+            Session.calls += 1
+            assert params == {"dates": "20260109"}
+            return Response()
+
+    client = ESPNClient(session=Session(), archive=ScoreboardArchive(tmp_path))
+    first = client.get_games("2026-01-09")
+    second = client.get_completed_games("2026-01-09")
+    assert Session.calls == 1
+    assert [(g.home_team_id, g.home_score) for g in first] == [(g.home_team_id, g.home_score) for g in second]
+    assert first[0].is_final
@@ -0,0 +1,121 @@
+"""
+Tests for the remaining-season Monte Carlo (core/season_simulator.py).
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_tracker import EloTracker
+from core.espn_client import GameResult
+from core.season_simulator import (
+    NBA_CONFERENCES,
+    PlayoffFormat,
+    build_inputs,
+    project_season,
+    simulate_season,
+)
+from core.standings_tracker import StandingsTracker
+
+
+START = date(2026, 3, 1)
+
+
+def _game(offset, home, away, status="Scheduled"):
+    return GameResult((START + timedelta(days=offset)).isoformat(), "", "", 0, 0, status,
+                      home_team_id=home, away_team_id=away, event_id=f"{offset}-{home}-{away}")
+
+
+def _nba_season(games_left=10):
+    teams = [t for conf in NBA_CONFERENCES.values() for t in conf]
+    rng = np.random.default_rng(7)
+    elo = EloTracker({t: 1500 + rng.normal(0, 60) for t in teams})
+    standings = StandingsTracker("nba")
+    for day in range(40):
+        order = rng.permutation(teams)
+        for home, away in zip(order[::2], order[1::2]):
+            standings.record_game(home, away, 100 + rng.integers(0, 20), 100 + rng.integers(-19, 0),
+                                  (START - timedelta(days=40 - day)).isoformat())
+    games = []
+    for day in range(games_left):
+        order = rng.permutation(teams)
+        games += [_game(day, int(h), int(a)) for h, a in zip(order[::2], order[1::2])]
+    return elo, standings, games
+
+
+def test_nba_seeding_and_play_in_counts():
+    elo, standings, games = _nba_season()
+    games.append(_game(3, 1610612738, 99999))          # exhibition opponent: ignored
+    inputs = build_inputs("nba", elo, standings, games)
+    assert len(inputs.home) == 150
+    # Each round has no team twice
+    for r in range(len(inputs.rounds) - 1):
+        teams = np.concatenate([inputs.home[inputs.rounds[r]:inputs.rounds[r + 1]],
+                                inputs.away[inputs.rounds[r]:inputs.rounds[r + 1]]])
+        assert len(set(teams.tolist())) == len(teams)
+
+    n = 3_000
+    counts = simulate_season(inputs, n, workers=1)
+    assert counts["playoffs"].sum() == 16 * n          # 6 direct + 2 via play-in, per conference
+    assert counts["play_in"].sum() == 8 * n
+    assert (counts["seed"].sum(axis=1) == n).all()
+    assert counts["wins"].sum() == (standings.games + 150) * n
+
+    # Chunks carry their own random streams: workers do not change results
+    pooled = simulate_season(inputs, n, workers=2)
+    assert all((counts[k] == pooled[k]).all() for k in counts)
+
+
+def test_clinched_team_and_head_to_head_tiebreak():
+    fmt = PlayoffFormat(None, direct=2)
+    standings = StandingsTracker("wnba")
+    # 1 finishes 3-1; 2 and 3 tie at 2-2 and 2 won their game; 4 is 1-3
+    for home, away in [(1, 2), (1, 3), (2, 3), (2, 4), (3, 1), (4, 2), (3, 4), (1, 4)]:
+        standings.record_game(home, away, 90, 80, "2026-06-01")
+    inputs = build_inputs("wnba", EloTracker(), standings, [], playoff_format=fmt)
+
+    counts = simulate_season(inputs, 2_000, workers=1)
+    seeds = dict(zip(inputs.team_ids.tolist(), counts["seed"]))
+    assert seeds[1][0] == 2_000 and seeds[2][1] == 2_000
+    assert counts["playoffs"].tolist() == [2_000, 2_000, 0, 0]
+
+
+def test_projection_cached_per_state(tmp_path):
+    elo, standings, games = _nba_season(games_left=4)
+    games.append(_game(0, 1610612738, 1610612747, status="Final"))   # already in the standings
+
+    first = project_season("nba", elo, standings, games, iterations=2_000, workers=1, cache_dir=tmp_path, today=START)
+    assert first["remaining_games"] == 60
+    again = project_season("nba", elo, standings, games, iterations=2_000, workers=1, cache_dir=tmp_path, today=START)
+    assert again["generated_at"] == first["generated_at"]
+
+    # Each iteration count has its own cache entry
+    other = project_season("nba", elo, standings, games, iterations=1_000, workers=1, cache_dir=tmp_path, today=START)
+    assert other["iterations"] == 1_000
+    again = project_season("nba", elo, standings, games, iterations=2_000, workers=1, cache_dir=tmp_path, today=START)
+    assert again["generated_at"] == first["generated_at"]
+
+    # A new state (another result) is a new key
+    standings.record_game(1610612738, 1610612747, 100, 90, START.isoformat())
+    changed = project_season("nba", elo, standings, games, iterations=2_000, workers=1, cache_dir=tmp_path, today=START)
+    assert changed["key"] != first["key"]
+    team = next(t for t in changed["teams"] if t["team_id"] == 1610612738)
+    assert abs(sum(team["seed_probs"]) - 1.0) < 1e-3
+    assert team["direct"] + team["play_in"] <= 1.0 + 1e-3
+
+
+def test_last_seasons_standings_are_not_carried_over():
+    elo, standings, games = _nba_season(games_left=4)          # standings of the 2025-26 season
+    opening = [GameResult(g.game_date.replace("2026-03", "2026-10"), "", "", 0, 0, "Scheduled",
+                          home_team_id=g.home_team_id, away_team_id=g.away_team_id,
+                          event_id=g.event_id, season_type=2) for g in games]
+    preseason = _game(0, 1610612738, 1610612747)
+    preseason.season_type = 1                                  # exhibitions are not simulated
+    result = project_season("nba", elo, standings, opening + [preseason], iterations=1_000,
+                            workers=1, today=date(2026, 10, 1))
+    assert result["season_id"] == 22026 and result["remaining_games"] == 60
+    assert all(t["wins"] == 0 and t["games"] == 4 for t in result["teams"])
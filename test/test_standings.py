@@ -0,0 +1,106 @@
+"""
+Tests for the locally maintained standings (core/standings_tracker.py).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_tracker import EloTracker
+from core.espn_client import POSTSEASON, PRESEASON, REGULAR_SEASON, ESPNClient, GameResult
+from core.game_processor import GameProcessor
+from core.standings_tracker import StandingsTracker
+from core.state_manager import StateManager
+from core.stats_tracker import StatsTracker
+
+
+def test_records_streaks_and_splits():
+    standings = StandingsTracker("nba")
+    # Team 1: W (home), W (away), L (home), W, W, W (home)
+    results = [(1, 2, 110, 100), (3, 1, 90, 95), (1, 3, 99, 100),
+               (1, 2, 120, 101), (2, 1, 88, 104), (1, 3, 111, 110)]
+    for i, (home, away, hs, as_) in enumerate(results):
+        standings.record_game(home, away, hs, as_, f"2026-01-{10 + i:02d}")
+
+    team = standings.team(1)
+    assert (team["wins"], team["losses"]) == (5, 1)
+    assert team["home_record"] == "3-1" and team["away_record"] == "2-0"
+    assert team["streak"] == "W3"
+    assert team["last_n_record"] == "5-1"
+    assert standings.team(1, last_n=3)["last_n_record"] == "3-0"
+    assert standings.team(2)["streak"] == "L3"
+
+    assert standings.head_to_head(3, 1) == {"team_a": 3, "team_b": 1, "team_a_wins": 1,
+                                            "team_b_wins": 2, "games": 3}
+    table = standings.table()
+    assert [row["team_id"] for row in table] == [1, 3, 2]
+    assert table[1]["games_back"] == 2.5
+
+    # Round trip through the stored form
+    assert StandingsTracker(state=standings.to_dict()).table() == table
+
+
+def test_new_season_resets_and_old_games_are_ignored():
+    standings = StandingsTracker("nba")
+    standings.record_game(1, 2, 100, 90, "2025-04-10")
+    assert standings.season_id == 22024
+
+    standings.record_game(2, 1, 100, 90, "2025-10-25")
+    assert standings.season_id == 22025 and len(standings) == 1
+    assert standings.team(2)["wins"] == 1 and standings.team(1)["wins"] == 0
+
+    assert not standings.record_game(1, 2, 100, 90, "2025-04-12")
+    assert len(standings) == 1
+
+
+def test_journaled_games_are_folded_on_save(tmp_path):
+    manager = StateManager(tmp_path)
+    manager.save(EloTracker(), StatsTracker(), standings=StandingsTracker("nba"), create_backup=False)
+
+    elo, stats = manager.load()
+    games = [GameResult(f"2026-01-{10 + i}", "A", "B", 101 + i, 100, "Final",
+                        home_team_id=1, away_team_id=2, event_id=str(401000 + i)) for i in range(3)]
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games(games)
+
+    # Journal tail is replayed on load; save folds it into the new generation
+    assert manager.load_standings().team(1)["wins"] == 3
+    manager.save(elo, stats, create_backup=False)
+    assert len(manager.journal) == 0
+
+    standings = StateManager(tmp_path).load_standings()
+    assert standings.head_to_head(1, 2)["team_a_wins"] == 3
+    assert standings.team(2)["streak"] == "L3"
+
+
+def _event(event_id, day, season_type, home=("Boston Celtics", 110), away=("Miami Heat", 101)):
+    return {
+        "id": event_id,
+        "date": f"{day}T12:00Z",
+        "season": {"year": 2027, "type": season_type},
+        "status": {"type": {"state": "post", "description": "Final"}},
+        "competitions": [{"competitors": [
+            {"homeAway": "home", "team": {"displayName": home[0]}, "score": str(home[1])},
+            {"homeAway": "away", "team": {"displayName": away[0]}, "score": str(away[1])},
+        ]}],
+    }
+
+
+def test_only_regular_season_games_are_recorded(tmp_path):
+    client = ESPNClient()
+    preseason = client._parse_event(_event("1", "2026-10-08", PRESEASON))
+    regular = client._parse_event(_event("2", "2026-10-25", REGULAR_SEASON))
+    postseason = client._parse_event(_event("3", "2027-04-25", POSTSEASON))
+    assert (preseason.season_type, regular.season_type, postseason.season_type) == (1, 2, 3)
+
+    manager = StateManager(tmp_path)
+    manager.save(EloTracker(), StatsTracker(), standings=StandingsTracker("nba"), create_backup=False)
+    elo, stats = manager.load()
+    standings = manager.load_standings()
+    processor = GameProcessor(elo, stats, None, journal=manager.journal, standings_tracker=standings)
+    assert processor.process_games([preseason, regular, postseason]) == 3
+
+    # Ratings see all three games, the W/L table only the regular-season one
+    for tracker in (standings, StateManager(tmp_path).load_standings()):
+        assert tracker.season_id == 22026 and tracker.games == 1
+        assert tracker.team(regular.home_team_id)["wins"] == 1
@@ -0,0 +1,125 @@
+"""
+Tests for lazy heavy imports and parallel league warm-up.
+"""
+
+import subprocess
+import sys
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+SRC = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+from core.lazy_import import LazyModule
+from api import dependencies
+from api.dependencies import PredictionService, warm_up_services
+from core.league_config import WNBA_CONFIG
+
+
+HEAVY_MODULES = ("xgboost", "sklearn", "google.genai", "firebase_admin", "google.cloud.storage")
+
+
+class TestLazyModule:
+    def test_import_deferred_until_attribute_access(self):
+        code = (
+            "import sys; sys.path.insert(0, %r)\n"
+            "from core.lazy_import import LazyModule\n"
+            "m = LazyModule('colorsys')\n"
+            "assert 'colorsys' not in sys.modules\n"
+            "assert m.rgb_to_hsv(1, 0, 0)[0] == 0\n"
+            "assert 'colorsys' in sys.modules\n"
+        ) % str(SRC)
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_module_attributes_not_shadowed(self):
+        joblib = LazyModule("joblib")
+        import joblib as real
+        assert joblib.load is real.load
+        assert joblib.dump is real.dump
+
+    def test_missing_attribute_raises(self):
+        with pytest.raises(AttributeError):
+            LazyModule("json").no_such_thing
+
+
+def test_api_import_skips_heavy_modules():
+    code = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "import api.main\n"
+        "loaded = [m for m in %r if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    ) % (str(SRC), HEAVY_MODULES)
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestWarmUpServices:
+    @pytest.fixture(autouse=True)
+    def fresh_services(self):
+        with patch.object(dependencies, "_prediction_services", {}):
+            yield
+
+    def test_parallel_warm_up_reports_stage_timings(self):
+        results = warm_up_services(["wnba", "cbb"], parallel=True)
+        assert "model_libraries" in results["imports"]
+        for league in ("wnba", "cbb"):
+            stages = results[league]
+            assert {"team_mapper", "state", "model", "calibrator", "total"} <= set(stages)
+            assert dependencies._prediction_services[league]._predictor_with_confidence is not None
+
+    def test_state_waits_for_sync_future(self):
+        sync = Future()
+        order = []
+        real_load = dependencies.get_trackers
+
+        def tracked(state_manager):
+            order.append("state")
+            return real_load(state_manager)
+
+        def finish_sync():
+            order.append("sync")
+            sync.set_result(0)
+
+        threading.Timer(0.2, finish_sync).start()
+        with patch.object(dependencies, "get_trackers", tracked):
+            warm_up_services(["wnba"], wait_for=sync)
+        assert order == ["sync", "state"]
+
+    def test_request_during_sync_waits_for_it(self):
+        sync = Future()
+        order = []
+        real_load = dependencies.get_trackers
+
+        def tracked(state_manager):
+            order.append("state")
+            return real_load(state_manager)
+
+        def finish_sync():
+            order.append("sync")
+            sync.set_result(0)
+
+        service = PredictionService(config=WNBA_CONFIG)
+        threading.Timer(0.2, finish_sync).start()
+        with patch.object(dependencies, "_state_sync", sync), \
+                patch.object(dependencies, "get_trackers", tracked):
+            service.predictor
+        assert order == ["sync", "state"]
+
+    def test_failed_league_reported_not_raised(self):
+        sync = Future()
+        sync.set_exception(RuntimeError("bucket unreachable"))
+        results = warm_up_services(["wnba"], wait_for=sync)
+        assert results["wnba"] == {"error": "bucket unreachable"}
+
+    def test_concurrent_requests_load_once(self):
+        service = PredictionService(config=WNBA_CONFIG)
+        with patch.object(dependencies, "Predictor", wraps=dependencies.Predictor) as predictor_cls:
+            threads = [threading.Thread(target=lambda: service.predictor) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert predictor_cls.call_count == 1
@@ -0,0 +1,162 @@
+"""
+Tests for crash-safe state writes: generations, manifest and hot reload.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.atomic_io import write_json_atomic
+from core.elo_tracker import EloTracker
+from core.espn_client import GameResult
+from core.game_processor import GameProcessor
+from core.state_manager import StateManager
+from core.stats_tracker import StatsTracker
+
+
+def _game(i):
+    return GameResult(f"2026-02-{1 + i:02d}", "Home", "Away", 101, 99, "Final",
+                      home_team_id=1, away_team_id=2, event_id=str(402000 + i))
+
+
+def _apply(manager, elo, stats, *ids):
+    GameProcessor(elo, stats, None, journal=manager.journal).process_games([_game(i) for i in ids])
+
+
+def test_atomic_write_leaves_no_temporaries(tmp_path):
+    target = tmp_path / "x.json"
+    write_json_atomic(target, {"a": 1})
+    write_json_atomic(target, {"a": 2})
+    assert json.loads(target.read_text()) == {"a": 2}
+    assert [p.name for p in tmp_path.iterdir()] == ["x.json"]
+
+
+def test_save_commits_generation_through_manifest(tmp_path):
+    manager = StateManager(tmp_path)
+    elo, stats = manager.load()
+    _apply(manager, elo, stats, 0)
+    manager.save(elo, stats)
+
+    manifest = json.loads((tmp_path / "MANIFEST.json").read_text())
+    assert manifest["generation"] == 1
+    assert manager.elo_path == tmp_path / "generations" / "000001" / "elo.json"
+    assert set(manifest["files"]) == {"elo.json", "stats.json", "snapshot.json"}
+    assert not (tmp_path / "elo.json").exists()
+
+    # Metadata lives in the manifest: no separate file, no re-reads
+    manager.set_last_processed_date("2026-02-01")
+    manager.increment_games_processed(1)
+    meta = StateManager(tmp_path).get_metadata()
+    assert meta["last_processed_date"] == "2026-02-01"
+    assert meta["games_processed_total"] == 1 and meta["generation"] == 1
+    assert not (tmp_path / "metadata.json").exists()
+
+    loaded_elo, _ = StateManager(tmp_path).load()
+    assert loaded_elo.get_all_ratings() == elo.get_all_ratings()
+
+
+def test_load_rejects_corrupted_generation(tmp_path):
+    manager = StateManager(tmp_path)
+    elo, stats = manager.load()
+    _apply(manager, elo, stats, 0)
+    manager.save(elo, stats)
+
+    manager.elo_path.write_text("{}")
+    with pytest.raises(RuntimeError, match="does not match"):
+        StateManager(tmp_path).load()
+
+
+def test_old_generations_pruned_and_restorable(tmp_path):
+    manager = StateManager(tmp_path)
+    elo, stats = manager.load()
+    ratings = []
+    for i in range(5):
+        _apply(manager, elo, stats, i)
+        manager.save(elo, stats)
+        ratings.append(elo.get_all_ratings())
+
+    kept = sorted(p.name for p in (tmp_path / "generations").iterdir())
+    assert kept == ["000003", "000004", "000005"]
+
+    assert manager.restore_backup()
+    assert manager.generation == 4
+    assert StateManager(tmp_path).load()[0].get_all_ratings() == ratings[3]
+
+    # A save after a restore never reuses a generation number
+    manager.save(*manager.load())
+    assert manager.generation == 6
+
+
+def test_legacy_flat_layout_is_upgraded(tmp_path):
+    elo = EloTracker()
+    elo.update(1, 2, home_won=True)
+    elo.save(tmp_path / "elo.json")
+    StatsTracker().save(tmp_path / "stats.json")
+    (tmp_path / "metadata.json").write_text(json.dumps(
+        {"version": "1.0", "last_processed_date": "2025-04-13", "games_processed_total": 7}))
+
+    manager = StateManager(tmp_path)
+    assert manager.exists() and manager.generation == 0
+    assert manager.get_games_processed_total() == 7
+    loaded, stats = manager.load()
+    assert loaded.get_all_ratings() == elo.get_all_ratings()
+
+    manager.save(loaded, stats)
+    reopened = StateManager(tmp_path)
+    assert reopened.generation == 1
+    assert reopened.get_metadata()["last_processed_date"] == "2025-04-13"
+    assert reopened.load()[0].get_all_ratings() == elo.get_all_ratings()
+
+
+def test_watcher_reloads_changed_state(tmp_path, monkeypatch):
+    from api import dependencies
+    from core.espn_client import GameResult
+
+    class Service:
+        def __init__(self):
+            self.state_manager = StateManager(tmp_path)
+            self._predictor_with_confidence = object()
+            self.state_version = self.state_manager.state_version()
+            self.model_version = None
+            self.reloads = []
+
+        def state_changed(self):
+            return self.state_manager.state_version() != self.state_version
+
+        def model_changed(self):
+            return self.model_version is not None
+
+        def reload_state(self, reload_model=True):
+            self.reloads.append(("state", reload_model))
+            self.state_version = self.state_manager.state_version()
+
+        def reload_model(self):
+            self.reloads.append(("model",))
+            self.model_version = None
+
+    StateManager(tmp_path).save(EloTracker(), StatsTracker())
+    service = Service()
+    monkeypatch.setitem(dependencies._prediction_services, "wnba", service)
+    watcher = dependencies.StateWatcher(interval=0, leagues=["wnba"])
+
+    assert watcher.check() == {}
+    # Metadata-only commits leave the trackers as they are
+    StateManager(tmp_path).set_last_processed_date("2026-02-01")
+    assert watcher.check() == {}
+
+    StateManager(tmp_path).journal.append(
+        GameResult("2026-02-02", "Home", "Away", 80, 75, "Final",
+                   home_team_id=1, away_team_id=2, event_id="1"))
+    assert watcher.check() == {"wnba": True}
+    assert watcher.check() == {}
+    StateManager(tmp_path).save(EloTracker(), StatsTracker())
+    assert watcher.check() == {"wnba": True}
+    assert service.reloads == [("state", False), ("state", False)]
+
+    service.model_version = "promoted"
+    assert watcher.check() == {"wnba": True}
+    assert service.reloads[-1] == ("model",)
@@ -0,0 +1,126 @@
+"""
+Tests for the point-in-time state index.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_engine import EloParams
+from core.elo_tracker import EloTracker
+from core.espn_client import GameResult
+from core.game_processor import GameProcessor
+from core.state_index import StateIndex
+from core.stats_tracker import StatsTracker
+
+
+PARAMS = EloParams(k_factor=24, home_court_advantage=60, season_carryover=0.6)
+
+
+def _season(season_id, start, days, rng, teams=6):
+    rows = []
+    for d in range(days):
+        pair = rng.choice(teams, size=4, replace=False) + 1
+        for home, away in (pair[:2], pair[2:]):
+            pts_home, pts_away = rng.integers(80, 120, size=2)
+            pts_home += pts_home == pts_away
+            rows.append({
+                "game_date": pd.Timestamp(start) + pd.Timedelta(days=2 * d),
+                "season_id": season_id,
+                "team_id_home": int(home),
+                "team_id_away": int(away),
+                "pts_home": int(pts_home),
+                "pts_away": int(pts_away),
+                "home_win": int(pts_home > pts_away),
+            })
+    return rows
+
+
+@pytest.fixture(scope="module")
+def games():
+    rng = np.random.default_rng(7)
+    return pd.DataFrame(_season(22024, "2024-11-01", 30, rng) + _season(22025, "2025-11-01", 30, rng))
+
+
+def _replayed_trackers(games, as_of):
+    """Trackers after every game before ``as_of``, applied one by one."""
+    elo, stats = EloTracker(params=PARAMS), StatsTracker()
+    processor = GameProcessor(elo, stats, team_mapper=None)
+    season = None
+    for row in games[games["game_date"] < pd.Timestamp(as_of)].itertuples():
+        if season is not None and row.season_id != season:
+            elo.apply_season_regression()
+        season = row.season_id
+        processor.process_game(GameResult(
+            row.game_date.strftime("%Y-%m-%d"), "", "", row.pts_home, row.pts_away, "Final",
+            home_team_id=row.team_id_home, away_team_id=row.team_id_away,
+        ))
+    # The state as of a season's first day already includes its regression
+    today = games.loc[games["game_date"] == pd.Timestamp(as_of), "season_id"]
+    if season is not None and len(today) and today.iloc[0] != season:
+        elo.apply_season_regression()
+    return elo, stats
+
+
+@pytest.mark.parametrize("as_of", ["2024-11-01", "2024-11-20", "2025-01-01", "2025-11-01", "2025-12-15"])
+def test_state_as_of_matches_replay(games, as_of):
+    index = StateIndex.from_games(games, PARAMS)
+    elo, stats = index.trackers_at(as_of)
+    expected_elo, expected_stats = _replayed_trackers(games, as_of)
+
+    assert elo.get_all_ratings() == pytest.approx(expected_elo.get_all_ratings())
+    assert stats.to_dict() == expected_stats.to_dict()
+    assert index.elo_at(99, as_of) == PARAMS.default_elo
+
+
+def test_append_matches_full_build(games):
+    cut = pd.Timestamp("2025-11-05")
+    full = StateIndex.from_games(games, PARAMS)
+    grown = StateIndex.from_games(games[games["game_date"] < cut], PARAMS)
+    grown = grown.append_games(games[games["game_date"] >= cut])
+
+    assert len(grown) == len(full)
+    np.testing.assert_allclose(grown.elo, full.elo)
+    np.testing.assert_array_equal(grown.season_days, full.season_days)
+    with pytest.raises(ValueError):
+        grown.append_games(games.head(2))
+
+    # GameResults from a daily update extend the index the same way
+    last = games[games["game_date"] == games["game_date"].max()]
+    head = StateIndex.from_games(games[games["game_date"] < games["game_date"].max()], PARAMS)
+    results = [
+        GameResult(r.game_date.strftime("%Y-%m-%d"), "", "", r.pts_home, r.pts_away, "Final",
+                   home_team_id=r.team_id_home, away_team_id=r.team_id_away)
+        for r in last.itertuples()
+    ]
+    np.testing.assert_allclose(head.append_results(results, 22025).elo, full.elo)
+
+
+def test_save_load_and_coverage(games, tmp_path):
+    index = StateIndex.from_games(games, PARAMS)
+    index.save(tmp_path / "state_index.npz")
+    loaded = StateIndex.load(tmp_path / "state_index.npz")
+
+    assert loaded.params == PARAMS and len(loaded) == len(games)
+    assert loaded.ratings_at("2025-12-01") == index.ratings_at("2025-12-01")
+    assert loaded.covers("2024-12-01") and loaded.covers(str(loaded.last_date))
+    assert not loaded.covers("2026-06-01")
+
+
+def test_service_predicts_past_dates_from_index(games):
+    from api.dependencies import PredictionService
+    from core.league_config import WNBA_CONFIG
+
+    service = PredictionService(config=WNBA_CONFIG)
+    service._state_index = StateIndex.from_games(games, PARAMS)
+
+    assert service.is_historical("2025-01-01")
+    assert not service.is_historical("2030-01-01")
+    builder = service.feature_builder_for("2025-01-01")
+    assert service.feature_builder_for("2025-01-01") is builder
+    assert builder.elo_tracker.get_elo(1) == service.state_index.elo_at(1, "2025-01-01")
@@ -0,0 +1,185 @@
+"""
+Tests for incremental GCS state sync against a filesystem-backed fake bucket.
+"""
+
+import gzip
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.elo_tracker import EloTracker
+from core.state_manager import StateManager
+from core.state_sync import SYNC_RECORD_FILE, download_state_from_gcs, upload_state_to_gcs
+from core.stats_tracker import StatsTracker
+
+
+class FakeBlob:
+    """The parts of google.cloud.storage.Blob the sync uses."""
+
+    def __init__(self, bucket, name):
+        self.bucket = bucket
+        self.name = name
+        meta = bucket._meta(name)
+        self.generation = meta.get("generation")
+        self.content_encoding = meta.get("content_encoding")
+
+    def upload_from_string(self, data, content_type=None):
+        self.generation = self.bucket._write(self.name, data, self.content_encoding)
+
+    def delete(self):
+        self.bucket.deletes.append(self.name)
+        (self.bucket.root / self.name).unlink()
+        self.bucket._meta_path(self.name).unlink()
+
+    def download_as_bytes(self, raw_download=False):
+        self.bucket.downloads.append(self.name)
+        data = (self.bucket.root / self.name).read_bytes()
+        if not raw_download and self.content_encoding == "gzip":
+            data = gzip.decompress(data)
+        return data
+
+
+class FakeBucket:
+    """Objects are files under root; generations live in a sidecar JSON."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.uploads, self.downloads, self.deletes = [], [], []
+        self._lock = threading.Lock()
+        self._next_generation = 1000
+
+    def _meta_path(self, name):
+        return self.root / ".meta" / f"{name.replace('/', '__')}.json"
+
+    def _meta(self, name):
+        path = self._meta_path(name)
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _write(self, name, data, content_encoding):
+        with self._lock:
+            self._next_generation += 1
+            generation = self._next_generation
+            self.uploads.append(name)
+        (self.root / name).parent.mkdir(parents=True, exist_ok=True)
+        (self.root / name).write_bytes(data)
+        self._meta_path(name).parent.mkdir(parents=True, exist_ok=True)
+        self._meta_path(name).write_text(json.dumps(
+            {"generation": generation, "content_encoding": content_encoding}))
+        return generation
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix=None):
+        for path in sorted(self.root.rglob("*")):
+            name = path.relative_to(self.root).as_posix()
+            if path.is_file() and not name.startswith(".meta") and name.startswith(prefix or ""):
+                yield FakeBlob(self, name)
+
+
+@pytest.fixture
+def bucket(tmp_path):
+    (tmp_path / "bucket").mkdir()
+    return FakeBucket(tmp_path / "bucket")
+
+
+def _league_state(state_root, league="wnba", rating=1600.0):
+    manager = StateManager(state_root / league)
+    elo = EloTracker({team: 1500.0 + team for team in range(2, 32)})
+    elo.set_elo(1, rating)
+    manager.save(elo, StatsTracker())
+    manager.set_last_processed_date("2026-06-01")
+    return manager
+
+
+def test_upload_covers_league_dirs_and_skips_unchanged(tmp_path, bucket):
+    local = tmp_path / "local"
+    _league_state(local, "wnba")
+    _league_state(local, "nba")
+    (local / "elo.json").parent.mkdir(parents=True, exist_ok=True)
+    (local / "elo.json").write_text(json.dumps({"1": 1500.0}))
+
+    uploaded = upload_state_to_gcs(local, bucket=bucket)
+    assert uploaded == 11       # root elo.json + 2 x (3 generation files, journal, manifest)
+    assert "state/wnba/generations/000001/elo.json" in bucket.uploads
+    # Manifests only after the files they reference
+    assert bucket.uploads.index("state/wnba/MANIFEST.json") > bucket.uploads.index(
+        "state/wnba/generations/000001/elo.json")
+
+    # JSON is stored compressed
+    stored = (bucket.root / "state/wnba/generations/000001/elo.json").read_bytes()
+    assert gzip.decompress(stored) == (local / "wnba/generations/000001/elo.json").read_bytes()
+
+    assert upload_state_to_gcs(local, bucket=bucket) == 0
+
+    _league_state(local, "wnba", rating=1650.0)     # new generation
+    bucket.uploads.clear()
+    assert upload_state_to_gcs(local, bucket=bucket) == 4
+    assert bucket.uploads[-1] == "state/wnba/MANIFEST.json"
+
+
+def test_download_fetches_only_new_generations(tmp_path, bucket):
+    source = tmp_path / "source"
+    _league_state(source, "wnba")
+    upload_state_to_gcs(source, bucket=bucket)
+
+    replica = tmp_path / "replica"
+    assert download_state_from_gcs(replica, bucket=bucket, workers=4) == 5
+    assert StateManager(replica / "wnba").load()[0].get_elo(1) == 1600.0
+    assert (replica / SYNC_RECORD_FILE).exists()
+
+    bucket.downloads.clear()
+    assert download_state_from_gcs(replica, bucket=bucket) == 0
+    assert bucket.downloads == []
+
+    _league_state(source, "wnba", rating=1700.0)
+    upload_state_to_gcs(source, bucket=bucket)
+    assert download_state_from_gcs(replica, bucket=bucket) == 4
+    reloaded = StateManager(replica / "wnba")
+    assert reloaded.load()[0].get_elo(1) == 1700.0
+    assert reloaded.get_metadata()["last_processed_date"] == "2026-06-01"
+
+
+def test_upload_deletes_pruned_generations(tmp_path, bucket):
+    local = tmp_path / "local"
+    for i in range(StateManager.KEEP_GENERATIONS + 2):
+        _league_state(local, "wnba", rating=1600.0 + i)
+        upload_state_to_gcs(local, bucket=bucket)
+
+    remote = sorted(p.name for p in (bucket.root / "state/wnba/generations").iterdir() if any(p.iterdir()))
+    local_generations = sorted(p.name for p in (local / "wnba/generations").iterdir())
+    assert remote == local_generations and len(remote) == StateManager.KEEP_GENERATIONS
+    assert bucket.deletes and all("/generations/000001/" in n or "/generations/000002/" in n
+                                  for n in bucket.deletes)
+    assert not any("generations/000001" in k for k in json.loads((local / SYNC_RECORD_FILE).read_text()))
+
+    # A fresh replica only downloads what the manifest references
+    replica = tmp_path / "replica"
+    download_state_from_gcs(replica, bucket=bucket)
+    assert StateManager(replica / "wnba").load()[0].get_elo(1) == 1600.0 + StateManager.KEEP_GENERATIONS + 1
+
+
+def test_download_repairs_locally_modified_files(tmp_path, bucket):
+    source = tmp_path / "source"
+    _league_state(source, "cbb")
+    upload_state_to_gcs(source, bucket=bucket)
+    replica = tmp_path / "replica"
+    download_state_from_gcs(replica, bucket=bucket)
+
+    elo_path = StateManager(replica / "cbb").elo_path
+    elo_path.write_text("{}")
+    assert download_state_from_gcs(replica, bucket=bucket) == 1
+    assert StateManager(replica / "cbb").load()[0].get_elo(1) == 1600.0
+
+
+def test_sync_without_bucket_is_noop(tmp_path, monkeypatch):
+    monkeypatch.delenv("STATE_BUCKET", raising=False)
+    assert download_state_from_gcs(tmp_path) == 0
+    assert upload_state_to_gcs(tmp_path) == 0
+    with pytest.raises(RuntimeError):
+        download_state_from_gcs(tmp_path, required=True)
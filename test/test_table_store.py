@@ -0,0 +1,75 @@
+"""
+Tests for the columnar (Arrow IPC) table store.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.table_store import export_csv, read_arrow, read_frame, save_frame, write_table
+
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+
+
+@pytest.fixture(scope="module")
+def games():
+    path = PROCESSED_DIR / "cbb_games_with_elo_rest.csv"
+    if not path.exists():
+        pytest.skip("CBB games not available")
+    return pd.read_csv(path, parse_dates=["game_date"], float_precision="round_trip")
+
+
+def test_round_trip_is_exact_and_typed(games, tmp_path):
+    write_table(games, "games_with_elo_rest", "cbb", tmp_path)
+    loaded = read_frame("games_with_elo_rest", "cbb", root=tmp_path, processed_dir=tmp_path)
+    pd.testing.assert_frame_equal(loaded, games, check_exact=True)
+
+    schema = read_arrow("games_with_elo_rest", "cbb", root=tmp_path).schema
+    assert str(schema.field("game_date").type).startswith("timestamp")
+    assert str(schema.field("elo_prob").type) == "double"
+
+
+def test_column_and_season_pruning(games, tmp_path):
+    write_table(games, "games_with_elo_rest", "cbb", tmp_path)
+    season = int(games["season_id"].max())
+    part = read_frame("games_with_elo_rest", "cbb", columns=["game_date", "elo_prob"],
+                      seasons=[season], root=tmp_path, processed_dir=tmp_path)
+    expected = games.loc[games["season_id"] == season, ["game_date", "elo_prob"]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(part, expected, check_exact=True)
+
+    seasons = sorted(p.name for p in (tmp_path / "games_with_elo_rest" / "league=cbb").glob("season=*"))
+    assert seasons == [f"season={s}" for s in sorted(games["season_id"].unique())]
+
+
+def test_row_order_kept_across_partitions(tmp_path):
+    df = pd.DataFrame({"season_id": [2, 1, 2, 1], "value": [0.1, 0.2, 0.3, 0.4]})
+    write_table(df, "toy", "wnba", tmp_path)
+    pd.testing.assert_frame_equal(read_frame("toy", "wnba", root=tmp_path, processed_dir=tmp_path), df)
+
+
+def test_stale_store_falls_back_to_csv(tmp_path):
+    processed, store = tmp_path / "processed", tmp_path / "store"
+    df = pd.DataFrame({"season_id": [1, 1], "game_date": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+                       "value": [1.0, 2.0]})
+    save_frame(df, "toy", "cbb", root=store, processed_dir=processed)
+
+    # Hand-edited CSV newer than the store -> the CSV wins
+    csv = processed / "cbb_toy.csv"
+    df.assign(value=[5.0, 6.0]).to_csv(csv, index=False)
+    later = time.time() + 10
+    os.utime(csv, (later, later))
+    assert read_frame("toy", "cbb", root=store, processed_dir=processed)["value"].tolist() == [5.0, 6.0]
+
+
+def test_csv_export_matches_source(games, tmp_path):
+    source = PROCESSED_DIR / "cbb_games_with_elo_rest.csv"
+    write_table(games, "games_with_elo_rest", "cbb", tmp_path)
+    out = export_csv("games_with_elo_rest", "cbb", tmp_path / "export.csv", root=tmp_path)
+    assert out.read_bytes() == source.read_bytes()
@@ -0,0 +1,228 @@
+"""
+Tests for the buffered chat usage ledger.
+
+RTDB is replaced by an in-memory fake that implements the pieces the ledger
+uses: per-path ``transaction`` and a root multi-path ``update`` understanding
+the ``{".sv": {"increment": n}}`` server value.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from fastapi import HTTPException
+
+from api.routes import chat
+from api.usage_ledger import UsageLedger, UsageLimitExceeded
+
+
+DAY = "2026-01-15"
+
+
+class FakeRTDB:
+    """Thread-safe dict-of-paths RTDB stand-in with call counters."""
+
+    def __init__(self):
+        self.data: dict[str, int] = {}
+        self.transactions = 0
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def reference(self, path: str):
+        db = self
+
+        class _Ref:
+            def get(self):
+                return db.data.get(path)
+
+            def transaction(self, fn):
+                with db._lock:
+                    db.transactions += 1
+                    value = fn(db.data.get(path))
+                    db.data[path] = value
+                    return value
+
+            def update(self, values: dict):
+                with db._lock:
+                    db.updates += 1
+                    for sub, value in values.items():
+                        full = f"{path}/{sub}"
+                        if isinstance(value, dict) and ".sv" in value:
+                            value = (db.data.get(full) or 0) + value[".sv"]["increment"]
+                        db.data[full] = value
+
+        return _Ref()
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ledger(db, clock=None, **kwargs):
+    return UsageLedger(db.reference, clock=clock or FakeClock(), **kwargs)
+
+
+def _drain(ledger, uid, limit):
+    """Consume until the limit is hit; return number of chats granted."""
+    granted = 0
+    while True:
+        try:
+            ledger.consume(uid, DAY, limit)
+            granted += 1
+        except UsageLimitExceeded:
+            return granted
+
+
+class TestUsageLedger:
+    def test_free_limit_exact(self):
+        db = FakeRTDB()
+        ledger = _ledger(db)
+        assert [ledger.consume("u1", DAY, 3) for _ in range(3)] == [(1, 2), (2, 1), (3, 0)]
+        with pytest.raises(UsageLimitExceeded) as exc:
+            ledger.consume("u1", DAY, 3)
+        assert exc.value.used == 3
+        assert db.data[f"usage/u1/{DAY}"] == 3
+
+    def test_free_user_counter_stays_exact(self):
+        # The app and the Cloud Function read the same counter: no reserved
+        # chats may show up as used
+        db = FakeRTDB()
+        ledger = _ledger(db)
+        for used in (1, 2, 3):
+            ledger.consume("u1", DAY, 3)
+            assert db.data[f"usage/u1/{DAY}"] == used
+        assert ledger.outstanding() == 0
+
+    def test_rejection_served_from_memory(self):
+        db = FakeRTDB()
+        ledger = _ledger(db)
+        _drain(ledger, "u1", 3)
+        before = db.transactions
+        for _ in range(5):
+            with pytest.raises(UsageLimitExceeded):
+                ledger.consume("u1", DAY, 3)
+        assert db.transactions == before
+
+    def test_exhausted_lease_rechecks_after_ttl(self):
+        db = FakeRTDB()
+        clock = FakeClock()
+        holder = _ledger(db, clock=clock, block_size=10, lease_idle=60, flush_interval=1e9)
+        other = _ledger(db, clock=clock, block_size=10, lease_idle=60, flush_interval=1e9, exhausted_ttl=30)
+        holder.consume("u1", DAY, 40)            # reserves a block of 10
+        assert _drain(other, "u1", 40) == 30     # near the limit: one at a time
+
+        # Rejected retries do not keep the lease alive or hit RTDB
+        before = db.transactions
+        for _ in range(5):
+            clock.now += 5
+            with pytest.raises(UsageLimitExceeded):
+                other.consume("u1", DAY, 40)
+        assert db.transactions == before
+
+        clock.now += 35                          # holder's lease idles out
+        assert holder.flush() == 1
+        assert other.consume("u1", DAY, 40) == (32, 8)
+
+    def test_background_flush_releases_idle_leases(self):
+        db = FakeRTDB()
+        ledger = UsageLedger(db.reference, block_size=10, flush_interval=0.01, lease_idle=0)
+        ledger.consume("pro", DAY, 9999)
+        ledger.start()
+        try:
+            deadline = time.monotonic() + 5
+            while ledger.outstanding() and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            ledger.stop()
+        assert db.data[f"usage/pro/{DAY}"] == 1
+
+    def test_pro_user_reserves_in_blocks(self):
+        db = FakeRTDB()
+        ledger = _ledger(db, block_size=10)
+        for _ in range(50):
+            ledger.consume("pro", DAY, 9999)
+        assert db.transactions == 5
+        assert db.data[f"usage/pro/{DAY}"] == 50
+
+    def test_two_instances_never_exceed_limit(self):
+        db = FakeRTDB()
+        ledgers = [_ledger(db, block_size=10) for _ in range(2)]
+        granted = []
+
+        def worker(ledger):
+            granted.append(_drain(ledger, "u1", 40))
+
+        threads = [threading.Thread(target=worker, args=(lg,)) for lg in ledgers for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(granted) == 40
+        for lg in ledgers:
+            lg.flush(force=True)
+        assert db.data[f"usage/u1/{DAY}"] == 40
+
+    def test_flush_batches_and_settles_unused(self):
+        db = FakeRTDB()
+        clock = FakeClock()
+        ledger = _ledger(db, clock=clock, block_size=10, lease_idle=60, flush_interval=1e9)
+        for uid in ("a", "b", "c"):
+            ledger.consume(uid, DAY, 9999)
+        assert ledger.outstanding() == 27
+
+        assert ledger.flush() == 0  # nothing idle yet
+        clock.now += 60
+        assert ledger.flush() == 3
+        assert db.updates == 1
+        assert all(db.data[f"usage/{uid}/{DAY}"] == 1 for uid in ("a", "b", "c"))
+        assert len(ledger) == 0
+
+    def test_failed_flush_keeps_reservation(self):
+        db = FakeRTDB()
+        ledger = _ledger(db, block_size=10)
+        ledger.consume("pro", DAY, 9999)
+
+        def broken(path):
+            ref = db.reference(path)
+            if path == "usage":
+                ref.update = lambda values: (_ for _ in ()).throw(ConnectionError("down"))
+            return ref
+
+        ledger._reference = broken
+        assert ledger.flush(force=True) == 0
+        assert ledger.outstanding() == 9
+
+        ledger._reference = db.reference
+        ledger.flush(force=True)
+        assert db.data[f"usage/pro/{DAY}"] == 1
+
+    def test_upgrade_mid_day_lifts_limit(self):
+        db = FakeRTDB()
+        ledger = _ledger(db)
+        _drain(ledger, "u1", 3)
+        used, _ = ledger.consume("u1", DAY, 9999)
+        assert used == 4
+
+
+class TestChatRouteUsesLedger:
+    def test_429_detail(self):
+        db = FakeRTDB()
+        with patch.object(chat, "usage_ledger", _ledger(db)):
+            for _ in range(3):
+                chat._check_and_increment_usage("u1", 3)
+            with pytest.raises(HTTPException) as exc:
+                chat._check_and_increment_usage("u1", 3)
+        assert exc.value.status_code == 429
+        assert exc.value.detail["chatsUsedToday"] == 3
+        assert exc.value.detail["chatsRemaining"] == 0
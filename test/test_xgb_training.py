@@ -0,0 +1,122 @@
+"""
+Tests for the cached XGBoost training / search subsystem.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import xgb_training
+from core.feature_builder import FEATURE_COLS
+from core.xgb_training import (
+    DEFAULT_PARAMS,
+    DataCache,
+    LeagueData,
+    TrialCache,
+    plan_workers,
+    predict,
+    random_params,
+    run_search,
+    split_by_season,
+    train_booster,
+)
+
+
+PROCESSED_DIR = Path(__file__).parent.parent / "data" / "processed"
+FEATURES_PATH = PROCESSED_DIR / "wnba_features_with_injuries.csv"
+
+
+@pytest.fixture(scope="module")
+def frame():
+    if not FEATURES_PATH.exists():
+        pytest.skip("WNBA features not available")
+    return pd.read_csv(FEATURES_PATH, parse_dates=["game_date"])
+
+
+@pytest.fixture(scope="module")
+def data(frame):
+    return LeagueData.from_frame(frame, "wnba")
+
+
+def test_native_training_matches_classifier(frame, data):
+    """train_booster reproduces the XGBClassifier the script used to fit."""
+    from xgboost import XGBClassifier
+
+    train, val, test = split_by_season(frame, "wnba")
+    model = XGBClassifier(
+        n_estimators=100, learning_rate=0.03, max_depth=3, subsample=0.9,
+        colsample_bytree=0.9, min_child_weight=5, reg_lambda=1.0, reg_alpha=0.0,
+        objective="binary:logistic", eval_metric="logloss", random_state=42, n_jobs=1,
+    )
+    model.fit(train[FEATURE_COLS], train["home_win"],
+              eval_set=[(val[FEATURE_COLS], val["home_win"])], verbose=False)
+
+    booster, n_trees = train_booster(data, num_boost_round=100, nthread=1)
+    assert n_trees == 100
+    np.testing.assert_array_equal(
+        predict(booster, data.X["test"], n_trees),
+        model.predict_proba(test[FEATURE_COLS])[:, 1],
+    )
+
+
+def test_data_cache_reuses_arrays(tmp_path, monkeypatch):
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    if not FEATURES_PATH.exists():
+        pytest.skip("WNBA features not available")
+    (processed / FEATURES_PATH.name).write_bytes(FEATURES_PATH.read_bytes())
+
+    cache = DataCache(tmp_path / "cache", store_root=tmp_path / "store", processed_dir=processed)
+    first = cache.load("wnba")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("feature table re-read")
+
+    monkeypatch.setattr(xgb_training, "read_frame", fail)
+    second = DataCache(tmp_path / "cache", store_root=tmp_path / "store", processed_dir=processed).load("wnba")
+    assert second.data_hash == first.data_hash
+    for split in xgb_training.SPLITS:
+        np.testing.assert_array_equal(second.X[split], first.X[split])
+        np.testing.assert_array_equal(second.y[split], first.y[split])
+
+    # New content -> new key -> rebuilt
+    monkeypatch.undo()
+    with open(processed / FEATURES_PATH.name, "a", encoding="utf-8") as f:
+        f.write(FEATURES_PATH.read_text().splitlines()[-1] + "\n")
+    third = DataCache(tmp_path / "cache", store_root=tmp_path / "store", processed_dir=processed).load("wnba")
+    assert third.data_hash != first.data_hash
+    assert third.sizes()["test"] == first.sizes()["test"] + 1
+
+
+def test_search_pool_matches_inline_and_caches(data, tmp_path, monkeypatch):
+    settings = [{}, *random_params(3, seed=1)]
+    kwargs = dict(num_boost_round=60, early_stopping_rounds=10, threads_per_trial=1)
+
+    inline = run_search({"wnba": data}, {"wnba": settings}, cpu_budget=1, **kwargs)["wnba"]
+    pooled = run_search({"wnba": data}, {"wnba": settings}, cpu_budget=2,
+                        cache_dir=tmp_path, **kwargs)["wnba"]
+    assert [r.val_log_loss for r in inline] == [r.val_log_loss for r in pooled]
+    assert inline == sorted(inline, key=lambda r: r.val_log_loss)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached trial re-run")
+
+    monkeypatch.setattr(xgb_training, "run_trial", fail)
+    cached = run_search({"wnba": data}, {"wnba": settings}, cpu_budget=1,
+                        cache_dir=tmp_path, **kwargs)["wnba"]
+    assert [r.val_log_loss for r in cached] == [r.val_log_loss for r in pooled]
+
+    best = TrialCache(tmp_path).best("wnba", data.data_hash)
+    assert best.val_log_loss == pooled[0].val_log_loss
+
+
+def test_plan_workers_respects_budget():
+    assert plan_workers(8, 2, 100) == 4
+    assert plan_workers(8, 2, 3) == 3
+    assert plan_workers(1, 4, 10) == 1
+    assert set(random_params(1)[0]) <= set(DEFAULT_PARAMS)